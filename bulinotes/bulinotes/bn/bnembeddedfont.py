@@ -34,10 +34,13 @@ from PyQt5.QtCore import (
         pyqtSignal as Signal
     )
 
-from bulinotes.pktk.modules.fontdb import (Font, FontDatabase)
 from bulinotes.pktk.modules.strutils import stripHtml
 from bulinotes.pktk.modules.bytesrw import BytesRW
 from bulinotes.pktk.modules.ekrita import EKritaNode
+from bulinotes.pktk.modules.lazyimport import LazyImport
+
+# font database is only used when fonts are embedded or loaded
+fontdb = LazyImport('bulinotes.pktk.modules.fontdb')
 
 
 class BNEmbeddedFont(QObject):
@@ -57,7 +60,7 @@ class BNEmbeddedFont(QObject):
         elif isinstance(source, str):
             # import from font name
             self.__name = source
-            self.__fontList = FontDatabase.font(self.__name)
+            self.__fontList = fontdb.FontDatabase.font(self.__name)
 
     def __repr__(self):
         return f"<BNEmbeddedFont({self.__name}, {len(self.__fontList)}, {self.__fontList})>"
@@ -140,7 +143,7 @@ class BNEmbeddedFont(QObject):
             fileSize = dataRead.readUInt8()
             fileContent = dataRead.read(fileSize)
 
-            self.__fontList.append(Font(fileName, fileContent))
+            self.__fontList.append(fontdb.Font(fileName, fileContent))
 
         dataRead.close()
 
@@ -63,28 +63,27 @@ from bulinotes.pktk.modules.timeutils import tsToStr
 from bulinotes.pktk.modules.edialog import EDialog
 from bulinotes.pktk.modules.ekrita import EKritaNode
 from bulinotes.pktk.modules.bytesrw import BytesRW
-from bulinotes.pktk.modules.fontdb import Font
+from bulinotes.pktk.modules.lazyimport import LazyImport
 from bulinotes.pktk.widgets.wstandardcolorselector import WStandardColorSelector
-from bulinotes.pktk.widgets.wmenuitem import (WMenuBrushesPresetSelector, WMenuColorPicker)
-from bulinotes.pktk.widgets.wcolorselector import WColorPicker
-from bulinotes.pktk.widgets.wdocnodesview import WDocNodesViewDialog
-from bulinotes.pktk.widgets.wtextedit import (
-                                WTextEditDialog,
-                                WTextEdit,
-                                WTextEditBtBarOption
-                            )
-from bulinotes.pktk.widgets.wefiledialog import WEFileDialog
-from bulinotes.pktk.widgets.wiodialog import WDialogMessage
 
 from .bnbrush import (BNBrushPreset, BNBrush, BNBrushes)
 from .bnlinkedlayer import (BNLinkedLayer, BNLinkedLayers)
 from .bnembeddedfont import (BNEmbeddedFont, BNEmbeddedFonts)
-from .bnwlinkedlayers import BNLinkedLayerEditor
-from .bnwbrushes import BNBrushesEditor
-from .bnwfonts import BNFont
-from .bnnote_postit import BNNotePostIt
 from .bnsettings import (BNSettings, BNSettingsKey)
 
+# modules only used by note editor and post-it are imported on first use
+wmenuitem = LazyImport('bulinotes.pktk.widgets.wmenuitem')
+wcolorselector = LazyImport('bulinotes.pktk.widgets.wcolorselector')
+wdocnodesview = LazyImport('bulinotes.pktk.widgets.wdocnodesview')
+wtextedit = LazyImport('bulinotes.pktk.widgets.wtextedit')
+wefiledialog = LazyImport('bulinotes.pktk.widgets.wefiledialog')
+fontdb = LazyImport('bulinotes.pktk.modules.fontdb')
+wiodialog = LazyImport('bulinotes.pktk.widgets.wiodialog')
+bnwlinkedlayers = LazyImport('.bnwlinkedlayers', __package__)
+bnwbrushes = LazyImport('.bnwbrushes', __package__)
+bnwfonts = LazyImport('.bnwfonts', __package__)
+bnnote_postit = LazyImport('.bnnote_postit', __package__)
+
 
 class BNNote(QObject):
     """A note"""
@@ -332,12 +331,12 @@ class BNNote(QObject):
 
     def setWindowPostIt(self, window):
         """Set window note compact"""
-        if window is None or isinstance(window, BNNotePostIt):
+        if window is None or isinstance(window, bnnote_postit.BNNotePostIt):
             self.__windowPostIt = window
 
     def openWindowPostIt(self, activateWindow=False):
         if self.__windowPostIt is None:
-            self.__windowPostIt = BNNotePostIt(self)
+            self.__windowPostIt = bnnote_postit.BNNotePostIt(self)
             self.__updated('opened')
         if activateWindow:
             self.__windowPostIt.activateWindow()
@@ -1487,7 +1486,7 @@ class BNNoteEditor(EDialog):
         self.tabWidget.currentChanged.connect(self.__tabChanged)
 
         # -- TEXT Note properties
-        self.wteText.setToolbarButtons(WTextEdit.DEFAULT_TOOLBAR | WTextEditBtBarOption.STYLE_STRIKETHROUGH | WTextEditBtBarOption.STYLE_COLOR_BG)
+        self.wteText.setToolbarButtons(wtextedit.WTextEdit.DEFAULT_TOOLBAR | wtextedit.WTextEditBtBarOption.STYLE_STRIKETHROUGH | wtextedit.WTextEditBtBarOption.STYLE_COLOR_BG)
         self.wteText.setHtml(self.__note.text())
         self.wteText.setColorPickerLayout(BNSettings.getTxtColorPickerLayout())
         self.wteText.colorMenuUiChanged.connect(BNSettings.setTxtColorPickerLayout)
@@ -1512,9 +1511,9 @@ class BNNoteEditor(EDialog):
                                                   i18n(f"Current painting brush ({self.__activeViewCurrentConfig['brushPreset'].name()})"),
                                                   self)
         self.__actionSelectCurrentBrush.triggered.connect(self.__actionScratchpadSetBrushCurrent)
-        self.__actionSelectBrush = WMenuBrushesPresetSelector()
+        self.__actionSelectBrush = wmenuitem.WMenuBrushesPresetSelector()
         self.__actionSelectBrush.presetChooser().presetClicked.connect(self.__actionScratchpadSetBrushPreset)
-        self.__actionSelectColor = WMenuColorPicker()
+        self.__actionSelectColor = wmenuitem.WMenuColorPicker()
         self.__actionSelectColor.colorPicker().colorUpdated.connect(self.__actionScratchpadSetColor)
         self.__actionSelectColor.colorPicker().setOptionCompactUi(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_SCRATCHPAD_COLORPICKER_COMPACT))
         self.__actionSelectColor.colorPicker().setOptionShowColorPalette(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_SCRATCHPAD_COLORPICKER_PALETTE_VISIBLE))
@@ -1532,7 +1531,7 @@ class BNNoteEditor(EDialog):
         self.__actionSelectColor.colorPicker().setOptionShowColorHSL(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_SCRATCHPAD_COLORPICKER_CSLIDER_HSV_VISIBLE))
         self.__actionSelectColor.colorPicker().setOptionDisplayAsPctColorHSL(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_SCRATCHPAD_COLORPICKER_CSLIDER_HSV_ASPCT))
         self.__actionSelectColor.colorPicker().setOptionShowColorAlpha(False)
-        self.__actionSelectColor.colorPicker().setOptionMenu(WColorPicker.OPTION_MENU_ALL & ~WColorPicker.OPTION_MENU_ALPHA)
+        self.__actionSelectColor.colorPicker().setOptionMenu(wcolorselector.WColorPicker.OPTION_MENU_ALL & ~wcolorselector.WColorPicker.OPTION_MENU_ALPHA)
         self.__actionSelectColor.colorPicker().uiChanged.connect(self.__selectColorMenuChanged)
 
         self.__actionImportFromFile = QAction(i18n('Import from file...'), self)
@@ -1582,10 +1581,10 @@ class BNNoteEditor(EDialog):
         self.hsZoom.valueChanged.connect(self.__actionScratchpadSetZoom)
 
         # -- BRUSHES Note properties
-        self.__actionSelectBrushScratchpadColor = WMenuColorPicker()
+        self.__actionSelectBrushScratchpadColor = wmenuitem.WMenuColorPicker()
         self.__actionSelectBrushScratchpadColor.colorPicker().colorUpdated.connect(self.__actionBrushScratchpadSetColor)
         self.__actionSelectBrushScratchpadColor.colorPicker().setOptionLayout(self.__actionSelectColor.colorPicker().optionLayout())
-        self.__actionSelectBrushScratchpadColor.colorPicker().setOptionMenu(WColorPicker.OPTION_MENU_ALL & ~WColorPicker.OPTION_MENU_ALPHA)
+        self.__actionSelectBrushScratchpadColor.colorPicker().setOptionMenu(wcolorselector.WColorPicker.OPTION_MENU_ALL & ~wcolorselector.WColorPicker.OPTION_MENU_ALPHA)
         self.__actionSelectBrushScratchpadColor.colorPicker().uiChanged.connect(self.__selectBrushScratchpadColorMenuChanged)
 
         menuBrushScratchpadColor = QMenu(self.tbColor)
@@ -1661,7 +1660,7 @@ class BNNoteEditor(EDialog):
         BNSettings.setTxtColorPickerLayout(self.wteText.colorPickerLayout())
 
         if BNSettings.modified():
-            BNSettings.save()
+            BNSettings.save(True)
 
     def __updateImportMenuUi(self):
         """Menu import is about to be displayed"""
@@ -1707,23 +1706,23 @@ class BNNoteEditor(EDialog):
 
         def addFontDefinition(fontInfo, font, fontFamily=None):
             # many files can define one font
-            familyName = font.property(Font.PROPERTY_TYPO_FAMILY_NAME)
-            subFamilyName = font.property(Font.PROPERTY_TYPO_SUBFAMILY_NAME)
+            familyName = font.property(fontdb.Font.PROPERTY_TYPO_FAMILY_NAME)
+            subFamilyName = font.property(fontdb.Font.PROPERTY_TYPO_SUBFAMILY_NAME)
 
             if fontFamily:
                 if familyName:
                     if fontFamily != familyName:
                         return 0
                 else:
-                    if fontFamily != font.property(Font.PROPERTY_FAMILY_NAME):
+                    if fontFamily != font.property(fontdb.Font.PROPERTY_FAMILY_NAME):
                         return 0
 
             if familyName is None or subFamilyName is None:
-                subName = font.property(Font.PROPERTY_SUBFAMILY_NAME)
+                subName = font.property(fontdb.Font.PROPERTY_SUBFAMILY_NAME)
                 if subName is None:
-                    fontInfo.addRow([TextTableCell(f"<h1>{font.property(Font.PROPERTY_FULLNAME)}</h1>", colspan=2)])
+                    fontInfo.addRow([TextTableCell(f"<h1>{font.property(fontdb.Font.PROPERTY_FULLNAME)}</h1>", colspan=2)])
                 else:
-                    fontInfo.addRow([TextTableCell(f"<h1>{font.property(Font.PROPERTY_FAMILY_NAME)} <i>({subName})</i></h1>", colspan=2)])
+                    fontInfo.addRow([TextTableCell(f"<h1>{font.property(fontdb.Font.PROPERTY_FAMILY_NAME)} <i>({subName})</i></h1>", colspan=2)])
             else:
                 fontInfo.addRow([TextTableCell(f"<h1>{familyName} <i>({subFamilyName})</i></h1>", colspan=2)])
 
@@ -1757,9 +1756,9 @@ class BNNoteEditor(EDialog):
                 fontInfo.addRow(["<b>File location</b>", asMonospace(font.fileName())])
             fontInfo.addRow(["<b>File type</b>", asMonospace(font.type())])
 
-            if value := font.property(Font.PROPERTY_FILE_SIZE):
+            if value := font.property(fontdb.Font.PROPERTY_FILE_SIZE):
                 fontInfo.addRow(["<b>File size</b>", asMonospace(f"{bytesSizeToStr(value)} ({value} bytes)")])
-            if value := font.property(Font.PROPERTY_FILE_DATE):
+            if value := font.property(fontdb.Font.PROPERTY_FILE_DATE):
                 fontInfo.addRow(["<b>File date</b>", asMonospace(f"{tsToStr(value)}")])
 
             fontInfo.addSeparator()
@@ -1770,9 +1769,9 @@ class BNNoteEditor(EDialog):
                         fontInfo.addSeparator()
                         lastProperty = property
                 elif value := font.property(property):
-                    if property in (Font.PROPERTY_URLDESIGNER, Font.PROPERTY_URLVENDOR, Font.PROPERTY_LICENSE_NFOURL):
+                    if property in (fontdb.Font.PROPERTY_URLDESIGNER, fontdb.Font.PROPERTY_URLVENDOR, fontdb.Font.PROPERTY_LICENSE_NFOURL):
                         value = f"<a href='{value}'>{value}</a>"
-                    fontInfo.addRow([f"<b>{Font.PROPERTY_NAMES[property]}</b>", asMonospace(value.replace('\n', '<br>'))])
+                    fontInfo.addRow([f"<b>{fontdb.Font.PROPERTY_NAMES[property]}</b>", asMonospace(value.replace('\n', '<br>'))])
                     lastProperty = property
 
             fontInfo.addSeparator()
@@ -1786,26 +1785,26 @@ class BNNoteEditor(EDialog):
         selectedItems = self.tvFontsList.selectedItems()
         if len(selectedItems) > 0:
             propertyList = [
-                Font.PROPERTY_FULLNAME,
-                Font.PROPERTY_TYPO_FAMILY_NAME,
-                Font.PROPERTY_TYPO_SUBFAMILY_NAME,
-                Font.PROPERTY_PSNAME,
-                Font.PROPERTY_UNIQUEID,
+                fontdb.Font.PROPERTY_FULLNAME,
+                fontdb.Font.PROPERTY_TYPO_FAMILY_NAME,
+                fontdb.Font.PROPERTY_TYPO_SUBFAMILY_NAME,
+                fontdb.Font.PROPERTY_PSNAME,
+                fontdb.Font.PROPERTY_UNIQUEID,
                 -1,  # separator
-                Font.PROPERTY_VERSION,
+                fontdb.Font.PROPERTY_VERSION,
                 -1,  # separator
-                Font.PROPERTY_MANUFACTURER_NAME,
-                Font.PROPERTY_URLVENDOR,
-                Font.PROPERTY_TRADEMARK,
+                fontdb.Font.PROPERTY_MANUFACTURER_NAME,
+                fontdb.Font.PROPERTY_URLVENDOR,
+                fontdb.Font.PROPERTY_TRADEMARK,
                 -1,  # separator
-                Font.PROPERTY_DESIGNER,
-                Font.PROPERTY_URLDESIGNER,
+                fontdb.Font.PROPERTY_DESIGNER,
+                fontdb.Font.PROPERTY_URLDESIGNER,
                 -1,  # separator
-                Font.PROPERTY_COPYRIGHT,
-                Font.PROPERTY_LICENSE_DESCRIPTION,
-                Font.PROPERTY_LICENSE_NFOURL,
+                fontdb.Font.PROPERTY_COPYRIGHT,
+                fontdb.Font.PROPERTY_LICENSE_DESCRIPTION,
+                fontdb.Font.PROPERTY_LICENSE_NFOURL,
                 -1,  # separator
-                Font.PROPERTY_DESCRIPTION
+                fontdb.Font.PROPERTY_DESCRIPTION
             ]
 
             # normally only one item is returned...
@@ -1865,8 +1864,8 @@ class BNNoteEditor(EDialog):
                 nbFonts = 0
 
                 fontInfo = TextTable()
-                for font in sorted(embeddedFont, key=lambda fnt: fnt.property(Font.PROPERTY_FULLNAME) or ''):
-                    if collection := font.property(Font.PROPERTY_COLLECTION_FONTS):
+                for font in sorted(embeddedFont, key=lambda fnt: fnt.property(fontdb.Font.PROPERTY_FULLNAME) or ''):
+                    if collection := font.property(fontdb.Font.PROPERTY_COLLECTION_FONTS):
                         for fnt in collection:
                             nbFonts += addFontDefinition(fontInfo, fnt, selectedItems[0].name())
                     else:
@@ -2080,11 +2079,11 @@ class BNNoteEditor(EDialog):
 
     def __actionScratchpadImportFromFile(self):
         """Import scratchpad content from a file"""
-        fDialog = WEFileDialog(i18n("Import from file"),
+        fDialog = wefiledialog.WEFileDialog(i18n("Import from file"),
                                "",
                                i18n("All images (*.png *.jpg *.jpeg);;Portable Network Graphics (*.png);;JPEG Image (*.jpg *.jpeg)"))
-        fDialog.setFileMode(WEFileDialog.ExistingFile)
-        if fDialog.exec() == WEFileDialog.Accepted:
+        fDialog.setFileMode(wefiledialog.WEFileDialog.ExistingFile)
+        if fDialog.exec() == wefiledialog.WEFileDialog.Accepted:
             pixmap = QPixmap()
             if pixmap.load(fDialog.file()):
                 self.__scratchpadHandWritting.loadScratchpadImage(pixmap.toImage())
@@ -2098,7 +2097,7 @@ class BNNoteEditor(EDialog):
     def __actionScratchpadImportFromLayer(self):
         """Import scratchpad content from a layer"""
         document = Krita.instance().activeDocument()
-        nodeId = WDocNodesViewDialog.show(i18n(f"{self.__name}::Import from layer::Select layer to import"), document)
+        nodeId = wdocnodesview.WDocNodesViewDialog.show(i18n(f"{self.__name}::Import from layer::Select layer to import"), document)
         if nodeId:
             node = document.nodeByUniqueID(nodeId)
             self.__scratchpadHandWritting.loadScratchpadImage(EKritaNode.toQImage(node))
@@ -2111,12 +2110,12 @@ class BNNoteEditor(EDialog):
 
     def __actionScratchpadExportToFile(self):
         """Export scratchpad content to a file"""
-        fDialog = WEFileDialog(i18n("Export to file"),
+        fDialog = wefiledialog.WEFileDialog(i18n("Export to file"),
                                "",
                                i18n("Portable Network Graphics (*.png);;JPEG Image (*.jpg *jpeg)"))
-        fDialog.setFileMode(WEFileDialog.AnyFile)
-        fDialog.setAcceptMode(WEFileDialog.AcceptSave)
-        if fDialog.exec() == WEFileDialog.Accepted:
+        fDialog.setFileMode(wefiledialog.WEFileDialog.AnyFile)
+        fDialog.setAcceptMode(wefiledialog.WEFileDialog.AcceptSave)
+        if fDialog.exec() == wefiledialog.WEFileDialog.Accepted:
             image = self.__scratchpadHandWritting.copyScratchpadImageData()
             image.save(fDialog.file())
 
@@ -2143,7 +2142,7 @@ class BNNoteEditor(EDialog):
 
     def __actionBrushAdd(self):
         """Add current brush definition to brushes list"""
-        result = BNBrushesEditor.edit(f"{self.__name}::Brush comment [{self.__currentUiBrush.name()}]", "")
+        result = bnwbrushes.BNBrushesEditor.edit(f"{self.__name}::Brush comment [{self.__currentUiBrush.name()}]", "")
         if result is not None:
             self.__currentUiBrush.setComments(result)
             self.__tmpBrushes.add(self.__currentUiBrush)
@@ -2154,7 +2153,7 @@ class BNNoteEditor(EDialog):
         """Edit comment for current selected brush"""
         selection = self.tvBrushes.selectedItems()
         if len(selection) == 1:
-            result = BNBrushesEditor.edit(f"{self.__name}::Brush description [{selection[0].name()}]", selection[0].comments())
+            result = bnwbrushes.BNBrushesEditor.edit(f"{self.__name}::Brush description [{selection[0].name()}]", selection[0].comments())
             if result is not None:
                 selection[0].setComments(result)
                 self.wteText.setColorPickerLayout(BNSettings.getTxtColorPickerLayout())
@@ -2173,7 +2172,7 @@ class BNNoteEditor(EDialog):
 
     def __actionLinkedLayerAdd(self):
         """Add layer to linked layer list"""
-        linkedLayers = BNLinkedLayerEditor.edit(None, i18n(f"{self.__name}::Add linked layer"))
+        linkedLayers = bnwlinkedlayers.BNLinkedLayerEditor.edit(None, i18n(f"{self.__name}::Add linked layer"))
 
         if len(linkedLayers) > 0:
             self.__tmpLinkedLayers.beginUpdate()
@@ -2188,7 +2187,7 @@ class BNNoteEditor(EDialog):
         selectedLinkedLayers = self.tvLinkedLayers.selectedItems()
 
         if len(selectedLinkedLayers) == 1:
-            linkedLayers = BNLinkedLayerEditor.edit(selectedLinkedLayers[0], i18n(f"{self.__name}::Edit linked layer"))
+            linkedLayers = bnwlinkedlayers.BNLinkedLayerEditor.edit(selectedLinkedLayers[0], i18n(f"{self.__name}::Edit linked layer"))
 
             if len(linkedLayers) == 1:
                 linkedLayer = linkedLayers[0]
@@ -2245,10 +2244,10 @@ class BNNoteEditor(EDialog):
                 totalSize = 0
                 fileList = ''
 
-                for number, font in enumerate(sorted(embeddedFonts, key=lambda fnt: fnt.property(Font.PROPERTY_FULLNAME) or '')):
-                    fontName = font.property(Font.PROPERTY_FULLNAME)
+                for number, font in enumerate(sorted(embeddedFonts, key=lambda fnt: fnt.property(fontdb.Font.PROPERTY_FULLNAME) or '')):
+                    fontName = font.property(fontdb.Font.PROPERTY_FULLNAME)
                     fileName = os.path.basename(font.fileName())
-                    fileSize = font.property(Font.PROPERTY_FILE_SIZE)
+                    fileSize = font.property(fontdb.Font.PROPERTY_FILE_SIZE)
 
                     totalSize += fileSize
                     fileList += f"<tr><td><i>{number+1}.</i></td><td><b>{fontName}</b></td><td style='font-family: monospace'>{fileName}</li></td>"\
@@ -2259,7 +2258,7 @@ class BNNoteEditor(EDialog):
                 else:
                     message = i18n(f"The following file ({bytesSizeToStr(totalSize)}) will be extracted, please choose a place to save it")
 
-                fileDialog = WEFileDialog(i18n("Extract embedded font"), "",
+                fileDialog = wefiledialog.WEFileDialog(i18n("Extract embedded font"), "",
                                           i18n("All files (*.*);;Supported font files (*.ttf *.ttc *.otf *.otc *.pfb)"),
                                           f"<html><style>td {{ padding: 0 8 0 0; }}</style><b>{message}</b><hr><table>{fileList}</table></html>",
                                           False)
@@ -2273,7 +2272,7 @@ class BNNoteEditor(EDialog):
 
                 nbKo = 0
 
-                for font in sorted(embeddedFonts, key=lambda fnt: fnt.property(Font.PROPERTY_FULLNAME)):
+                for font in sorted(embeddedFonts, key=lambda fnt: fnt.property(fontdb.Font.PROPERTY_FULLNAME)):
                     targetFileName = os.path.join(targetDirectory, os.path.basename(font.fileName()))
 
                     try:
@@ -2292,10 +2291,10 @@ class BNNoteEditor(EDialog):
                 else:
                     message = i18n(f"Some files have not been extracted")
 
-                WDialogMessage.display("Extract embedded font", message)
+                wiodialog.WDialogMessage.display("Extract embedded font", message)
                 return
 
-        WDialogMessage.display("Extract embedded font", i18n("<h1>Whoops!</h1><p>It seems something weird occurs with these font, can't process to extraction!</p>"))
+        wiodialog.WDialogMessage.display("Extract embedded font", i18n("<h1>Whoops!</h1><p>It seems something weird occurs with these font, can't process to extraction!</p>"))
 
     def __actionEmbeddedFontLoad(self):
         """Load font files for current session"""
@@ -2384,7 +2383,7 @@ class BNNoteEditor(EDialog):
                     else:
                         embeddedFonts = []
 
-                    self.__usedFonts.append(BNFont(fontName, True, embeddedFonts))
+                    self.__usedFonts.append(bnwfonts.BNFont(fontName, True, embeddedFonts))
 
         # get fonts from current note (and not anymore in document)
         for fontName in self.__tmpEmbeddedFonts.idList():
@@ -2394,7 +2393,7 @@ class BNNoteEditor(EDialog):
                     embeddedFonts = embeddedFonts.fonts()
                 else:
                     embeddedFonts = []
-                self.__usedFonts.append(BNFont(fontName, False, embeddedFonts))
+                self.__usedFonts.append(bnwfonts.BNFont(fontName, False, embeddedFonts))
 
         self.__usedFonts = sorted(self.__usedFonts, key=lambda x: x.name())
 
@@ -25,7 +25,10 @@ from bulinotes.pktk.modules.settings import (
                         SettingsKey,
                         SettingsRule
                     )
-from bulinotes.pktk.widgets.wcolorselector import WColorPicker
+from bulinotes.pktk.modules.lazyimport import LazyImport
+
+# color picker is imported on first use (settings are loaded by docker)
+wcolorselector = LazyImport('bulinotes.pktk.widgets.wcolorselector')
 
 
 class BNSettingsKey(SettingsKey):
@@ -114,45 +117,45 @@ class BNSettings(Settings):
     @staticmethod
     def getTxtColorPickerLayout():
         """Convert text color picker layout from settings to layout"""
-        # build a dummy color picker
-        tmpColorPicker = WColorPicker()
-        tmpColorPicker.setOptionCompactUi(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_COMPACT))
-        tmpColorPicker.setOptionShowColorPalette(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_PALETTE_VISIBLE))
-        tmpColorPicker.setOptionColorPalette(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_PALETTE_DEFAULT))
-        tmpColorPicker.setOptionShowColorWheel(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CWHEEL_VISIBLE))
-        tmpColorPicker.setOptionShowPreviewColor(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CWHEEL_CPREVIEW))
-        tmpColorPicker.setOptionShowColorCombination(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CCOMBINATION))
-        tmpColorPicker.setOptionShowCssRgb(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CCSS))
-        tmpColorPicker.setOptionShowColorRGB(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_RGB_VISIBLE))
-        tmpColorPicker.setOptionDisplayAsPctColorRGB(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_RGB_ASPCT))
-        tmpColorPicker.setOptionShowColorCMYK(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_CMYK_VISIBLE))
-        tmpColorPicker.setOptionDisplayAsPctColorCMYK(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_CMYK_ASPCT))
-        tmpColorPicker.setOptionShowColorHSV(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSL_VISIBLE))
-        tmpColorPicker.setOptionDisplayAsPctColorHSV(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSL_ASPCT))
-        tmpColorPicker.setOptionShowColorHSL(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSV_VISIBLE))
-        tmpColorPicker.setOptionDisplayAsPctColorHSL(BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSV_ASPCT))
-        tmpColorPicker.setOptionShowColorAlpha(False)
-        return tmpColorPicker.optionLayout()
+        return wcolorselector.ColorPickerLayout.encode({
+                'compactUi': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_COMPACT),
+                'colorPalette': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_PALETTE_VISIBLE),
+                'colorPaletteName': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_PALETTE_DEFAULT),
+                'colorWheel': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CWHEEL_VISIBLE),
+                'colorPreview': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CWHEEL_CPREVIEW),
+                'colorCombination': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CCOMBINATION),
+                'colorCssRGB': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CCSS),
+                'colorRGB': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_RGB_VISIBLE),
+                'colorRGB%': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_RGB_ASPCT),
+                'colorCMYK': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_CMYK_VISIBLE),
+                'colorCMYK%': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_CMYK_ASPCT),
+                'colorHSL': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSL_VISIBLE),
+                'colorHSL%': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSL_ASPCT),
+                'colorHSV': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSV_VISIBLE),
+                'colorHSV%': BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSV_ASPCT),
+                'colorAlpha': False,
+                'layoutOrientation': wcolorselector.WColorPicker.OPTION_ORIENTATION_VERTICAL
+            })
 
     @staticmethod
     def setTxtColorPickerLayout(layout):
         """Convert text color picker layout from settings to layout"""
-        # build a dummy color picker
-        tmpColorPicker = WColorPicker()
-        tmpColorPicker.setOptionLayout(layout)
-
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_COMPACT, tmpColorPicker.optionCompactUi())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_PALETTE_VISIBLE, tmpColorPicker.optionShowColorPalette())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_PALETTE_DEFAULT, tmpColorPicker.optionColorPalette())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CWHEEL_VISIBLE, tmpColorPicker.optionShowColorWheel())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CWHEEL_CPREVIEW, tmpColorPicker.optionShowPreviewColor())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CCOMBINATION, tmpColorPicker.optionShowColorCombination())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CCSS, tmpColorPicker.optionShowColorCssRGB())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_RGB_VISIBLE, tmpColorPicker.optionShowColorRGB())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_RGB_ASPCT, tmpColorPicker.optionDisplayAsPctColorRGB())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_CMYK_VISIBLE, tmpColorPicker.optionShowColorCMYK())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_CMYK_ASPCT, tmpColorPicker.optionDisplayAsPctColorCMYK())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSL_VISIBLE, tmpColorPicker.optionShowColorHSL())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSL_ASPCT, tmpColorPicker.optionDisplayAsPctColorHSL())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSV_VISIBLE, tmpColorPicker.optionShowColorHSV())
-        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSV_ASPCT, tmpColorPicker.optionDisplayAsPctColorHSV())
+        options = wcolorselector.ColorPickerLayout.decode(layout)
+
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_COMPACT, options['compactUi'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_PALETTE_VISIBLE, options['colorPalette'])
+        if options['colorPaletteName'] is not None:
+            BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_PALETTE_DEFAULT, options['colorPaletteName'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CWHEEL_VISIBLE, options['colorWheel'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CWHEEL_CPREVIEW, options['colorPreview'])
+        if options['colorCombination'] is not None:
+            BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CCOMBINATION, options['colorCombination'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CCSS, options['colorCssRGB'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_RGB_VISIBLE, options['colorRGB'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_RGB_ASPCT, options['colorRGB%'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_CMYK_VISIBLE, options['colorCMYK'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_CMYK_ASPCT, options['colorCMYK%'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSL_VISIBLE, options['colorHSL'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSL_ASPCT, options['colorHSL%'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSV_VISIBLE, options['colorHSV'])
+        BNSettings.set(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSV_ASPCT, options['colorHSV%'])
@@ -19,6 +19,7 @@
 #
 # -----------------------------------------------------------------------------
 
+import html
 import os.path
 
 from PyQt5.Qt import *
@@ -26,7 +27,7 @@ from PyQt5.QtWidgets import (
         QWidget
     )
 
-from bulinotes.pktk.modules.about import AboutWindow
+from bulinotes.pktk.modules.lazyimport import LazyImport
 from bulinotes.pktk.modules.uitheme import UITheme
 from bulinotes.pktk.modules.utils import loadXmlUi
 
@@ -36,7 +37,10 @@ from .bnnotes import (BNNote,
                       BNNoteEditor
                       )
 from .bnwnotes import BNNotesModel
-from .bnnote_postit import BNNotePostIt
+
+# about window and dialog box are imported on first use
+about = LazyImport('bulinotes.pktk.modules.about')
+wiodialog = LazyImport('bulinotes.pktk.widgets.wiodialog')
 
 
 class BNUiDocker(QWidget):
@@ -81,8 +85,17 @@ class BNUiDocker(QWidget):
         self.__updateUi()
 
     def __about(self):
-        """Display About window"""
-        AboutWindow(self.__bnName, self.__bnVersion, os.path.join(os.path.dirname(__file__), 'resources', 'png', 'buli-powered-big.png'), None, ':BuliNotes')
+        """Display About window
+
+        If Ctrl key is pressed, display modules import report instead
+        (startup imports, and modules imported on first use so far)
+        """
+        if QApplication.keyboardModifiers() & Qt.ControlModifier == Qt.ControlModifier:
+            report = html.escape(LazyImport.report())
+            wiodialog.WDialogMessage.display(f"{self.__bnName}::Modules import report", f"<pre>{report}</pre>")
+            return
+
+        about.AboutWindow(self.__bnName, self.__bnVersion, os.path.join(os.path.dirname(__file__), 'resources', 'png', 'buli-powered-big.png'), None, ':BuliNotes')
 
     def __addNote(self):
         """Add a new note in notes"""
@@ -36,6 +36,7 @@ from PyQt5.QtCore import (
 from bulinotes.pktk.modules.imgutils import (checkerBoardBrush, warningAreaBrush)
 from bulinotes.pktk.modules.strutils import stripHtml
 from bulinotes.pktk.modules.iconsizes import IconSizes
+from bulinotes.pktk.modules.uitheme import UITheme
 from bulinotes.pktk.modules.edialog import EDialog
 from bulinotes.pktk.widgets.wtextedit import (WTextEdit, WTextEditBtBarOption)
 from bulinotes.pktk.widgets.wdocnodesview import DocNodesModel
@@ -84,15 +85,6 @@ class BNLinkedLayersModel(QAbstractTableModel):
         self.__cache = {}
         self.__cacheTimer = None
 
-        # define cache for icons, as calling QIcon() seems to be very time consumming
-        self.__iconCache_warning = QIcon(':/pktk/images/normal/warning')
-        self.__iconCache_visibilityOn = QIcon(':/pktk/images/normal/visibility_on')
-        self.__iconCache_visibilityOff = QIcon(':/pktk/images/disabled/visibility_off')
-        self.__iconCache_pinnedOn = QIcon(':/pktk/images/normal/pinned')
-        self.__iconCache_pinnedOff = QIcon(':/pktk/images/disabled/pinned')
-        self.__iconCache_animatedOn = QIcon(':/pktk/images/normal/animation')
-        self.__iconCache_animatedOff = QIcon(':/pktk/images/disabled/animation')
-
     def __repr__(self):
         return f'<BNLinkedLayersModel()>'
 
@@ -182,23 +174,23 @@ class BNLinkedLayersModel(QAbstractTableModel):
             item = self.__itemFromCache(row)
             if item is None:
                 if index.column() == BNLinkedLayersModel.COLNUM_ICON_TYPE:
-                    return QIcon(':/pktk/images/normal/warning')
+                    return UITheme.icon(':/pktk/images/normal/warning')
                 else:
                     return None
 
             if index.column() == BNLinkedLayersModel.COLNUM_ICON_VISIBLE:
                 if item.visible():
-                    return self.__iconCache_visibilityOn
+                    return UITheme.icon(':/pktk/images/normal/visibility_on')
                 else:
-                    return self.__iconCache_visibilityOff
+                    return UITheme.icon(':/pktk/images/disabled/visibility_off')
             elif index.column() == BNLinkedLayersModel.COLNUM_ICON_TYPE:
                 return None
                 return item.icon()
             elif index.column() == BNLinkedLayersModel.COLNUM_ICON_PINNED:
                 if item.isPinnedToTimeline():
-                    return self.__iconCache_pinnedOn
+                    return UITheme.icon(':/pktk/images/normal/pinned')
                 else:
-                    return self.__iconCache_pinnedOff
+                    return UITheme.icon(':/pktk/images/disabled/pinned')
             elif index.column() == BNLinkedLayersModel.COLNUM_ICON_ANIMATED:
                 # ideally:
                 #   - no animation: return None
@@ -206,9 +198,9 @@ class BNLinkedLayersModel(QAbstractTableModel):
                 #   - animated + onion skin ON: return Krita.instance().icon('onionOn')
                 # But currently can't determinate if onion skin is active or not
                 if item.animated():
-                    return self.__iconCache_animatedOn
+                    return UITheme.icon(':/pktk/images/normal/animation')
                 else:
-                    return self.__iconCache_animatedOff
+                    return UITheme.icon(':/pktk/images/disabled/animation')
             elif index.column() == BNLinkedLayersModel.COLNUM_ICON_LOCK:
                 if item.locked():
                     return Krita.instance().icon('layer-locked')
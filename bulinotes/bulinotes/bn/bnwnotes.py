@@ -38,6 +38,7 @@ from .bnnotes import (
             )
 
 from bulinotes.pktk.modules.timeutils import tsToStr
+from bulinotes.pktk.modules.uitheme import UITheme
 from bulinotes.pktk.widgets.wstandardcolorselector import (
         WStandardColorSelector,
         WMenuStandardColorSelector
@@ -186,30 +187,30 @@ class BNNotesModel(QAbstractTableModel):
                     id = self.__items[row]
                     item = self.__notes.get(id)
                     if item.windowPostIt():
-                        return QIcon(':/pktk/images/normal/note_view')
+                        return UITheme.icon(':/pktk/images/normal/note_view')
                     else:
-                        return QIcon(':/pktk/images/disabled/note_view')
+                        return UITheme.icon(':/pktk/images/disabled/note_view')
                 elif column == BNNotesModel.COLNUM_PINNED:
                     id = self.__items[row]
                     item = self.__notes.get(id)
                     if item.pinned():
-                        return QIcon(':/pktk/images/normal/pinned')
+                        return UITheme.icon(':/pktk/images/normal/pinned')
                     else:
-                        return QIcon(':/pktk/images/disabled/pinned')
+                        return UITheme.icon(':/pktk/images/disabled/pinned')
                 elif column == BNNotesModel.COLNUM_LOCKED:
                     id = self.__items[row]
                     item = self.__notes.get(id)
 
                     if item.locked():
-                        return QIcon(':/pktk/images/normal/lock_locked')
+                        return UITheme.icon(':/pktk/images/normal/lock_locked')
                     else:
-                        return QIcon(':/pktk/images/disabled/lock_unlocked')
+                        return UITheme.icon(':/pktk/images/disabled/lock_unlocked')
                 elif column == BNNotesModel.COLNUM_FONTS:
                     id = self.__items[row]
                     item = self.__notes.get(id)
 
                     if item.hasEmbeddedFonts():
-                        return QIcon(':/pktk/images/normal/text_f')
+                        return UITheme.icon(':/pktk/images/normal/text_f')
         elif role == Qt.DisplayRole:
             id = self.__items[row]
             item = self.__notes.get(id)
@@ -0,0 +1,44 @@
+# -----------------------------------------------------------------------------
+# Buli Notes
+# Copyright (C) 2021-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin designed to manage notes
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests configuration
+#
+# Tests are executed outside Krita, with stubs provided by pktk tests (see
+# pktk/tests/stubs.py)
+#
+# Plugin modules are imported as 'bulinotes.xxx'
+# -----------------------------------------------------------------------------
+
+import os
+import sys
+
+import pytest
+
+PLUGIN_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# plugin package and stubs
+for path in (os.path.dirname(PLUGIN_PATH), os.path.join(PLUGIN_PATH, 'pktk', 'tests')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from stubs import QT_AVAILABLE
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'requiresQt: test needs PyQt5 library')
+
+
+def pytest_collection_modifyitems(config, items):
+    skipQt = pytest.mark.skip(reason='PyQt5 is not available')
+    for item in items:
+        if not QT_AVAILABLE and 'requiresQt' in item.keywords:
+            item.add_marker(skipQt)
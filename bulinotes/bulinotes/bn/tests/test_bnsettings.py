@@ -0,0 +1,81 @@
+# -----------------------------------------------------------------------------
+# Buli Notes
+# Copyright (C) 2021-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin designed to manage notes
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for plugin settings: color picker layout stored in settings
+# -----------------------------------------------------------------------------
+
+import itertools
+import os
+import random
+
+import pytest
+
+from bulinotes.pktk.widgets.wcolorselector import (ColorPickerLayout, WColorPicker)
+from bulinotes.bn.bnsettings import (BNSettings, BNSettingsKey)
+
+
+@pytest.fixture(autouse=True)
+def settings(tmp_path, monkeypatch):
+    """Settings instance for test, stored in a temporary configuration directory"""
+    monkeypatch.setenv('XDG_CONFIG_HOME', str(tmp_path))
+    # settings instance is created on first use
+    monkeypatch.setattr(BNSettings, '_Settings__name', None, raising=False)
+    monkeypatch.setattr(BNSettings, '_Settings__settings', None, raising=False)
+    assert os.path.dirname(BNSettings.fileName()) == str(tmp_path)
+    return BNSettings.instance()
+
+
+def randomOptions(rnd):
+    """Return a random options dictionary"""
+    returned = {flag: rnd.random() < 0.5 for flag in ColorPickerLayout.FLAGS}
+    returned['colorCombination'] = rnd.choice([None, 0, 1, 2, 3, 4, 5])
+    returned['colorPaletteName'] = rnd.choice([None, 'Default', 'Named Colors', 'palette:with:colons'])
+    returned['layoutOrientation'] = rnd.choice([None, WColorPicker.OPTION_ORIENTATION_VERTICAL, WColorPicker.OPTION_ORIENTATION_HORIZONTAL])
+    return returned
+
+
+@pytest.mark.parametrize('hsv,hsl', list(itertools.product([False, True], repeat=2)))
+def test_settingsHsvHsl(hsv, hsl):
+    # HSV and HSL sliders visibility are stored in their own settings keys
+    layout = ColorPickerLayout.encode({'colorHSV': hsv, 'colorHSL': hsl, 'colorHSV%': hsl, 'colorHSL%': hsv})
+    BNSettings.setTxtColorPickerLayout(layout)
+    assert BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSV_VISIBLE) == hsv
+    assert BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSL_VISIBLE) == hsl
+    assert BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSV_ASPCT) == hsl
+    assert BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CSLIDER_HSL_ASPCT) == hsv
+
+    options = ColorPickerLayout.decode(BNSettings.getTxtColorPickerLayout())
+    assert (options['colorHSV'], options['colorHSL'], options['colorHSV%'], options['colorHSL%']) == (hsv, hsl, hsl, hsv)
+
+
+def test_settingsRoundTrip(monkeypatch):
+    # layout stored in settings is restored as is; alpha slider is never
+    # displayed and orientation is always vertical for text color picker
+    rnd = random.Random(1234)
+    for index in range(100):
+        options = randomOptions(rnd)
+        options['colorAlpha'] = False
+        options['colorAlpha%'] = False
+        options['layoutOrientation'] = WColorPicker.OPTION_ORIENTATION_VERTICAL
+        if options['colorCombination'] is None:
+            options['colorCombination'] = BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_CCOMBINATION)
+        if options['colorPaletteName'] is None:
+            options['colorPaletteName'] = BNSettings.get(BNSettingsKey.CONFIG_EDITOR_TEXT_COLORPICKER_PALETTE_DEFAULT)
+
+        BNSettings.setTxtColorPickerLayout(ColorPickerLayout.encode(options))
+        assert ColorPickerLayout.decode(BNSettings.getTxtColorPickerLayout()) == options
+
+    # layout is restored from saved file
+    assert BNSettings.save()
+    monkeypatch.setattr(BNSettings, '_Settings__name', None)
+    assert BNSettings.load()
+    assert ColorPickerLayout.decode(BNSettings.getTxtColorPickerLayout()) == options
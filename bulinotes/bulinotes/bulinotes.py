@@ -46,8 +46,15 @@ if __name__ != '__main__':
             EInvalidValue,
             PkTk
         )
+    from bulinotes.pktk.modules.lazyimport import LazyImport
+
+    # heavy modules (editor, color picker, ...) are imported on first use; keep
+    # startup imports duration to report it
+    startupImportTime = time.perf_counter()
     from bulinotes.pktk.modules.utils import checkKritaVersion
     from bulinotes.bn.bnuidocker import BNUiDocker
+    # report is available from docker (ctrl+click on 'about' button)
+    LazyImport.setStartupDuration(time.perf_counter() - startupImportTime, 'bulinotes')
 else:
     # Execution from 'Scripter' plugin?
     __PLUGIN_EXEC_FROM__ = 'SCRIPTER_PLUGIN'
@@ -29,8 +29,110 @@ import pickle
 from ..pktk import *
 
 
+class ProceduralCache(object):
+    """A cache for procedural brushes/pixmaps (checker board, warning area, ...)
+
+    Items are identified by a key (a tuple that contains all values used to
+    render item, including device pixel ratio for items rendered for a
+    device), then a brush or pixmap is rendered once and shared
+
+    Memory used by cache is bounded; least recently used items are removed
+    first
+
+    Cache is cleared when theme is changed (see UITheme.reloadResources())
+    """
+    # maximum memory used by cache, in bytes
+    __MAX_SIZE = 16 * 1024 * 1024
+
+    # key=tuple, value=QBrush, QPixmap or QIcon
+    # dictionary keep insertion order, last item is the most recently used
+    __items = {}
+    __size = 0
+    __hits = 0
+    __misses = 0
+
+    @staticmethod
+    def __itemSize(item):
+        """Return size (in bytes) of given `item`
+
+        Icons are not rendered by cache (pixmaps are loaded and cached by
+        QIcon), they're not taken in account
+        """
+        if isinstance(item, QBrush):
+            item = item.texture()
+        if isinstance(item, (QPixmap, QImage)):
+            return item.width() * item.height() * 4
+        return 0
+
+    @staticmethod
+    def get(key, builder):
+        """Return cached item for given `key`
+
+        If not in cache, given `builder` callable is called to build item
+        """
+        item = ProceduralCache.__items.pop(key, None)
+        if item is not None:
+            # move to end: most recently used
+            ProceduralCache.__items[key] = item
+            ProceduralCache.__hits += 1
+            return item
+
+        ProceduralCache.__misses += 1
+        item = builder()
+
+        size = ProceduralCache.__itemSize(item)
+        if size > ProceduralCache.__MAX_SIZE:
+            # too big to be cached
+            return item
+
+        while ProceduralCache.__size + size > ProceduralCache.__MAX_SIZE and len(ProceduralCache.__items):
+            # remove least recently used items
+            ProceduralCache.__size -= ProceduralCache.__itemSize(ProceduralCache.__items.pop(next(iter(ProceduralCache.__items))))
+
+        ProceduralCache.__items[key] = item
+        ProceduralCache.__size += size
+        return item
+
+    @staticmethod
+    def colorKey(color):
+        """Return value to use in key for given `color` (QColor or any value accepted by QColor)"""
+        if isinstance(color, QColor):
+            return color.rgba()
+        return QColor(color).rgba()
+
+    @staticmethod
+    def clear():
+        """Clear cache"""
+        ProceduralCache.__items = {}
+        ProceduralCache.__size = 0
+
+    @staticmethod
+    def stats():
+        """Return cache statistics, as a dictionary
+
+            'items':    number of items in cache
+            'size':     memory used by items in cache, in bytes
+            'hits':     number of items returned from cache
+            'misses':   number of items built
+            'hitRate':  hits/(hits + misses) ratio
+        """
+        total = ProceduralCache.__hits + ProceduralCache.__misses
+        return {
+                'items': len(ProceduralCache.__items),
+                'size': ProceduralCache.__size,
+                'hits': ProceduralCache.__hits,
+                'misses': ProceduralCache.__misses,
+                'hitRate': ProceduralCache.__hits/total if total > 0 else 0.0
+            }
+
+
 def warningAreaBrush(size=32):
     """Return a checker board brush"""
+    return QBrush(ProceduralCache.get(('warningAreaBrush', size), lambda: buildWarningAreaBrush(size)))
+
+
+def buildWarningAreaBrush(size=32):
+    """Build and return a warning area brush (not cached, use warningAreaBrush())"""
     tmpPixmap = QPixmap(size, size)
     tmpPixmap.fill(QColor(255, 255, 255, 32))
     brush = QBrush(QColor(0, 0, 0, 32))
@@ -53,6 +155,12 @@ def warningAreaBrush(size=32):
 
 def checkerBoardBrush(size=32, color1=QColor(255, 255, 255), color2=QColor(220, 220, 220), strictSize=True):
     """Return a checker board brush"""
+    return QBrush(ProceduralCache.get(('checkerBoardBrush', size, ProceduralCache.colorKey(color1), ProceduralCache.colorKey(color2), strictSize),
+                                      lambda: buildCheckerBoardBrush(size, color1, color2, strictSize)))
+
+
+def buildCheckerBoardBrush(size=32, color1=QColor(255, 255, 255), color2=QColor(220, 220, 220), strictSize=True):
+    """Build and return a checker board brush (not cached, use checkerBoardBrush())"""
     s1 = size >> 1
     if strictSize:
         s2 = size - s1
@@ -77,21 +185,28 @@ def checkerBoardBrush(size=32, color1=QColor(255, 255, 255), color2=QColor(220,
     return QBrush(tmpPixmap)
 
 
-def checkerBoardImage(size, checkerSize=32):
-    """Return a checker board image"""
+def checkerBoardImage(size, checkerSize=32, devicePixelRatio=1.0):
+    """Return a checker board image
+
+    Given `size` is logical size of image, rendered for given `devicePixelRatio`
+    """
     if isinstance(size, int):
         size = QSize(size, size)
 
     if not isinstance(size, QSize):
         return None
 
-    pixmap = QPixmap(size)
-    painter = QPainter()
-    painter.begin(pixmap)
-    painter.fillRect(pixmap.rect(), checkerBoardBrush(checkerSize))
-    painter.end()
+    def build():
+        pixmap = QPixmap(round(size.width() * devicePixelRatio), round(size.height() * devicePixelRatio))
+        pixmap.setDevicePixelRatio(devicePixelRatio)
+        painter = QPainter()
+        painter.begin(pixmap)
+        painter.fillRect(QRect(QPoint(0, 0), size), checkerBoardBrush(checkerSize))
+        painter.end()
+        return pixmap
 
-    return pixmap
+    # return a copy (pixmap data are shared until copy is modified)
+    return QPixmap(ProceduralCache.get(('checkerBoardImage', size.width(), size.height(), checkerSize, devicePixelRatio), build))
 
 
 def bullet(size=16, color=QColor(255, 255, 255), shape='square', scaleShape=1.0):
@@ -261,20 +376,21 @@ def combineChannels(bytesPerChannel, *channels):
         elif channelSize != len(channel):
             raise EInvalidValue("All `channels` must have the same size")
 
+    if channelSize is None:
+        # no channel...
+        return bytearray()
+
     channelCount = len(channels)
     offsetTargetInc = channelCount*bytesPerChannel
     targetSize = channelSize*offsetTargetInc
     target = bytearray(targetSize)
 
-    channelNumber = 0
-    for channel in channels:
+    # copy is made with extended slices assignment, for each channel:
+    #   target[channelOffset::offsetTargetInc] = channel[::bytesPerChannel]
+    pixelCount = channelSize//bytesPerChannel
+    for channelNumber, channel in enumerate(channels):
         offsetTarget = channelNumber*bytesPerChannel
-        offsetSource = 0
-        for index in range(channelSize//bytesPerChannel):
-            target[offsetTarget] = channel[offsetSource]
-            offsetTarget += offsetTargetInc
-            offsetSource += bytesPerChannel
-        channelNumber += 1
+        target[offsetTarget:offsetTarget + pixelCount*offsetTargetInc:offsetTargetInc] = channel[0:pixelCount*bytesPerChannel:bytesPerChannel]
 
     return target
 
@@ -24,13 +24,14 @@
 # -----------------------------------------------------------------------------
 
 from PyQt5.Qt import *
-from enum import Enum
+from bisect import bisect_left
 
 import re
 
 from .tokenizer import (
             Token,
             TokenType,
+            TokenTypeBase,
             TokenStyle,
             Tokenizer,
             TokenizerRule
@@ -50,6 +51,34 @@ class LanguageDef:
         self.__tokenizer = Tokenizer(rules)
         self.__tokenStyle = TokenStyle()
 
+        # autoCompletion index, sorted list of tuple (key, checkMatch, value, description, rule)
+        # with key: case-folded autoCompletion value with simplified spaces
+        self.__proposalIndex = []
+        self.__proposalIndexKeys = []
+        self.__proposalIndexRevision = None
+
+    def __proposalKey(self, text):
+        """Return key used in autoCompletion index for given `text`"""
+        return re.sub(r'\s+', ' ', text).casefold()
+
+    def __updateProposalIndex(self):
+        """Build autoCompletion index if rules have been modified since last build"""
+        if self.__proposalIndexRevision == self.__tokenizer.rulesRevision():
+            return
+
+        self.__proposalIndex = []
+        for rule in self.__tokenizer.rules():
+            for item in rule.autoCompletion():
+                if result := re.match(r'([^\x01]+)', item[0]):
+                    checkMatch = result.groups()[0]
+                else:
+                    checkMatch = item[0]
+                self.__proposalIndex.append((self.__proposalKey(checkMatch), checkMatch, item[0], item[1], rule))
+
+        self.__proposalIndex.sort(key=lambda item: item[0])
+        self.__proposalIndexKeys = [item[0] for item in self.__proposalIndex]
+        self.__proposalIndexRevision = self.__tokenizer.rulesRevision()
+
     def tokenizer(self):
         """Return tokenizer for language"""
         return self.__tokenizer
@@ -73,20 +102,35 @@ class LanguageDef:
         if not isinstance(text, str):
             raise EInvalidType('Given `text` must be str')
 
-        rePattern = re.compile(re.escape(re.sub(r'\s+', '\x02', text)).replace('\x02', r'\s+')+'.*')
-        returned = []
-        for rule in self.__tokenizer.rules():
-            values = rule.matchText(rePattern, full)
-            if len(values) > 0:
-                returned += values
+        self.__updateProposalIndex()
+
+        # spaces in text match any number of spaces in values
+        simplifiedText = re.sub(r'\s+', ' ', text)
+        key = simplifiedText.casefold()
+
+        returned = set()
+        index = bisect_left(self.__proposalIndexKeys, key)
+        while index < len(self.__proposalIndex) and self.__proposalIndexKeys[index].startswith(key):
+            itemKey, checkMatch, value, description, rule = self.__proposalIndex[index]
+            index += 1
+
+            if not rule.caseInsensitive() and not re.sub(r'\s+', ' ', checkMatch).startswith(simplifiedText):
+                # case sensitive rule, need exact match
+                continue
+
+            if full:
+                returned.add((checkMatch, value, description, rule))
+            else:
+                returned.add(checkMatch)
+
         # return list without any duplicate values
-        return list(set(returned))
+        return list(returned)
 
 
 class LanguageDefXML(LanguageDef):
     """Extent language definition for XML markup language"""
 
-    class ITokenType(TokenType, Enum):
+    class ITokenType(TokenTypeBase):
         STRING = ('String', 'A STRING value')
         MARKUP = ('Markup', 'A XML Markup')
         ATTRIBUTE = ('Attribute', 'A node attribute')
@@ -97,7 +141,9 @@ class LanguageDefXML(LanguageDef):
 
     def __init__(self):
         super(LanguageDefXML, self).__init__([
-            TokenizerRule(LanguageDefXML.ITokenType.CDATA, r'<!\[CDATA\[.*\]\]>'),
+            # comments and CDATA can be spread over multiple lines
+            TokenizerRule(TokenType.COMMENT, r'<!--', multiLineEnd=r'-->'),
+            TokenizerRule(LanguageDefXML.ITokenType.CDATA, r'<!\[CDATA\[', multiLineEnd=r'\]\]>'),
             TokenizerRule(LanguageDefXML.ITokenType.STRING, r'"[^"\\]*(?:\\.[^"\\]*)*"'),
             TokenizerRule(LanguageDefXML.ITokenType.STRING, r"'[^'\\]*(?:\\.[^'\\]*)*'"),
             TokenizerRule(LanguageDefXML.ITokenType.MARKUP, r'<[a-zA-Z][a-zA-Z0-9_-]*|<\?xml|<!DOCTYPE'),
@@ -106,7 +152,7 @@ class LanguageDefXML(LanguageDef):
             TokenizerRule(LanguageDefXML.ITokenType.ATTRIBUTE, r'\s[a-zA-Z][a-zA-Z0-9_\:-]*'),
             TokenizerRule(LanguageDefXML.ITokenType.SETATTR, r'='),
             TokenizerRule(LanguageDefXML.ITokenType.NUMBER, r'-\d+|\d+'),
-            TokenizerRule(LanguageDefXML.ITokenType.SPACE, r'\s+'),
+            TokenizerRule(TokenType.SPACE, r'\s+'),
             TokenizerRule(LanguageDefXML.ITokenType.VALUE, r'[^<>]+')
         ])
 
@@ -118,7 +164,8 @@ class LanguageDefXML(LanguageDef):
             (LanguageDefXML.ITokenType.SETATTR, '#c278da', False, False),
             (LanguageDefXML.ITokenType.CDATA, '#78dac2', False, False),
             (LanguageDefXML.ITokenType.VALUE, '#82dde5', False, False),
-            (LanguageDefXML.ITokenType.SPACE, None, False, False)
+            (TokenType.COMMENT, '#686d9c', False, True),
+            (TokenType.SPACE, None, False, False)
         ])
         self.setStyles(UITheme.LIGHT_THEME, [
             (LanguageDefXML.ITokenType.STRING, '#9ac07c', False, False),
@@ -128,5 +175,6 @@ class LanguageDefXML(LanguageDef):
             (LanguageDefXML.ITokenType.SETATTR, '#c278da', False, False),
             (LanguageDefXML.ITokenType.CDATA, '#78dac2', False, False),
             (LanguageDefXML.ITokenType.VALUE, '#82dde5', False, False),
-            (LanguageDefXML.ITokenType.SPACE, None, False, False)
+            (TokenType.COMMENT, '#686d9c', False, True),
+            (TokenType.SPACE, None, False, False)
         ])
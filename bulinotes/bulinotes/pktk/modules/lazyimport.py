@@ -0,0 +1,89 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# The lazyimport module provides a class to defer import of modules
+#
+# Main class from this module
+#
+# - LazyImport:
+#       A module proxy; module is imported on first access to one of its
+#       attributes
+#       Provide static methods to get a report about imports durations
+#
+# -----------------------------------------------------------------------------
+
+import importlib
+import sys
+import time
+
+
+class LazyImport(object):
+    """A module proxy: module is imported on first use
+
+    Example:
+        wtextedit = LazyImport('.wtextedit', __package__)
+        ...
+        # module is imported here
+        wtextedit.WTextEditDialog.edit(...)
+    """
+    # key=module name, value=import duration (in seconds)
+    __imported = {}
+    # startup import duration (in seconds), and modules loaded at startup
+    __startupDuration = None
+    __startupModules = []
+
+    @staticmethod
+    def setStartupDuration(duration, packageName):
+        """Define startup imports `duration` (in seconds)
+
+        Modules from `packageName` currently loaded are considered as loaded at
+        startup
+        """
+        LazyImport.__startupDuration = duration
+        LazyImport.__startupModules = [name for name in sys.modules if name == packageName or name.startswith(f'{packageName}.')]
+
+    @staticmethod
+    def report():
+        """Return a text report about startup and deferred imports"""
+        returned = []
+        if LazyImport.__startupDuration is not None:
+            returned.append(f'Startup imports: {1000*LazyImport.__startupDuration:.2f}ms ({len(LazyImport.__startupModules)} modules)')
+
+        if len(LazyImport.__imported) == 0:
+            returned.append('Deferred imports: none')
+        else:
+            returned.append(f'Deferred imports: {1000*sum(LazyImport.__imported.values()):.2f}ms')
+            for name, duration in LazyImport.__imported.items():
+                returned.append(f'  {name}: {1000*duration:.2f}ms')
+
+        return "\n".join(returned)
+
+    def __init__(self, moduleName, package=None):
+        """Define module to import
+
+        If `moduleName` is a relative name, `package` must be provided
+        """
+        self.__moduleName = moduleName
+        self.__package = package
+        self.__module = None
+
+    def __repr__(self):
+        return f'<LazyImport({self.__moduleName}, {self.__module is not None})>'
+
+    def __getattr__(self, name):
+        """Import module if needed, and return attribute"""
+        if self.__module is None:
+            startTime = time.perf_counter()
+            self.__module = importlib.import_module(self.__moduleName, self.__package)
+            if self.__module.__name__ not in LazyImport.__imported:
+                LazyImport.__imported[self.__module.__name__] = time.perf_counter() - startTime
+        return getattr(self.__module, name)
@@ -49,7 +49,9 @@ from .tokenizer import (
         Token,
         Tokenizer,
         TokenizerRule,
-        TokenType
+        TokenType,
+        TokenTypeBase,
+        Tokens
     )
 
 from ..pktk import *
@@ -171,19 +173,17 @@ class Parser:
 
         self.__ignoredTokens = []
         for token in tokens:
-            if not isinstance(token, TokenType):
+            if not isinstance(token, TokenTypeBase):
                 raise EInvalidType("Given `tokens` items must be <TokenType>")
             self.__ignoredTokens.append(token)
 
-    def parse(self, text):
-        """Parse given text and build AST (Abstract Syntax Tree)
+    def __checkGrammarRules(self):
+        """Check if grammar rules can be used to parse text
 
-        Once parsed, can be 'executed'
+        Raise an EInvalidStatus exception if not
         """
         NL = '\n'
-        if not isinstance(text, str):
-            raise EInvalidType("Given `text` must be a <str>")
-        elif self.__grammarRules.count() == 0:
+        if self.__grammarRules.count() == 0:
             raise EInvalidStatus("There's no rules defined for given Grammar rules!")
 
         checkResult = self.__grammarRules.check()
@@ -195,9 +195,23 @@ class Parser:
         if self.__grammarRules.idFirst() is None:
             raise EInvalidStatus(f"Current grammar is not valid: first grammar rule hasn't been defined")
 
+    def __textHash(self, text):
+        """Return SHA1 value for given text"""
         textHash = hashlib.sha1()
         textHash.update(text.encode())
-        hashText = textHash.hexdigest()
+        return textHash.hexdigest()
+
+    def parse(self, text):
+        """Parse given text and build AST (Abstract Syntax Tree)
+
+        Once parsed, can be 'executed'
+        """
+        if not isinstance(text, str):
+            raise EInvalidType("Given `text` must be a <str>")
+
+        self.__checkGrammarRules()
+
+        hashText = self.__textHash(text)
 
         if self.__hashText is None or hashText != self.__hashText:
             # if given text hasn't been already parsed
@@ -209,6 +223,26 @@ class Parser:
 
         return self.__ast
 
+    def parseTokens(self, tokens):
+        """Parse given `tokens` and build AST (Abstract Syntax Tree)
+
+        Given `tokens` is a Tokens object, already built from text with parser's
+        tokenizer: text is not tokenized again
+        """
+        if not isinstance(tokens, Tokens):
+            raise EInvalidType("Given `tokens` must be a <Tokens>")
+
+        self.__checkGrammarRules()
+
+        if tokens is not self.__tokens:
+            # AST is built from given tokens; text hash is kept to avoid
+            # parsing again same text with parse()
+            self.__hashText = self.__textHash(tokens.text())
+            self.__tokens = tokens
+            self.__parse()
+
+        return self.__ast
+
     def errors(self):
         """Return error found by parser"""
         return self.__errors
@@ -1345,7 +1379,7 @@ class GRToken(GRObject):
     def __init__(self, tokenType, *possibleValues):
         super(GRToken, self).__init__()
 
-        if not isinstance(tokenType, TokenType):
+        if not isinstance(tokenType, TokenTypeBase):
             raise EInvalidType(f'Given `tokenType` must be <TokenType>: {tokenType} ({typeof(tokenType)})')
 
         self.__tokenType = tokenType
@@ -18,6 +18,8 @@
 # - Settings:
 #       Main class to extend to manage settings
 #       Provide init/read/write static methods
+#       Saves can be deferred (coalesced on an idle timer) and are written
+#       atomically, only if content has been modified
 #       Let define the default settings:
 #       - configuration names
 #       - default values
@@ -185,6 +187,9 @@ class Settings(QObject):
     _settingsSaved = Signal()          # settings has been saved
     _settingsLoaded = Signal()         # settings has been loaded
 
+    # delay (in milliseconds) applied for deferred save
+    __SAVE_DELAY = 1000
+
     @classmethod
     def __init(cls):
         """Internal function to initialise class"""
@@ -203,10 +208,20 @@ class Settings(QObject):
         return cls.__settings.loadConfig()
 
     @classmethod
-    def save(cls):
-        """save configuration"""
+    def save(cls, deferred=False):
+        """save configuration
+
+        If `deferred` is True, save is coalesced with other deferred saves and
+        executed when timer delay is over
+        """
+        cls.__init()
+        return cls.__settings.saveConfig(deferred)
+
+    @classmethod
+    def flush(cls):
+        """save configuration now if a deferred save is pending"""
         cls.__init()
-        return cls.__settings.saveConfig()
+        return cls.__settings.flushConfig()
 
     @classmethod
     def fileName(cls):
@@ -267,6 +282,23 @@ class Settings(QObject):
         # configuration has been modified and need to be saved?
         self.__modified = False
 
+        # options modified since last load/save
+        self.__dirtyOptions = set()
+
+        # last content read from/written to file; file is not written if
+        # content is the same
+        self.__fileContent = None
+
+        # deferred save
+        self.__timerSave = QTimer(self)
+        self.__timerSave.setSingleShot(True)
+        self.__timerSave.setInterval(Settings.__SAVE_DELAY)
+        self.__timerSave.timeout.connect(self.saveConfig)
+
+        # ensure pending save is executed before application is closed
+        if QCoreApplication.instance() is not None:
+            QCoreApplication.instance().aboutToQuit.connect(self.flushConfig)
+
         if rules is not None:
             self.setRules(rules)
         self.setDefaultConfig()
@@ -334,6 +366,7 @@ class Settings(QObject):
 
         # just initialised with default values, consider that it's not modified
         self.__modified = False
+        self.__dirtyOptions = set()
 
     def loadConfig(self):
         """Load configuration from file
@@ -354,6 +387,7 @@ class Settings(QObject):
             with open(self.__pluginCfgFile, 'r') as file:
                 try:
                     jsonAsStr = file.read()
+                    self.__fileContent = jsonAsStr
                 except Exception as e:
                     Debug.print('[Settings.loadConfig] Unable to load file {0}: {1}', self.__pluginCfgFile, f"{e}")
                     self.configurationLoadedEvent(False)
@@ -377,30 +411,66 @@ class Settings(QObject):
 
         # just loaded, consider that it's not modified
         self.__modified = False
+        self.__dirtyOptions = set()
         self._settingsLoaded.emit()
         return True
 
-    def saveConfig(self):
+    def saveConfig(self, deferred=False):
         """Save configuration to file
 
+        If `deferred` is True, save is executed when timer delay is over (all
+        deferred saves made during delay are coalesced in one save) and method
+        return True
+
+        File is written in a temporary file which is then renamed, and is not
+        written if content is not modified
+
         If file can't be saved, return False
         Otherwise True
         """
-        with open(self.__pluginCfgFile, 'w') as file:
+        if deferred:
+            # restart timer
+            self.__timerSave.start()
+            return True
+
+        self.__timerSave.stop()
+
+        fileContent = json.dumps(self.__config, indent=4, sort_keys=True)
+        if fileContent != self.__fileContent or not os.path.isfile(self.__pluginCfgFile):
+            tmpFileName = f'{self.__pluginCfgFile}.tmp'
             try:
-                file.write(json.dumps(self.__config, indent=4, sort_keys=True))
+                with open(tmpFileName, 'w') as file:
+                    file.write(fileContent)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(tmpFileName, self.__pluginCfgFile)
             except Exception as e:
                 Debug.print('[Settings.saveConfig] Unable to save file {0}: {1}', self.__pluginCfgFile, f"{e}")
+                if os.path.isfile(tmpFileName):
+                    os.remove(tmpFileName)
                 self.configurationSavedEvent(False)
                 return False
 
+            self.__fileContent = fileContent
+
         self.configurationSavedEvent(True)
 
         # just saved, consider that it's not modified
         self.__modified = False
+        self.__dirtyOptions = set()
         self._settingsSaved.emit()
         return True
 
+    def flushConfig(self):
+        """Save configuration now if a deferred save is pending
+
+        Return True if there's nothing to save or if file has been saved
+        Otherwise False
+        """
+        if self.__timerSave.isActive():
+            return self.saveConfig()
+        return True
+
     def configurationLoadedEvent(self, fileLoaded):
         """Called after configuration is loaded and before signal is emitted
 
@@ -439,6 +509,8 @@ class Settings(QObject):
         try:
             self.__rules[id].checkValue(value)
             # value is valid, set it
+            if id not in self.__dirtyOptions and self.__getValue(self.__config, id) != value:
+                self.__dirtyOptions.add(id)
             self.__setValue(self.__config, id, value)
         except Exception as e:
             Debug.print('[Settings.setOption] Given value is not valid: {0}', f"{e}")
@@ -461,3 +533,7 @@ class Settings(QObject):
     def isModified(self):
         """Return True if configuration has been modified"""
         return self.__modified
+
+    def modifiedOptions(self):
+        """Return list of options id modified since last load/save"""
+        return sorted(self.__dirtyOptions)
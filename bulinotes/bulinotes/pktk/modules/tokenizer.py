@@ -16,6 +16,12 @@
 # (that can be tokenized and parsed --> tokenizer + parser modules)
 # Main class from this module
 #
+# - TokenTypeBase:
+#       Base class for token types enumerations
+#
+# - TokenType:
+#       Default token types
+#
 # - Tokenizer:
 #       The tokenizer (need rules to tokenize)
 #       Usually, language definition instanciate tokenizer and provides rules
@@ -33,6 +39,7 @@ from enum import Enum
 
 import hashlib
 import re
+import threading
 import time
 
 from PyQt5.Qt import *
@@ -41,16 +48,13 @@ from .uitheme import UITheme
 from ..pktk import *
 
 
-class TokenType(Enum):
-    # some default token type
-    UNKNOWN = ('Unknown', 'This value is not know in grammar and might not be interpreted')
-    NEWLINE = ('New line', 'A line feed')
-    SPACE = ('Space', 'Space(s) character(s)')
-    INDENT = ('Indent', 'An indented block start')
-    DEDENT = ('Dedent', 'An indented block finished')
-    WRONG_INDENT = ('WrongIndent', 'An indent is found but doesn\'t match expected indentation value')
-    WRONG_DEDENT = ('WrongDedent', 'An dedent is found but doesn\'t match expected indentation value')
-    COMMENT = ('Comment', 'A comment text')
+class TokenTypeBase(Enum):
+    """Base class for token types
+
+    Python doesn't allow to extend an enumeration that already have members:
+    language definitions that need their own token types define them in an
+    enumeration that extends this class, and use TokenType for default types
+    """
 
     def id(self, **param):
         """Return token Id value"""
@@ -67,6 +71,18 @@ class TokenType(Enum):
             return self.value[1]
 
 
+class TokenType(TokenTypeBase):
+    # some default token type
+    UNKNOWN = ('Unknown', 'This value is not know in grammar and might not be interpreted')
+    NEWLINE = ('New line', 'A line feed')
+    SPACE = ('Space', 'Space(s) character(s)')
+    INDENT = ('Indent', 'An indented block start')
+    DEDENT = ('Dedent', 'An indented block finished')
+    WRONG_INDENT = ('WrongIndent', 'An indent is found but doesn\'t match expected indentation value')
+    WRONG_DEDENT = ('WrongDedent', 'An dedent is found but doesn\'t match expected indentation value')
+    COMMENT = ('Comment', 'A comment text')
+
+
 class TokenStyle:
     """Define styles applied for tokens types"""
 
@@ -94,7 +110,7 @@ class TokenStyle:
 
     def style(self, type):
         """Return style to apply for a token type"""
-        if isinstance(type, TokenType):
+        if isinstance(type, TokenTypeBase):
             if type in self.__tokenStyles[self.__currentThemeId]:
                 return self.__tokenStyles[self.__currentThemeId][type]
         # in all other case, token style is not known...
@@ -139,13 +155,14 @@ class Token(object):
     - a value
     - position (column and row) from original text
     """
-    __LINE_NUMBER = 0
-    __LINE_POSSTART = 0
+    # line counters are stored per thread, allowing texts to be tokenized
+    # from a background thread while GUI thread is also tokenizing
+    __LINE = threading.local()
 
     @staticmethod
     def resetTokenizer():
-        Token.__LINE_NUMBER = 1
-        Token.__LINE_POSSTART = 0
+        Token.__LINE.number = 1
+        Token.__LINE.posStart = 0
 
     def __init__(self, text, rule, positionStart, positionEnd, length, simplifySpaces=False):
         self.__text = text.lstrip()
@@ -153,8 +170,8 @@ class Token(object):
         self.__positionStart = positionStart
         self.__positionEnd = positionEnd
         self.__length = length
-        self.__lineNumber = Token.__LINE_NUMBER
-        self.__linePositionStart = (positionStart - Token.__LINE_POSSTART)+1
+        self.__lineNumber = Token.__LINE.number
+        self.__linePositionStart = (positionStart - Token.__LINE.posStart)+1
         self.__linePositionEnd = self.__linePositionStart + length
         self.__next = None
         self.__previous = None
@@ -162,8 +179,8 @@ class Token(object):
 
         if self.type() == TokenType.NEWLINE:
             self.__indent = 0
-            Token.__LINE_NUMBER += text.count('\n')
-            Token.__LINE_POSSTART = positionEnd
+            Token.__LINE.number += text.count('\n')
+            Token.__LINE.posStart = positionEnd
         else:
             self.__indent = len(text) - len(self.__text)
 
@@ -297,11 +314,15 @@ class Token(object):
 class Tokens(EList):
     """A tokenized text with facilities to access and parse tokens"""
 
-    def __init__(self, text, tokens):
+    def __init__(self, text, tokens, state=0):
         super(Tokens, self).__init__(tokens)
 
         self.__text = None
 
+        # lexer state at end of text
+        # (0 = no state, N = inside multi-line token defined by Nth multi-line rule)
+        self.__state = state
+
         if isinstance(text, str):
             self.__text = text
         else:
@@ -315,6 +336,14 @@ class Tokens(EList):
         """Return original tokenized text"""
         return self.__text
 
+    def state(self):
+        """Return lexer state at end of tokenized text
+
+        Value is 0 if text doesn't end within a multi-line token, otherwise
+        value is state from which next text have to be tokenized
+        """
+        return self.__state
+
     def inText(self, displayPosition=False, reference=None):
         """Return current token in text
 
@@ -416,6 +445,7 @@ class TokenizerRule(object):
     - An optional autocompletion properties
     - An option autoCompletion character (for popup, used as an 'icon')
     - An optional flag to set rule case insensitive (by default=True) or case sensitive
+    - An optional regular expression defining end of a multi-line token
     """
 
     @staticmethod
@@ -469,7 +499,7 @@ class TokenizerRule(object):
         else:
             return ""
 
-    def __init__(self, type, regex, description=None, autoCompletion=None, autoCompletionChar=None, caseInsensitive=True, ignoreIndent=False, onInitValue=None):
+    def __init__(self, type, regex, description=None, autoCompletion=None, autoCompletionChar=None, caseInsensitive=True, ignoreIndent=False, onInitValue=None, multiLineEnd=None):
         """Initialise a tokenizer rule
 
         Given `type` determinate which type of token will be generated by rule
@@ -488,10 +518,15 @@ class TokenizerRule(object):
             Called function will get TokenType and token value and return new value
             Mainly, this can be used to pre-process tokens like:
             - pre-convert a "number" as real number   (ie: value "45.7" <str> will be converted as 45.7 <float>)
+        Given `multiLineEnd` allows to define a token that can be spread over multiple lines (block comment, long string, ...)
+            In this case, given `regex` define the start of token and `multiLineEnd` is a regular expression that define the end of token
+            If end of token is not found, token ends with text
         """
         self.__type = None
         self.__regEx = None
         self.__regExSingle = None           # put in cache a QRegularExpression with '^....$' to match single values (improve speed!)
+        self.__regExStart = None            # for multi-line rule, QRegularExpression with '^....' to match start of token
+        self.__regExEnd = None              # for multi-line rule, QRegularExpression to match end of token
         self.__error = []
         self.__description = description
         self.__autoCompletion = []
@@ -507,6 +542,8 @@ class TokenizerRule(object):
         if isinstance(autoCompletionChar, str):
             self.__autoCompletionChar = autoCompletionChar
 
+        if multiLineEnd is not None:
+            regex = self.__setRegExMultiLine(regex, multiLineEnd)
         self.__setRegEx(regex)
         self.__setType(type)
 
@@ -572,9 +609,33 @@ class TokenizerRule(object):
         else:
             self.__regExSingle = QRegularExpression(pattern)
 
+    def __setRegExMultiLine(self, regExStart, regExEnd):
+        """Set start and end regular expressions for a multi-line rule
+
+        Return regular expression (as str) to use to match a complete token
+        """
+        if not (isinstance(regExStart, str) and isinstance(regExEnd, str)):
+            self.__error.append("Given regular expressions for a multi-line rule must be <str> type")
+            return regExStart
+
+        if self.__caseInsensitive:
+            options = QRegularExpression.CaseInsensitiveOption
+        else:
+            options = QRegularExpression.NoPatternOption
+
+        self.__regExStart = QRegularExpression(f'^(?:{regExStart})', options)
+        self.__regExEnd = QRegularExpression(regExEnd, options)
+
+        if not (self.__regExStart.isValid() and self.__regExEnd.isValid()):
+            self.__error.append("Given regular expressions for multi-line rule are not valid")
+
+        # token is matched from start to end, or until the end of text if end
+        # is not found
+        return f'(?:{regExStart})(?s:.*?(?:{regExEnd})|.*\\z)'
+
     def __setType(self, value):
         """Set current type for rule"""
-        if isinstance(value, TokenType):
+        if isinstance(value, TokenTypeBase):
             self.__type = value
         else:
             self.__error.append("Given type must be a valid <TokenType>")
@@ -632,6 +693,33 @@ class TokenizerRule(object):
         """Return if token ignore or not indent/dedent"""
         return self.__ignoreIndent
 
+    def isMultiLine(self):
+        """Return if rule define a token that can be spread over multiple lines"""
+        return self.__regExEnd is not None
+
+    def multiLineEnd(self, text, continued=False):
+        """For a multi-line rule, return position in given `text` just after the end of token
+
+        If `continued` is True, given text is considered to be the continuation
+        of a token (ie: text doesn't start with token start)
+
+        Return -1 if end of token is not found in text
+        """
+        if self.__regExEnd is None:
+            return -1
+
+        offset = 0
+        if not continued:
+            match = self.__regExStart.match(text)
+            if not match.hasMatch():
+                return -1
+            offset = match.capturedEnd()
+
+        match = self.__regExEnd.match(text, offset)
+        if match.hasMatch():
+            return match.capturedEnd()
+        return -1
+
     def matchText(self, matchText, full=False):
         """Return rule as a autoCompletion (return list of tuple (str, str, rule), or empty list if there's no text representation) and
         that match the given `matchText`
@@ -697,9 +785,16 @@ class Tokenizer(object):
         # a global regEx with all rules
         self.__regEx = None
 
+        # list of multi-line rules; index+1 of rule in list is used as lexer
+        # state when a text ends within a multi-line token
+        self.__multiLineRules = []
+
         # a flag to determinate if regular expression&cache need to be updated
         self.__needUpdate = True
 
+        # incremented each time rules are modified
+        self.__rulesRevision = 0
+
         # a cache to store tokenized code
         self.__cache = {}
         self.__cacheOrdered = []
@@ -824,6 +919,7 @@ class Tokenizer(object):
                     self.__rules.insert(self.__searchAddIndex(mode, rules.type()), rules)
 
                 self.__needUpdate = True
+                self.__rulesRevision += 1
             else:
                 self.__invalidRules.append((rules, "The rule type is set to NONE: the NONE type is reserved"))
         else:
@@ -849,6 +945,7 @@ class Tokenizer(object):
                     self.__rules.pop(index)
 
                 self.__needUpdate = True
+                self.__rulesRevision += 1
             else:
                 self.__invalidRules.append((rules, "The rule type is set to NONE: the NONE type is reserved"))
         else:
@@ -863,11 +960,19 @@ class Tokenizer(object):
         if isinstance(rules, list):
             self.__rules = []
             self.__invalidRules = []
+            self.__rulesRevision += 1
 
             self.addRule(rules)
         else:
             raise Exception("Given `rules` must be a list of <TokenizerRule>")
 
+    def rulesRevision(self):
+        """Return a number incremented each time rules are modified
+
+        Can be used to invalidate data built from rules
+        """
+        return self.__rulesRevision
+
     def invalidRules(self):
         """Return list of invalid given rules"""
         return self.__invalidRules
@@ -884,9 +989,18 @@ class Tokenizer(object):
             self.clearCache(True)
             self.__needUpdate = False
             self.__regEx = QRegularExpression('|'.join([ruleInsensitive(rule) for rule in self.__rules]), QRegularExpression.MultilineOption)
+            self.__multiLineRules = [rule for rule in self.__rules if rule.isMultiLine()]
 
         return self.__regEx
 
+    def multiLineRules(self):
+        """Return list of multi-line rules
+
+        Lexer state N (returned by Tokens.state()) is related to multi-line rule N-1 from list
+        """
+        self.regEx()
+        return self.__multiLineRules
+
     def clearCache(self, full=True):
         """Clear cache content
 
@@ -925,7 +1039,7 @@ class Tokenizer(object):
             self.__simplifyTokenSpaces = value
             self.__needUpdate = True
 
-    def tokenize(self, text):
+    def tokenize(self, text, state=0):
         """Tokenize given text
 
         If ` stripSpaces` is True, token spaces are simplified
@@ -934,6 +1048,10 @@ class Tokenizer(object):
             token 'set   value'
             is returned as 'set value'
 
+        Given `state` is the lexer state from which tokenization starts (ie:
+        value returned by Tokens.state() for previous line); this allows to
+        tokenize line per line texts with multi-line tokens
+
 
         Return a Tokens object
         """
@@ -944,15 +1062,18 @@ class Tokenizer(object):
 
         if self.__needUpdate:
             # rules has been modified, cleanup cache
-            self.clearCache(True)
+            self.regEx()
+
+        if state < 0 or state > len(self.__multiLineRules):
+            state = 0
 
         if text == "" or len(self.__rules) == 0:
             # nothing to process (empty string and/or no rules?)
-            return Tokens(text, returned)
+            return Tokens(text, returned, state)
 
         textHash = hashlib.sha1()
         textHash.update(text.encode())
-        hashValue = textHash.hexdigest()
+        hashValue = f'{state}:{textHash.hexdigest()}'
 
         if hashValue in self.__cache:
             # udpate
@@ -961,13 +1082,23 @@ class Tokenizer(object):
             self.clearCache(False)
             return self.__cache[hashValue][1]
 
-        matchIterator = self.regEx().globalMatch(text)
-
         Token.resetTokenizer()
 
         indent = self.__indent
         previousIndent = 0
         previousToken = None
+
+        offset = 0
+        if state > 0:
+            # continue a multi-line token started on a previous text
+            rule = self.__multiLineRules[state - 1]
+            offset = rule.multiLineEnd(text, True)
+            if offset == -1:
+                offset = len(text)
+            previousToken = Token(text[0:offset], rule, 0, offset, offset, self.__simplifyTokenSpaces)
+            returned.append(previousToken)
+
+        matchIterator = self.regEx().globalMatch(text, offset)
         # iterate all found tokens
         while matchIterator.hasNext():
             match = matchIterator.next()
@@ -1058,8 +1189,20 @@ class Tokenizer(object):
                         # do not need to continue to check for another token type
                         break
 
+        # determinate lexer state at end of text
+        state = 0
+        if previousToken is not None and previousToken.rule().isMultiLine() and previousToken.positionEnd() == len(text):
+            if previousToken.positionStart() == 0 and len(returned) == 1 and offset > 0:
+                # token is the continuation of a multi-line token
+                continued = True
+            else:
+                continued = False
+
+            if previousToken.rule().multiLineEnd(text[previousToken.positionStart():], continued) == -1:
+                state = self.__multiLineRules.index(previousToken.rule()) + 1
+
         # add
-        self.__setCache(hashValue, Tokens(text, returned))
+        self.__setCache(hashValue, Tokens(text, returned, state))
 
         # need to clear unused items in cache
         self.clearCache(False)
@@ -18,6 +18,7 @@
 #       Main class to manage themes
 #       Provide init ans static methods to load theme (icons, colors) according
 #       to current Krita theme
+#       Provide a memoized icon provider for resources icons
 #
 # -----------------------------------------------------------------------------
 
@@ -36,6 +37,7 @@ from PyQt5.QtCore import (
         QResource
     )
 from PyQt5.QtGui import (
+        QIcon,
         QPalette,
         QPixmapCache
     )
@@ -44,6 +46,7 @@ from PyQt5.QtWidgets import (
     )
 
 
+from .imgutils import ProceduralCache
 from ..pktk import *
 
 
@@ -71,6 +74,10 @@ class UITheme(object):
     __themes = {}
     __kraActiveWindow = None
 
+    # memoized icons from resources
+    #   key=(theme, path)       value=QIcon
+    __icons = {}
+
     @staticmethod
     def load(rccPath=None, autoReload=True):
         """Initialise theme"""
@@ -100,6 +107,11 @@ class UITheme(object):
         """Reload resources"""
         if clearPixmapCache is None:
             clearPixmapCache = True
+
+        # procedural brushes/pixmaps and resources icons depend on theme
+        ProceduralCache.clear()
+        UITheme.clearIcons()
+
         for theme in UITheme.__themes:
             if UITheme.__themes[theme].getAutoReload():
                 # reload
@@ -121,6 +133,25 @@ class UITheme(object):
             # return style from first theme (should be the same for all themes)
             return UITheme.__themes[theme].getTheme()
 
+    @staticmethod
+    def icon(path):
+        """Return icon for given resource `path` (ie: ':/pktk/images/normal/pinned')
+
+        Icons are memoized for current theme: use this method rather than
+        QIcon(path) in models data() and delegates paint() methods
+
+        Pixmaps rendered from icons are cached by Qt (QPixmapCache)
+        """
+        key = (UITheme.theme(), path)
+        if key not in UITheme.__icons:
+            UITheme.__icons[key] = QIcon(path)
+        return UITheme.__icons[key]
+
+    @staticmethod
+    def clearIcons():
+        """Clear memoized icons"""
+        UITheme.__icons = {}
+
     def __init__(self, rccPath, autoReload=True):
         """The given `rccPath` is full path to directory where .rcc files can be found
         If None, default resources from PkTk will be loaded
@@ -20,6 +20,8 @@ import sys
 import os
 import json
 import base64
+import io
+import types
 
 import xml.etree.ElementTree as ET
 
@@ -173,24 +175,125 @@ def checkKritaVersion(major, minor, revision):
     return False
 
 
+class XmlUiCache(object):
+    """Cache for ui files loaded with loadXmlUi()
+
+    Each ui file is parsed once per process (and again only if file is
+    modified): cache store icons properties to apply on widgets.
+
+    Compiling a ui file is slower than loading it with PyQt5.uic.loadUi(), and
+    is faster only for next loads: ui file is compiled when loaded for the
+    second time only, then compiled Ui class is stored in cache
+    """
+    # key=file name, value=[mtime, compiled flag, Ui class, icons properties]
+    __items = {}
+    __index = 0
+
+    @staticmethod
+    def __parse(fileName):
+        """Parse given ui file
+
+        Return icons properties, as a list of tuple (object name, property name, value)
+        """
+        tree = ET.parse(fileName)
+
+        # retrieve all object for which an icon is set
+        properties = []
+        for nodeParent in tree.findall(".//property[@name='icon'].."):
+            for nodeIconSet in nodeParent.findall(".//iconset"):
+                for nodeIcon in list(nodeIconSet):
+                    # store on object resource path for icons
+                    properties.append((nodeParent.attrib['name'], f"__bcIcon_{nodeIcon.tag}", nodeIcon.text))
+        return properties
+
+    @staticmethod
+    def __compile(fileName):
+        """Compile given ui file
+
+        Return Ui class, None if file can't be compiled
+        """
+        tree = ET.parse(fileName)
+
+        # resources are provided by registered .rcc files; remove them from ui
+        # otherwise compiled code try to import a '<resource>_rc' module
+        root = tree.getroot()
+        for nodeResources in root.findall("resources"):
+            root.remove(nodeResources)
+
+        uiClass = None
+        try:
+            source = io.StringIO()
+            PyQt5.uic.compileUi(io.StringIO(ET.tostring(root, encoding='unicode')), source)
+
+            # custom widgets headers can be relative to package
+            XmlUiCache.__index += 1
+            module = types.ModuleType(f"{PkTk.packageName()}.__xmlui{XmlUiCache.__index}")
+            module.__package__ = PkTk.packageName()
+            exec(compile(source.getvalue(), fileName, 'exec'), module.__dict__)
+
+            for name, value in module.__dict__.items():
+                if name.startswith('Ui_') and isinstance(value, type):
+                    uiClass = value
+                    break
+        except Exception as e:
+            Debug.print('[XmlUiCache.compile] Unable to compile ui file "{0}": {1}', fileName, str(e))
+
+        return uiClass
+
+    @staticmethod
+    def get(fileName):
+        """Return a tuple (Ui class, icons properties) for given ui file
+
+        Ui class is None if file has not been compiled yet, or can't be compiled
+        """
+        mtime = os.path.getmtime(fileName)
+        item = XmlUiCache.__items.get(fileName)
+        if item is None or item[0] != mtime:
+            # first load: only parse file
+            item = [mtime, False, None, XmlUiCache.__parse(fileName)]
+            XmlUiCache.__items[fileName] = item
+        elif not item[1]:
+            # file is loaded again: compile it
+            item[1] = True
+            item[2] = XmlUiCache.__compile(fileName)
+        return (item[2], item[3])
+
+    @staticmethod
+    def clear():
+        """Clear cache"""
+        XmlUiCache.__items = {}
+
+
 def loadXmlUi(fileName, parent):
-    """Load a ui file PyQt5.uic.loadUi()
+    """Load a ui file
+
+    Ui file is compiled when loaded for the second time (see XmlUiCache) and
+    applied to `parent`, like PyQt5.uic.loadUi() does
 
     For each item in ui file that refers to an icon resource, update widget
     properties with icon reference
     """
+    uiClass, properties = XmlUiCache.get(fileName)
+
     # load UI
-    PyQt5.uic.loadUi(fileName, parent, PkTk.packageName())
-
-    # Parse XML file and retrieve all object for which an icon is set
-    tree = ET.parse(fileName)
-    for nodeParent in tree.findall(".//property[@name='icon'].."):
-        for nodeIconSet in nodeParent.findall(".//iconset"):
-            widget = parent.findChild((QAction, QWidget), nodeParent.attrib['name'])
-            if widget is not None:
-                for nodeIcon in list(nodeIconSet):
-                    # store on object resource path for icons
-                    widget.setProperty(f"__bcIcon_{nodeIcon.tag}", nodeIcon.text)
+    if uiClass is None:
+        # not compiled, use default loader
+        PyQt5.uic.loadUi(fileName, parent, PkTk.packageName())
+    else:
+        ui = uiClass()
+        # like loadUi(), widgets are available as parent attributes as soon as
+        # they're created: custom widgets can use parent widgets created before
+        # them
+        ui.__dict__ = parent.__dict__
+        ui.setupUi(parent)
+
+    for objectName, propertyName, value in properties:
+        # widgets are parent attributes; avoid a recursive search in widgets tree
+        widget = getattr(parent, objectName, None)
+        if not isinstance(widget, (QAction, QWidget)):
+            widget = parent.findChild((QAction, QWidget), objectName)
+        if widget is not None:
+            widget.setProperty(propertyName, value)
 
 
 def cloneRect(rect):
@@ -0,0 +1,65 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests configuration
+#
+# Tests are executed outside Krita: 'krita' and, if not available, PyQt5
+# modules are replaced by stubs (see stubs.py)
+#
+# Tests that need a real Qt library (rendering, images, ui files) use the
+# `requiresQt` marker and are skipped when PyQt5 is not available
+#
+# Benchmarks (`perf` marker) are not executed by default, use:
+#   python -m pytest --perf
+# -----------------------------------------------------------------------------
+
+import os
+import sys
+
+import pytest
+
+PKTK_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGIN_PATH = os.path.dirname(PKTK_PATH)
+
+# pktk modules are imported as 'pktk.xxx'
+if PLUGIN_PATH not in sys.path:
+    sys.path.insert(0, PLUGIN_PATH)
+
+from stubs import QT_AVAILABLE
+
+
+def pytest_addoption(parser):
+    parser.addoption('--perf', action='store_true', default=False, help='execute benchmarks')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'requiresQt: test needs PyQt5 library')
+    config.addinivalue_line('markers', 'perf: benchmark, executed with --perf option')
+
+
+def pytest_collection_modifyitems(config, items):
+    skipQt = pytest.mark.skip(reason='PyQt5 is not available')
+    skipBenchmark = pytest.mark.skip(reason='use --perf option to execute benchmarks')
+    for item in items:
+        if not QT_AVAILABLE and 'requiresQt' in item.keywords:
+            item.add_marker(skipQt)
+        if not config.getoption('--perf') and 'perf' in item.keywords:
+            item.add_marker(skipBenchmark)
+
+
+@pytest.fixture
+def perfReport(capsys):
+    """Return a function to print benchmark results (output is not captured)"""
+    def report(text):
+        with capsys.disabled():
+            print(f"\n{text}")
+    return report
@@ -0,0 +1,475 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Stubs used to execute tests outside Krita
+#
+# Stubs are installed when module is imported:
+# - 'krita' module is always replaced by a stub
+# - if PyQt5 is available, it's used (with offscreen platform); otherwise
+#   PyQt5 modules are replaced by a stub that allows to import pktk modules
+#   and provides a minimal implementation for non graphical classes (signals,
+#   timers, mutex, item models, event loop)
+#
+# Module is shared by pktk tests and plugin tests configurations
+# -----------------------------------------------------------------------------
+
+import builtins
+import inspect
+import os
+import re
+import sys
+import tempfile
+import threading
+import types
+
+PKTK_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGIN_PATH = os.path.dirname(PKTK_PATH)
+
+
+class _StubValue(int):
+    """Stub for class attributes
+
+    Class attributes are mostly used as enum/flags values (Qt.UserRole + 1,
+    Qt.AlignLeft | Qt.AlignTop, ...): each one is a distinct <int>, that can
+    also be called (static methods) or used to access attributes (nested enum)
+    """
+    __nextValue = 0x10000
+
+    def __new__(cls):
+        _StubValue.__nextValue += 0x10000
+        return super(_StubValue, cls).__new__(cls, _StubValue.__nextValue)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        value = _StubValue()
+        setattr(self, name, value)
+        return value
+
+    def __call__(self, *args, **kwargs):
+        return Stub()
+
+
+class _StubMeta(type):
+    """Stub classes return a stub value for any undefined class attribute"""
+
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        value = _StubValue()
+        setattr(cls, name, value)
+        return value
+
+
+class Stub(metaclass=_StubMeta):
+    """Stub for Qt classes: any method can be called and returns a stub"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return Stub()
+
+    def __call__(self, *args, **kwargs):
+        return Stub()
+
+    def __getitem__(self, key):
+        return Stub()
+
+    def __iter__(self):
+        return iter(())
+
+    def __int__(self):
+        return 0
+
+    def __float__(self):
+        return 0.0
+
+    def __index__(self):
+        return 0
+
+    def __add__(self, other):
+        return 0
+
+    __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = __truediv__ = __rtruediv__ = __floordiv__ = __rfloordiv__ = __add__
+    __or__ = __ror__ = __and__ = __rand__ = __add__
+
+    def __neg__(self):
+        return 0
+
+    __pos__ = __abs__ = __invert__ = __neg__
+
+    def __lt__(self, other):
+        return False
+
+    __le__ = __gt__ = __ge__ = __lt__
+
+
+def _callSlot(slot, args):
+    """Call `slot` with given `args`; like Qt, extra arguments are ignored"""
+    try:
+        parameters = inspect.signature(slot).parameters.values()
+    except (TypeError, ValueError):
+        return slot(*args)
+
+    if any(parameter.kind == inspect.Parameter.VAR_POSITIONAL for parameter in parameters):
+        return slot(*args)
+    return slot(*args[:len(parameters)])
+
+
+class _BoundSignal(object):
+    """Signal instance, slots are called synchronously (no event loop)"""
+
+    def __init__(self):
+        self.__slots = []
+
+    def __getitem__(self, types):
+        return self
+
+    def connect(self, slot, type=None):
+        self.__slots.append(slot)
+
+    def disconnect(self, slot=None):
+        if slot is None:
+            self.__slots = []
+        elif slot in self.__slots:
+            self.__slots.remove(slot)
+
+    def emit(self, *args):
+        for slot in list(self.__slots):
+            _callSlot(slot, args)
+
+
+class _Signal(object):
+    """pyqtSignal stub"""
+
+    def __init__(self, *types, **kwargs):
+        pass
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        signals = instance.__dict__.setdefault('_stubSignals', {})
+        if id(self) not in signals:
+            signals[id(self)] = _BoundSignal()
+        return signals[id(self)]
+
+
+def _pyqtSlot(*types, **kwargs):
+    """pyqtSlot stub: decorated method is returned as is"""
+    return lambda method: method
+
+
+class QObject(Stub):
+    """QObject stub"""
+    destroyed = _Signal()
+
+
+class QTimer(QObject):
+    """QTimer stub
+
+    Timer never fires by itself: active timers with a 0ms interval are fired
+    by QApplication.processEvents()
+    """
+    timeout = _Signal()
+    activeTimers = {}
+
+    def __init__(self, parent=None):
+        self.__active = False
+        self.__interval = 0
+        self.__singleShot = False
+
+    def start(self, interval=None):
+        if interval is not None:
+            self.__interval = interval
+        self.__active = True
+        QTimer.activeTimers[self] = None
+
+    def stop(self):
+        self.__active = False
+        QTimer.activeTimers.pop(self, None)
+
+    def fire(self):
+        """Emit timeout signal; single shot timer is stopped before"""
+        if self.__singleShot:
+            self.stop()
+        self.timeout.emit()
+
+    def isActive(self):
+        return self.__active
+
+    def interval(self):
+        return self.__interval
+
+    def setInterval(self, value):
+        self.__interval = value
+
+    def setSingleShot(self, value):
+        self.__singleShot = value
+
+    @staticmethod
+    def singleShot(delay, slot):
+        slot()
+
+
+class QApplication(QObject):
+    """QApplication stub"""
+
+    @staticmethod
+    def instance():
+        return None
+
+    @staticmethod
+    def processEvents(*args):
+        """Fire active timers with a 0ms interval, until there's no more"""
+        for loop in range(100):
+            timers = [timer for timer in QTimer.activeTimers if timer.interval() == 0]
+            if len(timers) == 0:
+                break
+            for timer in timers:
+                if timer.isActive():
+                    timer.fire()
+
+
+class QStandardPaths(Stub):
+    """QStandardPaths stub: all locations are $XDG_CONFIG_HOME directory, or
+    temporary directory if not defined
+    """
+
+    @staticmethod
+    def writableLocation(location):
+        return os.environ.get('XDG_CONFIG_HOME', tempfile.gettempdir())
+
+
+class QMutex(Stub):
+    """QMutex stub"""
+
+    def __init__(self, *args):
+        self.__lock = threading.Lock()
+
+    def lock(self):
+        self.__lock.acquire()
+
+    def unlock(self):
+        self.__lock.release()
+
+    def tryLock(self, timeout=0):
+        if timeout < 0:
+            return self.__lock.acquire()
+        elif timeout == 0:
+            return self.__lock.acquire(False)
+        return self.__lock.acquire(timeout=timeout / 1000)
+
+
+class QModelIndex(Stub):
+    """QModelIndex stub"""
+
+    def __init__(self, row=-1, column=-1, model=None):
+        self.__row = row
+        self.__column = column
+        self.__model = model
+
+    def isValid(self):
+        return self.__row >= 0
+
+    def row(self):
+        return self.__row
+
+    def column(self):
+        return self.__column
+
+    def model(self):
+        return self.__model
+
+    def data(self, role=0):
+        return self.__model.data(self, role)
+
+
+class QAbstractItemModel(QObject):
+    """QAbstractItemModel stub
+
+    Signals are emitted by end*() methods, like Qt does
+    """
+    rowsInserted = _Signal()
+    rowsRemoved = _Signal()
+    modelReset = _Signal()
+    dataChanged = _Signal()
+    layoutChanged = _Signal()
+
+    def __init__(self, parent=None):
+        self.__pending = []
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if 0 <= row < self.rowCount() and column == 0:
+            return QModelIndex(row, column, self)
+        return QModelIndex()
+
+    def beginInsertRows(self, parent, first, last):
+        self.__pending.append((self.rowsInserted, parent, first, last))
+
+    def endInsertRows(self):
+        signal, parent, first, last = self.__pending.pop()
+        signal.emit(parent, first, last)
+
+    def beginRemoveRows(self, parent, first, last):
+        self.__pending.append((self.rowsRemoved, parent, first, last))
+
+    def endRemoveRows(self):
+        signal, parent, first, last = self.__pending.pop()
+        signal.emit(parent, first, last)
+
+    def beginResetModel(self):
+        pass
+
+    def endResetModel(self):
+        self.modelReset.emit()
+
+
+class QAbstractListModel(QAbstractItemModel):
+    """QAbstractListModel stub"""
+    pass
+
+
+def _qtNames():
+    """Return names imported from PyQt5 modules by plugin sources"""
+    returned = set()
+    for path, directories, fileNames in os.walk(PLUGIN_PATH):
+        for fileName in fileNames:
+            if fileName.endswith('.py'):
+                with open(os.path.join(path, fileName), 'r', encoding='utf-8') as file:
+                    returned.update(re.findall(r'\b(Q[A-Z]\w*|Qt|pyqt\w+|qDebug|QT_VERSION_STR|PYQT_VERSION_STR)\b', file.read()))
+    return returned
+
+
+def _stubModule(name, attributes):
+    """Return a stub module; undefined attributes are stub classes"""
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+
+    def getattr(attributeName):
+        if attributeName.startswith('__'):
+            raise AttributeError(attributeName)
+        value = _StubMeta(attributeName, (Stub,), {})
+        setattr(module, attributeName, value)
+        return value
+
+    module.__getattr__ = getattr
+    return module
+
+
+def _installQtStub():
+    """Replace PyQt5 modules with stubs"""
+    attributes = {
+            'QObject': QObject,
+            'QTimer': QTimer,
+            'QApplication': QApplication,
+            'QCoreApplication': QApplication,
+            'QMutex': QMutex,
+            'QStandardPaths': QStandardPaths,
+            'QModelIndex': QModelIndex,
+            'QAbstractItemModel': QAbstractItemModel,
+            'QAbstractListModel': QAbstractListModel,
+            'pyqtSignal': _Signal,
+            'pyqtSlot': _pyqtSlot,
+            'qDebug': print,
+            'QT_VERSION_STR': '5.15.0',
+            'PYQT_VERSION_STR': '5.15.0'
+        }
+    names = sorted(_qtNames().union(attributes))
+
+    package = _stubModule('PyQt5', {'__path__': []})
+    sys.modules['PyQt5'] = package
+    for moduleName in ('Qt', 'QtCore', 'QtGui', 'QtWidgets', 'QtSvg', 'uic'):
+        module = _stubModule(f'PyQt5.{moduleName}', attributes)
+        module.__all__ = names
+        setattr(package, moduleName, module)
+        sys.modules[f'PyQt5.{moduleName}'] = module
+
+
+class Swatch(Stub):
+    """Swatch stub: an invalid swatch, like the one returned for an empty palette entry"""
+
+    def isValid(self):
+        return False
+
+
+class Palette(Stub):
+    """Palette stub: a palette with empty entries"""
+
+    def __init__(self, resource=None, colors=32, columns=8):
+        self.__colors = colors
+        self.__columns = columns
+
+    def colorsCountTotal(self):
+        return self.__colors
+
+    def columnCount(self):
+        return self.__columns
+
+    def colorSetEntryByIndex(self, index):
+        return Swatch()
+
+
+class Krita(Stub):
+    """Krita stub: application without window, that provides a 'Default' palette"""
+    __instance = None
+
+    @staticmethod
+    def instance():
+        if Krita.__instance is None:
+            Krita.__instance = Krita()
+        return Krita.__instance
+
+    def activeWindow(self):
+        return None
+
+    def resources(self, resourceType):
+        if resourceType == 'palette':
+            return {'Default': Stub()}
+        return {}
+
+
+def _installKritaStub():
+    """Replace krita module with a stub
+
+    Like Krita does, i18n() and i18nc() are also provided as builtins
+    """
+    attributes = {
+            'i18n': lambda text: text,
+            'i18nc': lambda context, text: text,
+            'Krita': Krita,
+            'Palette': Palette,
+            'Swatch': Swatch
+        }
+    builtins.i18n = attributes['i18n']
+    builtins.i18nc = attributes['i18nc']
+    module = _stubModule('krita', attributes)
+    module.__all__ = ['i18n', 'i18nc', 'Krita', 'DockWidget', 'DockWidgetFactory', 'DockWidgetFactoryBase', 'Extension',
+                      'InfoObject', 'Node', 'Document', 'Selection', 'Resource', 'PresetChooser', 'ManagedColor', 'Palette', 'Swatch']
+    sys.modules['krita'] = module
+
+
+try:
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    QT_AVAILABLE = True
+    qApplication = QApplication.instance() or QApplication([])
+except ImportError:
+    QT_AVAILABLE = False
+    _installQtStub()
+
+try:
+    import krita
+except ImportError:
+    _installKritaStub()
@@ -0,0 +1,64 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for color picker layout encode/decode
+# -----------------------------------------------------------------------------
+
+import random
+
+import pytest
+
+from pktk.widgets.wcolorselector import (ColorPickerLayout, WColorPicker)
+from pktk.pktk import EInvalidType
+
+
+def randomOptions(rnd):
+    """Return a random options dictionary"""
+    returned = {flag: rnd.random() < 0.5 for flag in ColorPickerLayout.FLAGS}
+    returned['colorCombination'] = rnd.choice([None, 0, 1, 2, 3, 4, 5])
+    returned['colorPaletteName'] = rnd.choice([None, 'Default', 'Named Colors', 'palette:with:colons'])
+    returned['layoutOrientation'] = rnd.choice([None, WColorPicker.OPTION_ORIENTATION_VERTICAL, WColorPicker.OPTION_ORIENTATION_HORIZONTAL])
+    return returned
+
+
+def test_decodeEncode():
+    rnd = random.Random(1234)
+    for index in range(500):
+        options = randomOptions(rnd)
+        assert ColorPickerLayout.decode(ColorPickerLayout.encode(options)) == options
+
+
+def test_encodeDecode():
+    rnd = random.Random(1234)
+    for index in range(500):
+        layout = ColorPickerLayout.encode(randomOptions(rnd))
+        assert ColorPickerLayout.encode(ColorPickerLayout.decode(layout)) == layout
+
+
+def test_decodeDefaults():
+    # values not defined in layout: False for flags, None for others
+    options = ColorPickerLayout.decode(['colorHSV', 'colorHSL%'])
+    assert [flag for flag in ColorPickerLayout.FLAGS if options[flag]] == ['colorHSV', 'colorHSL%']
+    assert options['colorCombination'] is None
+    assert options['colorPaletteName'] is None
+    assert options['layoutOrientation'] is None
+
+    # missing options are not encoded
+    assert ColorPickerLayout.encode({}) == []
+    assert ColorPickerLayout.encode({'colorWheel': True, 'colorPaletteName': 'Default'}) == ['colorWheel', 'colorPalette:Default']
+
+
+def test_invalidTypes():
+    with pytest.raises(EInvalidType):
+        ColorPickerLayout.encode(['colorRGB'])
+    with pytest.raises(EInvalidType):
+        ColorPickerLayout.decode('colorRGB')
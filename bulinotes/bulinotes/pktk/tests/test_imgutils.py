@@ -0,0 +1,231 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for imgutils module
+# -----------------------------------------------------------------------------
+
+import random
+import time
+
+import pytest
+
+from PyQt5.Qt import *
+
+from pktk.modules.imgutils import (combineChannels, ProceduralCache, checkerBoardBrush, checkerBoardImage, warningAreaBrush,
+                                   buildCheckerBoardBrush)
+from pktk.pktk import EInvalidValue
+
+
+def combineChannelsLoop(bytesPerChannel, *channels):
+    """Former combineChannels() implementation (byte per byte loop), used as reference"""
+    channelSize = None
+    for channel in channels:
+        if channelSize is None:
+            channelSize = len(channel)
+        elif channelSize != len(channel):
+            raise EInvalidValue("All `channels` must have the same size")
+
+    channelCount = len(channels)
+    offsetTargetInc = channelCount*bytesPerChannel
+    targetSize = channelSize*offsetTargetInc
+    target = bytearray(targetSize)
+
+    channelNumber = 0
+    for channel in channels:
+        offsetTarget = channelNumber*bytesPerChannel
+        offsetSource = 0
+        for index in range(channelSize//bytesPerChannel):
+            target[offsetTarget] = channel[offsetSource]
+            offsetTarget += offsetTargetInc
+            offsetSource += bytesPerChannel
+        channelNumber += 1
+
+    return target
+
+
+def randomChannels(rnd, count, size):
+    """Return `count` channels of `size` random bytes"""
+    return [bytes(rnd.getrandbits(8) for index in range(size)) for channel in range(count)]
+
+
+def test_combineChannelsExample():
+    assert combineChannels(1, b'\xff\x01\x02', b'\x03\xff\x04', b'\x05\x06\xff') == bytearray(b'\xff\x03\x05\x01\xff\x06\x02\x04\xff')
+
+
+@pytest.mark.parametrize('bytesPerChannel', [1, 2, 4])
+@pytest.mark.parametrize('channelCount', [1, 2, 3, 4])
+def test_combineChannelsBitExact(bytesPerChannel, channelCount):
+    # result is exactly the same than former implementation, including for
+    # channel size that is not a multiple of bytes per channel
+    rnd = random.Random(1234)
+    for size in (0, 1, 2, 3, 7, 8, 64, 1001):
+        channels = randomChannels(rnd, channelCount, size)
+        expected = combineChannelsLoop(bytesPerChannel, *channels)
+        assert combineChannels(bytesPerChannel, *channels) == expected
+        assert combineChannels(bytesPerChannel, *[bytearray(channel) for channel in channels]) == expected
+        assert combineChannels(bytesPerChannel, *[memoryview(channel) for channel in channels]) == expected
+
+
+def test_combineChannelsInvalid():
+    assert combineChannels(1) == bytearray()
+    with pytest.raises(EInvalidValue):
+        combineChannels(1, b'\x00\x01', b'\x00')
+
+
+def statsDelta(stats):
+    """Return hits and misses since given `stats`"""
+    current = ProceduralCache.stats()
+    return (current['hits'] - stats['hits'], current['misses'] - stats['misses'])
+
+
+@pytest.mark.requiresQt
+def test_proceduralCacheHits():
+    # repeated paints don't build pixmaps anymore
+    ProceduralCache.clear()
+    stats = ProceduralCache.stats()
+
+    brushes = [checkerBoardBrush(16) for index in range(100)]
+    assert statsDelta(stats) == (99, 1)
+    assert ProceduralCache.stats()['items'] == 1
+    # all brushes share the same pixmap
+    assert len({brush.texture().cacheKey() for brush in brushes}) == 1
+
+    # items are identified by all rendering parameters
+    checkerBoardBrush(16, QColor(Qt.red))
+    checkerBoardBrush(16, Qt.red)
+    checkerBoardBrush(16, strictSize=False)
+    checkerBoardBrush(32)
+    warningAreaBrush(16)
+    warningAreaBrush(16)
+    assert statsDelta(stats) == (101, 5)
+    assert ProceduralCache.stats()['items'] == 5
+
+    # checker board image is built from a checker board brush
+    images = [checkerBoardImage(QSize(20, 10), 8) for index in range(10)]
+    assert images[0].size() == QSize(20, 10)
+    assert len({image.cacheKey() for image in images}) == 1
+    assert statsDelta(stats) == (101 + 9, 5 + 2)
+
+    total = ProceduralCache.stats()['hits'] + ProceduralCache.stats()['misses']
+    assert ProceduralCache.stats()['hitRate'] == pytest.approx(ProceduralCache.stats()['hits'] / total)
+
+
+@pytest.mark.requiresQt
+def test_proceduralCacheShared():
+    # modifying a returned item doesn't modify cached item
+    ProceduralCache.clear()
+    reference = checkerBoardImage(QSize(8, 8), 4).toImage()
+    image = checkerBoardImage(QSize(8, 8), 4)
+    image.fill(Qt.black)
+    assert checkerBoardImage(QSize(8, 8), 4).toImage() == reference
+
+    reference = buildCheckerBoardBrush(4).texture().toImage()
+    texture = checkerBoardBrush(4).texture()
+    texture.fill(Qt.black)
+    assert checkerBoardBrush(4).texture().toImage() == reference
+
+
+@pytest.mark.requiresQt
+def test_proceduralCacheBounded(monkeypatch):
+    # a 16x16 checker board brush uses 1KB: cache can store 3 brushes
+    monkeypatch.setattr(ProceduralCache, '_ProceduralCache__MAX_SIZE', 3 * 1024)
+    ProceduralCache.clear()
+
+    for size in (16, 17, 18):
+        checkerBoardBrush(16, QColor(size, 0, 0))
+    assert ProceduralCache.stats()['items'] == 3
+    assert ProceduralCache.stats()['size'] == 3 * 1024
+
+    # least recently used item is removed first
+    checkerBoardBrush(16, QColor(16, 0, 0))
+    checkerBoardBrush(16, QColor(19, 0, 0))
+    assert ProceduralCache.stats()['items'] == 3
+    stats = ProceduralCache.stats()
+    checkerBoardBrush(16, QColor(16, 0, 0))
+    assert statsDelta(stats) == (1, 0)
+    checkerBoardBrush(16, QColor(17, 0, 0))
+    assert statsDelta(stats) == (1, 1)
+
+    # too big items are not cached
+    checkerBoardImage(QSize(64, 64), 8)
+    assert ProceduralCache.stats()['size'] <= 3 * 1024
+
+    ProceduralCache.clear()
+    assert ProceduralCache.stats()['size'] == 0
+
+
+@pytest.mark.requiresQt
+def test_proceduralCacheDevicePixelRatio():
+    # images are rendered for device pixel ratio
+    ProceduralCache.clear()
+    image = checkerBoardImage(QSize(20, 10), 4)
+    imageHiDpi = checkerBoardImage(QSize(20, 10), 4, 2.0)
+    assert ProceduralCache.stats()['items'] == 3
+    assert image.size() == QSize(20, 10)
+    assert imageHiDpi.size() == QSize(40, 20)
+    assert imageHiDpi.devicePixelRatio() == 2.0
+    # same checker board in logical coordinates
+    assert imageHiDpi.toImage().pixelColor(39, 19) == image.toImage().pixelColor(19, 9)
+
+
+@pytest.mark.requiresQt
+def test_proceduralCacheThemeChanged():
+    # procedural items and memoized resources icons are cleared when theme is
+    # changed
+    from pktk.modules.uitheme import UITheme
+
+    checkerBoardBrush(16)
+    icon = UITheme.icon(':/pktk/images/normal/pinned')
+    assert UITheme.icon(':/pktk/images/normal/pinned') is icon
+    assert ProceduralCache.stats()['items'] > 0
+
+    UITheme.reloadResources()
+    assert ProceduralCache.stats()['items'] == 0
+    assert UITheme.icon(':/pktk/images/normal/pinned') is not icon
+
+
+@pytest.mark.perf
+@pytest.mark.requiresQt
+def test_perfProceduralCache(perfReport):
+    # 10000 checker board brushes, built or returned from cache
+    ProceduralCache.clear()
+    results = []
+    for label, function in (('built', buildCheckerBoardBrush), ('cached', checkerBoardBrush)):
+        startTime = time.perf_counter()
+        for index in range(10000):
+            function(16)
+        results.append(f"  {label}: {1000 * (time.perf_counter() - startTime):.2f}ms")
+
+    stats = ProceduralCache.stats()
+    perfReport("checkerBoardBrush, 10000 calls\n" + "\n".join(results) + f"\n  cache hit rate: {100 * stats['hitRate']:.2f}%")
+
+
+@pytest.mark.perf
+def test_perfCombineChannels(perfReport):
+    # combine RGBA channels of a 4K image (3840x2160)
+    size = 3840 * 2160
+    channels = [bytes(range(256)) * (size // 256) for channel in range(4)]
+
+    timings = []
+    for index in range(5):
+        startTime = time.perf_counter()
+        returned = combineChannels(1, *channels)
+        timings.append(time.perf_counter() - startTime)
+
+    startTime = time.perf_counter()
+    expected = combineChannelsLoop(1, *channels)
+    timingLoop = time.perf_counter() - startTime
+
+    assert returned == expected
+    perfReport("combineChannels, 4 channels 3840x2160\n"
+               f"  byte per byte loop: {1000 * timingLoop:.2f}ms\n"
+               f"  slice assignment: {1000 * min(timings):.2f}ms")
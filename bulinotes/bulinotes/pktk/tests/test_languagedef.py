@@ -0,0 +1,131 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for languagedef module: autoCompletion proposals
+# -----------------------------------------------------------------------------
+
+import re
+import time
+
+import pytest
+
+from pktk.modules.tokenizer import (TokenizerRule, TokenType)
+from pktk.modules.languagedef import LanguageDef
+
+# tokenizer use QRegularExpression
+pytestmark = pytest.mark.requiresQt
+
+
+def rules():
+    """Rules with autoCompletion values, case insensitive and case sensitive"""
+    return [TokenizerRule(TokenType.UNKNOWN, r'set\s+\w+',
+                          autoCompletion=[('Set value', 'Set a value'),
+                                          ('set unit\x01unit\x01', 'Set unit'),
+                                          ('SETTINGS', 'Open settings'),
+                                          ('set  layer name\x01name\x01', 'Set layer name')]),
+            TokenizerRule(TokenType.COMMENT, r'draw\s+\w+',
+                          autoCompletion=['draw round', 'draw square', 'Draw Text', 'set value']),
+            TokenizerRule(TokenType.SPACE, r'(?:color|Color)\w*', caseInsensitive=False,
+                          autoCompletion=['Color', 'color', 'colorRGB', 'Color Space'])]
+
+
+def linearProposals(languageDef, text, full=False):
+    """Former implementation: all autoCompletion values of all rules are checked
+
+    Case sensitivity follows rules, like TokenizerRule.matchText() with a <str>
+    """
+    returned = []
+    for rule in languageDef.tokenizer().rules():
+        returned += rule.matchText(text, full)
+    return list(set(returned))
+
+
+def formerProposals(languageDef, text, full=False):
+    """Former implementation, with a case sensitive regular expression for all rules"""
+    rePattern = re.compile(re.escape(re.sub(r'\s+', '\x02', text)).replace('\x02', r'\s+')+'.*')
+    returned = []
+    for rule in languageDef.tokenizer().rules():
+        returned += rule.matchText(rePattern, full)
+    return list(set(returned))
+
+
+def proposalTexts(languageDef):
+    """Return all prefixes of autoCompletion values, with case and spaces variations"""
+    returned = {'', ' ', 'x', 'set   ', 'set\tv', 'SET V', 'colour'}
+    for rule in languageDef.tokenizer().rules():
+        for item in rule.autoCompletion():
+            value = item[0].split('\x01')[0]
+            for index in range(len(value) + 1):
+                prefix = value[:index]
+                returned.update((prefix, prefix.lower(), prefix.upper(), prefix.replace(' ', '   ')))
+    return sorted(returned)
+
+
+@pytest.mark.parametrize('full', [False, True])
+def test_textProposal(full):
+    # prefix index returns same proposals than a linear filter
+    languageDef = LanguageDef(rules())
+    for text in proposalTexts(languageDef):
+        assert sorted(map(str, languageDef.getTextProposal(text, full))) == sorted(map(str, linearProposals(languageDef, text, full))), text
+
+
+def test_textProposalFormer():
+    # former implementation was case sensitive for all rules: its proposals are
+    # still returned, additional proposals are only from case insensitive rules
+    languageDef = LanguageDef(rules())
+    for text in proposalTexts(languageDef):
+        proposals = set(languageDef.getTextProposal(text, True))
+        formerProposalsSet = set(formerProposals(languageDef, text, True))
+        assert formerProposalsSet.issubset(proposals), text
+        assert all(proposal[3].caseInsensitive() for proposal in proposals.difference(formerProposalsSet)), text
+
+
+def test_textProposalCase():
+    languageDef = LanguageDef(rules())
+    # case insensitive rules
+    assert sorted(languageDef.getTextProposal('SET V')) == ['Set value', 'set value']
+    assert sorted(languageDef.getTextProposal('set l')) == ['set  layer name']
+    # case sensitive rule
+    assert sorted(languageDef.getTextProposal('color')) == ['color', 'colorRGB']
+    assert sorted(languageDef.getTextProposal('COLOR')) == []
+
+    # full proposals provide value, description and rule
+    proposals = languageDef.getTextProposal('set u', True)
+    assert proposals == [('set unit', 'set unit\x01unit\x01', 'Set unit', languageDef.tokenizer().rules()[0])]
+
+
+def test_textProposalRulesModified():
+    # index is rebuilt when rules are modified
+    languageDef = LanguageDef(rules())
+    assert languageDef.getTextProposal('fill') == []
+    languageDef.tokenizer().addRule(TokenizerRule(TokenType.UNKNOWN, r'fill', autoCompletion='fill'))
+    assert languageDef.getTextProposal('fi') == ['fill']
+
+
+@pytest.mark.perf
+def test_perfTextProposal(perfReport):
+    # proposals for all prefixes of 2000 autoCompletion values
+    autoCompletion = [f'{verb} {noun}{index}' for index in range(100) for verb in ('set', 'get', 'draw', 'fill') for noun in ('layer', 'color', 'brush', 'pen', 'text')]
+    languageDef = LanguageDef([TokenizerRule(TokenType.UNKNOWN, r'\w+\s+\w+', autoCompletion=autoCompletion)])
+    texts = ['s', 'set', 'set l', 'set layer1', 'draw pen99', 'x']
+
+    results = []
+    for label, function in (('linear filter', linearProposals), ('prefix index', lambda languageDef, text: languageDef.getTextProposal(text))):
+        timings = []
+        for index in range(3):
+            startTime = time.perf_counter()
+            for text in texts:
+                function(languageDef, text)
+            timings.append(time.perf_counter() - startTime)
+        results.append(f"  {label}: {1000 * min(timings) / len(texts):.3f}ms per proposal")
+
+    perfReport(f"LanguageDef.getTextProposal ({len(autoCompletion)} values)\n" + "\n".join(results))
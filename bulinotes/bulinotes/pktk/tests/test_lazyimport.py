@@ -0,0 +1,85 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for lazyimport module: deferred imports and imports report
+# -----------------------------------------------------------------------------
+
+import re
+import sys
+
+import pytest
+
+from pktk.modules.lazyimport import LazyImport
+
+
+@pytest.fixture(autouse=True)
+def lazyPackage(tmp_path, monkeypatch):
+    """Create a 'lazypackage' package with 'lazymodule' and 'lazyother' modules"""
+    package = tmp_path / 'lazypackage'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    (package / 'lazymodule.py').write_text('VALUE = 42\n')
+    (package / 'lazyother.py').write_text('VALUE = 24\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    # imports report is global
+    monkeypatch.setattr(LazyImport, '_LazyImport__imported', {})
+    monkeypatch.setattr(LazyImport, '_LazyImport__startupDuration', None)
+    monkeypatch.setattr(LazyImport, '_LazyImport__startupModules', [])
+    yield
+    for name in ('lazypackage', 'lazypackage.lazymodule', 'lazypackage.lazyother'):
+        sys.modules.pop(name, None)
+
+
+def test_deferredImport():
+    lazymodule = LazyImport('lazypackage.lazymodule')
+    assert 'lazypackage.lazymodule' not in sys.modules
+    assert repr(lazymodule) == '<LazyImport(lazypackage.lazymodule, False)>'
+
+    # imported on first access to an attribute
+    assert lazymodule.VALUE == 42
+    assert 'lazypackage.lazymodule' in sys.modules
+    assert repr(lazymodule) == '<LazyImport(lazypackage.lazymodule, True)>'
+
+    with pytest.raises(AttributeError):
+        lazymodule.undefined
+
+
+def test_relativeName():
+    import lazypackage
+
+    lazyother = LazyImport('.lazyother', 'lazypackage')
+    assert 'lazypackage.lazyother' not in sys.modules
+    assert lazyother.VALUE == 24
+    assert sys.modules['lazypackage.lazyother'].VALUE == 24
+
+    # relative name without package can't be resolved
+    with pytest.raises(TypeError):
+        LazyImport('.lazymodule').VALUE
+
+
+def test_report():
+    assert LazyImport.report() == 'Deferred imports: none'
+
+    import lazypackage
+    LazyImport.setStartupDuration(0.0125, 'lazypackage')
+
+    # a module is reported once, with absolute name, whatever the number of
+    # proxies for it
+    for lazymodule in (LazyImport('lazypackage.lazymodule'), LazyImport('.lazymodule', 'lazypackage')):
+        assert lazymodule.VALUE == 42
+    assert LazyImport('.lazyother', 'lazypackage').VALUE == 24
+
+    lines = LazyImport.report().split('\n')
+    assert lines[0] == 'Startup imports: 12.50ms (1 modules)'
+    assert re.fullmatch(r'Deferred imports: \d+\.\d\dms', lines[1])
+    assert [re.fullmatch(r'  ([\w.]+): \d+\.\d\dms', line).group(1) for line in lines[2:]] == ['lazypackage.lazymodule', 'lazypackage.lazyother']
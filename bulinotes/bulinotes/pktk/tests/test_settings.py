@@ -0,0 +1,155 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for settings module: deferred and atomic save of configuration file
+# -----------------------------------------------------------------------------
+
+import glob
+import json
+import os
+import time
+
+import pytest
+
+from PyQt5.Qt import *
+
+from pktk.modules import settings as settingsModule
+from pktk.modules.settings import (Settings, SettingsFmt, SettingsKey, SettingsRule)
+
+
+class PkTkSettingsKey(SettingsKey):
+    CONFIG_COUNTER = 'config.counter'
+    CONFIG_NAME = 'config.name'
+
+
+class PkTkSettings(Settings):
+    """Settings for tests"""
+
+    def __init__(self, rules=None):
+        if rules is None:
+            rules = []
+
+        rules += [
+            SettingsRule(PkTkSettingsKey.CONFIG_COUNTER, 0, SettingsFmt(int)),
+            SettingsRule(PkTkSettingsKey.CONFIG_NAME, 'pktk', SettingsFmt(str))
+        ]
+
+        super(PkTkSettings, self).__init__('pktktests', rules)
+
+
+def waitSave():
+    """Process events to let deferred save be executed"""
+    for index in range(10):
+        QApplication.processEvents()
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def writes(tmp_path, monkeypatch):
+    """Return list of configuration files written, in a temporary configuration
+    directory"""
+    monkeypatch.setenv('XDG_CONFIG_HOME', str(tmp_path))
+    # settings instance is created on first use
+    monkeypatch.setattr(PkTkSettings, '_Settings__name', None, raising=False)
+    monkeypatch.setattr(PkTkSettings, '_Settings__settings', None, raising=False)
+    # deferred save is executed on next events processing
+    monkeypatch.setattr(Settings, '_Settings__SAVE_DELAY', 0)
+
+    returned = []
+    osReplace = os.replace
+
+    def replace(source, target):
+        returned.append(target)
+        osReplace(source, target)
+
+    monkeypatch.setattr(settingsModule.os, 'replace', replace)
+    assert os.path.dirname(PkTkSettings.fileName()) == str(tmp_path)
+    return returned
+
+
+def content():
+    with open(PkTkSettings.fileName()) as fHandle:
+        return json.load(fHandle)
+
+
+def test_deferredSave(writes):
+    for index in range(10):
+        PkTkSettings.set(PkTkSettingsKey.CONFIG_COUNTER, index)
+        assert PkTkSettings.save(True)
+    assert writes == []
+    assert not os.path.isfile(PkTkSettings.fileName())
+
+    # deferred saves are coalesced in one write
+    waitSave()
+    assert writes == [PkTkSettings.fileName()]
+    assert content()['config']['counter'] == 9
+
+    waitSave()
+    assert len(writes) == 1
+
+
+def test_unchangedSave(writes):
+    assert PkTkSettings.save()
+    assert len(writes) == 1
+    os.utime(PkTkSettings.fileName(), (0, 0))
+
+    # same content: file is not written
+    PkTkSettings.set(PkTkSettingsKey.CONFIG_NAME, 'pktk')
+    assert PkTkSettings.save()
+    PkTkSettings.save(True)
+    waitSave()
+    assert len(writes) == 1
+    assert os.stat(PkTkSettings.fileName()).st_mtime == 0
+
+    PkTkSettings.set(PkTkSettingsKey.CONFIG_NAME, 'modified')
+    assert PkTkSettings.save()
+    assert len(writes) == 2
+    assert os.stat(PkTkSettings.fileName()).st_mtime > 0
+    assert content()['config']['name'] == 'modified'
+
+
+def test_flush(writes):
+    # nothing to save
+    assert PkTkSettings.flush()
+    assert writes == []
+
+    # pending deferred save is executed
+    PkTkSettings.set(PkTkSettingsKey.CONFIG_COUNTER, 42)
+    PkTkSettings.save(True)
+    assert PkTkSettings.flush()
+    assert len(writes) == 1
+    assert content()['config']['counter'] == 42
+
+    # timer is stopped, file is not written again
+    waitSave()
+    assert len(writes) == 1
+
+    # saved value is loaded
+    PkTkSettings.set(PkTkSettingsKey.CONFIG_COUNTER, 0)
+    assert PkTkSettings.load()
+    assert PkTkSettings.get(PkTkSettingsKey.CONFIG_COUNTER) == 42
+
+
+def test_noTemporaryFile(writes, tmp_path, monkeypatch):
+    PkTkSettings.set(PkTkSettingsKey.CONFIG_COUNTER, 1)
+    assert PkTkSettings.save()
+    assert os.listdir(tmp_path) == [os.path.basename(PkTkSettings.fileName())]
+
+    # file can't be renamed: previous file is kept, temporary file is removed
+    def replace(source, target):
+        raise OSError('replace failed')
+
+    monkeypatch.setattr(settingsModule.os, 'replace', replace)
+    PkTkSettings.set(PkTkSettingsKey.CONFIG_COUNTER, 2)
+    assert not PkTkSettings.save()
+    assert glob.glob(str(tmp_path / '*.tmp')) == []
+    assert content()['config']['counter'] == 1
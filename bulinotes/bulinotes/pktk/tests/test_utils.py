@@ -0,0 +1,207 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for utils module: ui files loading
+# -----------------------------------------------------------------------------
+
+import glob
+import importlib
+import os.path
+import sys
+import time
+import types
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import PyQt5.uic
+from PyQt5.Qt import *
+
+from pktk.modules.utils import (XmlUiCache, loadXmlUi)
+from pktk.pktk import PkTk
+
+# ui files are loaded in real widgets
+pytestmark = pytest.mark.requiresQt
+
+PLUGIN_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+UI_FILES = sorted(glob.glob(os.path.join(PLUGIN_PATH, 'pktk', 'resources', '*.ui')) +
+                  glob.glob(os.path.join(PLUGIN_PATH, 'bn', 'resources', '*.ui')))
+
+
+def customWidgetsModules():
+    """Return modules for custom widgets headers in ui files, as {header: module}
+
+    Headers from plugin package are mapped to pktk modules; plugin widgets need
+    Krita and are replaced by their base Qt class
+    """
+    returned = {}
+    for fileName in UI_FILES:
+        for customWidget in ET.parse(fileName).getroot().iter('customwidget'):
+            header = customWidget.find('header').text
+            if header.startswith('.'):
+                header = f'bulinotes{header}'
+            if header.startswith('bulinotes.pktk.'):
+                returned[header] = importlib.import_module(header.replace('bulinotes.', '', 1))
+            else:
+                module = returned.setdefault(header, types.ModuleType(header))
+                className = customWidget.find('class').text
+                setattr(module, className, type(className, (globals()[customWidget.find('extends').text],), {}))
+
+    for header in list(returned):
+        # parent packages
+        names = header.split('.')
+        for index in range(1, len(names)):
+            package = returned.setdefault('.'.join(names[:index]), types.ModuleType('.'.join(names[:index])))
+            package.__path__ = []
+    return returned
+
+
+@pytest.fixture(autouse=True)
+def packageName(monkeypatch):
+    # custom widgets headers in ui files are relative to plugin package
+    previous = PkTk.packageName()
+    PkTk.setPackageName('bulinotes')
+    for header, module in customWidgetsModules().items():
+        monkeypatch.setitem(sys.modules, header, module)
+    XmlUiCache.clear()
+    yield
+    PkTk.setPackageName(previous)
+    XmlUiCache.clear()
+
+
+def rootWidget(fileName):
+    """Return an instance of root widget class defined in ui file"""
+    return {'QDialog': QDialog, 'QWidget': QWidget}[ET.parse(fileName).getroot().find('widget').attrib['class']]()
+
+
+def uiFileId(fileName):
+    return os.path.relpath(fileName, PLUGIN_PATH)
+
+
+UI_PARENT_ATTRIBUTES = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QPushButton" name="btOk"/>
+   </item>
+   <item>
+    <widget class="ParentLabel" name="lblParent"/>
+   </item>
+  </layout>
+ </widget>
+ <customwidgets>
+  <customwidget>
+   <class>ParentLabel</class>
+   <extends>QLabel</extends>
+   <header>xmluiwidgets</header>
+  </customwidget>
+ </customwidgets>
+</ui>
+"""
+
+UI_PARENT_ATTRIBUTES_WIDGETS = """from PyQt5.QtWidgets import QLabel
+
+
+class ParentLabel(QLabel):
+    # like BNWNotes, use a parent widget created before
+    def __init__(self, parent=None):
+        super(ParentLabel, self).__init__(parent)
+        self.setText(parent.btOk.objectName())
+"""
+
+
+def test_loadXmlUi():
+    fileName = os.path.join(PLUGIN_PATH, 'pktk', 'resources', 'about.ui')
+    # first load: ui file is not compiled
+    uiClass, properties = XmlUiCache.get(fileName)
+    assert uiClass is None
+    # compiled on second load, once
+    uiClass = XmlUiCache.get(fileName)[0]
+    assert uiClass is not None
+    assert XmlUiCache.get(fileName)[0] is uiClass
+    XmlUiCache.clear()
+
+    # like loadUi(), widgets are available as parent attributes
+    for index in range(3):
+        widget = QDialog()
+        loadXmlUi(fileName, widget)
+        assert isinstance(widget.lblName, QLabel)
+        assert isinstance(widget.dbbxOk, QDialogButtonBox)
+        assert widget.findChild(QLabel, 'lblName') is widget.lblName
+    assert XmlUiCache.get(fileName)[0] is not None
+
+
+def test_loadXmlUiParentAttributes(tmp_path, monkeypatch):
+    # widgets are available as parent attributes as soon as they're created,
+    # whatever the loader (uic.loadUi() or compiled Ui class) is
+    fileName = str(tmp_path / 'form.ui')
+    with open(fileName, 'w') as fHandle:
+        fHandle.write(UI_PARENT_ATTRIBUTES)
+    with open(str(tmp_path / 'xmluiwidgets.py'), 'w') as fHandle:
+        fHandle.write(UI_PARENT_ATTRIBUTES_WIDGETS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    for index in range(3):
+        widget = QWidget()
+        loadXmlUi(fileName, widget)
+        assert widget.lblParent.text() == 'btOk'
+    assert XmlUiCache.get(fileName)[0] is not None
+
+
+def test_cacheModified(tmp_path):
+    # modified file is parsed and compiled again
+    fileName = str(tmp_path / 'about.ui')
+    with open(os.path.join(PLUGIN_PATH, 'pktk', 'resources', 'about.ui')) as fHandle:
+        content = fHandle.read()
+    with open(fileName, 'w') as fHandle:
+        fHandle.write(content)
+
+    XmlUiCache.get(fileName)
+    uiClass = XmlUiCache.get(fileName)[0]
+    os.utime(fileName, (0, 0))
+    assert XmlUiCache.get(fileName)[0] is None
+    assert XmlUiCache.get(fileName)[0] not in (None, uiClass)
+
+
+@pytest.mark.perf
+def test_perfLoadXmlUi(perfReport):
+    # first open (parse + uic.loadUi()), second open (compile) and repeated
+    # opens (from cache) compared to PyQt5.uic.loadUi() + parse to retrieve
+    # icons, used before cache
+    def openTime(function, fileName):
+        widget = rootWidget(fileName)
+        startTime = time.perf_counter()
+        function(fileName, widget)
+        returned = time.perf_counter() - startTime
+        widget.deleteLater()
+        return returned
+
+    def loadUi(fileName, widget):
+        PyQt5.uic.loadUi(fileName, widget, PkTk.packageName())
+        ET.parse(fileName).findall(".//property[@name='icon']..")
+
+    results = []
+    for fileName in UI_FILES:
+        # first load of file imports custom widgets modules
+        openTime(loadUi, fileName)
+
+        XmlUiCache.clear()
+        first = openTime(loadXmlUi, fileName)
+        second = openTime(loadXmlUi, fileName)
+        repeated = min(openTime(loadXmlUi, fileName) for index in range(10))
+        reference = min(openTime(loadUi, fileName) for index in range(10))
+        results.append(f"  {uiFileId(fileName)}: first open {1000 * first:.2f}ms, second open {1000 * second:.2f}ms, "
+                       f"repeated open {1000 * repeated:.2f}ms, uic.loadUi {1000 * reference:.2f}ms")
+
+    perfReport("loadXmlUi() latency\n" + "\n".join(results))
@@ -0,0 +1,309 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for wcodeeditor module: background analysis, multi-line tokens
+# -----------------------------------------------------------------------------
+
+import threading
+import time
+
+import pytest
+
+from PyQt5.Qt import *
+
+from pktk.modules.tokenizer import (Tokenizer, TokenizerRule, TokenType)
+from pktk.modules.parser import (Parser, GrammarRule, GROneOrMore, GRToken)
+from pktk.modules.languagedef import (LanguageDef, LanguageDefXML)
+from pktk.widgets import wcodeeditor
+from pktk.widgets.wcodeeditor import (WCodeEditor, WCEAnalysisResults, WCEAnalyzerWorker)
+
+# tokenizer use QRegularExpression
+pytestmark = pytest.mark.requiresQt
+
+
+def rules():
+    """Rules for a minimal language, only made of comments"""
+    return [TokenizerRule(TokenType.COMMENT, r'#[^\n]*'),
+            TokenizerRule(TokenType.SPACE, r' +'),
+            TokenizerRule(TokenType.NEWLINE, r'\n'),
+            TokenizerRule(TokenType.UNKNOWN, r'[^#\s]+')]
+
+
+class CountTokenizer(Tokenizer):
+    """Tokenizer that count number of tokenized texts"""
+
+    def __init__(self):
+        super(CountTokenizer, self).__init__(rules())
+        self.count = 0
+
+    def tokenize(self, text, state=0):
+        self.count += 1
+        return super(CountTokenizer, self).tokenize(text, state)
+
+
+class Analyzer(object):
+    """Minimal analyzer for worker: only given revision is not cancelled"""
+
+    def __init__(self, revision):
+        self.revision = revision
+
+    def isCancelled(self, revision):
+        return revision != self.revision
+
+
+class BlockingTokenizer(Tokenizer):
+    """Tokenizer for which tokenize() wait until `released` event is set"""
+    released = threading.Event()
+
+    def tokenize(self, text, state=0):
+        BlockingTokenizer.released.wait(5)
+        return super(BlockingTokenizer, self).tokenize(text, state)
+
+
+def buildGrammarRules():
+    # a script is only made of comments
+    grammarRules = GrammarRule.setGrammarRules()
+    GrammarRule('Script', GrammarRule.OPTION_FIRST, GROneOrMore('Comment'))
+    GrammarRule('Comment', GRToken(TokenType.COMMENT))
+    return grammarRules
+
+
+def buildParser(tokenizer):
+    parser = Parser(tokenizer, buildGrammarRules())
+    parser.setIgnoredTokens([TokenType.SPACE, TokenType.NEWLINE])
+    return parser
+
+
+def errors(parser):
+    return [(error.errorMessage(), error.errorToken().row()) for error in parser.errors()]
+
+
+def waitFor(condition, timeout=5):
+    """Process events until `condition` is True; return False if timeout is reached"""
+    endTime = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > endTime:
+            return False
+        QApplication.processEvents()
+        time.sleep(0.005)
+    return True
+
+
+def blockStates(editor):
+    """Return lexer state of each block"""
+    document = editor.document()
+    return [document.findBlockByNumber(index).userState() for index in range(document.blockCount())]
+
+
+def isHighlightedAsComment(editor, blockNumber, position):
+    """Return if character at `position` in block is highlighted as a comment (italic)"""
+    for formatRange in editor.document().findBlockByNumber(blockNumber).layout().formats():
+        if formatRange.start <= position < formatRange.start + formatRange.length:
+            return formatRange.format.fontItalic()
+    return False
+
+
+# an xml content with a multi-line comment and a multi-line CDATA
+XML_LINES = ['<a> <!-- start', 'middle <b>', 'end --> <c/>', '<![CDATA[ x', 'y ]]>']
+
+
+@pytest.fixture
+def editor():
+    # editor with a minimal language definition, and analysis
+    # results/started revisions recorded
+    returned = WCodeEditor(languageDef=LanguageDef(rules()))
+    returned.setOptionAnalysisDelay(50)
+    returned.started = []
+    returned.results = []
+    returned.analyzer().analysisStarted.connect(returned.started.append)
+    returned.analysisUpdated.connect(returned.results.append)
+
+    # initial analysis (empty document)
+    assert waitFor(lambda: len(returned.results) == 1)
+    returned.started.clear()
+    returned.results.clear()
+    return returned
+
+
+def test_parseTokens():
+    # parsing tokens or text provides the same AST and errors
+    tokenizer = CountTokenizer()
+    for text in ("# a\n# b", "# a\nx\n# c"):
+        parserText = buildParser(tokenizer)
+        parserTokens = buildParser(tokenizer)
+        assert str(parserText.parse(text)) == str(parserTokens.parseTokens(tokenizer.tokenize(text)))
+        assert errors(parserText) == errors(parserTokens)
+
+
+def test_workerTokenizeOnce():
+    tokenizer = CountTokenizer()
+    parser = buildParser(tokenizer)
+    finished = []
+
+    worker = WCEAnalyzerWorker(Analyzer(1), 1, "# a\nx\n# c", tokenizer, parser)
+    worker.signals.finished.connect(lambda revision, results: finished.append((revision, results)))
+    worker.run()
+
+    assert tokenizer.count == 1
+    assert len(finished) == 1
+    revision, results = finished[0]
+    assert revision == 1
+    assert results.tokens().text() == "# a\nx\n# c"
+    assert results.errorRows() == {2}
+
+
+def test_workerCancelled():
+    tokenizer = CountTokenizer()
+    finished = []
+
+    worker = WCEAnalyzerWorker(Analyzer(2), 1, "# a", tokenizer, buildParser(tokenizer))
+    worker.signals.finished.connect(lambda revision, results: finished.append((revision, results)))
+    worker.run()
+
+    assert tokenizer.count == 0
+    assert finished == [(1, None)]
+
+
+def test_resultsErrors():
+    # results without errors don't share the same list
+    tokens = CountTokenizer().tokenize("# a")
+    results1 = WCEAnalysisResults(1, tokens)
+    results2 = WCEAnalysisResults(2, tokens)
+    assert results1.errors() == []
+    assert results1.errors() is not results2.errors()
+
+
+def test_analyzerDebounce(editor):
+    # modifications made during delay are analyzed once
+    for text in ("# a", "\nx", "\n# c"):
+        editor.insertPlainText(text)
+    assert editor.results == []
+
+    assert waitFor(lambda: len(editor.results) > 0)
+    QTest.qWait(100)
+    assert editor.started == [editor.analyzer().revision()]
+    assert len(editor.results) == 1
+    assert editor.results[0].revision() == editor.analyzer().revision()
+    assert editor.results[0].tokens().text() == "# a\nx\n# c"
+    assert editor.analysisResults() is editor.results[0]
+
+    # no grammar rules: content is only tokenized
+    assert editor.results[0].ast() is None
+    assert editor.results[0].errorRows() == set()
+
+
+def test_analyzerGrammarRules(editor):
+    # setting grammar rules restart analysis, errors are returned
+    editor.insertPlainText("# a\nx\n# c")
+    editor.analyzer().setGrammarRules(buildGrammarRules(), [TokenType.SPACE, TokenType.NEWLINE])
+    assert waitFor(lambda: len(editor.results) > 0)
+    assert len(editor.results) == 1
+    assert editor.results[0].ast() is not None
+    assert editor.results[0].errorRows() == {2}
+
+
+def test_analyzerCancelled(editor):
+    # planned analysis is cancelled
+    editor.insertPlainText("# a")
+    editor.analyzer().cancel()
+    QTest.qWait(150)
+    assert editor.started == []
+    assert editor.results == []
+
+
+def test_analyzerModifiedWhileRunning(editor, monkeypatch):
+    # modification made while an analysis is running cancel it; a new analysis
+    # is started on latest content once running one is finished
+    monkeypatch.setattr(wcodeeditor, 'Tokenizer', BlockingTokenizer)
+    BlockingTokenizer.released.clear()
+    editor.setLanguageDefinition(LanguageDef(rules()))
+    editor.started.clear()
+
+    editor.insertPlainText("# a")
+    assert waitFor(lambda: len(editor.started) == 1)
+    editor.insertPlainText("\n# b")
+    # let delay expire while worker is running
+    QTest.qWait(150)
+    assert len(editor.started) == 1
+
+    BlockingTokenizer.released.set()
+    assert waitFor(lambda: len(editor.results) > 0)
+    QTest.qWait(100)
+    assert len(editor.started) == 2
+    assert editor.started[1] == editor.analyzer().revision()
+    assert len(editor.results) == 1
+    assert editor.results[0].tokens().text() == "# a\n# b"
+
+
+def test_tokenizeMultiLine():
+    # tokenized line per line, multi-line tokens are continued from state
+    tokenizer = LanguageDefXML().tokenizer()
+    tokens = []
+    states = []
+    state = 0
+    for line in XML_LINES:
+        lineTokens = tokenizer.tokenize(line, state)
+        state = lineTokens.state()
+        tokens.append([(token.type(), token.text()) for token in lineTokens.list() if token.type() != TokenType.SPACE])
+        states.append(state)
+
+    assert states == [1, 1, 0, 2, 0]
+    assert tokens[0][-1] == (TokenType.COMMENT, '<!-- start')
+    assert tokens[1] == [(TokenType.COMMENT, 'middle <b>')]
+    assert tokens[2][0] == (TokenType.COMMENT, 'end -->')
+    assert tokens[2][1:] == [(LanguageDefXML.ITokenType.MARKUP, '<c'), (LanguageDefXML.ITokenType.MARKUP, '/>')]
+    assert tokens[3] == [(LanguageDefXML.ITokenType.CDATA, '<![CDATA[ x')]
+    assert tokens[4] == [(LanguageDefXML.ITokenType.CDATA, 'y ]]>')]
+
+    # same tokens when whole text is tokenized
+    wholeTokens = tokenizer.tokenize("\n".join(XML_LINES))
+    assert wholeTokens.state() == 0
+    assert [(token.type(), token.text()) for token in wholeTokens.list() if token.type() in (TokenType.COMMENT, LanguageDefXML.ITokenType.CDATA)] == [
+        (TokenType.COMMENT, "<!-- start\nmiddle <b>\nend -->"),
+        (LanguageDefXML.ITokenType.CDATA, "<![CDATA[ x\ny ]]>")]
+
+
+def test_highlighterMultiLine():
+    # lexer state is stored per block, and next blocks are highlighted again
+    # when it's modified
+    editor = WCodeEditor(languageDef=LanguageDefXML())
+    editor.setPlainText("\n".join(XML_LINES))
+    assert blockStates(editor) == [1, 1, 0, 2, 0]
+    assert not isHighlightedAsComment(editor, 0, 0)
+    assert isHighlightedAsComment(editor, 0, 5)
+    assert isHighlightedAsComment(editor, 1, 8)
+    assert isHighlightedAsComment(editor, 2, 0)
+    assert not isHighlightedAsComment(editor, 2, 9)
+
+    # edit middle block, state is not modified
+    cursor = QTextCursor(editor.document().findBlockByNumber(1))
+    cursor.insertText("<x> ")
+    assert blockStates(editor) == [1, 1, 0, 2, 0]
+    assert isHighlightedAsComment(editor, 1, 0)
+    assert isHighlightedAsComment(editor, 2, 0)
+
+    # close comment in middle block: next block is not a comment anymore
+    cursor.movePosition(QTextCursor.EndOfBlock)
+    cursor.insertText(" -->")
+    assert blockStates(editor) == [1, 0, 0, 2, 0]
+    assert isHighlightedAsComment(editor, 1, 0)
+    assert not isHighlightedAsComment(editor, 2, 0)
+
+    # remove comment start: all blocks are updated
+    cursor = QTextCursor(editor.document().findBlockByNumber(0))
+    cursor.movePosition(QTextCursor.EndOfBlock)
+    cursor.movePosition(QTextCursor.StartOfWord, QTextCursor.KeepAnchor)
+    cursor.movePosition(QTextCursor.PreviousCharacter, QTextCursor.KeepAnchor, 5)
+    assert cursor.selectedText() == "<!-- start"
+    cursor.removeSelectedText()
+    assert blockStates(editor) == [0, 0, 0, 2, 0]
+    assert not isHighlightedAsComment(editor, 1, 0)
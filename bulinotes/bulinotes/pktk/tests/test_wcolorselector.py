@@ -0,0 +1,182 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for color picker: coalesced updates from user interface, and update of
+# hidden components
+# -----------------------------------------------------------------------------
+
+import time
+
+import pytest
+
+from PyQt5.Qt import *
+
+from pktk.widgets.wcolorselector import (WColorPicker, WColorSlider, WColorWheel)
+
+# color picker widgets are real widgets
+pytestmark = pytest.mark.requiresQt
+
+LAYOUT_ALL = ['colorRGB', 'colorCMYK', 'colorHSV', 'colorHSL', 'colorAlpha', 'colorCssRGB', 'colorWheel', 'colorCombination:2']
+LAYOUT_WHEEL = ['colorWheel']
+
+
+def wait(delay=0.05):
+    """Process events during given `delay` (in seconds), to let pending updates be applied"""
+    endTime = time.perf_counter() + delay
+    while time.perf_counter() < endTime:
+        QApplication.processEvents()
+
+
+def slider(picker, model):
+    """Return color slider for given `model` from picker"""
+    for returned in picker.findChildren(WColorSlider):
+        if returned.model() == model:
+            return returned
+    return None
+
+
+def moveSlider(slider, value):
+    """Simulate a value modified from slider user interface"""
+    slider.setValue(value)
+    slider.valueUpdated.emit(value)
+
+
+def moveWheel(picker, color):
+    """Simulate a color modified from color wheel user interface"""
+    wheel = picker.findChild(WColorWheel)
+    wheel.setColor(color)
+    wheel.colorUpdated.emit(color)
+
+
+@pytest.fixture
+def picker():
+    returned = WColorPicker()
+    returned.setOptionLayout(LAYOUT_ALL)
+    returned.setColor(QColor(10, 20, 30))
+    yield returned
+    returned.deleteLater()
+
+
+def test_updateCoalesced(picker):
+    emitted = []
+    picker.colorUpdated.connect(lambda color: emitted.append(QColor(color)))
+
+    for value in range(100, 200):
+        moveSlider(slider(picker, 'red'), value)
+    # updates are applied on next frame only
+    assert emitted == []
+
+    wait()
+    assert len(emitted) == 1
+    assert emitted[0] == QColor(199, 20, 30)
+    assert slider(picker, 'green').value() == 20
+    assert slider(picker, 'hue').value() == QColor(199, 20, 30).hue()
+
+
+def test_updateFromAnotherComponent(picker):
+    # pending update is applied before an update from another component is
+    # queued
+    emitted = []
+    picker.colorUpdated.connect(lambda color: emitted.append(QColor(color)))
+
+    moveSlider(slider(picker, 'red'), 100)
+    moveSlider(slider(picker, 'green'), 150)
+    assert len(emitted) == 1
+    wait()
+    assert len(emitted) == 2
+    assert emitted[-1] == QColor(100, 150, 30)
+    assert slider(picker, 'red').value() == 100
+    assert slider(picker, 'green').value() == 150
+
+
+def test_hiddenComponentsUpdatedWhenShown(picker):
+    picker.setOptionLayout(LAYOUT_WHEEL)
+
+    color = QColor(200, 100, 50)
+    moveWheel(picker, color)
+    wait()
+    assert picker.color() == color
+    # hidden sliders are not updated...
+    assert slider(picker, 'red').value() != color.red()
+
+    # ...until they're visible
+    picker.setOptionShowColorRGB(True)
+    assert (slider(picker, 'red').value(), slider(picker, 'green').value(), slider(picker, 'blue').value()) == (200, 100, 50)
+    assert slider(picker, 'cyan').value() != color.cyan()
+
+    picker.setOptionShowColorCMYK(True)
+    picker.setOptionShowColorHSV(True)
+    assert slider(picker, 'cyan').value() == color.cyan()
+    assert slider(picker, 'black').value() == color.black()
+    assert slider(picker, 'hue').value() == color.hue()
+    assert slider(picker, 'value').value() == color.value()
+
+    # programmatically defined color is also applied when components are shown
+    picker.setOptionLayout(LAYOUT_WHEEL)
+    picker.setColor(QColor(0, 255, 0))
+    picker.setOptionShowColorRGB(True)
+    assert (slider(picker, 'red').value(), slider(picker, 'green').value(), slider(picker, 'blue').value()) == (0, 255, 0)
+
+
+@pytest.mark.perf
+def test_perfUpdateColor(perfReport):
+    # color modified from user interface: number of interface updates and
+    # emitted colorUpdated signals per second, with hidden slider groups and
+    # with all slider groups visible
+    def events(count):
+        # hue rotation, like a mouse moved over color wheel
+        return [QColor.fromHsv(index % 360, 200, 200) for index in range(count)]
+
+    def updatesPerSecond(picker):
+        # synchronous update of interface, without coalescing
+        colors = events(500)
+        startTime = time.perf_counter()
+        for color in colors:
+            picker.setColor(color)
+        return len(colors) / (time.perf_counter() - startTime)
+
+    def drag(picker, rate=250, duration=1.0):
+        # mouse events from color wheel at given `rate`, during given `duration`
+        emitted = []
+        picker.colorUpdated.connect(lambda color: emitted.append(1))
+        busy = 0
+        colors = events(int(rate * duration))
+        startTime = time.perf_counter()
+        for index, color in enumerate(colors):
+            eventTime = time.perf_counter()
+            moveWheel(picker, color)
+            busy += time.perf_counter() - eventTime
+            # time between mouse events is used to process events (timer, paint)
+            eventTime = time.perf_counter()
+            QApplication.processEvents()
+            busy += time.perf_counter() - eventTime
+            time.sleep(max(0, startTime + (index + 1) / rate - time.perf_counter()))
+        elapsed = time.perf_counter() - startTime
+        wait()
+        return len(colors) / elapsed, len(emitted) / elapsed, busy / elapsed
+
+    results = []
+    for name, layout in (('hidden slider groups', LAYOUT_WHEEL), ('all visible', LAYOUT_ALL)):
+        picker = WColorPicker()
+        picker.setOptionLayout(layout)
+        picker.resize(400, 800)
+        picker.show()
+        wait()
+
+        updates = updatesPerSecond(picker)
+        eventRate, emitRate, busy = drag(picker)
+        results.append(f"  {name}: setColor() {updates:.0f} updates/s, "
+                       f"drag {eventRate:.0f} events/s => {emitRate:.0f} colorUpdated/s, busy {100 * busy:.0f}%")
+        picker.hide()
+        picker.deleteLater()
+
+    perfReport("WColorPicker updates\n" + "\n".join(results))
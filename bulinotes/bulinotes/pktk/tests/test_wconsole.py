@@ -0,0 +1,392 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for wconsole module: line queue and console model
+# -----------------------------------------------------------------------------
+
+import random
+import re
+import time
+
+import pytest
+
+from PyQt5.Qt import *
+
+from pktk.widgets.wconsole import (WConsoleType, WConsoleLineQueue, WConsoleModel, WConsole, WConsoleView)
+
+TYPES = list(WConsoleType)
+
+
+class ModelMirror(object):
+    """Rows of a model, maintained from model signals only (like a view does)"""
+
+    def __init__(self, model):
+        self.model = model
+        self.ids = self.__modelIds()
+        self.resetCount = 0
+        model.rowsInserted.connect(self.__rowsInserted)
+        model.rowsRemoved.connect(self.__rowsRemoved)
+        model.modelReset.connect(self.__modelReset)
+
+    def __modelIds(self, first=0, last=None):
+        if last is None:
+            last = self.model.rowCount() - 1
+        return [self.model.index(row, 0).data(WConsoleModel.ROLE_ID) for row in range(first, last + 1)]
+
+    def __rowsInserted(self, parent, first, last):
+        self.ids[first:first] = self.__modelIds(first, last)
+
+    def __rowsRemoved(self, parent, first, last):
+        del self.ids[first:last + 1]
+
+    def __modelReset(self):
+        self.resetCount += 1
+        self.ids = self.__modelIds()
+
+
+def expectedIds(lines, filteredTypes):
+    """Return expected visible ids from list of lines (id, type)"""
+    return [id for id, type in lines if type not in filteredTypes]
+
+
+def modelIds(model):
+    """Return visible ids from model"""
+    return [model.index(row, 0).data(WConsoleModel.ROLE_ID) for row in range(model.rowCount())]
+
+
+def buildLines(count, typeRuns=1):
+    """Return `count` lines; types change every `typeRuns` lines"""
+    return [(f'line {index}', TYPES[(index // typeRuns) % len(TYPES)], None) for index in range(count)]
+
+
+class RegexFormatter(object):
+    """Former WConsole.formatText() implementation (regular expressions), used as reference"""
+    RE_BOLD = re.compile(r'(?<!\$)\*\*(([^*]|\$\*)+)(?<!\$)\*\*')
+    RE_ITALIC = re.compile(r'(?<!\$)\*(([^*]|\$\*)+)(?<!\$)\*')
+    RE_COLOR = re.compile(r'(?<!\$)#(l?[rgbcmykw]|[A-F0-9]{6})(?<!\$)#(([^#]|\$#)+)(?<!\$)#')
+    RE_UNESCAPE = re.compile(r'(?:\$([\*\$#]))')
+
+    @staticmethod
+    def unescape(text):
+        return RegexFormatter.RE_UNESCAPE.sub(r'\1', text)
+
+    @staticmethod
+    def formatText(text):
+        def replaceColor(regResult):
+            colorCode = regResult.groups()[0]
+            if colorCode in WConsole.styleColors():
+                color = WConsole.styleColors()[colorCode].name()
+            else:
+                color = QColor(f'#{colorCode}').name()
+            return f'<span style="color: {color}">{regResult.groups()[1]}</span>'
+
+        def formatLine(text):
+            if '*' not in text and '#' not in text and '$' not in text:
+                return text
+            text = RegexFormatter.RE_BOLD.sub(r'<b>\1</b>', text)
+            text = RegexFormatter.RE_ITALIC.sub(r'<i>\1</i>', text)
+            text = RegexFormatter.RE_COLOR.sub(replaceColor, text)
+            return RegexFormatter.unescape(text)
+
+        return [formatLine(line) for line in text.split("\n")]
+
+
+def randomMarkup(rnd, length):
+    """Return a random text, mostly made of markup characters"""
+    return ''.join(rnd.choice(['*', '**', '#', '$', 'l', 'r', 'g', 'k', 'A', 'F', '0', '9', 'x', ' ', '\n',
+                               '#r#', '#lb#', '#FF00A0#', '$*', '$#', '$$']) for index in range(length))
+
+
+def buildMarkupLog(count):
+    """Return a log of `count` lines with mixed markup"""
+    lines = ['Processing item **{0}** of *batch* #g#done# in #lk#{0}ms#',
+             'Value $* and $# are escaped, #r#**error**# #FF8000#warning #lb#nested# text#',
+             'plain text line without any markup, only numbers {0}',
+             '*italic* **bold** *unclosed **partial* #x#not a color# ${0}']
+    return "\n".join(lines[index % len(lines)].format(index) for index in range(count))
+
+
+def buildPlainLog(count):
+    """Return a log of `count` lines without markup"""
+    return "\n".join(f'plain text line without any markup, only numbers {index}' for index in range(count))
+
+
+def test_lineQueue():
+    queue = WConsoleLineQueue(50)
+    queue.append("a\nb", WConsoleType.INFO)
+    queue.append("c")
+    assert queue.take() == [('a', WConsoleType.INFO, None), ('b', WConsoleType.INFO, None), ('c', WConsoleType.NORMAL, None)]
+    assert queue.take() == []
+
+    queue.setMaxSize(2)
+    queue.append("1\n2\n3")
+    assert [line[0] for line in queue.take()] == ['2', '3']
+
+    queue.setMaxSize(0)
+    queue.append("1\n2\n3")
+    queue.clear()
+    assert queue.take() == []
+
+
+def test_modelFilterRows():
+    model = WConsoleModel()
+    mirror = ModelMirror(model)
+
+    model.appendLines(buildLines(1000, 100))
+    assert modelIds(model) == list(range(1000))
+
+    # hide/show a type: rows are removed/inserted, no reset
+    model.setFilteredTypes({WConsoleType.INFO})
+    assert modelIds(model) == [id for id in range(1000) if (id // 100) % len(TYPES) != 2]
+    assert mirror.ids == modelIds(model)
+
+    model.setFilteredTypes({WConsoleType.INFO, WConsoleType.ERROR})
+    assert mirror.ids == modelIds(model)
+
+    model.setFilteredTypes({WConsoleType.ERROR})
+    assert mirror.ids == modelIds(model)
+
+    model.setFilteredTypes(set())
+    assert modelIds(model) == list(range(1000))
+    assert mirror.ids == modelIds(model)
+    assert mirror.resetCount == 0
+
+
+def test_modelFilterRowsInterleaved():
+    # too many ranges of rows to update: model is reset
+    model = WConsoleModel()
+    mirror = ModelMirror(model)
+
+    model.appendLines(buildLines(1000))
+    model.setFilteredTypes({WConsoleType.INFO})
+    assert modelIds(model) == [id for id in range(1000) if id % len(TYPES) != 2]
+    assert mirror.ids == modelIds(model)
+    assert mirror.resetCount == 1
+
+
+def test_modelRandomOperations():
+    # model rows and rows signals are checked against expected lines after
+    # each operation
+    rnd = random.Random(1234)
+    model = WConsoleModel()
+    mirror = ModelMirror(model)
+
+    lines = []
+    nextId = 0
+    filteredTypes = set()
+    maxSize = 0
+    for iteration in range(2000):
+        operation = rnd.random()
+        if operation < 0.5:
+            typeRuns = rnd.choice([1, 3, 50])
+            appended = [(f'{index}', TYPES[(index // typeRuns + rnd.randint(0, 1)) % len(TYPES)], None) for index in range(rnd.randint(1, 200))]
+            model.appendLines(appended)
+            if maxSize > 0:
+                # lines trimmed before being added don't get an id
+                appended = appended[-maxSize:]
+            for line in appended:
+                lines.append((nextId, line[1]))
+                nextId += 1
+            if maxSize > 0:
+                lines = lines[-maxSize:]
+        elif operation < 0.85:
+            filteredTypes = set(rnd.sample(TYPES, rnd.randint(0, 3)))
+            model.setFilteredTypes(filteredTypes)
+        elif operation < 0.97:
+            maxSize = rnd.choice([0, 0, 10, 100, 500, 1000])
+            model.setMaxSize(maxSize)
+            if maxSize > 0:
+                lines = lines[-maxSize:]
+        else:
+            model.clear()
+            lines = []
+
+        expected = expectedIds(lines, filteredTypes)
+        assert modelIds(model) == expected, f"iteration {iteration}"
+        assert mirror.ids == expected, f"iteration {iteration}"
+
+
+def test_formatTextExamples():
+    assert WConsole.formatText("**bold** *italic*") == ["<b>bold</b> <i>italic</i>"]
+    assert WConsole.formatText("a $* b $# c $$ d\nline 2") == ["a * b # c $ d", "line 2"]
+    assert WConsole.formatText(["**a", "b**"]) == ["**a", "b**"]
+    assert WConsole.formatText("plain\ntext") == ["plain", "text"]
+    assert WConsole.unescape("$*$#$$$x") == "*#$$x"
+
+
+@pytest.mark.requiresQt
+def test_formatTextRegex():
+    # single scan formatter provides exactly the same result than regular
+    # expressions for random texts
+    rnd = random.Random(1234)
+    for index in range(5000):
+        text = randomMarkup(rnd, rnd.randint(0, 40))
+        assert WConsole.formatText(text) == RegexFormatter.formatText(text), repr(text)
+        assert WConsole.unescape(text) == RegexFormatter.unescape(text), repr(text)
+
+    text = buildMarkupLog(1000)
+    assert WConsole.formatText(text) == RegexFormatter.formatText(text)
+
+
+@pytest.mark.requiresQt
+def test_consoles():
+    # both consoles share queue and filter options
+    console = WConsole()
+    console.appendLine("line 1\nline 2", WConsoleType.INFO)
+    console.appendLine("line 3")
+    console.flush()
+    assert console.toPlainText() == "line 1\nline 2\nline 3"
+
+    console.setOptionAddFilteredTypes(WConsoleType.INFO)
+    assert console.optionFilteredTypes() == [WConsoleType.INFO]
+    assert [console.document().findBlockByNumber(index).isVisible() for index in range(3)] == [False, False, True]
+    console.setOptionRemoveFilteredTypes([WConsoleType.INFO])
+    assert console.optionFilteredTypes() == []
+
+    view = WConsoleView()
+    view.setOptionBufferSize(2)
+    view.appendLine("line 1\nline 2", WConsoleType.INFO)
+    view.appendLine("line 3")
+    view.flush()
+    assert [view.model().index(row, 0).data() for row in range(view.model().rowCount())] == ['line 2', 'line 3']
+
+    view.setOptionFilteredTypes([WConsoleType.INFO])
+    assert [view.model().index(row, 0).data() for row in range(view.model().rowCount())] == ['line 3']
+
+
+@pytest.mark.requiresQt
+@pytest.mark.parametrize('consoleClass, pixelSize', [(WConsole, False), (WConsoleView, False), (WConsoleView, True)])
+def test_wheelZoom(consoleClass, pixelSize):
+    # CTRL+WHEEL zoom keeps font size unit
+    # (WConsole uses QPlainTextEdit zoom, that only works with point sized fonts)
+    def wheel(delta):
+        console.wheelEvent(QWheelEvent(QPointF(10, 10), QPointF(10, 10), QPoint(), QPoint(0, delta),
+                                       Qt.NoButton, Qt.ControlModifier, Qt.NoScrollPhase, False))
+
+    def fontSize():
+        if consoleClass is WConsole:
+            # QPlainTextEdit zoom is applied to document
+            font = console.document().defaultFont()
+        else:
+            font = console.font()
+        if pixelSize:
+            assert font.pointSize() == -1
+            return font.pixelSize()
+        return font.pointSize()
+
+    console = consoleClass()
+    if pixelSize:
+        font = console.font()
+        font.setPixelSize(12)
+        console.setFont(font)
+
+    size = fontSize()
+    wheel(120)
+    assert fontSize() > size
+    wheel(-120)
+    wheel(-120)
+    assert fontSize() < size
+
+    if consoleClass is WConsole:
+        # read only QPlainTextEdit already zoom on CTRL+WHEEL when option is disabled
+        return
+
+    # rows height follows font
+    assert console.verticalHeader().defaultSectionSize() == console.fontMetrics().lineSpacing()
+
+    console.setOptionAllowWheelSetFontSize(False)
+    size = fontSize()
+    wheel(120)
+    assert fontSize() == size
+
+
+@pytest.mark.perf
+def test_perfModelFilter(perfReport):
+    # toggle filter on 100k lines
+    results = []
+    for typeRuns, label in ((1, 'interleaved types (reset)'), (25000, 'grouped types (rows)')):
+        model = WConsoleModel()
+        model.appendLines(buildLines(100000, typeRuns))
+
+        timings = []
+        for index in range(10):
+            startTime = time.perf_counter()
+            model.setFilteredTypes({WConsoleType.INFO})
+            model.setFilteredTypes(set())
+            timings.append(time.perf_counter() - startTime)
+        results.append(f"  {label}: {1000 * min(timings) / 2:.2f}ms per toggle")
+
+    perfReport("WConsoleModel, filter toggle (100000 lines)\n" + "\n".join(results))
+
+
+@pytest.mark.perf
+@pytest.mark.requiresQt
+def test_perfFormatText(perfReport):
+    # format a 100k lines log with mixed markup, and without markup (as text
+    # and as list of lines, checked line per line)
+    results = []
+    for logLabel, text in (('mixed markup', buildMarkupLog(100000)), ('no markup', buildPlainLog(100000))):
+        for label, formatText, argument in (('regular expressions', RegexFormatter.formatText, text),
+                                            ('single scan', WConsole.formatText, text),
+                                            ('single scan, list of lines', WConsole.formatText, text.split("\n"))):
+            timings = []
+            for index in range(3):
+                startTime = time.perf_counter()
+                formatText(argument)
+                timings.append(time.perf_counter() - startTime)
+            results.append(f"  {logLabel}, {label}: {1000 * min(timings):.2f}ms")
+
+    perfReport("WConsole.formatText (100000 lines)\n" + "\n".join(results))
+
+
+@pytest.mark.perf
+@pytest.mark.requiresQt
+@pytest.mark.parametrize('count', [100000, 1000000])
+def test_perfViewFilter(perfReport, count):
+    # toggle filter with a view: rows updates vs model reset
+    # a QListView is given as reference (layout query model for each row)
+    def toggleTime(model):
+        timings = []
+        for index in range(3):
+            startTime = time.perf_counter()
+            model.setFilteredTypes({WConsoleType.INFO})
+            QApplication.processEvents()
+            model.setFilteredTypes(set())
+            QApplication.processEvents()
+            timings.append(time.perf_counter() - startTime)
+        return 1000 * min(timings) / 2
+
+    results = []
+    for typeRuns, label in ((1, 'interleaved types (reset)'), (count // 4, 'grouped types (rows)')):
+        lines = buildLines(count, typeRuns)
+
+        view = WConsoleView()
+        view.model().appendLines(lines)
+        view.resize(600, 400)
+        view.show()
+        QApplication.processEvents()
+        results.append(f"  {label}, WConsoleView: {toggleTime(view.model()):.2f}ms per toggle")
+        view.close()
+
+        if count <= 100000:
+            model = WConsoleModel()
+            model.appendLines(lines)
+            view = QListView()
+            view.setUniformItemSizes(True)
+            view.setModel(model)
+            view.resize(600, 400)
+            view.show()
+            QApplication.processEvents()
+            results.append(f"  {label}, QListView: {toggleTime(model):.2f}ms per toggle")
+            view.close()
+
+    perfReport(f"WConsoleModel + view, filter toggle ({count} lines)\n" + "\n".join(results))
@@ -0,0 +1,426 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for wnodeeditor module: output values propagation
+# -----------------------------------------------------------------------------
+
+import time
+
+import pytest
+
+from PyQt5.Qt import *
+
+from pktk.widgets.wnodeeditor import (NodeEditorScene, NodeEditorNode, NodeEditorConnector, NodeEditorLink,
+                                      NodeEditorNodeWidget, NodeEditorGrTitleButton, WNodeEditorView)
+
+
+class SumNodeWidget(NodeEditorNodeWidget):
+    """Node with 2 inputs: output is sum of inputs (None is 0)"""
+
+    def __init__(self, scene, title, value=None):
+        self.evaluations = []
+        self.__value = value
+        self.__inputs = {'in1': None, 'in2': None}
+        connectors = [NodeEditorConnector('in1', NodeEditorConnector.DIRECTION_INPUT, NodeEditorConnector.LOCATION_LEFT_TOP),
+                      NodeEditorConnector('in2', NodeEditorConnector.DIRECTION_INPUT, NodeEditorConnector.LOCATION_LEFT_BOTTOM),
+                      NodeEditorConnector('out', NodeEditorConnector.DIRECTION_OUTPUT, NodeEditorConnector.LOCATION_RIGHT_TOP)]
+        super(SumNodeWidget, self).__init__(scene, title, connectors)
+
+    def setValue(self, value):
+        self.__value = value
+        self.updateOutputs()
+
+    def inputsUpdated(self, inputs):
+        self.evaluations.append(dict(inputs))
+        self.__inputs.update(inputs)
+        self.updateOutputs()
+
+    def updateOutputs(self, outputs=None):
+        if self.__value is not None:
+            self.updateOutput('out', self.__value)
+        else:
+            self.updateOutput('out', sum(value for value in self.__inputs.values() if value is not None))
+
+
+@pytest.fixture
+def scene():
+    try:
+        return NodeEditorScene()
+    except TypeError as exception:
+        # since python 3.10, PyQt5 doesn't accept float values for int arguments
+        pytest.skip(f"NodeEditorScene can't be created with this python version: {exception}")
+
+
+def link(fromNode, toNode, inputId):
+    NodeEditorLink(fromNode.node().connector('out'), toNode.node().connector(inputId))
+
+
+def buildGraph(scene, count):
+    """Build `count` nodes, each node N is linked to nodes N-1 and N-2"""
+    nodes = []
+    for index in range(count):
+        node = NodeEditorNode(scene, f'Node {index}',
+                              [NodeEditorConnector('in1', NodeEditorConnector.DIRECTION_INPUT, NodeEditorConnector.LOCATION_LEFT_TOP),
+                               NodeEditorConnector('in2', NodeEditorConnector.DIRECTION_INPUT, NodeEditorConnector.LOCATION_LEFT_BOTTOM),
+                               NodeEditorConnector('out', NodeEditorConnector.DIRECTION_OUTPUT, NodeEditorConnector.LOCATION_RIGHT_TOP)])
+        node.setPosition(QPointF((index % 100) * 300, (index // 100) * 200))
+        if index > 0:
+            NodeEditorLink(nodes[index - 1].connector('out'), node.connector('in1'))
+        if index > 1:
+            NodeEditorLink(nodes[index - 2].connector('out'), node.connector('in2'))
+        nodes.append(node)
+    return nodes
+
+
+def test_propagationDiamond(scene):
+    #       +--> B --+
+    #   A --+        +--> D
+    #       +--> C --+
+    nodeA = SumNodeWidget(scene, 'A', 1)
+    nodeB = SumNodeWidget(scene, 'B')
+    nodeC = SumNodeWidget(scene, 'C')
+    nodeD = SumNodeWidget(scene, 'D')
+    link(nodeA, nodeB, 'in1')
+    link(nodeA, nodeC, 'in1')
+    link(nodeB, nodeD, 'in1')
+    link(nodeC, nodeD, 'in2')
+    QApplication.processEvents()
+
+    for node in (nodeA, nodeB, nodeC, nodeD):
+        node.evaluations = []
+
+    # propagation is asynchronous
+    nodeA.setValue(5)
+    assert nodeD.node().connector('out').value() == 2
+    QApplication.processEvents()
+
+    # each node is evaluated once, D with both inputs at their final value
+    assert nodeB.evaluations == [{'in1': 5}]
+    assert nodeC.evaluations == [{'in1': 5}]
+    assert nodeD.evaluations == [{'in1': 5, 'in2': 5}]
+    assert nodeD.node().connector('out').value() == 10
+
+    # modifications made before propagation are coalesced
+    nodeA.setValue(6)
+    nodeA.setValue(7)
+    QApplication.processEvents()
+    assert nodeD.evaluations == [{'in1': 5, 'in2': 5}, {'in1': 7, 'in2': 7}]
+    assert nodeD.node().connector('out').value() == 14
+
+
+def test_propagationCycle(scene):
+    # A --> B --> C --> B
+    cycles = []
+    scene.evaluationCycleDetected.connect(lambda nodes: cycles.append(nodes))
+
+    nodeA = SumNodeWidget(scene, 'A', 1)
+    nodeB = SumNodeWidget(scene, 'B')
+    nodeC = SumNodeWidget(scene, 'C')
+    link(nodeA, nodeB, 'in1')
+    link(nodeB, nodeC, 'in1')
+    link(nodeC, nodeB, 'in2')
+    QApplication.processEvents()
+    cycles.clear()
+
+    # evaluation ends, cycle is reported
+    nodeA.setValue(2)
+    QApplication.processEvents()
+    assert len(cycles) == 1
+    assert set(cycles[0]) == {nodeB.node(), nodeC.node()}
+
+
+@pytest.mark.requiresQt
+def test_selection(scene):
+    nodeSelectionChanged = []
+    linkSelectionChanged = []
+    scene.nodeSelectionChanged.connect(lambda: nodeSelectionChanged.append(True))
+    scene.linkSelectionChanged.connect(lambda: linkSelectionChanged.append(True))
+
+    nodes = buildGraph(scene, 10)
+    links = scene.links()
+    assert nodeSelectionChanged == linkSelectionChanged == []
+
+    nodes[2].setSelected(True)
+    nodes[5].setSelected(True)
+    links[3].setSelected(True)
+    assert scene.selectedNodes() == [nodes[2], nodes[5]]
+    assert scene.selectedLinks() == [links[3]]
+    assert len(nodeSelectionChanged) == 2
+    assert len(linkSelectionChanged) == 1
+
+    # removing unselected items doesn't change selection
+    scene.removeNode(nodes[8])
+    assert scene.selectedNodes() == [nodes[2], nodes[5]]
+    assert len(nodeSelectionChanged) == 2
+
+    # removing selected items (and links of node) changes selection
+    scene.removeNode(nodes[5])
+    assert scene.selectedNodes() == [nodes[2]]
+    assert len(nodeSelectionChanged) == 3
+    linksCount = len(linkSelectionChanged)
+    scene.removeLink(links[3])
+    assert scene.selectedLinks() == []
+    assert len(linkSelectionChanged) == linksCount + 1
+
+    # one notification for a mass selection
+    scene.selectAll()
+    assert set(scene.selectedNodes()) == set(scene.nodes())
+    assert set(scene.selectedLinks()) == set(scene.links())
+    assert len(nodeSelectionChanged) == 4
+    scene.deselectAll()
+    assert scene.selectedNodes() == scene.selectedLinks() == []
+    assert len(nodeSelectionChanged) == 5
+
+    scene.clear()
+    assert scene.selectedNodes() == scene.selectedLinks() == []
+
+
+@pytest.mark.requiresQt
+def test_selectInRect(scene):
+    nodes = buildGraph(scene, 3)
+    links = scene.links()
+    for node in nodes:
+        # nodes without content keep the default (9999x9999) minimum size
+        node.setMinimumSize(QSize(200, 100))
+
+    def nodeRect(node):
+        return node.graphicItem().sceneBoundingRect()
+
+    # node 1 fully contained, links only partially
+    rect = nodeRect(nodes[1]).adjusted(-1, -1, 1, 1)
+    scene.selectInRect(rect, mode=Qt.ContainsItemBoundingRect)
+    assert scene.selectedNodes() == [nodes[1]]
+    assert scene.selectedLinks() == []
+
+    # node 0 partially covered
+    rect = nodeRect(nodes[0])
+    rect.setWidth(rect.width() / 2)
+    scene.selectInRect(rect, NodeEditorScene.SELECTION_NODES, mode=Qt.ContainsItemBoundingRect)
+    assert scene.selectedNodes() == []
+
+    # default mode: items that intersect rect are selected, like Qt's default
+    # rubber band selection
+    scene.selectInRect(rect, NodeEditorScene.SELECTION_NODES)
+    assert scene.selectedNodes() == [nodes[0]]
+    for mode in (Qt.IntersectsItemBoundingRect, Qt.IntersectsItemShape):
+        scene.deselectAll()
+        scene.selectInRect(rect, NodeEditorScene.SELECTION_NODES, mode=mode)
+        assert scene.selectedNodes() == [nodes[0]]
+
+    # links intersecting rect around node 1
+    scene.selectInRect(nodeRect(nodes[1]).adjusted(-1, -1, 1, 1), NodeEditorScene.SELECTION_LINKS)
+    assert links[0] in scene.selectedLinks()
+    assert scene.selectedNodes() == []
+
+    # current selection is kept
+    scene.selectInRect(rect, NodeEditorScene.SELECTION_NODES, addToSelection=True)
+    scene.selectInRect(nodeRect(nodes[2]), NodeEditorScene.SELECTION_NODES, addToSelection=True)
+    assert set(scene.selectedNodes()) == {nodes[0], nodes[2]}
+    assert links[0] in scene.selectedLinks()
+
+
+@pytest.mark.requiresQt
+def test_defaultValuesForwarded(scene):
+    # default values changes from scene are forwarded to nodes, connectors and links
+    nodes = buildGraph(scene, 3)
+    link = scene.links()[0]
+    nodes[1].connector('in2').setRadius(3)
+
+    emitted = []
+    nodes[0].titleColorChanged.connect(lambda value: emitted.append(('title', 0)))
+    nodes[1].titleColorChanged.connect(lambda value: emitted.append(('title', 1)))
+    nodes[1].connector('in1').radiusChanged.connect(lambda value: emitted.append(('in1', value)))
+    nodes[1].connector('in2').radiusChanged.connect(lambda value: emitted.append(('in2', value)))
+    nodes[1].connector('in1').colorChanged.connect(lambda value: emitted.append(('in1', value.name())))
+    nodes[1].connector('out').colorChanged.connect(lambda value: emitted.append(('out', value.name())))
+    link.colorChanged.connect(lambda value: emitted.append(('link', value.name())))
+
+    # node with its own value is not impacted
+    nodes[1].setTitleColor(QColor('#ff0000'))
+    emitted.clear()
+    scene.setDefaultNodeTitleColor(QColor('#00ff00'))
+    assert emitted == [('title', 0)]
+
+    # connector with its own value is not impacted
+    emitted.clear()
+    scene.setDefaultConnectorRadius(8)
+    assert emitted == [('in1', 8)]
+
+    # only input connectors are impacted by default input color
+    emitted.clear()
+    scene.setDefaultConnectorInputColor(QColor('#0000ff'))
+    assert emitted == [('in1', '#0000ff')]
+
+    emitted.clear()
+    scene.setDefaultLinkColor(QColor('#ffff00'))
+    assert emitted == [('link', '#ffff00')]
+
+    # removed items are not impacted anymore
+    scene.removeNode(nodes[0])
+    emitted.clear()
+    scene.setDefaultNodeTitleColor(QColor('#ffffff'))
+    scene.setDefaultLinkColor(QColor('#ffffff'))
+    assert emitted == []
+
+
+@pytest.mark.requiresQt
+def test_closeButton(scene):
+    # close button is created when displayed
+    nodes = buildGraph(scene, 2)
+    nodes[1].setRemovable(False)
+    assert nodes[0].graphicItem().childItems() == [connector.graphicItem() for connector in nodes[0].connector()]
+
+    scene.setOptionNodeCloseButtonVisible(True)
+    buttons = [item for item in nodes[0].graphicItem().childItems() if isinstance(item, NodeEditorGrTitleButton)]
+    assert len(buttons) == 1 and buttons[0].isVisible()
+    assert len(nodes[1].graphicItem().childItems()) == 3
+
+    scene.setOptionNodeCloseButtonVisible(False)
+    assert not buttons[0].isVisible()
+
+
+@pytest.mark.requiresQt
+@pytest.mark.parametrize('binary', [False, True])
+def test_serializeRoundTrip(scene, binary):
+    nodes = buildGraph(scene, 20)
+    nodes[3].setTitleColor(QColor('#ff0000'))
+    nodes[4].connector('in1').setRadius(3)
+    scene.links()[5].setColor(QColor('#00ff00'))
+    reference = scene.toJson()
+
+    loaded = []
+    loadedScene = NodeEditorScene()
+    loadedScene.sceneLoaded.connect(lambda: loaded.append(True))
+    if binary:
+        assert loadedScene.fromBinary(scene.toBinary())
+    else:
+        assert loadedScene.fromJson(reference)
+
+    assert loaded == [True]
+    assert not loadedScene.isModified()
+    assert loadedScene.toJson() == reference
+    assert [node.id() for node in loadedScene.nodes()] == [node.id() for node in nodes]
+    assert len(loadedScene.links(loadedScene.nodeFromId(nodes[10].id()))) == 4
+
+
+@pytest.mark.perf
+@pytest.mark.requiresQt
+@pytest.mark.parametrize('count', [1000, 10000])
+def test_perfLoad(scene, perfReport, count):
+    # load a scene of `count` nodes (2 * `count` links) from json and binary
+    # content; building the same scene item by item is given as reference
+    repeat = 3 if count < 10000 else 1
+
+    timingsBuild = []
+    for index in range(repeat):
+        scene.clear()
+        startTime = time.perf_counter()
+        buildGraph(scene, count)
+        timingsBuild.append(time.perf_counter() - startTime)
+
+    results = []
+    for label, content, load in (('json', scene.toJson(), NodeEditorScene.fromJson),
+                                 ('binary', scene.toBinary(), NodeEditorScene.fromBinary)):
+        timings = []
+        for index in range(repeat):
+            loadedScene = NodeEditorScene()
+            startTime = time.perf_counter()
+            assert load(loadedScene, content)
+            timings.append(time.perf_counter() - startTime)
+            assert len(loadedScene.nodes()) == count
+            loadedScene.clear()
+        results.append(f"  {label}: {len(content) / 1024:.0f}KB, load {1000 * min(timings):.2f}ms")
+
+    perfReport(f"NodeEditorScene load, {count} nodes, {len(scene.links())} links\n"
+               f"  build item by item: {1000 * min(timingsBuild):.2f}ms\n" + "\n".join(results))
+
+
+@pytest.mark.perf
+@pytest.mark.requiresQt
+@pytest.mark.parametrize('count', [1000, 10000])
+def test_perfBuildTeardown(scene, perfReport, count):
+    # build a graph of `count` nodes (2 * `count` links), remove half of nodes
+    # (one by one) then clear scene
+    startTime = time.perf_counter()
+    nodes = buildGraph(scene, count)
+    timingBuild = time.perf_counter() - startTime
+    linksCount = len(scene.links())
+
+    nodes[0].setSelected(True)
+
+    startTime = time.perf_counter()
+    for node in nodes[1::2]:
+        scene.removeNode(node)
+    timingRemove = time.perf_counter() - startTime
+
+    startTime = time.perf_counter()
+    scene.clear()
+    timingClear = time.perf_counter() - startTime
+
+    perfReport(f"NodeEditorScene, {count} nodes, {linksCount} links\n"
+               f"  build: {1000 * timingBuild:.2f}ms\n"
+               f"  remove half of nodes: {1000 * timingRemove:.2f}ms\n"
+               f"  clear: {1000 * timingClear:.2f}ms")
+
+
+@pytest.mark.perf
+@pytest.mark.requiresQt
+def test_perfRenderZoom(scene, perfReport, monkeypatch):
+    # render a 20x20 nodes grid at different zoom levels, with and without
+    # level of detail
+    nodes = []
+    for row in range(20):
+        for column in range(20):
+            node = SumNodeWidget(scene, f'Node {row}.{column}')
+            node.node().setPosition(QPointF(column * 300, row * 200))
+            if column > 0:
+                link(nodes[-1], node, 'in1')
+            if row > 0:
+                link(nodes[-20], node, 'in2')
+            nodes.append(node)
+
+    view = WNodeEditorView(scene=scene)
+    view.setMinimumZoom(0.05)
+    view.resize(1600, 1000)
+    view.show()
+    QApplication.processEvents()
+
+    def frameTime(zoom):
+        """Return frame times (ms) for given zoom: when zoom is changed (items
+        cache is invalidated) and when view is repainted without modification"""
+        timingsZoom = []
+        timingsRepaint = []
+        for index in range(6):
+            view.setZoom(zoom + 0.01 * (index % 2))
+            view.centerOn(scene.nodesBoundingRect().center())
+            startTime = time.perf_counter()
+            view.viewport().repaint()
+            timingsZoom.append(time.perf_counter() - startTime)
+
+            startTime = time.perf_counter()
+            view.viewport().repaint()
+            timingsRepaint.append(time.perf_counter() - startTime)
+        return (1000 * min(timingsZoom), 1000 * min(timingsRepaint))
+
+    zooms = (1.0, 0.5, 0.25, 0.1)
+    results = {zoom: frameTime(zoom) for zoom in zooms}
+
+    # disable level of detail
+    view.setZoom(1.0)
+    monkeypatch.setattr(NodeEditorScene, 'LOD_SIMPLIFIED', 0)
+    monkeypatch.setattr(NodeEditorScene, 'LOD_MINIMAL', 0)
+    resultsFull = {zoom: frameTime(zoom) for zoom in zooms}
+    view.close()
+
+    perfReport("WNodeEditorView frame time (400 nodes, 760 links, 1600x1000 view), level of detail / full detail\n" +
+               "\n".join(f"  zoom {zoom:.2f}: zoom changed {results[zoom][0]:.2f}ms / {resultsFull[zoom][0]:.2f}ms, "
+                          f"repaint {results[zoom][1]:.2f}ms / {resultsFull[zoom][1]:.2f}ms" for zoom in zooms))
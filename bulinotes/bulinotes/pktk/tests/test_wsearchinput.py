@@ -0,0 +1,126 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for wsearchinput module: occurences search
+# -----------------------------------------------------------------------------
+
+import time
+
+import pytest
+
+from PyQt5.Qt import *
+
+from pktk.widgets.wsearchinput import (SearchOptions, SearchFromPlainTextEdit, SearchFromPlainTextEditPattern)
+
+# search is compared to QTextDocument.find()
+pytestmark = pytest.mark.requiresQt
+
+LINES = ['Hello world, hello World!',
+         'foo.bar foobar bar barfoo',
+         'Ünïcode ÉTÉ été',
+         'emoji \U0001F600 bar \U0001F600bar bar\U0001F600 \U0001F600',
+         'nbsp bar end',
+         '',
+         'tab\tbar  x']
+
+SEARCHES = [('hello', 0),
+            ('hello', SearchOptions.CASESENSITIVE),
+            ('bar', SearchOptions.WHOLEWORD),
+            ('World', SearchOptions.WHOLEWORD | SearchOptions.CASESENSITIVE),
+            ('foo.bar', 0),
+            ('été', 0),
+            ('bar end', 0),
+            ('o.', SearchOptions.REGEX),
+            (r'\bbar\b', SearchOptions.REGEX),
+            (r'^\w+', SearchOptions.REGEX),
+            (r'\w+$', SearchOptions.REGEX),
+            (r'\s+', SearchOptions.REGEX),
+            ('\U0001F600.', SearchOptions.REGEX),
+            ('.\U0001F600', SearchOptions.REGEX),
+            ('bar', SearchOptions.REGEX | SearchOptions.WHOLEWORD),
+            # PCRE syntax, not supported (or different) with python re module
+            (r'\Qfoo.bar\E', SearchOptions.REGEX),
+            (r'(?<word>bar)\k<word>?', SearchOptions.REGEX),
+            (r'\p{Lu}\w+', SearchOptions.REGEX | SearchOptions.CASESENSITIVE),
+            (r'[[:upper:]]+', SearchOptions.REGEX | SearchOptions.CASESENSITIVE),
+            (r'\h+', SearchOptions.REGEX)]
+
+
+def documentOccurences(document, text, options):
+    """Return occurences found with QTextDocument.find()"""
+    findFlags = 0
+    if options & SearchOptions.WHOLEWORD:
+        findFlags |= QTextDocument.FindWholeWords
+
+    if options & SearchOptions.CASESENSITIVE:
+        findFlags |= QTextDocument.FindCaseSensitively
+    if options & SearchOptions.REGEX:
+        text = QRegularExpression(text)
+
+    returned = []
+    cursor = QTextCursor(document)
+    while not (cursor := document.find(text, cursor, QTextDocument.FindFlags(findFlags))).isNull():
+        returned.append((cursor.selectionStart(), cursor.selectionEnd()))
+    return returned
+
+
+def patternOccurences(document, text, options):
+    """Return occurences found with SearchFromPlainTextEditPattern, block by block"""
+    pattern = SearchFromPlainTextEditPattern(text, options)
+    returned = []
+    block = document.firstBlock()
+    while block.isValid():
+        returned += [(block.position() + start, block.position() + end) for start, end in pattern.occurences(block.text())]
+        block = block.next()
+    return returned
+
+
+def waitFor(condition, timeout=5):
+    """Process events until `condition` is True; return False if timeout is reached"""
+    endTime = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > endTime:
+            return False
+        QApplication.processEvents()
+        time.sleep(0.005)
+    return True
+
+
+@pytest.mark.parametrize('text, options', SEARCHES)
+def test_patternOccurences(text, options):
+    # same occurences than QTextDocument.find()
+    document = QTextDocument("\n".join(LINES))
+    expected = documentOccurences(document, text, options)
+    assert len(expected) > 0
+    assert patternOccurences(document, text, options) == expected
+
+
+def test_patternInvalid():
+    assert not SearchFromPlainTextEditPattern('(bar', SearchOptions.REGEX).isValid()
+    assert SearchFromPlainTextEditPattern('(bar', 0).isValid()
+    assert SearchFromPlainTextEditPattern('(bar', SearchOptions.REGEX).occurences('(bar') == []
+
+
+@pytest.mark.parametrize('text, options', [(r'\Qfoo.bar\E', SearchOptions.REGEX), ('bar', SearchOptions.WHOLEWORD)])
+def test_searchAll(text, options):
+    # background search provides same occurences than QTextDocument.find()
+    plainTextEdit = QPlainTextEdit()
+    plainTextEdit.setPlainText("\n".join(LINES * 100))
+    search = SearchFromPlainTextEdit(plainTextEdit)
+    finished = []
+    search.searchAllFinished.connect(finished.append)
+
+    search.searchAll(text, options)
+    assert waitFor(lambda: len(finished) > 0)
+    expected = documentOccurences(plainTextEdit.document(), text, options)
+    assert finished[-1] == len(expected)
+    assert search.searchAllOccurences() == expected
@@ -22,6 +22,9 @@
 #       Widget
 #       The code editor
 #
+# - WCEAnalyzer:
+#       Background analysis (tokenize+parse) of editor's content
+#
 # - Other
 #       used for gutter rendering, autocompletion, syntax highlighting...
 #
@@ -54,6 +57,10 @@ from ..modules.tokenizer import (
         Tokenizer,
         Token
     )
+from ..modules.parser import (
+        GrammarRules,
+        Parser
+    )
 
 from .wsearchinput import SearchFromPlainTextEdit
 
@@ -67,6 +74,7 @@ class WCodeEditor(QPlainTextEdit):
     overwriteModeChanged = Signal(bool)     # INS / OVR mode changed
     readOnlyModeChanged = Signal(bool)      # read-only mode changed
     autoCompletionChanged = Signal(str)     # auto completion item has changed
+    analysisUpdated = Signal(object)        # background analysis results (WCEAnalysisResults) are available
 
     KEY_INDENT = 'indent'
     KEY_DEDENT = 'dedent'
@@ -115,6 +123,8 @@ class WCodeEditor(QPlainTextEdit):
         self.__optionGutterText = QTextCharFormat()
         self.__optionGutterText.setForeground(QColor('#4c5363'))
         self.__optionGutterText.setBackground(QColor('#282c34'))
+        # line number background for rows on which analysis found errors
+        self.__optionGutterErrorColor = QColor('#88e06c75')
 
         # editor current's selected line
         self.__optionColorHighlightedLine = QColor('#2d323c')
@@ -135,6 +145,11 @@ class WCodeEditor(QPlainTextEdit):
         self.__optionShowSpaces = True
         self.__optionSpacesColor = QColor("#88666666")
 
+        # large file mode: above given number of lines, spaces and/or level
+        # indent are not drawn anymore (0 = no limit)
+        self.__optionShowSpacesMaxLines = 10000
+        self.__optionShowIndentLevelMaxLines = 25000
+
         # autocompletion is automatic (True) or manual (False)
         self.__optionAutoCompletion = True
 
@@ -183,6 +198,14 @@ class WCodeEditor(QPlainTextEdit):
         # ---- instanciate line number area
         self.__lineNumberArea = WCELineNumberArea(self)
 
+        # ---- decorations cache
+        # block text: (nb spaces left, position spaces right, nb spaces right, length, stripped length)
+        self.__cacheBlockDecoration = {}
+        # line number: QStaticText
+        self.__cacheLineNumber = {}
+        # font used to build line number cache
+        self.__cacheLineNumberFont = None
+
         # ---- initialise signals
         self.blockCountChanged.connect(self.__updateLineNumberAreaWidth)
         self.updateRequest.connect(self.__updateLineNumberArea)
@@ -194,6 +217,11 @@ class WCodeEditor(QPlainTextEdit):
         # ---- initialise completion list model
         self.__completerModel = WCECompleterModel()
 
+        # ---- initialise background analyzer
+        self.__analyzer = WCEAnalyzer(self)
+        self.__analyzer.analysisFinished.connect(self.__analysisFinished)
+        self.textChanged.connect(self.__analyzer.invalidate)
+
         # set dictionary + syntax highlighter
         self.setLanguageDefinition(languageDef)
 
@@ -240,7 +268,7 @@ class WCodeEditor(QPlainTextEdit):
             return
 
         if self.__cursorRow != previousRow or self.__cursorTokens is None or force:
-            self.__cursorTokens = self.__languageDef.tokenizer().tokenize(cursor.block().text())
+            self.__cursorTokens = self.__languageDef.tokenizer().tokenize(cursor.block().text(), max(0, cursor.block().previous().userState()))
 
         # row is always 1 here as tokenized text is only current row
         self.__cursorToken = self.__cursorTokens.tokenAt(self.__cursorCol + 1, 1)
@@ -274,6 +302,15 @@ class WCodeEditor(QPlainTextEdit):
                                                QPoint(self.__cursorSelColEnd, self.__cursorSelRowEnd),
                                                self.__cursorSelLen)
 
+    def __analysisFinished(self, results):
+        """Background analysis has been finished, update error markers and completion context"""
+        if self.__optionShowLineNumber:
+            self.__lineNumberArea.update()
+        if self.__completer.popup().isVisible():
+            # proposals are updated from analyzed document
+            self.doCompletionPopup()
+        self.analysisUpdated.emit(results)
+
     def __hideCompleterHint(self):
         """Hide completer hint"""
         QToolTip.showText(self.mapToGlobal(QPoint()), '')
@@ -405,6 +442,23 @@ class WCodeEditor(QPlainTextEdit):
         self.setExtraSelections(extraSelections)
         self.__updateCurrentPositionAndToken(False)
 
+    def __blockDecoration(self, block):
+        """Return decoration metrics for given `block`
+
+        Return a tuple (nb spaces left, position spaces right, nb spaces right, length, stripped length)
+        """
+        text = block.text()
+        returned = self.__cacheBlockDecoration.get(text)
+        if returned is None:
+            textLength = len(text)
+            strippedLength = len(text.strip())
+            nbSpacesLeft = textLength - len(text.lstrip())
+            posSpacesRight = len(text.rstrip())
+            nbSpacesRight = textLength - posSpacesRight
+            returned = (nbSpacesLeft, posSpacesRight, nbSpacesRight, textLength, strippedLength)
+            self.__cacheBlockDecoration[text] = returned
+        return returned
+
     def __isEmptyBlock(self, blockNumber):
         """Check is line for current block is empty or not"""
         # get block text
@@ -458,6 +512,19 @@ class WCodeEditor(QPlainTextEdit):
         # set background
         painter.fillRect(event.rect(), self.__optionGutterText.background())
 
+        # rows in error from last analysis
+        errorRows = set()
+        if self.__analyzer.results() is not None:
+            errorRows = self.__analyzer.results().errorRows()
+
+        if self.__cacheLineNumberFont != self.font():
+            self.__cacheLineNumber = {}
+            self.__cacheLineNumberFont = QFont(self.font())
+
+        areaWidth = self.__lineNumberArea.width()
+        painter.setPen(self.__optionGutterText.foreground().color())
+        painter.setFont(self.__cacheLineNumberFont)
+
         # Get the top and bottom y-coordinate of the first text block,
         # and adjust these values by the height of the current text block in each iteration in the loop
         block = self.firstVisibleBlock()
@@ -472,9 +539,16 @@ class WCodeEditor(QPlainTextEdit):
             # Check if the block is visible in addition to check if it is in the areas viewport
             #   a block can, for example, be hidden by a window placed over the text edit
             if block.isVisible() and bottom >= event.rect().top():
-                number = f"{blockNumber + 1}"
-                painter.setPen(self.__optionGutterText.foreground().color())
-                painter.drawText(0, top, self.__lineNumberArea.width(), self.fontMetrics().height(), Qt.AlignRight, number)
+                if (blockNumber + 1) in errorRows:
+                    painter.fillRect(QRectF(0, top, areaWidth, bottom - top), self.__optionGutterErrorColor)
+
+                number = self.__cacheLineNumber.get(blockNumber)
+                if number is None:
+                    number = QStaticText(f"{blockNumber + 1}")
+                    number.setTextFormat(Qt.PlainText)
+                    number.prepare(QTransform(), self.__cacheLineNumberFont)
+                    self.__cacheLineNumber[blockNumber] = number
+                painter.drawStaticText(QPointF(areaWidth - number.size().width(), top), number)
 
             block = block.next()
             top = bottom
@@ -538,7 +612,11 @@ class WCodeEditor(QPlainTextEdit):
         self.doAction(action)
 
     def paintEvent(self, event):
-        """Customize painting"""
+        """Customize painting
+
+        Only visible blocks are processed; spaces/indent metrics are cached per
+        block text
+        """
         super(WCodeEditor, self).paintEvent(event)
 
         if not(self.__optionRightLimitVisible or self.__optionShowSpaces or self.__optionShowIndentLevel):
@@ -548,6 +626,7 @@ class WCodeEditor(QPlainTextEdit):
         rect = event.rect()
         font = self.currentCharFormat().font()
         charWidth = QFontMetricsF(font).averageCharWidth()
+        fontHeight = self.fontMetrics().height()
         leftOffset = self.contentOffset().x() + self.document().documentMargin()
 
         # initialise painter to editor's viewport
@@ -559,9 +638,18 @@ class WCodeEditor(QPlainTextEdit):
             painter.setPen(self.__optionRightLimitColor)
             painter.drawLine(position, rect.top(), position, rect.bottom())
 
-        if not(self.__optionShowSpaces or self.__optionShowIndentLevel):
+        # large file mode: ignore costly decorations
+        blockCount = self.blockCount()
+        showSpaces = self.__optionShowSpaces and (self.__optionShowSpacesMaxLines == 0 or blockCount <= self.__optionShowSpacesMaxLines)
+        showIndentLevel = self.__optionShowIndentLevel and (self.__optionShowIndentLevelMaxLines == 0 or blockCount <= self.__optionShowIndentLevelMaxLines)
+
+        if not(showSpaces or showIndentLevel):
             return
 
+        if len(self.__cacheBlockDecoration) > max(1000, 2 * blockCount):
+            # avoid cache to grow indefinitely with texts that don't exist anymore
+            self.__cacheBlockDecoration = {}
+
         # draw spaces and/or level indent
         block = self.firstVisibleBlock()
 
@@ -571,63 +659,50 @@ class WCodeEditor(QPlainTextEdit):
         painter.setPen(self.__optionSpacesColor)
         previousIndent = 0
 
-        while block.isValid() and top <= event.rect().bottom():
+        while block.isValid() and top <= rect.bottom():
             # Check if the block is visible in addition to check if it is in the areas viewport
             #   a block can, for example, be hidden by a window placed over the text edit
-            if block.isVisible() and bottom >= event.rect().top():
-                result = re.search(r"(\s*)$", block.text())
-                posSpacesRight = 0
-                nbSpacesLeft = len(re.match(r"(\s*)", block.text()).groups()[0])
-                nbSpacesRight = len(result.groups()[0])
-                if nbSpacesRight > 0:
-                    posSpacesRight = result.start()
+            if block.isVisible() and bottom >= rect.top():
+                nbSpacesLeft, posSpacesRight, nbSpacesRight, textLength, strippedLength = self.__blockDecoration(block)
 
-                left = leftOffset
-
-                if self.__optionShowSpaces:
+                if showSpaces:
                     # draw spaces
-                    for i in range(nbSpacesLeft):
-                        painter.drawText(left, top, charWidth, self.fontMetrics().height(), Qt.AlignLeft, '.')
-                        left += charWidth
+                    if nbSpacesLeft > 0:
+                        painter.drawText(QRectF(leftOffset, top, charWidth * nbSpacesLeft, fontHeight), Qt.AlignLeft, '.' * nbSpacesLeft)
 
-                    left = leftOffset + charWidth * posSpacesRight
-                    for i in range(nbSpacesRight):
-                        painter.drawText(left, top, charWidth, self.fontMetrics().height(), Qt.AlignLeft, '.')
-                        left += charWidth
+                    if nbSpacesRight > 0 and strippedLength > 0:
+                        painter.drawText(QRectF(leftOffset + charWidth * posSpacesRight, top, charWidth * nbSpacesRight, fontHeight), Qt.AlignLeft, '.' * nbSpacesRight)
 
-                if self.__optionShowIndentLevel:
+                if showIndentLevel:
                     # draw level indent
                     if nbSpacesLeft > 0 or previousIndent > 0:
                         # if spaces or previous indent, check if level indent have to be drawn
-                        if len(block.text()) == 0:
+                        if textLength == 0:
                             # current block is empty (even no spaces)
                             # look forward for next block with level > 0
                             # if found, keep current indent otherwhise, no indent
                             nBlockText = block.next()
-                            while nBlockText.blockNumber() > -1 and nBlockText.isVisible():
-                                if nBlockText is None:
-                                    break
-                                if len(nBlockText.text()) > 0:
-                                    nNbSpacesLeft = len(re.match(r"(\s*)", nBlockText.text()).groups()[0])
+                            while nBlockText.isValid() and nBlockText.isVisible():
+                                nNbSpacesLeft, dummy, dummy, nTextLength, dummy = self.__blockDecoration(nBlockText)
+                                if nTextLength > 0:
                                     if nNbSpacesLeft == 0:
                                         nbSpacesLeft = 0
                                     else:
                                         nbSpacesLeft = previousIndent
                                     break
                                 nBlockText = nBlockText.next()
-                        elif len(block.text().strip()) == 0:
+                        elif strippedLength == 0:
                             # current block is only spaces, then draw level indent
                             nbSpacesLeft = max(previousIndent, nbSpacesLeft)
                         else:
                             previousIndent = nbSpacesLeft
 
-                        left = leftOffset + round(charWidth*2/3, 0)
                         nbChar = 0
                         while nbChar < nbSpacesLeft:
                             position = round(charWidth * nbChar) + leftOffset
-                            painter.drawLine(position, top, position, top + self.blockBoundingRect(block).height() - 1)
+                            painter.drawLine(position, top, position, bottom - 1)
                             nbChar += self.__optionIndentWidth
-                    elif len(block.text().strip()) > 0:
+                    elif strippedLength > 0:
                         previousIndent = 0
 
             block = block.next()
@@ -975,7 +1050,10 @@ class WCodeEditor(QPlainTextEdit):
         displayPopup = False
         minLength = 0
 
-        currentToken = self.cursorToken(False)
+        # if up to date, use document analysis for completion context
+        currentToken = self.analysisCursorToken(False)
+        if not currentToken:
+            currentToken = self.cursorToken(False)
 
         if not currentToken:
             # no token, try from highlight syntaxing
@@ -1071,6 +1149,7 @@ class WCodeEditor(QPlainTextEdit):
             raise EInvalidType('Given `languageDef` must be <LanguageDef> type')
 
         self.__completerModel.clear()
+        self.__analyzer.setLanguageDefinition(languageDef)
 
         if languageDef is not None:
             self.__languageDef = languageDef
@@ -1080,6 +1159,7 @@ class WCodeEditor(QPlainTextEdit):
                 for autoCompletion in rule.autoCompletion():
                     self.__completerModel.add(autoCompletion[0], rule.type(),  self.__languageDef.style(rule), autoCompletion[1], rule.autoCompletionChar())
             self.__completerModel.sort()
+            self.__analyzer.invalidate()
         else:
             if isinstance(self.__highlighter, QSyntaxHighlighter):
                 self.__highlighter.setDocument(None)
@@ -1124,6 +1204,24 @@ class WCodeEditor(QPlainTextEdit):
             self.__optionGutterText = value
             self.update()
 
+    def optionGutterErrorColor(self):
+        """Return current gutter (line number) background color for rows in error"""
+        return self.__optionGutterErrorColor
+
+    def setOptionGutterErrorColor(self, value):
+        """Set current gutter (line number) background color for rows in error (QColor)"""
+        if isinstance(value, QColor) and value != self.__optionGutterErrorColor:
+            self.__optionGutterErrorColor = value
+            self.update()
+
+    def optionAnalysisDelay(self):
+        """Return delay (in milliseconds) without modification before background analysis is started"""
+        return self.__analyzer.delay()
+
+    def setOptionAnalysisDelay(self, value):
+        """Set delay (in milliseconds) without modification before background analysis is started"""
+        self.__analyzer.setDelay(value)
+
     def optionHighlightedLineColor(self):
         """Return current color for highlighted line"""
         return self.__optionColorHighlightedLine
@@ -1222,6 +1320,26 @@ class WCodeEditor(QPlainTextEdit):
             self.__optionSpacesColor = value
             self.update()
 
+    def optionShowSpacesMaxLines(self):
+        """Return number of lines above which spaces are not visible anymore (0 = no limit)"""
+        return self.__optionShowSpacesMaxLines
+
+    def setOptionShowSpacesMaxLines(self, value):
+        """Set number of lines above which spaces are not visible anymore (0 = no limit)"""
+        if isinstance(value, int) and value != self.__optionShowSpacesMaxLines and value >= 0:
+            self.__optionShowSpacesMaxLines = value
+            self.update()
+
+    def optionShowIndentLevelMaxLines(self):
+        """Return number of lines above which indent level are not visible anymore (0 = no limit)"""
+        return self.__optionShowIndentLevelMaxLines
+
+    def setOptionShowIndentLevelMaxLines(self, value):
+        """Set number of lines above which indent level are not visible anymore (0 = no limit)"""
+        if isinstance(value, int) and value != self.__optionShowIndentLevelMaxLines and value >= 0:
+            self.__optionShowIndentLevelMaxLines = value
+            self.update()
+
     def optionAutoCompletion(self):
         """Return if autoCompletion is manual or automatic"""
         return self.__optionAutoCompletion
@@ -1316,6 +1434,27 @@ class WCodeEditor(QPlainTextEdit):
 
         return self.__cursorToken
 
+    def analysisCursorToken(self, starting=True):
+        """Return token currently under cursor, from background analysis results
+
+        If cursor is on first character of token, by default return current token
+        But if option `starting` is False, in this case consider that we want the previous token
+
+        Return None if there's no analysis results, or if results are not up to date
+        with current editor's content
+
+        Note: token position is relative to document (row position start from 1)
+        """
+        results = self.__analyzer.results()
+        if results is None or results.revision() != self.__analyzer.revision():
+            return None
+
+        token = results.tokens().tokenAt(self.__cursorCol + 1, self.__cursorRow + 1)
+        if token and starting is False and token.column() == (self.__cursorCol+1):
+            return token.previous()
+
+        return token
+
     def tokenCursor(self):
         """Return a QTextCursor matching current token on which cursor is"""
         token = self.cursorToken()
@@ -1427,6 +1566,17 @@ class WCodeEditor(QPlainTextEdit):
         """Return search object"""
         return self.__search
 
+    def analyzer(self):
+        """Return background analyzer object
+
+        Can be used to define grammar rules applied to content
+        """
+        return self.__analyzer
+
+    def analysisResults(self):
+        """Return last background analysis results (WCEAnalysisResults), or None if not yet available"""
+        return self.__analyzer.results()
+
 
 class WCELineNumberArea(QWidget):
     """Gutter area for line number
@@ -1646,10 +1796,15 @@ class WCESyntaxHighlighter(QSyntaxHighlighter):
         self.__editor = editor
 
     def highlightBlock(self, text):
-        """Highlight given text according to the type"""
+        """Highlight given text according to the type
+
+        Lexer state at end of block is stored as block state: Qt only highlight
+        the next block if its entry state (ie: current block state) has changed
+        """
         if self.__languageDef is None:
             return
-        tokens = self.__languageDef.tokenizer().tokenize(text)
+        tokens = self.__languageDef.tokenizer().tokenize(text, max(0, self.previousBlockState()))
+        self.setCurrentBlockState(tokens.state())
         self.__cursorToken = None
         self.__cursorPreviousToken = None
 
@@ -1680,3 +1835,244 @@ class WCESyntaxHighlighter(QSyntaxHighlighter):
     def lastCursorToken(self):
         """Return last token processed before current token on which cursor is"""
         return self.__cursorLastToken
+
+
+class WCEAnalysisResults(object):
+    """Results of a background analysis made on editor's content"""
+
+    def __init__(self, revision, tokens, ast=None, errors=None):
+        if errors is None:
+            errors = []
+
+        self.__revision = revision
+        self.__tokens = tokens
+        self.__ast = ast
+        self.__errors = errors
+
+        # rows (from 1) on which errors have been found
+        self.__errorRows = set()
+        for error in errors:
+            token = error.errorToken()
+            if isinstance(token, Token):
+                self.__errorRows.add(token.row())
+
+    def __repr__(self):
+        return f"<WCEAnalysisResults(Revision={self.__revision}, Tokens={self.__tokens.length()}, Errors={len(self.__errors)})>"
+
+    def revision(self):
+        """Return document revision for which analysis has been made"""
+        return self.__revision
+
+    def tokens(self):
+        """Return tokens (Tokens) for analyzed text"""
+        return self.__tokens
+
+    def ast(self):
+        """Return AST built from analyzed text, or None if no grammar rules are defined"""
+        return self.__ast
+
+    def errors(self):
+        """Return list of ParserError found during analysis"""
+        return self.__errors
+
+    def errorRows(self):
+        """Return a set of row numbers (from 1) on which errors have been found"""
+        return self.__errorRows
+
+
+class WCEAnalyzerSignals(QObject):
+    finished = Signal(int, object)          # revision, WCEAnalysisResults (None if analysis has been cancelled)
+
+
+class WCEAnalyzerWorker(QRunnable):
+    """Analyze a text in a background thread
+
+    Not aimed to be instancied directly, just use WCEAnalyzer
+    """
+
+    def __init__(self, analyzer, revision, text, tokenizer, parser):
+        super(WCEAnalyzerWorker, self).__init__()
+        self.__analyzer = analyzer
+        self.__revision = revision
+        self.__text = text
+        self.__tokenizer = tokenizer
+        self.__parser = parser
+        self.signals = WCEAnalyzerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        """Tokenize and parse text
+
+        Cancellation is checked between each step: as soon as a newer revision
+        has been asked, current analysis is stopped and results are not returned
+        """
+        if self.__analyzer.isCancelled(self.__revision):
+            self.signals.finished.emit(self.__revision, None)
+            return
+
+        tokens = self.__tokenizer.tokenize(self.__text)
+
+        if self.__analyzer.isCancelled(self.__revision):
+            self.signals.finished.emit(self.__revision, None)
+            return
+
+        ast = None
+        errors = []
+        if self.__parser is not None:
+            try:
+                # text is already tokenized, parse tokens
+                ast = self.__parser.parseTokens(tokens)
+                errors = list(self.__parser.errors())
+            except EInvalidStatus:
+                # grammar is not valid, can't provide an AST
+                ast = None
+
+            if self.__analyzer.isCancelled(self.__revision):
+                self.signals.finished.emit(self.__revision, None)
+                return
+
+        self.signals.finished.emit(self.__revision, WCEAnalysisResults(self.__revision, tokens, ast, errors))
+
+
+class WCEAnalyzer(QObject):
+    """Analyze editor's content in a background thread
+
+    Analysis is started once editor content has not been modified during a
+    given delay; any modification made while an analysis is running cancel it
+    and a new analysis is started on latest content
+    """
+    analysisStarted = Signal(int)           # revision
+    analysisFinished = Signal(object)       # WCEAnalysisResults
+
+    def __init__(self, editor):
+        super(WCEAnalyzer, self).__init__(editor)
+        self.__editor = editor
+
+        # dedicated tokenizer/parser: they're only used from background thread
+        # and are not shared with syntax highlighter
+        self.__tokenizer = None
+        self.__parser = None
+        self.__grammarRules = None
+        self.__ignoredTokens = []
+
+        # current document revision; incremented on each modification
+        self.__revision = 0
+        # revision currently processed by worker, None if no worker is running
+        self.__runningRevision = None
+        # an analysis has been asked while worker was running
+        self.__pending = False
+        # last results
+        self.__results = None
+
+        # only one analysis at a time
+        self.__threadPool = QThreadPool()
+        self.__threadPool.setMaxThreadCount(1)
+
+        # debounce
+        self.__delay = 500
+        self.__timer = QTimer()
+        self.__timer.setSingleShot(True)
+        self.__timer.timeout.connect(self.__startAnalysis)
+
+    def __startAnalysis(self):
+        """Start analysis of current editor content"""
+        if self.__tokenizer is None:
+            return
+        elif self.__runningRevision is not None:
+            # an analysis is already running (and has been cancelled by new
+            # revision); new analysis will be started once worker is finished
+            self.__pending = True
+            return
+
+        self.__pending = False
+        self.__runningRevision = self.__revision
+        worker = WCEAnalyzerWorker(self, self.__revision, self.__editor.toPlainText(), self.__tokenizer, self.__parser)
+        worker.signals.finished.connect(self.__analysisFinished)
+        worker.setAutoDelete(True)
+        self.__threadPool.start(worker)
+        self.analysisStarted.emit(self.__runningRevision)
+
+    def __analysisFinished(self, revision, results):
+        """Worker has finished"""
+        self.__runningRevision = None
+        if results is not None and revision == self.__revision:
+            self.__results = results
+            self.analysisFinished.emit(results)
+        elif self.__pending:
+            # document has been modified while worker was running
+            self.__startAnalysis()
+
+    def __updateParser(self):
+        """Rebuild parser according to current tokenizer and grammar rules"""
+        if self.__tokenizer is None or self.__grammarRules is None:
+            self.__parser = None
+        else:
+            self.__parser = Parser(self.__tokenizer, self.__grammarRules)
+            self.__parser.setIgnoredTokens(self.__ignoredTokens)
+
+    def setLanguageDefinition(self, languageDef):
+        """Set language definition used to analyze content"""
+        self.cancel()
+        self.__results = None
+
+        if languageDef is None:
+            self.__tokenizer = None
+        else:
+            self.__tokenizer = Tokenizer(languageDef.tokenizer().rules())
+            self.__tokenizer.setIndent(languageDef.tokenizer().indent())
+            self.__tokenizer.setSimplifyTokenSpaces(languageDef.tokenizer().simplifyTokenSpaces())
+
+        self.__updateParser()
+
+    def grammarRules(self):
+        """Return grammar rules used to parse content"""
+        return self.__grammarRules
+
+    def setGrammarRules(self, grammarRules, ignoredTokens=[]):
+        """Set grammar rules used to parse content
+
+        If None, content is only tokenized
+        """
+        if not (grammarRules is None or isinstance(grammarRules, GrammarRules)):
+            raise EInvalidType('Given `grammarRules` must be <GrammarRules> type')
+
+        self.__grammarRules = grammarRules
+        self.__ignoredTokens = ignoredTokens
+        self.__updateParser()
+        self.invalidate()
+
+    def delay(self):
+        """Return delay (in milliseconds) without modification before analysis is started"""
+        return self.__delay
+
+    def setDelay(self, value):
+        """Set delay (in milliseconds) without modification before analysis is started"""
+        if isinstance(value, int) and value >= 0:
+            self.__delay = value
+
+    def revision(self):
+        """Return current document revision"""
+        return self.__revision
+
+    def isCancelled(self, revision):
+        """Return True if analysis for given `revision` is not needed anymore"""
+        return (revision != self.__revision)
+
+    def invalidate(self):
+        """Document has been modified
+
+        Cancel running analysis and restart delay before next analysis
+        """
+        self.__revision += 1
+        if self.__tokenizer is not None:
+            self.__timer.start(self.__delay)
+
+    def cancel(self):
+        """Cancel running and planned analysis"""
+        self.__timer.stop()
+        self.__pending = False
+        self.__revision += 1
+
+    def results(self):
+        """Return last analysis results (WCEAnalysisResults) or None if nothing has been analyzed"""
+        return self.__results
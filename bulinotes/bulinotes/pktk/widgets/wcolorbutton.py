@@ -37,7 +37,10 @@ from PyQt5.QtWidgets import (
     )
 
 from ..modules.imgutils import checkerBoardBrush
-from .wmenuitem import WMenuColorPicker
+from ..modules.lazyimport import LazyImport
+
+# color picker menu (and color picker) is imported on first use
+wmenuitem = LazyImport('.wmenuitem', __package__)
 
 
 class QEColor(QColor):
@@ -84,7 +87,7 @@ class WColorButton(QToolButton):
 
         self.__actionNoColor = QAction(i18n('No color'), self)
         self.__actionNoColor.triggered.connect(self.__setColorNone)
-        self.__actionFromColorPicker = WMenuColorPicker()
+        self.__actionFromColorPicker = wmenuitem.WMenuColorPicker()
         self.__actionFromColorPicker.colorPicker().colorUpdated.connect(self.__setColor)
         self.__menu = QMenu(self)
         self.__menu.addAction(self.__actionNoColor)
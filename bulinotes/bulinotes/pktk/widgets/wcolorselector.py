@@ -41,6 +41,145 @@ from ..pktk import *
 #
 
 
+class ColorWidgetPixmapCache(object):
+    """A process wide cache for pixmaps rendered by color widgets
+
+    Pixmaps are identified by a key (a tuple that contains all values used to
+    render pixmap: widget kind, size, device pixel ratio, gradient, options...)
+    then widgets with the same geometry and options share the same pixmaps
+
+    Memory used by cache is bounded; least recently used pixmaps are removed
+    first
+    """
+    # maximum memory used by cache, in bytes
+    __MAX_SIZE = 32 * 1024 * 1024
+
+    # key=tuple, value=QPixmap
+    # dictionary keep insertion order, last item is the most recently used
+    __pixmaps = {}
+    __size = 0
+
+    @staticmethod
+    def __pixmapSize(pixmap):
+        """Return size (in bytes) of given `pixmap`"""
+        return pixmap.width() * pixmap.height() * 4
+
+    @staticmethod
+    def pixmap(key):
+        """Return pixmap for given `key`, None if not in cache"""
+        pixmap = ColorWidgetPixmapCache.__pixmaps.pop(key, None)
+        if pixmap is not None:
+            # move to end: most recently used
+            ColorWidgetPixmapCache.__pixmaps[key] = pixmap
+        return pixmap
+
+    @staticmethod
+    def setPixmap(key, pixmap):
+        """Add given `pixmap` to cache for given `key`
+
+        Return given `pixmap`
+        """
+        if key in ColorWidgetPixmapCache.__pixmaps:
+            ColorWidgetPixmapCache.__size -= ColorWidgetPixmapCache.__pixmapSize(ColorWidgetPixmapCache.__pixmaps.pop(key))
+
+        size = ColorWidgetPixmapCache.__pixmapSize(pixmap)
+        if size > ColorWidgetPixmapCache.__MAX_SIZE:
+            # too big to be cached
+            return pixmap
+
+        while ColorWidgetPixmapCache.__size + size > ColorWidgetPixmapCache.__MAX_SIZE and len(ColorWidgetPixmapCache.__pixmaps):
+            # remove least recently used pixmaps
+            ColorWidgetPixmapCache.__size -= ColorWidgetPixmapCache.__pixmapSize(ColorWidgetPixmapCache.__pixmaps.pop(next(iter(ColorWidgetPixmapCache.__pixmaps))))
+
+        ColorWidgetPixmapCache.__pixmaps[key] = pixmap
+        ColorWidgetPixmapCache.__size += size
+        return pixmap
+
+    @staticmethod
+    def newPixmap(size, devicePixelRatio):
+        """Return a new transparent pixmap for given logical `size` and `devicePixelRatio`"""
+        img = QImage(round(size.width() * devicePixelRatio), round(size.height() * devicePixelRatio), QImage.Format_ARGB32_Premultiplied)
+        img.setDevicePixelRatio(devicePixelRatio)
+        img.fill(Qt.transparent)
+        return QPixmap.fromImage(img)
+
+    @staticmethod
+    def clear():
+        """Clear cache"""
+        ColorWidgetPixmapCache.__pixmaps = {}
+        ColorWidgetPixmapCache.__size = 0
+
+
+class ColorPickerLayout(object):
+    """Encode/decode WColorPicker layout options
+
+    Layout is provided as a list of string (see WColorPicker.setOptionLayout()
+    for list of options) and options as a dictionary:
+        'colorRGB', 'colorCMYK', 'colorHSV', 'colorHSL', 'colorAlpha',
+        'colorCssRGB', 'colorPalette', 'colorWheel', 'colorPreview',
+        'colorRGB%', 'colorCMYK%', 'colorHSV%', 'colorHSL%', 'colorAlpha%',
+        'compactUi'
+            <bool> values
+        'colorCombination'
+            <int> value (WColorComplementary COLOR_COMBINATION_xxx values) or None
+        'colorPaletteName'
+            <str> value (palette name) or None
+        'layoutOrientation'
+            <int> value (WColorPicker OPTION_ORIENTATION_xxx values) or None
+
+    No widget is needed to encode/decode layout
+    """
+    # boolean options, in layout order
+    FLAGS = ['colorRGB', 'colorCMYK', 'colorHSV', 'colorHSL', 'colorAlpha', 'colorCssRGB', 'colorPalette', 'colorWheel', 'colorPreview',
+             'colorRGB%', 'colorCMYK%', 'colorHSV%', 'colorHSL%', 'colorAlpha%',
+             'compactUi']
+
+    __RE_PALETTE = re.compile('colorPalette:(.*)', re.IGNORECASE)
+    __RE_COMBINATION = re.compile(r'colorCombination:(\d)', re.IGNORECASE)
+    __RE_ORIENTATION = re.compile(r'layoutOrientation:(\d)', re.IGNORECASE)
+
+    @staticmethod
+    def encode(options):
+        """Return layout (a list of string) from given `options` dictionary"""
+        if not isinstance(options, dict):
+            raise EInvalidType('Given `options` must be a <dict>')
+
+        returned = [flag for flag in ColorPickerLayout.FLAGS if options.get(flag, False)]
+
+        if options.get('colorCombination', None) is not None:
+            returned.append(f"colorCombination:{options['colorCombination']}")
+        if options.get('colorPaletteName', None) is not None:
+            returned.append(f"colorPalette:{options['colorPaletteName']}")
+        if options.get('layoutOrientation', None) is not None:
+            returned.append(f"layoutOrientation:{options['layoutOrientation']}")
+
+        return returned
+
+    @staticmethod
+    def decode(layout):
+        """Return options dictionary from given `layout` (a list of string)
+
+        Values not defined in layout are returned as None
+        """
+        if not isinstance(layout, (list, tuple)):
+            raise EInvalidType('Given `layout` must be a <list> or <tuple>')
+
+        returned = {flag: (flag in layout) for flag in ColorPickerLayout.FLAGS}
+        returned['colorCombination'] = None
+        returned['colorPaletteName'] = None
+        returned['layoutOrientation'] = None
+
+        for item in layout:
+            if r := ColorPickerLayout.__RE_PALETTE.match(item):
+                returned['colorPaletteName'] = r.groups()[0]
+            elif r := ColorPickerLayout.__RE_COMBINATION.match(item):
+                returned['colorCombination'] = int(r.groups()[0])
+            elif r := ColorPickerLayout.__RE_ORIENTATION.match(item):
+                returned['layoutOrientation'] = int(r.groups()[0])
+
+        return returned
+
+
 class WColorWheel(QWidget):
     """A basic color wheel"""
     colorUpdated = Signal(QColor)       # when color is changed from user interface
@@ -326,9 +465,17 @@ class WColorWheel(QWidget):
 
     def __buildPixmapColorWheel(self):
         """Generate pixmap cache for color wheel"""
-        img = QImage(self.__borderLength, self.__borderLength, QImage.Format_ARGB32_Premultiplied)
-        img.fill(Qt.transparent)
-        self.__pixmapColorWheel = QPixmap.fromImage(img)
+        # also need to regenerate region
+        self.__regionColorWheel = QRegion(self.__outerRect, QRegion.Ellipse)
+        self.__regionColorWheel -= QRegion(self.__middleRect, QRegion.Ellipse)
+
+        devicePixelRatio = self.devicePixelRatioF()
+        key = ('wheel', self.__borderLength, self.__wheelWidth, devicePixelRatio, self.__optionAntialiasing, self.__optionBorderWidth, self.__optionBorderColor.rgba())
+        self.__pixmapColorWheel = ColorWidgetPixmapCache.pixmap(key)
+        if self.__pixmapColorWheel is not None:
+            return
+
+        self.__pixmapColorWheel = ColorWidgetPixmapCache.newPixmap(QSize(self.__borderLength, self.__borderLength), devicePixelRatio)
 
         gradientHue = QConicalGradient(self.cpHSize, self.cpHSize, 0)
         for color in WColorWheel.__HUE_COLORS:
@@ -362,15 +509,21 @@ class WColorWheel(QWidget):
             canvas.drawEllipse(self.__middleRect)
         canvas.end()
 
-        # also need to regenerate region
-        self.__regionColorWheel = QRegion(self.__outerRect, QRegion.Ellipse)
-        self.__regionColorWheel -= QRegion(self.__middleRect, QRegion.Ellipse)
+        ColorWidgetPixmapCache.setPixmap(key, self.__pixmapColorWheel)
 
     def __buildPixmapColorInner(self):
         """Generate pixmap cache for inner color"""
-        img = QImage(self.__innerRect.size(), QImage.Format_ARGB32_Premultiplied)
-        img.fill(Qt.transparent)
-        self.__pixmapColorInner = QPixmap.fromImage(img)
+        if self.__optionInnerModel == WColorWheel.__INNER_MODE_HSV_SQ or self.__optionInnerModel == WColorWheel.__INNER_MODE_HSL_SQ:
+            # also need to regenerate region
+            self.__regionColorInner = QRegion(self.__innerRect, QRegion.Rectangle)
+
+        devicePixelRatio = self.devicePixelRatioF()
+        key = ('inner', self.__innerRect.width(), self.__middleRect.width(), self.__optionInnerModel, devicePixelRatio, self.__optionAntialiasing, self.__optionBorderWidth, self.__optionBorderColor.rgba())
+        self.__pixmapColorInner = ColorWidgetPixmapCache.pixmap(key)
+        if self.__pixmapColorInner is not None:
+            return
+
+        self.__pixmapColorInner = ColorWidgetPixmapCache.newPixmap(self.__innerRect.size(), devicePixelRatio)
 
         canvas = QPainter()
         canvas.begin(self.__pixmapColorInner)
@@ -411,14 +564,13 @@ class WColorWheel(QWidget):
                 canvas.setPen(pen)
                 canvas.setBrush(Qt.transparent)
                 canvas.drawRect(rect)
-
-            # also need to regenerate region
-            self.__regionColorInner = QRegion(self.__innerRect, QRegion.Rectangle)
         elif self.__optionInnerModel == WColorWheel.__INNER_MODE_HSV_TR:
             pass
 
         canvas.end()
 
+        ColorWidgetPixmapCache.setPixmap(key, self.__pixmapColorInner)
+
     def __drawCursorCircle(self, canvas, position, size):
         """Draw a cursor as a circle"""
         penB = QPen(Qt.black)
@@ -576,6 +728,8 @@ class WColorWheel(QWidget):
             return
 
         self.__optionAntialiasing = value
+        self.__pixmapColorWheel = None
+        self.__pixmapColorInner = None
         self.update()
 
     def setOptionBorderWidth(self, value):
@@ -584,6 +738,8 @@ class WColorWheel(QWidget):
             return
 
         self.__optionBorderWidth = max(0, value)
+        self.__pixmapColorWheel = None
+        self.__pixmapColorInner = None
         self.update()
 
     def setOptionBorderColor(self, value):
@@ -592,6 +748,8 @@ class WColorWheel(QWidget):
             return
 
         self.__optionBorderColor = value
+        self.__pixmapColorWheel = None
+        self.__pixmapColorInner = None
         self.update()
 
     def setOptionWheelWidthMin(self, value):
@@ -1009,9 +1167,16 @@ class WColorSlider(QWidget):
 
         def __buildPixmapFgGradient(self):
             """Generate pixmap cache for foreground gradient wheel"""
-            img = QImage(self.size(), QImage.Format_ARGB32_Premultiplied)
-            img.fill(Qt.transparent)
-            self.__pixmapFgGradient = QPixmap.fromImage(img)
+            self.__invalidatedFgGradient = False
+
+            devicePixelRatio = self.devicePixelRatioF()
+            key = ('sliderGradient', self.width(), self.height(), self.__paintRect.getRect(), devicePixelRatio, self.__optionAntialiasing, self.__optionRoundCorner,
+                   tuple((gradientPoint[0], gradientPoint[1].rgba()) for gradientPoint in self.__propFgGradient))
+            self.__pixmapFgGradient = ColorWidgetPixmapCache.pixmap(key)
+            if self.__pixmapFgGradient is not None:
+                return
+
+            self.__pixmapFgGradient = ColorWidgetPixmapCache.newPixmap(self.size(), devicePixelRatio)
 
             gradientLinear = QLinearGradient(0, 0, 1, 0)
             gradientLinear.setCoordinateMode(QGradient.ObjectBoundingMode)
@@ -1034,8 +1199,12 @@ class WColorSlider(QWidget):
 
             canvas.end()
 
+            ColorWidgetPixmapCache.setPixmap(key, self.__pixmapFgGradient)
+
         def __buildPixmapBgTicks(self):
             """Generate pixmap cache for background ticks"""
+            self.__invalidatedBgTicks = False
+
             # calculate number of ticks
             nbTicksMain = round((self.__propValueMax - self.__propValueMin)/self.__propTicksMain)
 
@@ -1059,9 +1228,14 @@ class WColorSlider(QWidget):
                 if spaceTicksSecond < self.__ticksHideLimit:
                     nbTicksSecond = 0
 
-            img = QImage(self.size(), QImage.Format_ARGB32_Premultiplied)
-            img.fill(Qt.transparent)
-            self.__pixmapBgTicks = QPixmap.fromImage(img)
+            devicePixelRatio = self.devicePixelRatioF()
+            key = ('sliderTicks', self.width(), self.height(), self.__paintRect.getRect(), self.__margins.top(), devicePixelRatio, self.__optionAntialiasing,
+                   nbTicksMain, nbTicksSecond, self.__optionTickWidth, self.__optionTickColor.rgba(), self.__ticksOffsetY)
+            self.__pixmapBgTicks = ColorWidgetPixmapCache.pixmap(key)
+            if self.__pixmapBgTicks is not None:
+                return
+
+            self.__pixmapBgTicks = ColorWidgetPixmapCache.newPixmap(self.size(), devicePixelRatio)
 
             canvas = QPainter()
             canvas.begin(self.__pixmapBgTicks)
@@ -1086,6 +1260,8 @@ class WColorSlider(QWidget):
 
             canvas.end()
 
+            ColorWidgetPixmapCache.setPixmap(key, self.__pixmapBgTicks)
+
         def __emitValueUpdated(self):
             """Emit signal when value has been updated (from mouse position)"""
             self.valueUpdated.emit(self.__propValue)
@@ -1115,6 +1291,7 @@ class WColorSlider(QWidget):
         def setValueMin(self, value):
             """Define minimum allowed value"""
             self.__propValueMin = round(value, self.__propValueDec)
+            self.__invalidatedBgTicks = True
 
             if self.__propValueMin > self.__propValueMax:
                 self.setValueMax(self.__propValueMin)
@@ -1127,6 +1304,7 @@ class WColorSlider(QWidget):
         def setValueMax(self, value):
             """Define maximum allowed value"""
             self.__propValueMax = round(value, self.__propValueDec)
+            self.__invalidatedBgTicks = True
 
             if self.__propValueMax < self.__propValueMin:
                 self.setValueMin(self.__propValueMax)
@@ -1790,8 +1968,16 @@ class WColorPalette(QWidget):
             # color cell coordinates on which mouse is over; as tuple(row, column) or None if no index
             self.__overCell = None
 
-            # rendered grid in a pixmap cache
-            self.__cachedGrid = None
+            # resolved colors cache (key=color index, value=QColor or None)
+            # colors are resolved for current canvas color space
+            self.__cachedColors = {}
+            # color space for which colors have been resolved
+            self.__cachedColorsKey = None
+            # canvas used to resolve colors
+            self.__canvas = None
+
+            # checker board rendered for cells without color
+            self.__noColorPixmap = None
 
             # QPen used for mouse over rendering
             self.__qPalette = QApplication.palette()
@@ -1804,38 +1990,55 @@ class WColorPalette(QWidget):
             """Return a QRect for a color square in grid"""
             return QRect(column * (1 + self.__cellSize), row * (1 + self.__cellSize), self.__cellSize, self.__cellSize)
 
-        def __renderCache(self):
-            """Render current grid in cache"""
-            if self.__palette is None or self.__columns == 0:
-                self.__cachedGrid = None
-                return
+        def __checkCachedColors(self):
+            """Check if resolved colors are still valid for current canvas color space
 
-            # generate pixmap cache
-            self.__cachedGrid = QPixmap(self.__idealSize)
-            self.__cachedGrid.fill(self.__qPalette.color(QPalette.Base))
+            If not, cache is cleared
+            """
+            self.__canvas = None
+            key = None
+            if Krita.instance().activeWindow():
+                view = Krita.instance().activeWindow().activeView()
+                if view:
+                    self.__canvas = view.canvas()
+                    document = view.document()
+                    if document:
+                        key = (document.colorModel(), document.colorDepth(), document.colorProfile())
+                    else:
+                        key = ()
 
-            noColorPixMap = checkerBoardImage(self.__cellSize, self.__cellSize)
+            if key != self.__cachedColorsKey:
+                self.__cachedColors = {}
+                self.__cachedColorsKey = key
 
-            painter = QPainter()
-            painter.begin(self.__cachedGrid)
+        def __cachedColor(self, index):
+            """Return resolved QColor for given `index`, None if no color is defined
 
-            for row in range(self.__rows):
-                for col in range(self.__columns):
-                    color = self.colorFromRowColumn(row, col)
-                    if color:
-                        painter.fillRect(self.__colorRect(row, col), QBrush(color))
-                    else:
-                        # no color defined, let the checker board be displayed
-                        painter.drawPixmap(self.__colorRect(row, col).topLeft(), noColorPixMap)
+            Cache must have been checked with __checkCachedColors()
+            """
+            if index in self.__cachedColors:
+                return self.__cachedColors[index]
+
+            color = None
+            if self.__canvas is not None:
+                swatch = self.__palette.colorSetEntryByIndex(index)
+                if swatch.isValid():
+                    color = swatch.color().colorForCanvas(self.__canvas)
 
-            painter.end()
+            self.__cachedColors[index] = color
+            return color
+
+        def __updateCell(self, cell):
+            """Repaint given cell (row, column), including mouse over marker"""
+            if cell is not None:
+                self.update(self.__colorRect(cell[0], cell[1]) + QMargins(2, 2, 2, 2))
 
         def invalidate(self):
-            self.__cachedGrid = None
             # calculate pixel size of a color square
             # total width - number of columns ==> because keep 1 pixel per column
             # as separator
             self.__cellSize = (self.width() - self.__columns)//self.__columns
+            self.__noColorPixmap = None
 
             # recalculate size according to:
             # - current width
@@ -1845,27 +2048,65 @@ class WColorPalette(QWidget):
 
             # and set ideal height as minimal height for widget
             self.setMinimumHeight(self.__idealSize.height())
+            self.update()
+
+        def invalidateColors(self):
+            """Clear resolved colors cache (palette content has been modified)"""
+            self.__cachedColors = {}
+            self.update()
 
         def resizeEvent(self, event):
-            """Widget is resized, need to invalidate pixmap cache"""
-            self.__cachedGrid = None
+            """Widget is resized, need to recalculate cells size"""
             super(WColorPalette.WPaletteGrid, self).resizeEvent(event)
             self.invalidate()
 
+        def showEvent(self, event):
+            """Widget is displayed, colors are resolved again
+
+            Krita doesn't notify when palette content is modified (from palette
+            docker for example): resolved colors are kept only while widget is
+            visible
+            """
+            super(WColorPalette.WPaletteGrid, self).showEvent(event)
+            self.invalidateColors()
+
         def paintEvent(self, event):
-            """refresh widget content"""
-            if self.__cachedGrid is None:
-                # cache is not valid anymore, regenerate it
-                self.__renderCache()
+            """refresh widget content
 
-                if self.__cachedGrid is None:
-                    # wow big problem here!
-                    # hope it will never occur :)
-                    super(WColorPalette.WPaletteGrid, self).paintEvent(event)
-                    return
+            Only cells intersecting area to repaint are rendered (when in a
+            scroll area, area is the visible region)
+            """
+            rect = event.rect()
 
             painter = QPainter(self)
-            painter.drawPixmap(QPoint(0, 0), self.__cachedGrid)
+            painter.fillRect(rect, self.__qPalette.color(QPalette.Base))
+
+            if self.__palette is None or self.__columns == 0 or self.__cellSize <= 0:
+                return
+
+            self.__checkCachedColors()
+
+            if self.__noColorPixmap is None:
+                self.__noColorPixmap = checkerBoardImage(QSize(self.__cellSize, self.__cellSize), devicePixelRatio=self.devicePixelRatioF())
+
+            cellStep = self.__cellSize + 1
+            firstRow = max(0, rect.top()//cellStep)
+            lastRow = min(self.__rows - 1, rect.bottom()//cellStep)
+            firstColumn = max(0, rect.left()//cellStep)
+            lastColumn = min(self.__columns - 1, rect.right()//cellStep)
+
+            for row in range(firstRow, lastRow + 1):
+                for column in range(firstColumn, lastColumn + 1):
+                    index = row * self.__columns + column
+                    if index >= self.__nbColors:
+                        break
+
+                    color = self.__cachedColor(index)
+                    if color:
+                        painter.fillRect(self.__colorRect(row, column), color)
+                    else:
+                        # no color defined, let the checker board be displayed
+                        painter.drawPixmap(self.__colorRect(row, column).topLeft(), self.__noColorPixmap)
 
             if self.__overCell is not None:
                 painter.setPen(self.__penOver)
@@ -1894,19 +2135,23 @@ class WColorPalette(QWidget):
 
             # determinate color index
             overIndex = self.colorIndex(row, column)
+            if overIndex == self.__overIndex:
+                # still over the same cell
+                return
+
+            previousCell = self.__overCell
             if overIndex > -1:
                 self.__overIndex = overIndex
                 self.__overCell = (row, column)
-            elif self.__overIndex > -1:
+            else:
                 self.__overIndex = -1
                 self.__overCell = None
-            else:
-                return
 
-            # redraw palette to display marker over cell
-            self.update()
+            # redraw cells to display marker over cell
+            self.__updateCell(previousCell)
+            self.__updateCell(self.__overCell)
 
-            if isinstance(self.__overIndex, int) and self.__overIndex > -1:
+            if self.__overIndex > -1:
                 swatch = self.colorFromIndex(self.__overIndex, False)
                 if swatch.isValid():
                     qColor = self.colorFromIndex(self.__overIndex, True)
@@ -1918,9 +2163,9 @@ class WColorPalette(QWidget):
 
         def leaveEvent(self, event):
             """Mouse is not over widget anymore"""
+            self.__updateCell(self.__overCell)
             self.__overIndex = -1
             self.__overCell = None
-            self.update()
             self.colorOver.emit(-1, Swatch(), QColor())
 
         def idealSize(self):
@@ -1960,18 +2205,11 @@ class WColorPalette(QWidget):
             if index < 0 or self.__palette is None:
                 return None
 
-            color = self.__palette.colorSetEntryByIndex(index)
-
             if asQColor:
-                if not color.isValid():
-                    return None
-                if Krita.instance().activeWindow():
-                    if Krita.instance().activeWindow().activeView():
-                        return color.color().colorForCanvas(Krita.instance().activeWindow().activeView().canvas())
-            else:
-                return color
+                self.__checkCachedColors()
+                return self.__cachedColor(index)
 
-            return None
+            return self.__palette.colorSetEntryByIndex(index)
 
         def colorFromRowColumn(self, row, column, asQColor=True):
             """Return QColor for given row color
@@ -1993,6 +2231,7 @@ class WColorPalette(QWidget):
                 self.__nbColors = self.__palette.colorsCountTotal()
                 self.__columns = self.__palette.columnCount()
                 self.__rows = math.ceil(self.__nbColors/self.__columns)
+                self.__cachedColors = {}
                 self.invalidate()
                 # self.update()
 
@@ -2194,6 +2433,16 @@ class WColorPicker(QWidget):
     __COLOR_PALETTE = 30
     __COLOR_CSSRGB = 40
 
+    # components updated when color is modified
+    __COMPONENTS = [__COLOR_COMPLEMENTARY, __COLOR_WHEEL,
+                    __COLOR_RED, __COLOR_GREEN, __COLOR_BLUE,
+                    __COLOR_CYAN, __COLOR_MAGENTA, __COLOR_YELLOW, __COLOR_BLACK,
+                    __COLOR_HUE, __COLOR_SATURATION, __COLOR_VALUE, __COLOR_LIGHTNESS,
+                    __COLOR_ALPHA, __COLOR_CSSRGB]
+
+    # delay (in milliseconds) used to coalesce updates from mouse (~1 frame)
+    __UPDATE_DELAY = 16
+
     OPTION_MENU_RGB =        0b0000000000000001
     OPTION_MENU_CMYK =       0b0000000000000010
     OPTION_MENU_HSV =        0b0000000000000100
@@ -2268,6 +2517,16 @@ class WColorPicker(QWidget):
         self.__color = QColor()
         self.__colorHue = QColor()
 
+        # components not updated with current color because not visible
+        self.__staleComponents = set()
+
+        # updates from mouse are coalesced
+        self.__pendingUpdate = None
+        self.__timerUpdate = QTimer(self)
+        self.__timerUpdate.setSingleShot(True)
+        self.__timerUpdate.setInterval(WColorPicker.__UPDATE_DELAY)
+        self.__timerUpdate.timeout.connect(self.__applyPendingUpdate)
+
         self.__wContainerColorPalette = QWidget(self)
         self.__wContainerColorWheel = QWidget(self)
         self.__wContainerColorSliders = QWidget(self)
@@ -2566,16 +2825,20 @@ class WColorPicker(QWidget):
 
     def __colorComplementaryClicked(self, color, colorIndex):
         """A complementary color has been cliked, apply it"""
+        # pending update must be applied with color it has been queued for
+        self.__applyPendingUpdate()
         self.__color = color
         self.__updateColor(WColorPicker.__COLOR_COMPLEMENTARY)
 
     def __colorWheelChanged(self, color):
         """Color from color wheel has been changed"""
         self.__color = self.__colorWheel.color()
-        self.__updateColor(WColorPicker.__COLOR_WHEEL)
+        self.__queueUpdateColor(WColorPicker.__COLOR_WHEEL)
 
     def __colorCssRGBChanged(self, color):
         """Color from CSS color code editor has been changed"""
+        # pending update must be applied with color it has been queued for
+        self.__applyPendingUpdate()
         self.__color = color
         self.__updateColor(WColorPicker.__COLOR_CSSRGB)
 
@@ -2588,111 +2851,183 @@ class WColorPicker(QWidget):
         """Color palette has been changed"""
         if index > -1 and swatch.isValid():
             if self.__optionAllowRightClick or (int(buttons) & Qt.RightButton != Qt.RightButton):
+                # pending update must be applied with color it has been queued for
+                self.__applyPendingUpdate()
                 self.__color = color
                 self.__updateColor(WColorPicker.__COLOR_PALETTE)
 
     def __colorRChanged(self, value):
         """Color from Red color slider has been changed"""
         self.__color.setRed(int(value))
-        self.__updateColor(WColorPicker.__COLOR_RED)
+        self.__queueUpdateColor(WColorPicker.__COLOR_RED)
 
     def __colorGChanged(self, value):
         """Color from Green color slider has been changed"""
         self.__color.setGreen(int(value))
-        self.__updateColor(WColorPicker.__COLOR_GREEN)
+        self.__queueUpdateColor(WColorPicker.__COLOR_GREEN)
 
     def __colorBChanged(self, value):
         """Color from Blue color slider has been changed"""
         self.__color.setBlue(int(value))
-        self.__updateColor(WColorPicker.__COLOR_BLUE)
+        self.__queueUpdateColor(WColorPicker.__COLOR_BLUE)
 
     def __colorCChanged(self, value):
         """Color from Cyan color slider has been changed"""
         self.__color.setCmyk(int(value), self.__color.magenta(), self.__color.yellow(), self.__color.black())
-        self.__updateColor(WColorPicker.__COLOR_CYAN)
+        self.__queueUpdateColor(WColorPicker.__COLOR_CYAN)
 
     def __colorMChanged(self, value):
         """Color from Magenta color slider has been changed"""
         self.__color.setCmyk(self.__color.cyan(), int(value), self.__color.yellow(), self.__color.black())
-        self.__updateColor(WColorPicker.__COLOR_MAGENTA)
+        self.__queueUpdateColor(WColorPicker.__COLOR_MAGENTA)
 
     def __colorYChanged(self, value):
         """Color from Yellow color slider has been changed"""
         self.__color.setCmyk(self.__color.cyan(), self.__color.magenta(), int(value), self.__color.black())
-        self.__updateColor(WColorPicker.__COLOR_YELLOW)
+        self.__queueUpdateColor(WColorPicker.__COLOR_YELLOW)
 
     def __colorKChanged(self, value):
         """Color from Black color slider has been changed"""
         self.__color.setCmyk(self.__color.cyan(), self.__color.magenta(), self.__color.yellow(), int(value))
-        self.__updateColor(WColorPicker.__COLOR_BLACK)
+        self.__queueUpdateColor(WColorPicker.__COLOR_BLACK)
 
     def __colorHChanged(self, value):
         """Color from Hue color slider has been changed"""
         self.__color.setHsv(int(value), self.__color.saturation(), self.__color.value())
-        self.__updateColor(WColorPicker.__COLOR_HUE)
+        self.__queueUpdateColor(WColorPicker.__COLOR_HUE)
 
     def __colorSChanged(self, value):
         """Color from Saturation color slider has been changed"""
         self.__color.setHsv(self.__colorHue.hue(), int(value), self.__color.value())
-        self.__updateColor(WColorPicker.__COLOR_SATURATION)
+        self.__queueUpdateColor(WColorPicker.__COLOR_SATURATION)
 
     def __colorVChanged(self, value):
         """Color from Value color slider has been changed"""
         self.__color.setHsv(self.__colorHue.hue(), self.__color.saturation(), int(value))
-        self.__updateColor(WColorPicker.__COLOR_VALUE)
+        self.__queueUpdateColor(WColorPicker.__COLOR_VALUE)
 
     def __colorLChanged(self, value):
         """Color from Lightness color slider has been changed"""
         self.__color.setHsl(self.__colorHue.hue(), self.__color.saturation(), int(value))
-        self.__updateColor(WColorPicker.__COLOR_LIGHTNESS)
+        self.__queueUpdateColor(WColorPicker.__COLOR_LIGHTNESS)
 
     def __colorAChanged(self, value):
         """Color from Green color slider has been changed"""
         self.__color.setAlpha(int(value))
-        self.__updateColor(WColorPicker.__COLOR_ALPHA)
-
-    def __updateColor(self, updating=__COLOR_NONE):
-        """Update color interface to current color"""
-        if updating == WColorPicker.__COLOR_COMPLEMENTARY:
-            self.__colorHue = QColor.fromHsv(self.__color.hue(), 255, 255)
-        else:
-            self.__colorHue = self.__colorWheel.colorHue()
-
-        self.__colorComplementary.setColor(self.__color)
+        self.__queueUpdateColor(WColorPicker.__COLOR_ALPHA)
 
-        if updating != WColorPicker.__COLOR_WHEEL:
+    def __isComponentVisible(self, component):
+        """Return True if given `component` is visible, according to options"""
+        if component == WColorPicker.__COLOR_WHEEL:
+            # always updated: hue from color wheel is used by others components
+            return True
+        elif component == WColorPicker.__COLOR_COMPLEMENTARY:
+            return self.__optionShowColorWheel and self.__optionShowColorCombination != WColorComplementary.COLOR_COMBINATION_NONE
+        elif component in (WColorPicker.__COLOR_RED, WColorPicker.__COLOR_GREEN, WColorPicker.__COLOR_BLUE):
+            return self.__optionShowColorRGB
+        elif component in (WColorPicker.__COLOR_CYAN, WColorPicker.__COLOR_MAGENTA, WColorPicker.__COLOR_YELLOW, WColorPicker.__COLOR_BLACK):
+            return self.__optionShowColorCMYK
+        elif component in (WColorPicker.__COLOR_HUE, WColorPicker.__COLOR_SATURATION):
+            return self.__optionShowColorHSV or self.__optionShowColorHSL
+        elif component == WColorPicker.__COLOR_VALUE:
+            return self.__optionShowColorHSV
+        elif component == WColorPicker.__COLOR_LIGHTNESS:
+            return self.__optionShowColorHSL
+        elif component == WColorPicker.__COLOR_ALPHA:
+            return self.__optionShowColorAlpha
+        elif component == WColorPicker.__COLOR_CSSRGB:
+            return self.__optionShowColorCssRGB
+        return True
+
+    def __updateComponent(self, component):
+        """Update given `component` to current color"""
+        if component == WColorPicker.__COLOR_COMPLEMENTARY:
+            self.__colorComplementary.setColor(self.__color)
+        elif component == WColorPicker.__COLOR_WHEEL:
             self.__colorWheel.setColor(self.__color)
-        if updating != WColorPicker.__COLOR_RED:
+        elif component == WColorPicker.__COLOR_RED:
             self.__colorSliderRed.setValue(self.__color.red())
-        if updating != WColorPicker.__COLOR_GREEN:
+        elif component == WColorPicker.__COLOR_GREEN:
             self.__colorSliderGreen.setValue(self.__color.green())
-        if updating != WColorPicker.__COLOR_BLUE:
+        elif component == WColorPicker.__COLOR_BLUE:
             self.__colorSliderBlue.setValue(self.__color.blue())
-        if updating != WColorPicker.__COLOR_CYAN:
+        elif component == WColorPicker.__COLOR_CYAN:
             self.__colorSliderCyan.setValue(self.__color.cyan())
-        if updating != WColorPicker.__COLOR_MAGENTA:
+        elif component == WColorPicker.__COLOR_MAGENTA:
             self.__colorSliderMagenta.setValue(self.__color.magenta())
-        if updating != WColorPicker.__COLOR_YELLOW:
+        elif component == WColorPicker.__COLOR_YELLOW:
             self.__colorSliderYellow.setValue(self.__color.yellow())
-        if updating != WColorPicker.__COLOR_BLACK:
+        elif component == WColorPicker.__COLOR_BLACK:
             self.__colorSliderBlack.setValue(self.__color.black())
-        if updating != WColorPicker.__COLOR_HUE:
+        elif component == WColorPicker.__COLOR_HUE:
             self.__colorSliderHue.setValue(self.__color.hue())
-        if updating != WColorPicker.__COLOR_SATURATION:
+        elif component == WColorPicker.__COLOR_SATURATION:
             self.__colorSliderSaturation.setBgColor(self.__colorHue)
             self.__colorSliderSaturation.setValue(self.__color.saturation())
-        if updating != WColorPicker.__COLOR_VALUE:
+        elif component == WColorPicker.__COLOR_VALUE:
             self.__colorSliderValue.setBgColor(self.__colorHue)
             self.__colorSliderValue.setValue(self.__color.value())
-        if updating != WColorPicker.__COLOR_LIGHTNESS:
+        elif component == WColorPicker.__COLOR_LIGHTNESS:
             self.__colorSliderLightness.setBgColor(self.__colorHue)
             self.__colorSliderLightness.setValue(self.__color.lightness())
-        if updating != WColorPicker.__COLOR_ALPHA:
+        elif component == WColorPicker.__COLOR_ALPHA:
             self.__colorSliderAlpha.setFgGradient([(0, QColor(Qt.transparent)), (1, self.__colorHue)])
             self.__colorSliderAlpha.setValue(self.__color.alpha())
-        if updating != WColorPicker.__COLOR_CSSRGB:
+        elif component == WColorPicker.__COLOR_CSSRGB:
             self.__colorCssEdit.setColor(self.__color)
 
+    def __updateStaleComponents(self):
+        """Update components that are now visible and not updated with current color"""
+        for component in WColorPicker.__COMPONENTS:
+            if component in self.__staleComponents and self.__isComponentVisible(component):
+                self.__updateComponent(component)
+                self.__staleComponents.discard(component)
+
+    def __queueUpdateColor(self, updating):
+        """Color has been modified from mouse, update interface on next frame
+
+        Successive updates from the same component are coalesced
+        """
+        if self.__pendingUpdate is not None and self.__pendingUpdate != updating:
+            self.__applyPendingUpdate()
+
+        self.__pendingUpdate = updating
+        if not self.__timerUpdate.isActive():
+            self.__timerUpdate.start()
+
+    def __applyPendingUpdate(self):
+        """Apply pending update, if any"""
+        self.__timerUpdate.stop()
+        if self.__pendingUpdate is not None:
+            updating = self.__pendingUpdate
+            self.__pendingUpdate = None
+            self.__updateColor(updating)
+
+    def __updateColor(self, updating=__COLOR_NONE):
+        """Update color interface to current color
+
+        Only visible components are updated, hidden components are updated
+        when they become visible
+        """
+        if self.__pendingUpdate is not None:
+            # a coalesced update from another component is waiting, apply it first
+            self.__applyPendingUpdate()
+
+        if updating == WColorPicker.__COLOR_COMPLEMENTARY:
+            self.__colorHue = QColor.fromHsv(self.__color.hue(), 255, 255)
+        else:
+            self.__colorHue = self.__colorWheel.colorHue()
+
+        for component in WColorPicker.__COMPONENTS:
+            if component == updating and component != WColorPicker.__COLOR_COMPLEMENTARY:
+                # component that provides the color is already up to date
+                self.__staleComponents.discard(component)
+            elif self.__isComponentVisible(component):
+                self.__updateComponent(component)
+                self.__staleComponents.discard(component)
+            else:
+                self.__staleComponents.add(component)
+
         if self.__alphaAsColor or updating != WColorPicker.__COLOR_ALPHA:
             # when only alpha is modified, do not consider color is changed
             if updating == WColorPicker.__COLOR_NONE:
@@ -2789,6 +3124,8 @@ class WColorPicker(QWidget):
         if value == self.__color or not isinstance(value, QColor):
             return
 
+        # pending update must be applied with color it has been queued for
+        self.__applyPendingUpdate()
         self.__color = value
         self.__updateColor()
 
@@ -2875,6 +3212,7 @@ class WColorPicker(QWidget):
         self.__colorSliderRed.setVisible(self.__optionShowColorRGB)
         self.__colorSliderGreen.setVisible(self.__optionShowColorRGB)
         self.__colorSliderBlue.setVisible(self.__optionShowColorRGB)
+        self.__updateStaleComponents()
         self.__updateSize()
 
     def setOptionShowColorCMYK(self, value):
@@ -2889,6 +3227,7 @@ class WColorPicker(QWidget):
         self.__colorSliderMagenta.setVisible(self.__optionShowColorCMYK)
         self.__colorSliderYellow.setVisible(self.__optionShowColorCMYK)
         self.__colorSliderBlack.setVisible(self.__optionShowColorCMYK)
+        self.__updateStaleComponents()
         self.__updateSize()
 
     def setOptionShowColorHSV(self, value):
@@ -2903,6 +3242,7 @@ class WColorPicker(QWidget):
         self.__colorSliderSaturation.setVisible(self.__optionShowColorHSV or self.__optionShowColorHSL)
 
         self.__colorSliderValue.setVisible(self.__optionShowColorHSV)
+        self.__updateStaleComponents()
         self.__updateSize()
 
     def setOptionShowColorHSL(self, value):
@@ -2917,6 +3257,7 @@ class WColorPicker(QWidget):
         self.__colorSliderSaturation.setVisible(self.__optionShowColorHSV or self.__optionShowColorHSL)
 
         self.__colorSliderLightness.setVisible(self.__optionShowColorHSL)
+        self.__updateStaleComponents()
         self.__updateSize()
 
     def setOptionShowColorAlpha(self, value):
@@ -2928,6 +3269,7 @@ class WColorPicker(QWidget):
         self.__checkColorSliders()
 
         self.__colorSliderAlpha.setVisible(self.__optionShowColorAlpha)
+        self.__updateStaleComponents()
         self.__updateSize()
 
     def setOptionShowCssRgb(self, value):
@@ -2939,6 +3281,7 @@ class WColorPicker(QWidget):
         self.__checkColorSliders()
 
         self.__colorCssEdit.setVisible(self.__optionShowColorCssRGB)
+        self.__updateStaleComponents()
         self.__updateSize()
 
     def setOptionShowColorCombination(self, value):
@@ -2975,6 +3318,7 @@ class WColorPicker(QWidget):
             self.__optionShowColorCombination = value
 
         self.__colorComplementary.setMode(self.__optionShowColorCombination)
+        self.__updateStaleComponents()
         self.__updateSize()
 
     def setOptionShowColorPalette(self, value):
@@ -2998,6 +3342,7 @@ class WColorPicker(QWidget):
 
         self.__wContainerColorWheel.setVisible(self.__optionShowColorWheel)
         # self.__colorWheel.setVisible(self.__optionShowColorWheel)
+        self.__updateStaleComponents()
         self.__updateSize()
 
     def setOptionCompactUi(self, value):
@@ -3226,45 +3571,26 @@ class WColorPicker(QWidget):
 
     def optionLayout(self):
         """Return a list of current layout options status"""
-        returned = []
-        if self.__optionShowColorRGB:
-            returned.append('colorRGB')
-        if self.__optionShowColorCMYK:
-            returned.append('colorCMYK')
-        if self.__optionShowColorHSV:
-            returned.append('colorHSV')
-        if self.__optionShowColorHSL:
-            returned.append('colorHSL')
-        if self.__optionShowColorAlpha:
-            returned.append('colorAlpha')
-        if self.__optionShowColorCssRGB:
-            returned.append('colorCssRGB')
-        if self.__optionShowColorPalette:
-            returned.append('colorPalette')
-        if self.__optionShowColorWheel:
-            returned.append('colorWheel')
-        if self.__optionShowPreviewColor:
-            returned.append('colorPreview')
-
-        if self.__optionDisplayAsPctRGB:
-            returned.append('colorRGB%')
-        if self.__optionDisplayAsPctCMYK:
-            returned.append('colorCMYK%')
-        if self.__optionDisplayAsPctHSV:
-            returned.append('colorHSV%')
-        if self.__optionDisplayAsPctHSL:
-            returned.append('colorHSL%')
-        if self.__optionDisplayAsPctAlpha:
-            returned.append('colorAlpha%')
-
-        if self.__optionCompactUi:
-            returned.append('compactUi')
-
-        returned.append(f"colorCombination:{self.__optionShowColorCombination}")
-        returned.append(f"colorPalette:{self.__colorPalette.palette()}")
-        returned.append(f"layoutOrientation:{self.__optionOrientation}")
-
-        return returned
+        return ColorPickerLayout.encode({
+                'colorRGB': self.__optionShowColorRGB,
+                'colorCMYK': self.__optionShowColorCMYK,
+                'colorHSV': self.__optionShowColorHSV,
+                'colorHSL': self.__optionShowColorHSL,
+                'colorAlpha': self.__optionShowColorAlpha,
+                'colorCssRGB': self.__optionShowColorCssRGB,
+                'colorPalette': self.__optionShowColorPalette,
+                'colorWheel': self.__optionShowColorWheel,
+                'colorPreview': self.__optionShowPreviewColor,
+                'colorRGB%': self.__optionDisplayAsPctRGB,
+                'colorCMYK%': self.__optionDisplayAsPctCMYK,
+                'colorHSV%': self.__optionDisplayAsPctHSV,
+                'colorHSL%': self.__optionDisplayAsPctHSL,
+                'colorAlpha%': self.__optionDisplayAsPctAlpha,
+                'compactUi': self.__optionCompactUi,
+                'colorCombination': self.__optionShowColorCombination,
+                'colorPaletteName': self.__colorPalette.palette(),
+                'layoutOrientation': self.__optionOrientation
+            })
 
     def setOptionLayout(self, layout):
         """Set layout from given options
@@ -3297,36 +3623,34 @@ class WColorPicker(QWidget):
 
 
         """
-        if not (isinstance(layout, list) or isinstance(layout, tuple)):
-            raise EInvalidType('Given `layout` must be a <list> or <tuple>')
+        options = ColorPickerLayout.decode(layout)
 
         self.__inUpdate = True
 
-        self.setOptionShowColorRGB('colorRGB' in layout)
-        self.setOptionShowColorCMYK('colorCMYK' in layout)
-        self.setOptionShowColorHSV('colorHSV' in layout)
-        self.setOptionShowColorHSL('colorHSL' in layout)
-        self.setOptionShowColorAlpha('colorAlpha' in layout)
-        self.setOptionShowCssRgb('colorCssRGB' in layout)
-        self.setOptionShowColorPalette('colorPalette' in layout)
-        self.setOptionShowColorWheel('colorWheel' in layout)
-        self.setOptionShowPreviewColor('colorPreview' in layout)
-
-        self.setOptionDisplayAsPctColorRGB('colorRGB%' in layout)
-        self.setOptionDisplayAsPctColorCMYK('colorCMYK%' in layout)
-        self.setOptionDisplayAsPctColorHSV('colorHSV%' in layout)
-        self.setOptionDisplayAsPctColorHSL('colorHSL%' in layout)
-        self.setOptionDisplayAsPctColorAlpha('colorAlpha%' in layout)
-
-        self.setOptionCompactUi('compactUi' in layout)
-
-        for item in layout:
-            if r := re.match('colorPalette:(.*)', item, re.IGNORECASE):
-                self.setOptionColorPalette(r.groups()[0])
-            elif r := re.match(r'colorCombination:(\d)', item, re.IGNORECASE):
-                self.setOptionShowColorCombination(int(r.groups()[0]))
-            elif r := re.match(r'layoutOrientation:(\d)', item, re.IGNORECASE):
-                self.setOptionOrientation(int(r.groups()[0]))
+        self.setOptionShowColorRGB(options['colorRGB'])
+        self.setOptionShowColorCMYK(options['colorCMYK'])
+        self.setOptionShowColorHSV(options['colorHSV'])
+        self.setOptionShowColorHSL(options['colorHSL'])
+        self.setOptionShowColorAlpha(options['colorAlpha'])
+        self.setOptionShowCssRgb(options['colorCssRGB'])
+        self.setOptionShowColorPalette(options['colorPalette'])
+        self.setOptionShowColorWheel(options['colorWheel'])
+        self.setOptionShowPreviewColor(options['colorPreview'])
+
+        self.setOptionDisplayAsPctColorRGB(options['colorRGB%'])
+        self.setOptionDisplayAsPctColorCMYK(options['colorCMYK%'])
+        self.setOptionDisplayAsPctColorHSV(options['colorHSV%'])
+        self.setOptionDisplayAsPctColorHSL(options['colorHSL%'])
+        self.setOptionDisplayAsPctColorAlpha(options['colorAlpha%'])
+
+        self.setOptionCompactUi(options['compactUi'])
+
+        if options['colorPaletteName'] is not None:
+            self.setOptionColorPalette(options['colorPaletteName'])
+        if options['colorCombination'] is not None:
+            self.setOptionShowColorCombination(options['colorCombination'])
+        if options['layoutOrientation'] is not None:
+            self.setOptionOrientation(options['layoutOrientation'])
 
         self.__inUpdate = False
         self.__updateSize()
@@ -22,15 +22,37 @@
 # - WConsoleType:
 #       Information type for console output line
 #
+# - WConsoleLineQueue:
+#       Lines waiting to be flushed in console
+#
+# - WConsoleMixin:
+#       Features shared by WConsole and WConsoleView
+#
 # - WConsoleUserData:
 #       User data associated with an output line
 #
 # - WConsoleGutterArea:
 #       Widget to render console gutter
 #
+# - WConsoleView:
+#       Widget
+#       A virtualized console widget (model/view), for very large outputs
+#
+# - WConsoleBuffer:
+#       Ring buffer of console lines, with per type indexes
+#
+# - WConsoleModel:
+#       List model of console lines, used by WConsoleView
+#
+# - WConsoleItemDelegate:
+#       Render console lines in WConsoleView
+#
 # -----------------------------------------------------------------------------
 
 from enum import Enum
+from bisect import bisect_left
+from collections import deque
+from itertools import chain
 import re
 import html
 
@@ -43,6 +65,7 @@ from PyQt5.QtWidgets import (
     )
 
 from .wsearchinput import SearchFromPlainTextEdit
+from ..pktk import *
 
 
 class WConsoleType(Enum):
@@ -93,11 +116,211 @@ class WConsoleType(Enum):
         return WConsoleType.NORMAL
 
 
-class WConsole(QPlainTextEdit):
+class WConsoleLineQueue(QObject):
+    """Lines waiting to be flushed in a console
+
+    Lines can be queued from any thread: access to queue is protected by a
+    mutex; signal flushRequested is emitted from console thread once flush
+    delay is elapsed
+    """
+    linesQueued = Signal()          # new lines are waiting to be flushed in console
+    flushRequested = Signal()       # queued lines have to be flushed in console
+
+    def __init__(self, flushDelay, parent=None):
+        super(WConsoleLineQueue, self).__init__(parent)
+
+        # tuples (text, type, data)
+        self.__lines = deque()
+        self.__linesMutex = QMutex()
+
+        # timer used to flush queued lines
+        self.__timerFlush = QTimer(self)
+        self.__timerFlush.setSingleShot(True)
+        self.__timerFlush.setInterval(flushDelay)
+        self.__timerFlush.timeout.connect(self.flushRequested.emit)
+        # signal is queued, timer is always started from console thread
+        self.linesQueued.connect(self.__startFlushTimer, Qt.QueuedConnection)
+
+    def __startFlushTimer(self):
+        """Start timer to flush queued lines, if not already started"""
+        if not self.__timerFlush.isActive():
+            self.__timerFlush.start()
+
+    def append(self, text, type=WConsoleType.NORMAL, data=None):
+        """Queue lines from given `text`"""
+        self.__linesMutex.lock()
+        self.__lines.extend((line, type, data) for line in text.split("\n"))
+        self.__linesMutex.unlock()
+        self.linesQueued.emit()
+
+    def take(self):
+        """Return queued lines (list of tuple (text, type, data)) and clear queue"""
+        self.__timerFlush.stop()
+        self.__linesMutex.lock()
+        returned = list(self.__lines)
+        self.__lines.clear()
+        self.__linesMutex.unlock()
+        return returned
+
+    def setMaxSize(self, value):
+        """Set maximum number of queued lines (0 = unlimited)
+
+        Queue is bounded by console buffer size: lines that would be trimmed
+        from console are never flushed
+        """
+        self.__linesMutex.lock()
+        if value > 0:
+            self.__lines = deque(self.__lines, maxlen=value)
+        else:
+            self.__lines = deque(self.__lines)
+        self.__linesMutex.unlock()
+
+    def clear(self):
+        """Clear queued lines"""
+        self.__timerFlush.stop()
+        self.__linesMutex.lock()
+        self.__lines.clear()
+        self.__linesMutex.unlock()
+
+
+class WConsoleMixin(object):
+    """Features shared by WConsole and WConsoleView
+
+    - lines are queued by appendLine() and flushed asynchronously
+    - CTRL+WHEEL font size and filtered types options
+
+    Console must call _initConsole() from its constructor and implement:
+    - _flushLines(lines): add flushed lines (list of tuple (text, type, data))
+    - _setFilteredTypes(filteredTypes): apply filtered types (a <set>)
+    - _zoom(delta): zoom in (delta > 0) or out (delta < 0) font size
+    - optionFilteredTypes()
+    """
+
+    # delay (in milliseconds) before queued lines are flushed in console
+    __FLUSH_DELAY = 50
+
+    def _initConsole(self):
+        """Initialise shared properties"""
+        # allows key bindings
+        self.__optionWheelSetFontSize = True
+
+        # lines waiting to be flushed in console
+        self.__lineQueue = WConsoleLineQueue(WConsoleMixin.__FLUSH_DELAY, self)
+        self.__lineQueue.flushRequested.connect(self.flush)
+
+    def _setQueueMaxSize(self, value):
+        """Set maximum number of queued lines (0 = unlimited)"""
+        self.__lineQueue.setMaxSize(value)
+
+    def _clearQueue(self):
+        """Clear queued lines"""
+        self.__lineQueue.clear()
+
+    def wheelEvent(self, event):
+        """CTRL + wheel os used to zoom in/out font size"""
+        if self.__optionWheelSetFontSize and event.modifiers() == Qt.ControlModifier:
+            delta = event.angleDelta().y()
+            if delta != 0:
+                self._zoom(delta)
+        else:
+            super(WConsoleMixin, self).wheelEvent(event)
+
+    def optionAllowWheelSetFontSize(self):
+        """Return if CTRL+WHEEL allows to change font size"""
+        return self.__optionWheelSetFontSize
+
+    def setOptionAllowWheelSetFontSize(self, value):
+        """Set if CTRL+WHEEL allows to change font size"""
+        if isinstance(value, bool) and value != self.__optionWheelSetFontSize:
+            self.__optionWheelSetFontSize = value
+
+    def setOptionFilteredTypes(self, filteredTypes):
+        """Set list of filtered types"""
+        if isinstance(filteredTypes, list):
+            self._setFilteredTypes(set(filteredType for filteredType in filteredTypes if isinstance(filteredType, WConsoleType)))
+
+    def setOptionAddFilteredTypes(self, filteredTypes):
+        """Add filtered types
+
+        Given `filteredTypes` can be a <WConsoleType> or a <list>
+        """
+        if isinstance(filteredTypes, WConsoleType):
+            filteredTypes = [filteredTypes]
+
+        if isinstance(filteredTypes, list):
+            self._setFilteredTypes(set(self.optionFilteredTypes()).union(filteredType for filteredType in filteredTypes if isinstance(filteredType, WConsoleType)))
+
+    def setOptionRemoveFilteredTypes(self, filteredTypes):
+        """Remove filtered types
+
+        Given `filteredTypes` can be a <WConsoleType> or a <list>
+        """
+        if isinstance(filteredTypes, WConsoleType):
+            filteredTypes = [filteredTypes]
+
+        if isinstance(filteredTypes, list):
+            self._setFilteredTypes(set(self.optionFilteredTypes()).difference(filteredTypes))
+
+    def appendLine(self, text, type=WConsoleType.NORMAL, data=None):
+        """Append a new line to console
+
+        Given `type` is a WConsoleType value
+
+        Lines are queued and flushed in console asynchronously; method can be
+        called from any thread
+        """
+        if isinstance(text, list):
+            text = "\n".join(text)
+
+        self.__lineQueue.append(text, type, data)
+
+    def flush(self):
+        """Flush queued lines in console"""
+        lines = self.__lineQueue.take()
+        if len(lines) > 0:
+            self._flushLines(lines)
+
+
+class WConsole(WConsoleMixin, QPlainTextEdit):
     """A console output (no input...)"""
 
     __TYPE_COLOR_ALPHA = 30
 
+    __RE_ESCAPE = re.compile(r'([\*\$#])')
+
+    # characters allowed in color codes (#r#, #lr#, #FF0000#)
+    __COLOR_CODES = frozenset('rgbcmykw')
+    __COLOR_HEX = frozenset('ABCDEF0123456789')
+
+    # memoized html color names; key=color code, value=color name
+    __COLOR_NAMES = {}
+
+    __STYLE_COLORS = {
+            'r':  QColor("#de382b"),
+            'g':  QColor("#39b54a"),
+            'b':  QColor("#006fb8"),
+            'c':  QColor("#2cb5e9"),
+            'm':  QColor("#762671"),
+            'y':  QColor("#ffc706"),
+            'k':  QColor("#000000"),
+            'w':  QColor("#cccccc"),
+            'lr': QColor("#ff0000"),
+            'lg': QColor("#00ff00"),
+            'lb': QColor("#0000ff"),
+            'lc': QColor("#00ffff"),
+            'lm': QColor("#ff00ff"),
+            'ly': QColor("#ffff00"),
+            'lk': QColor("#808080"),
+            'lw': QColor("#ffffff")
+        }
+
+    __TYPE_COLORS = {
+            WConsoleType.VALID: QColor('#39b54a'),
+            WConsoleType.INFO: QColor('#006fb8'),
+            WConsoleType.WARNING: QColor('#ffc706'),
+            WConsoleType.ERROR: QColor('#de382b')
+        }
+
     @staticmethod
     def escape(text):
         """Escape characters used to format data in console:
@@ -105,7 +328,7 @@ class WConsole(QPlainTextEdit):
             '#'
 
         """
-        return re.sub(r'([\*\$#])', r'$\1', text)
+        return WConsole.__RE_ESCAPE.sub(r'$\1', text)
 
     @staticmethod
     def unescape(text):
@@ -113,38 +336,202 @@ class WConsole(QPlainTextEdit):
             '*'
             '#'
         """
-        return re.sub(r'(?:\$([\*\$#]))', r'\1', text)
+        position = text.find('$')
+        if position == -1:
+            return text
+
+        returned = []
+        start = 0
+        length = len(text)
+        while position != -1:
+            if position + 1 < length and text[position + 1] in '*$#':
+                returned.append(text[start:position])
+                # escaped character is kept as is
+                start = position + 1
+                position = text.find('$', position + 2)
+            else:
+                position = text.find('$', position + 1)
+        returned.append(text[start:])
+        return ''.join(returned)
+
+    @staticmethod
+    def __colorName(colorCode):
+        """Return html color name for given `colorCode`"""
+        if colorCode in WConsole.__COLOR_NAMES:
+            return WConsole.__COLOR_NAMES[colorCode]
+
+        if colorCode in WConsole.__STYLE_COLORS:
+            color = WConsole.__STYLE_COLORS[colorCode].name()
+        else:
+            color = QColor(f'#{colorCode}').name()
+        WConsole.__COLOR_NAMES[colorCode] = color
+        return color
+
+    @staticmethod
+    def __markerPositions(text, marker):
+        """Return positions of non escaped `marker` character in `text`"""
+        returned = []
+        position = text.find(marker)
+        while position != -1:
+            if position == 0 or text[position - 1] != '$':
+                returned.append(position)
+            position = text.find(marker, position + 1)
+        return returned
+
+    @staticmethod
+    def __colorCode(text, position):
+        """Return color code for color markup starting at `position`, None if there's no valid code"""
+        char = text[position + 1:position + 2]
+        if char == 'l':
+            char = text[position + 2:position + 3]
+            if char != '' and char in WConsole.__COLOR_CODES and text[position + 3:position + 4] == '#':
+                return f'l{char}'
+        elif char != '' and char in WConsole.__COLOR_CODES and text[position + 2:position + 3] == '#':
+            return char
+
+        if text[position + 7:position + 8] == '#' and WConsole.__COLOR_HEX.issuperset(text[position + 1:position + 7]):
+            return text[position + 1:position + 7]
+        return None
+
+    @staticmethod
+    def __formatLine(text):
+        """Return a HTML formatted text from a markdown like single line text
+
+        Text is scanned once to find non escaped markers, then html is built
+        """
+        if '*' not in text and '#' not in text and '$' not in text:
+            # no markup, nothing to format
+            return text
+
+        # key=position in text, value=tuple(html, number of replaced characters)
+        replacements = {}
+
+        # bold: '**' ... '**'
+        stars = WConsole.__markerPositions(text, '*')
+        nbStars = len(stars)
+        notBoldStars = []
+        index = 0
+        while index < nbStars:
+            position = stars[index]
+            if index + 3 < nbStars and stars[index + 1] == position + 1 and stars[index + 2] > position + 2 and stars[index + 3] == stars[index + 2] + 1:
+                replacements[position] = ('<b>', 2)
+                replacements[stars[index + 2]] = ('</b>', 2)
+                index += 4
+            else:
+                notBoldStars.append(position)
+                index += 1
+
+        # italic: '*' ... '*'
+        nbStars = len(notBoldStars)
+        index = 0
+        while index < nbStars:
+            position = notBoldStars[index]
+            if index + 1 < nbStars and notBoldStars[index + 1] > position + 1:
+                replacements[position] = ('<i>', 1)
+                replacements[notBoldStars[index + 1]] = ('</i>', 1)
+                index += 2
+            else:
+                index += 1
+
+        # color: '#code#' ... '#'
+        hashes = WConsole.__markerPositions(text, '#')
+        nbHashes = len(hashes)
+        index = 0
+        while index < nbHashes:
+            position = hashes[index]
+            colorCode = WConsole.__colorCode(text, position)
+            if colorCode is not None:
+                codeEnd = position + len(colorCode) + 1
+                closeIndex = index + 1
+                while closeIndex < nbHashes and hashes[closeIndex] <= codeEnd:
+                    closeIndex += 1
+
+                if closeIndex < nbHashes and hashes[closeIndex] > codeEnd + 1:
+                    replacements[position] = (f'<span style="color: {WConsole.__colorName(colorCode)}">', len(colorCode) + 2)
+                    replacements[hashes[closeIndex]] = ('</span>', 1)
+                    index = closeIndex + 1
+                    continue
+            # not a valid markup, continue search from next '#'
+            index += 1
+
+        if len(replacements) == 0:
+            return WConsole.unescape(text)
+
+        returned = []
+        start = 0
+        for position in sorted(replacements):
+            html, length = replacements[position]
+            returned.append(text[start:position])
+            returned.append(html)
+            start = position + length
+        returned.append(text[start:])
+
+        # html tags don't contain '$' and replaced markers are never preceded by
+        # '$': text can be unescaped once built
+        return WConsole.unescape(''.join(returned))
+
+    @staticmethod
+    def typeColor(type):
+        """Return color for given console `type`, None for WConsoleType.NORMAL"""
+        return WConsole.__TYPE_COLORS.get(type, None)
+
+    @staticmethod
+    def typeColorAlpha():
+        """Return alpha value used to render background of typed lines"""
+        return WConsole.__TYPE_COLOR_ALPHA
+
+    @staticmethod
+    def styleColors():
+        """Return dictionary of colors available for text formatting"""
+        return WConsole.__STYLE_COLORS
+
+    @staticmethod
+    def formatText(text):
+        """Return a list of HTML formatted text from a markdown like text
+
+        Given `text` can be a <str> (split on new lines) or a <list> of lines
+
+        Allows use of some 'Markdown':
+        **XXX**     => bold
+        *XXX*       => italic
+
+        #r#XXX#     => RED
+        #g#XXX#     => GREEN
+        #b#XXX#     => BLUE
+        #c#XXX#     => CYAN
+        #m#XXX#     => MAGENTA
+        #y#XXX#     => YELLOW
+        #k#XXX#     => BLACK
+        #w#XXX#     => WHITE
+
+        #lr#XXX#    => LIGHT RED
+        #lg#XXX#    => LIGHT GREEN
+        #lb#XXX#    => LIGHT BLUE
+        #lc#XXX#    => LIGHT CYAN
+        #lm#XXX#    => LIGHT MAGENTA
+        #ly#XXX#    => LIGHT YELLOW
+        #lk#XXX#    => LIGHT BLACK (GRAY)
+        #lw#XXX#    => LIGHT WHITE
+
+        #xxxxxx#XXX# => Color #xxxxxx
+        """
+        if isinstance(text, list):
+            texts = text
+        else:
+            texts = text.split("\n")
+            if '*' not in text and '#' not in text and '$' not in text:
+                # no markup in whole text, lines are not scanned
+                return texts
+
+        return [WConsole.__formatLine(text) for text in texts]
 
     def __init__(self, parent=None):
         super(WConsole, self).__init__(parent)
 
         self.setReadOnly(True)
 
-        self.__typeColors = {
-                WConsoleType.VALID: QColor('#39b54a'),
-                WConsoleType.INFO: QColor('#006fb8'),
-                WConsoleType.WARNING: QColor('#ffc706'),
-                WConsoleType.ERROR: QColor('#de382b')
-            }
-
-        self.__styleColors = {
-                'r':  QColor("#de382b"),
-                'g':  QColor("#39b54a"),
-                'b':  QColor("#006fb8"),
-                'c':  QColor("#2cb5e9"),
-                'm':  QColor("#762671"),
-                'y':  QColor("#ffc706"),
-                'k':  QColor("#000000"),
-                'w':  QColor("#cccccc"),
-                'lr': QColor("#ff0000"),
-                'lg': QColor("#00ff00"),
-                'lb': QColor("#0000ff"),
-                'lc': QColor("#00ffff"),
-                'lm': QColor("#ff00ff"),
-                'ly': QColor("#ffff00"),
-                'lk': QColor("#808080"),
-                'lw': QColor("#ffffff")
-            }
+        self.__typeColors = WConsole.__TYPE_COLORS
+        self.__styleColors = WConsole.__STYLE_COLORS
 
         # Gutter colors
         # maybe font size/type/style can be modified
@@ -154,15 +541,23 @@ class WConsole(QPlainTextEdit):
         # show gutter with Warning/Error/... message type
         self.__optionShowGutter = True
 
-        # allows key bindings
-        self.__optionWheelSetFontSize = True
-
         # filtered
-        self.__optionFilteredTypes = []
+        self.__optionFilteredTypes = set()
+
+        # per type line id; line id = block number + number of blocks removed
+        # from document (buffer size)
+        # key=WConsoleType, value=deque of line id
+        self.__typeLines = {}
+        self.__removedBlocks = 0
 
         # search object
         self.__search = SearchFromPlainTextEdit(self)
 
+        # first (empty) block of document has been used by a line or not
+        self.__firstBlockUsed = False
+
+        self._initConsole()
+
         # ---- Set default font (monospace, 10pt)
         font = QFont()
         font.setFamily("Monospace")
@@ -202,68 +597,6 @@ class WConsole(QPlainTextEdit):
         """Update viewport margins, taking in account gutter visibility"""
         self.setViewportMargins(self.gutterAreaWidth(), 0, 0, 0)
 
-    def __formatText(self, text):
-        """Return a HTML formatted text from a markdown like text
-
-        Allows use of some 'Markdown':
-        **XXX**     => bold
-        *XXX*       => italic
-
-        #r#XXX#     => RED
-        #g#XXX#     => GREEN
-        #b#XXX#     => BLUE
-        #c#XXX#     => CYAN
-        #m#XXX#     => MAGENTA
-        #y#XXX#     => YELLOW
-        #k#XXX#     => BLACK
-        #w#XXX#     => WHITE
-
-        #lr#XXX#    => LIGHT RED
-        #lg#XXX#    => LIGHT GREEN
-        #lb#XXX#    => LIGHT BLUE
-        #lc#XXX#    => LIGHT CYAN
-        #lm#XXX#    => LIGHT MAGENTA
-        #ly#XXX#    => LIGHT YELLOW
-        #lk#XXX#    => LIGHT BLACK (GRAY)
-        #lw#XXX#    => LIGHT WHITE
-
-        #xxxxxx#XXX# => Color #xxxxxx
-
-        [c:nn]XXX[/c] => color 'nn'
-        """
-        def replaceColor(regResult):
-            colorCode = regResult.groups()[0]
-            if colorCode in self.__styleColors:
-                color = self.__styleColors[colorCode].name()
-            else:
-                try:
-                    color = QColor(f'#{colorCode}').name()
-                except Exception as e:
-                    color = None
-            if color is None:
-                return regResult.groups()[1]
-            else:
-                return f'<span style="color: {color}">{regResult.groups()[1]}</span>'
-
-        def asBold(regResult):
-            return f'<b>{WConsole.unescape(regResult.groups()[0])}</b>'
-
-        def asItalic(regResult):
-            return f'<i>{WConsole.unescape(regResult.groups()[0])}</i>'
-
-        def formatText(text):
-            text = re.sub(r'(?<!\$)\*\*(([^*]|\$\*)+)(?<!\$)\*\*', r'<b>\1</b>', text)
-            text = re.sub(r'(?<!\$)\*(([^*]|\$\*)+)(?<!\$)\*', r'<i>\1</i>', text)
-            text = re.sub(r'(?<!\$)#(l?[rgbcmykw]|[A-F0-9]{6})(?<!\$)#(([^#]|\$#)+)(?<!\$)#', replaceColor, text)
-            return WConsole.unescape(text)
-
-        texts = text.split("\n")
-        returned = []
-        for text in texts:
-            returned.append(formatText(text))
-
-        return returned
-
     def __getFontMarkup(self, text, formatOptions):
         """Return an html formatted `text`, taking in account `formatOptions`"""
         options = []
@@ -287,21 +620,46 @@ class WConsole(QPlainTextEdit):
         """Return True if given `type` is filtered"""
         return (type in self.__optionFilteredTypes)
 
-    def __updateFilteredTypes(self):
-        """Update current filtered types"""
-        block = self.document().firstBlock()
+    def __updateRemovedBlocks(self, expectedBlockCount):
+        """Update number of blocks removed by document, according to
+        `expectedBlockCount` (number of blocks if nothing was removed)
 
-        while block.isValid():
-            colorLevel = WConsoleType.NORMAL
-
-            blockData = block.userData()
-            if blockData:
-                colorLevel = block.userData().type()
+        Removed lines are also removed from per type indexes
+        """
+        removed = expectedBlockCount - self.document().blockCount()
+        if removed > 0:
+            self.__removedBlocks += removed
+            for lines in self.__typeLines.values():
+                while len(lines) and lines[0] < self.__removedBlocks:
+                    lines.popleft()
 
-            block.setVisible(not self.__isTypeFiltered(colorLevel))
-            block = block.next()
+    def __updateFilteredTypes(self, types):
+        """Update visibility for lines of given `types`
 
-        self.update()
+        Only blocks of given types are processed
+        """
+        document = self.document()
+        firstPosition = None
+        lastPosition = None
+
+        for type in types:
+            if type not in self.__typeLines:
+                continue
+
+            visible = not self.__isTypeFiltered(type)
+            for lineId in self.__typeLines[type]:
+                block = document.findBlockByNumber(lineId - self.__removedBlocks)
+                if block.isValid() and block.isVisible() != visible:
+                    block.setVisible(visible)
+                    if firstPosition is None or block.position() < firstPosition:
+                        firstPosition = block.position()
+                    if lastPosition is None or block.position() + block.length() > lastPosition:
+                        lastPosition = block.position() + block.length()
+
+        if firstPosition is not None:
+            # a single layout update for all modified blocks
+            document.markContentsDirty(firstPosition, lastPosition - firstPosition)
+            self.viewport().update()
 
     # region: event overload ---------------------------------------------------
 
@@ -370,17 +728,6 @@ class WConsole(QPlainTextEdit):
             bottom = top + self.blockBoundingRect(block).height()
             blockNumber += 1
 
-    def wheelEvent(self, event):
-        """CTRL + wheel os used to zoom in/out font size"""
-        if self.__optionWheelSetFontSize and event.modifiers() == Qt.ControlModifier:
-            delta = event.angleDelta().y()
-            if delta < 0:
-                self.zoomOut()
-            elif delta > 0:
-                self.zoomIn()
-        else:
-            super(WConsole, self).wheelEvent(event)
-
     def paintEvent(self, event):
         """Customize painting for block types"""
 
@@ -450,15 +797,6 @@ class WConsole(QPlainTextEdit):
             self.__updateGutterAreaWidth()
             self.update()
 
-    def optionAllowWheelSetFontSize(self):
-        """Return if CTRL+WHEEL allows to change font size"""
-        return self.__optionWheelSetFontSize
-
-    def setOptionAllowWheelSetFontSize(self, value):
-        """Set if CTRL+WHEEL allows to change font size"""
-        if isinstance(value, bool) and value != self.__optionWheelSetFontSize:
-            self.__optionWheelSetFontSize = value
-
     def setHeight(self, numberOfRows=None):
         """Set height according to given number of rows"""
 
@@ -478,81 +816,104 @@ class WConsole(QPlainTextEdit):
 
     def setOptionBufferSize(self, value):
         """Set maximum buffer size for console"""
-        return self.setMaximumBlockCount(value)
+        # queue is bounded too: lines that would be trimmed are never formatted
+        self._setQueueMaxSize(value)
+        blockCount = self.document().blockCount()
+        self.setMaximumBlockCount(value)
+        self.__updateRemovedBlocks(blockCount)
 
     def optionFilteredTypes(self):
         """Return list of filtered types"""
-        return self.__optionFilteredTypes
-
-    def setOptionFilteredTypes(self, filteredTypes):
-        """Set list of filtered types"""
-        if isinstance(filteredTypes, list):
-            self.__optionFilteredTypes = []
-            self.setOptionAddFilteredTypes(filteredTypes)
-
-    def setOptionAddFilteredTypes(self, filteredTypes):
-        """Add filtered types
-
-        Given `filteredTypes` can be a <WConsoleType> or a <list>
-        """
-        if isinstance(filteredTypes, WConsoleType):
-            filteredTypes = [filteredTypes]
-
-        if isinstance(filteredTypes, list):
-            for filteredType in filteredTypes:
-                if isinstance(filteredType, WConsoleType) and filteredType not in self.__optionFilteredTypes:
-                    self.__optionFilteredTypes.append(filteredType)
-
-            self.__updateFilteredTypes()
-
-    def setOptionRemoveFilteredTypes(self, filteredTypes):
-        """Remove filtered types
-
-        Given `filteredTypes` can be a <WConsoleType> or a <list>
-        """
-        if isinstance(filteredTypes, WConsoleType):
-            filteredTypes = [filteredTypes]
-
-        if isinstance(filteredTypes, list):
-            current = self.__optionFilteredTypes
-            self.__optionFilteredTypes = []
-            for filteredType in current:
-                if filteredType not in filteredTypes:
-                    self.__optionFilteredTypes.append(filteredType)
-
-            self.__updateFilteredTypes()
+        return list(self.__optionFilteredTypes)
+
+    def _setFilteredTypes(self, filteredTypes):
+        """Apply given `filteredTypes` (a <set>)"""
+        changedTypes = filteredTypes.symmetric_difference(self.__optionFilteredTypes)
+        self.__optionFilteredTypes = filteredTypes
+        self.__updateFilteredTypes(changedTypes)
+
+    def _zoom(self, delta):
+        """Zoom in/out font size (works with point and pixel sized fonts)"""
+        if delta < 0:
+            self.zoomOut()
+        else:
+            self.zoomIn()
 
     # ---
 
-    def appendLine(self, text, type=WConsoleType.NORMAL, data=None):
-        """Append a new line to console
+    def _flushLines(self, lines):
+        """Add flushed `lines` in console
 
-        Given `type` is a WConsoleType value
+        All lines are added in a single edit block
         """
-        if isinstance(text, list):
-            text = "\n".join(text)
+        bufferSize = self.maximumBlockCount()
+        if bufferSize > 0 and len(lines) > bufferSize:
+            # trimmed lines don't need to be formatted
+            lines = lines[-bufferSize:]
+
+        formattedLines = WConsole.formatText([line[0] for line in lines])
+
+        scrollbar = self.verticalScrollBar()
+        atBottom = (scrollbar.value() == scrollbar.maximum())
+
+        document = self.document()
+        blockCount = document.blockCount()
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        cursor.movePosition(QTextCursor.End)
+        for index, line in enumerate(formattedLines):
+            if self.__firstBlockUsed:
+                cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+                blockCount += 1
+            else:
+                # document always have a first block, use it for first line
+                self.__firstBlockUsed = True
+            cursor.insertHtml(line)
+
+            type = lines[index][1]
+            block = cursor.block()
+            block.setUserData(WConsoleUserData(type, lines[index][2]))
+            block.setVisible(not self.__isTypeFiltered(type))
+
+            lineId = self.__removedBlocks + block.blockNumber()
+            if type in self.__typeLines:
+                self.__typeLines[type].append(lineId)
+            else:
+                self.__typeLines[type] = deque([lineId])
+        cursor.endEditBlock()
 
-        lines = self.__formatText(text)
-        for line in lines:
-            self.appendHtml(line)
+        # oldest blocks removed by document according to buffer size
+        self.__updateRemovedBlocks(blockCount)
 
-            lastBlock = self.document().lastBlock()
-            if lastBlock:
-                lastBlock.setUserData(WConsoleUserData(type, data))
-                lastBlock.setVisible(not self.__isTypeFiltered(type))
+        if atBottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def clear(self):
+        """Clear console content, including queued lines"""
+        self._clearQueue()
+        self.__typeLines = {}
+        self.__removedBlocks = 0
+        self.__firstBlockUsed = False
+        super(WConsole, self).clear()
 
     def append(self, text):
         """Append to current line"""
+        # ensure queued lines are added before
+        self.flush()
+
         if isinstance(text, list):
             text = "\n".join(text)
 
-        texts = self.__formatText(text)
+        texts = WConsole.formatText(text)
 
         for text in texts:
             self.moveCursor(QTextCursor.End)
             self.textCursor().insertHtml(text)
             self.moveCursor(QTextCursor.End)
 
+        if len(texts) > 0:
+            self.__firstBlockUsed = True
+
     # ---
 
     def search(self):
@@ -612,3 +973,582 @@ class WConsoleGutterArea(QWidget):
     def disconnect(self):
         """Disconnect area from console"""
         self.__console = None
+
+
+class WConsoleBuffer(object):
+    """A ring buffer of console lines
+
+    Each line is stored as a tuple (type, raw text, data) and is identified by
+    a unique, incremental, line id
+
+    Per type indexes (ordered line id) are maintained while lines are appended
+    and removed
+    """
+
+    def __init__(self, maxSize=0):
+        # lines, first item is line with id `__firstId`
+        self.__lines = deque()
+        self.__firstId = 0
+
+        # key=WConsoleType, value=deque of line id
+        self.__typeIndexes = {}
+
+        # 0 = no limit
+        self.__maxSize = 0
+        self.setMaxSize(maxSize)
+
+    def __len__(self):
+        """Return number of lines in buffer"""
+        return len(self.__lines)
+
+    def maxSize(self):
+        """Return maximum number of lines in buffer (0 = unlimited)"""
+        return self.__maxSize
+
+    def setMaxSize(self, value):
+        """Set maximum number of lines in buffer (0 = unlimited)
+
+        Oldest lines are removed if buffer contains more lines than given `value`
+        """
+        if not isinstance(value, int):
+            raise EInvalidType("Given `value` must be an <int>")
+        elif value < 0:
+            raise EInvalidValue("Given `value` must be greater or equal than 0")
+
+        self.__maxSize = value
+        if self.__maxSize > 0 and len(self.__lines) > self.__maxSize:
+            self.removeFirst(len(self.__lines) - self.__maxSize)
+
+    def firstId(self):
+        """Return id of first (oldest) line in buffer"""
+        return self.__firstId
+
+    def nextId(self):
+        """Return id that will be given to next appended line"""
+        return self.__firstId + len(self.__lines)
+
+    def line(self, id):
+        """Return line (type, raw text, data) for given `id`, None if not in buffer"""
+        index = id - self.__firstId
+        if 0 <= index < len(self.__lines):
+            return self.__lines[index]
+        return None
+
+    def idsByType(self, type):
+        """Return ordered line id for given `type`"""
+        if type in self.__typeIndexes:
+            return self.__typeIndexes[type]
+        return deque()
+
+    def types(self):
+        """Return types currently present in buffer"""
+        return [type for type, ids in self.__typeIndexes.items() if len(ids) > 0]
+
+    def append(self, text, type=WConsoleType.NORMAL, data=None):
+        """Append a line to buffer and return its id
+
+        Buffer size is not checked, caller have to call removeFirst() to keep
+        buffer size (this let caller knows which lines are removed)
+        """
+        id = self.__firstId + len(self.__lines)
+        self.__lines.append((type, text, data))
+
+        if type in self.__typeIndexes:
+            self.__typeIndexes[type].append(id)
+        else:
+            self.__typeIndexes[type] = deque([id])
+        return id
+
+    def removeFirst(self, count):
+        """Remove the `count` oldest lines from buffer"""
+        count = min(count, len(self.__lines))
+        for index in range(count):
+            type = self.__lines.popleft()[0]
+            # removed line is always the oldest line for its type
+            self.__typeIndexes[type].popleft()
+        self.__firstId += count
+
+    def clear(self):
+        """Clear buffer
+
+        Line id are not reset
+        """
+        self.__firstId += len(self.__lines)
+        self.__lines.clear()
+        self.__typeIndexes = {}
+
+
+class WConsoleModel(QAbstractListModel):
+    """A list model for console lines
+
+    Model rows are lines from a WConsoleBuffer, excluding lines for which type
+    is filtered
+    """
+    ROLE_TYPE = Qt.UserRole + 1
+    ROLE_DATA = Qt.UserRole + 2
+    ROLE_ID = Qt.UserRole + 3
+
+    # when filtered types are modified, rows are inserted/removed by ranges of
+    # consecutive rows; above this number of ranges, model is reset
+    __MAX_ROW_RANGES = 64
+
+    def __init__(self, parent=None):
+        super(WConsoleModel, self).__init__(parent)
+        self.__buffer = WConsoleBuffer()
+        self.__filteredTypes = set()
+
+        # when types are filtered, visible line id are stored in a list
+        # rows start from __visibleOffset (removed lines are not immediately
+        # removed from list)
+        self.__visibleIds = None
+        self.__visibleOffset = 0
+
+    def __idsByTypes(self, types):
+        """Return ordered line id for given `types`, merged from buffer's type indexes"""
+        if len(types) == 1:
+            return list(self.__buffer.idsByType(next(iter(types))))
+        # indexes are sorted runs: sort merges them (much faster than heapq.merge())
+        return sorted(chain(*[self.__buffer.idsByType(type) for type in types]))
+
+    def __updateVisibleIds(self):
+        """Rebuild list of visible line id from buffer's type indexes"""
+        if len(self.__filteredTypes) == 0:
+            self.__visibleIds = None
+        else:
+            self.__visibleIds = self.__idsByTypes([type for type in self.__buffer.types() if type not in self.__filteredTypes])
+        self.__visibleOffset = 0
+
+    def __rowRanges(self, ids, visible):
+        """Return ranges of consecutive rows for given ordered line `ids`
+
+        If `visible` is True, ids are visible and range row is row of first id,
+        otherwise range row is row where ids have to be inserted
+
+        Return a list of tuple (row, list of id), ordered by row
+        Return None if there's more than __MAX_ROW_RANGES ranges
+        """
+        returned = []
+        visibleIds = self.__visibleIds
+        row = 0
+        index = 0
+        while index < len(ids):
+            if len(returned) == WConsoleModel.__MAX_ROW_RANGES:
+                return None
+
+            row = bisect_left(visibleIds, ids[index], row)
+            if visible:
+                # ids are a subset of visible ids: if n-th id is on n-th row
+                # from range row, all ids before are on consecutive rows
+                length = 1
+                maxLength = min(len(ids) - index, len(visibleIds) - row)
+                while length < maxLength:
+                    middle = (length + maxLength + 1) // 2
+                    if visibleIds[row + middle - 1] == ids[index + middle - 1]:
+                        length = middle
+                    else:
+                        maxLength = middle - 1
+            elif row < len(visibleIds):
+                # all ids lower than next visible id are inserted at same row
+                length = bisect_left(ids, visibleIds[row], index) - index
+            else:
+                length = len(ids) - index
+
+            returned.append((row, ids[index:index + length]))
+            index += length
+        return returned
+
+    def __removeFirstLines(self, count):
+        """Remove the `count` oldest lines"""
+        if self.__visibleIds is None:
+            removedRows = count
+        else:
+            lastRemovedId = self.__buffer.firstId() + count
+            removedRows = 0
+            while self.__visibleOffset + removedRows < len(self.__visibleIds) and self.__visibleIds[self.__visibleOffset + removedRows] < lastRemovedId:
+                removedRows += 1
+
+        if removedRows > 0:
+            self.beginRemoveRows(QModelIndex(), 0, removedRows - 1)
+        self.__buffer.removeFirst(count)
+        if self.__visibleIds is not None:
+            self.__visibleOffset += removedRows
+            if self.__visibleOffset > len(self.__visibleIds) // 2:
+                # compact list from time to time
+                self.__visibleIds = self.__visibleIds[self.__visibleOffset:]
+                self.__visibleOffset = 0
+        if removedRows > 0:
+            self.endRemoveRows()
+
+    def __rowId(self, row):
+        """Return line id for given `row`"""
+        if self.__visibleIds is None:
+            return self.__buffer.firstId() + row
+        return self.__visibleIds[self.__visibleOffset + row]
+
+    def rowCount(self, parent=QModelIndex()):
+        """Return number of visible lines"""
+        if parent.isValid():
+            return 0
+        elif self.__visibleIds is None:
+            return len(self.__buffer)
+        return len(self.__visibleIds) - self.__visibleOffset
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Return data for given index"""
+        if not index.isValid():
+            return None
+
+        id = self.__rowId(index.row())
+        line = self.__buffer.line(id)
+        if line is None:
+            return None
+        elif role == Qt.DisplayRole:
+            return line[1]
+        elif role == WConsoleModel.ROLE_TYPE:
+            return line[0]
+        elif role == WConsoleModel.ROLE_DATA:
+            return line[2]
+        elif role == WConsoleModel.ROLE_ID:
+            return id
+        return None
+
+    def buffer(self):
+        """Return buffer used by model"""
+        return self.__buffer
+
+    def maxSize(self):
+        """Return maximum number of lines (0 = unlimited)"""
+        return self.__buffer.maxSize()
+
+    def setMaxSize(self, value):
+        """Set maximum number of lines (0 = unlimited)"""
+        if isinstance(value, int) and value > 0 and len(self.__buffer) > value:
+            self.__removeFirstLines(len(self.__buffer) - value)
+        self.__buffer.setMaxSize(value)
+
+    def filteredTypes(self):
+        """Return filtered types, as a <set>"""
+        return set(self.__filteredTypes)
+
+    def setFilteredTypes(self, filteredTypes):
+        """Set filtered types
+
+        Given `filteredTypes` is a <set> or a <list> of WConsoleType
+
+        Only lines of modified types are processed: their rows are removed or
+        inserted
+        """
+        filteredTypes = set(filteredTypes)
+        if filteredTypes == self.__filteredTypes:
+            return
+
+        hiddenTypes = filteredTypes.difference(self.__filteredTypes)
+        shownTypes = self.__filteredTypes.difference(filteredTypes)
+        self.__filteredTypes = filteredTypes
+
+        if self.__visibleIds is None:
+            self.__visibleIds = list(range(self.__buffer.firstId(), self.__buffer.nextId()))
+        elif self.__visibleOffset > 0:
+            self.__visibleIds = self.__visibleIds[self.__visibleOffset:]
+        self.__visibleOffset = 0
+
+        rowRanges = self.__rowRanges(self.__idsByTypes(hiddenTypes), True)
+        if rowRanges is None:
+            self.beginResetModel()
+            self.__updateVisibleIds()
+            self.endResetModel()
+            return
+
+        # process ranges from last to first: rows of previous ranges are not modified
+        for row, ids in reversed(rowRanges):
+            self.beginRemoveRows(QModelIndex(), row, row + len(ids) - 1)
+            del self.__visibleIds[row:row + len(ids)]
+            self.endRemoveRows()
+
+        rowRanges = self.__rowRanges(self.__idsByTypes(shownTypes), False)
+        if rowRanges is None:
+            self.beginResetModel()
+            self.__updateVisibleIds()
+            self.endResetModel()
+            return
+
+        for row, ids in reversed(rowRanges):
+            self.beginInsertRows(QModelIndex(), row, row + len(ids) - 1)
+            self.__visibleIds[row:row] = ids
+            self.endInsertRows()
+
+        if len(self.__filteredTypes) == 0:
+            # all lines are visible
+            self.__visibleIds = None
+
+    def appendLines(self, lines):
+        """Append lines to model
+
+        Given `lines` is a list of tuple (raw text, type, data)
+        Oldest lines are removed if buffer maximum size is reached
+        """
+        maxSize = self.__buffer.maxSize()
+        if maxSize > 0:
+            if len(lines) > maxSize:
+                lines = lines[-maxSize:]
+            removedCount = len(self.__buffer) + len(lines) - maxSize
+        else:
+            removedCount = 0
+
+        if removedCount > 0:
+            self.__removeFirstLines(removedCount)
+
+        addedLines = [line for line in lines if line[1] not in self.__filteredTypes]
+        if len(addedLines) == 0:
+            for line in lines:
+                self.__buffer.append(*line)
+            return
+
+        rowCount = self.rowCount()
+        self.beginInsertRows(QModelIndex(), rowCount, rowCount + len(addedLines) - 1)
+        for line in lines:
+            id = self.__buffer.append(*line)
+            if self.__visibleIds is not None and line[1] not in self.__filteredTypes:
+                self.__visibleIds.append(id)
+        self.endInsertRows()
+
+    def clear(self):
+        """Clear all lines"""
+        self.beginResetModel()
+        self.__buffer.clear()
+        self.__updateVisibleIds()
+        self.endResetModel()
+
+
+class WConsoleItemDelegate(QStyledItemDelegate):
+    """Render console lines: gutter, type background and formatted text
+
+    Formatted text for recently rendered lines is cached
+    """
+    __CACHE_SIZE = 1024
+
+    def __init__(self, parent=None):
+        super(WConsoleItemDelegate, self).__init__(parent)
+        self.__gutterWidth = 0
+
+        # key=line id, value=QStaticText
+        self.__cache = {}
+
+    def __staticText(self, id, text):
+        """Return a QStaticText for given line"""
+        if id in self.__cache:
+            return self.__cache[id]
+
+        if len(self.__cache) >= WConsoleItemDelegate.__CACHE_SIZE:
+            # oldest rendered lines are removed first
+            for key in list(self.__cache.keys())[:WConsoleItemDelegate.__CACHE_SIZE // 4]:
+                self.__cache.pop(key)
+
+        staticText = QStaticText(WConsole.formatText(text)[0])
+        staticText.setTextFormat(Qt.RichText)
+        staticText.setTextWidth(-1)
+        self.__cache[id] = staticText
+        return staticText
+
+    def gutterWidth(self):
+        """Return width of gutter"""
+        return self.__gutterWidth
+
+    def setGutterWidth(self, value):
+        """Set width of gutter (0 = no gutter)"""
+        self.__gutterWidth = value
+
+    def clearCache(self):
+        """Clear formatted text cache"""
+        self.__cache = {}
+
+    def paint(self, painter, option, index):
+        """Paint line"""
+        rect = option.rect
+        type = index.data(WConsoleModel.ROLE_TYPE)
+        color = WConsole.typeColor(type)
+
+        painter.save()
+        if self.__gutterWidth > 0:
+            painter.fillRect(QRect(rect.left(), rect.top(), self.__gutterWidth, rect.height()), QColor('#282c34'))
+
+        if color is not None:
+            if self.__gutterWidth > 0:
+                dx = self.__gutterWidth // 2
+                radius = (option.fontMetrics.height() // 2 - 4) // 2
+                painter.setRenderHint(QPainter.Antialiasing)
+                painter.setPen(QPen(Qt.transparent))
+                painter.setBrush(QBrush(color))
+                painter.drawEllipse(QPoint(rect.left() + dx, rect.top() + rect.height() // 2), radius, radius)
+
+            color = QColor(color)
+            color.setAlpha(WConsole.typeColorAlpha())
+            painter.fillRect(rect, QBrush(color))
+
+        if option.state & QStyle.State_Selected:
+            color = QColor(option.palette.color(QPalette.Highlight))
+            color.setAlpha(WConsole.typeColorAlpha() * 2)
+            painter.fillRect(rect, QBrush(color))
+
+        painter.setFont(option.font)
+        painter.setPen(option.palette.color(QPalette.Text))
+        painter.drawStaticText(rect.left() + self.__gutterWidth + 4, rect.top(), self.__staticText(index.data(WConsoleModel.ROLE_ID), index.data(Qt.DisplayRole)))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        """All lines have the same height"""
+        return QSize(option.rect.width(), option.fontMetrics.lineSpacing())
+
+
+class WConsoleView(WConsoleMixin, QTableView):
+    """A virtualized console output (no input...)
+
+    An alternative to WConsole for very large logs: lines are stored in a ring
+    buffer (type, raw text, data) and only visible rows are rendered
+
+    Lines are rendered on a single row (no wrap)
+
+    A single column table is used rather than a list view: rows have a fixed
+    height defined from vertical header (row position is computed from row
+    number) while a list view layout query model for each row, which is slow
+    for a python model with more than 100000 rows
+    """
+
+    def __init__(self, parent=None):
+        super(WConsoleView, self).__init__(parent)
+
+        self.__model = WConsoleModel(self)
+        self.__delegate = WConsoleItemDelegate(self)
+        self.setModel(self.__model)
+        self.setItemDelegate(self.__delegate)
+
+        # all rows have the same height, defined from font
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.horizontalHeader().setVisible(False)
+        self.horizontalHeader().setStretchLastSection(True)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+
+        # show gutter with Warning/Error/... message type
+        self.__optionShowGutter = True
+
+        self._initConsole()
+
+        # ---- Set default font (monospace, 10pt)
+        font = QFont()
+        font.setFamily("Monospace")
+        font.setFixedPitch(True)
+        font.setPointSize(10)
+        self.setFont(font)
+
+        self.__updateRowHeight()
+        self.__updateGutterWidth()
+
+        styleColors = WConsole.styleColors()
+        self.setStyleSheet(f"WConsoleView {{ background: {styleColors['k'].name()}; color: {styleColors['w'].name()};}}")
+
+    def __updateRowHeight(self):
+        """Update rows height according to font"""
+        lineSpacing = self.fontMetrics().lineSpacing()
+        self.verticalHeader().setMinimumSectionSize(lineSpacing)
+        self.verticalHeader().setDefaultSectionSize(lineSpacing)
+
+    def __updateGutterWidth(self):
+        """Update gutter width according to font and gutter visibility"""
+        if self.__optionShowGutter:
+            self.__delegate.setGutterWidth(3 + self.fontMetrics().width('9') * 2)
+        else:
+            self.__delegate.setGutterWidth(0)
+        self.__delegate.clearCache()
+        self.viewport().update()
+
+    def changeEvent(self, event):
+        """Font is changed, update gutter"""
+        super(WConsoleView, self).changeEvent(event)
+        if event.type() == QEvent.FontChange:
+            self.__updateRowHeight()
+            self.__updateGutterWidth()
+
+    def model(self):
+        """Return console model"""
+        return self.__model
+
+    def optionShowGutter(self):
+        """Return if gutter is visible or not"""
+        return self.__optionShowGutter
+
+    def setOptionShowGutter(self, value):
+        """Set if gutter is visible or not"""
+        if isinstance(value, bool) and value != self.__optionShowGutter:
+            self.__optionShowGutter = value
+            self.__updateGutterWidth()
+
+    def setHeight(self, numberOfRows=None):
+        """Set height according to given number of rows"""
+        if numberOfRows is None:
+            self.setMinimumHeight(0)
+            self.setMaximumHeight(16777215)
+        elif isinstance(numberOfRows, int) and numberOfRows > 0:
+            margins = self.contentsMargins()
+            self.setFixedHeight(self.fontMetrics().lineSpacing() * numberOfRows + self.frameWidth() * 2 + margins.top() + margins.bottom())
+
+    def optionBufferSize(self):
+        """Return maximum buffer size for console"""
+        return self.__model.maxSize()
+
+    def setOptionBufferSize(self, value):
+        """Set maximum buffer size for console"""
+        self._setQueueMaxSize(value)
+        self.__model.setMaxSize(value)
+
+    def optionFilteredTypes(self):
+        """Return list of filtered types"""
+        return list(self.__model.filteredTypes())
+
+    def _setFilteredTypes(self, filteredTypes):
+        """Apply given `filteredTypes` (a <set>)"""
+        self.__model.setFilteredTypes(filteredTypes)
+
+    def _zoom(self, delta):
+        """Zoom in/out font size
+
+        Font size unit (point or pixel) is kept
+        """
+        font = self.font()
+        if font.pointSize() > 0:
+            size = font.pointSize()
+            setSize = font.setPointSize
+        else:
+            size = font.pixelSize()
+            setSize = font.setPixelSize
+
+        if delta < 0 and size > 1:
+            setSize(size - 1)
+        elif delta > 0:
+            setSize(size + 1)
+        else:
+            return
+        self.setFont(font)
+
+    # ---
+
+    def _flushLines(self, lines):
+        """Add flushed `lines` in console"""
+        scrollbar = self.verticalScrollBar()
+        atBottom = (scrollbar.value() == scrollbar.maximum())
+
+        self.__model.appendLines(lines)
+
+        if atBottom:
+            self.scrollToBottom()
+
+    def clear(self):
+        """Clear console content, including queued lines"""
+        self._clearQueue()
+        self.__model.clear()
+        self.__delegate.clearCache()
@@ -46,6 +46,7 @@ from ..modules.utils import replaceLineEditClearButton
 from ..modules.imgutils import (buildIcon, checkerBoardBrush)
 from ..modules.ekrita import EKritaNode
 from ..modules.iconsizes import IconSizes
+from ..modules.uitheme import UITheme
 from .wstandardcolorselector import WStandardColorSelector
 from ..pktk import *
 
@@ -211,16 +212,16 @@ class DocNodesModel(QAbstractItemModel):
         if role == Qt.DecorationRole:
             if index.column() == DocNodesModel.COLNUM_ICON_VISIBLE:
                 if item.visible():
-                    return QIcon(':/pktk/images/normal/visibility_on')
+                    return UITheme.icon(':/pktk/images/normal/visibility_on')
                 else:
-                    return QIcon(':/pktk/images/disabled/visibility_off')
+                    return UITheme.icon(':/pktk/images/disabled/visibility_off')
             elif index.column() == DocNodesModel.COLNUM_ICON_TYPE:
                 return item.icon()
             elif index.column() == DocNodesModel.COLNUM_ICON_PINNED:
                 if item.isPinnedToTimeline():
-                    return QIcon(':/pktk/images/normal/pinned')
+                    return UITheme.icon(':/pktk/images/normal/pinned')
                 else:
-                    return QIcon(':/pktk/images/disabled/pinned')
+                    return UITheme.icon(':/pktk/images/disabled/pinned')
             elif index.column() == DocNodesModel.COLNUM_ICON_ANIMATED:
                 # ideally:
                 #   - no animation: return None
@@ -228,9 +229,9 @@ class DocNodesModel(QAbstractItemModel):
                 #   - animated + onion skin ON: return Krita.instance().icon('onionOn')
                 # But currently can't determinate if onion skin is active or not
                 if item.animated():
-                    return QIcon(':/pktk/images/normal/animation')
+                    return UITheme.icon(':/pktk/images/normal/animation')
                 else:
-                    return QIcon(':/pktk/images/disabled/animation')
+                    return UITheme.icon(':/pktk/images/disabled/animation')
             elif index.column() == DocNodesModel.COLNUM_ICON_LOCK:
                 if item.locked():
                     return Krita.instance().icon('layer-locked')
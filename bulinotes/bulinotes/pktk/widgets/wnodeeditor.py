@@ -33,17 +33,18 @@
 #
 # -----------------------------------------------------------------------------
 
+import functools
 import math
 import json
 import os.path
-import hashlib
+import zlib
 
 from PyQt5.Qt import *
 from PyQt5.QtCore import (
         pyqtSignal as Signal
     )
 
-from ..modules.imgutils import (buildIcon, paintOpaqueAsColor)
+from ..modules.imgutils import (buildIcon, paintOpaqueAsColor, ProceduralCache)
 from ..modules.utils import (JsonQObjectEncoder, JsonQObjectDecoder, Debug)
 from ..pktk import *
 
@@ -61,6 +62,91 @@ class NodeEditorLink(QObject):
     pass
 
 
+# ------------------------------------------------------------------------------
+
+class NodeEditorSpatialIndex(object):
+    """A uniform grid spatial index
+
+    Allows to quickly retrieve items for which bounding rect intersects a given
+    area, without having to check all items
+    """
+
+    def __init__(self, cellSize=256):
+        # size (in pixels) of a grid cell
+        self.__cellSize = cellSize
+
+        # grid cells
+        # - key: tuple (column, row)
+        # - value: items in cell (dictionary used as an ordered set)
+        self.__cells = {}
+
+        # indexed items
+        # - key: item
+        # - value: tuple (bounding rect, list of cells)
+        self.__items = {}
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __contains__(self, item):
+        return item in self.__items
+
+    def __cellsFromRect(self, rect):
+        """Return list of cells covered by given `rect`"""
+        left = math.floor(rect.left()/self.__cellSize)
+        right = math.floor(rect.right()/self.__cellSize)
+        top = math.floor(rect.top()/self.__cellSize)
+        bottom = math.floor(rect.bottom()/self.__cellSize)
+        return [(column, row) for column in range(left, right+1) for row in range(top, bottom+1)]
+
+    def insert(self, item, rect):
+        """Insert (or update) `item` in index, with given bounding `rect` (in scene coordinates)"""
+        self.remove(item)
+
+        cells = self.__cellsFromRect(rect)
+        for cell in cells:
+            self.__cells.setdefault(cell, {})[item] = None
+
+        self.__items[item] = (QRectF(rect), cells)
+
+    def remove(self, item):
+        """Remove `item` from index, if indexed"""
+        if item in self.__items:
+            rect, cells = self.__items.pop(item)
+            for cell in cells:
+                self.__cells[cell].pop(item, None)
+                if len(self.__cells[cell]) == 0:
+                    self.__cells.pop(cell)
+
+    def clear(self):
+        """Remove all items from index"""
+        self.__cells = {}
+        self.__items = {}
+
+    def rect(self, item):
+        """Return indexed bounding rect for item, None if item is not indexed"""
+        if item in self.__items:
+            return self.__items[item][0]
+        return None
+
+    def query(self, rect):
+        """Return list of items for which bounding rect intersects given `rect`
+
+        Note: bounding rect with a null width or height (vertical/horizontal line)
+              are considered
+        """
+        returned = {}
+        for cell in self.__cellsFromRect(rect):
+            if cell in self.__cells:
+                for item in self.__cells[cell]:
+                    if item not in returned:
+                        itemRect = self.__items[item][0]
+                        if (itemRect.left() <= rect.right() and rect.left() <= itemRect.right() and
+                           itemRect.top() <= rect.bottom() and rect.top() <= itemRect.bottom()):
+                            returned[item] = None
+        return list(returned)
+
+
 # ------------------------------------------------------------------------------
 
 class NodeEditorScene(QObject):
@@ -77,6 +163,12 @@ class NodeEditorScene(QObject):
     CONNECTOR_ZINDEX = 1.0
     WIDGET_ZINDEX = 0.5
 
+    # level of detail thresholds for rendering
+    # - below LOD_SIMPLIFIED: title texts, title buttons and node's widgets are not rendered
+    # - below LOD_MINIMAL: nodes are rendered as filled rect, links as straight lines, connectors are not rendered
+    LOD_SIMPLIFIED = 0.6
+    LOD_MINIMAL = 0.35
+
     SELECTION_NODES = 0b00000001
     SELECTION_LINKS = 0b00000010
     SELECTION_ALL =   0b00000011
@@ -92,6 +184,9 @@ class NodeEditorScene(QObject):
     IMPORT_FILE_MISSING_FORMAT_IDENTIFIER =  0b00010000
     IMPORT_FILE_MISSING_SCENE_DEFINITION =   0b00100000
 
+    # header for binary format: compressed compact json
+    BINARY_HEADER = b'PKTKNES\x01'
+
     # declare signals
     sizeChanged = Signal(QSize, QSize)                       # scene size changed: newSize, oldSize
 
@@ -105,6 +200,7 @@ class NodeEditorScene(QObject):
     nodeRemoved = Signal(NodeEditorNode)                     # a node has been removed: removed node
     linkAdded = Signal(NodeEditorLink)                       # a new link has been added: added link
     nodeOutputUpdated = Signal(NodeEditorNode, dict)         # a node output has been updated: emitted even if eventOutput  is disabled (Node + dict(connector, value))
+    evaluationCycleDetected = Signal(list)                   # a cycle has been found while propagating outputs: list of nodes in (or after) cycle
     linkRemoved = Signal(NodeEditorLink)                     # a link has been removed: removed link
 
     selectionChanged = Signal()                              # selection has changed
@@ -139,14 +235,56 @@ class NodeEditorScene(QObject):
 
         palette = QApplication.palette()
 
-        # list of nodes
-        self.__nodes = []
-        self.__links = []
-
-        # hash of current selected nodes
-        self.__selectedNodesHash = ''
-        # hash of current selected links
-        self.__selectedLinksHash = ''
+        # nodes & links in scene
+        # dictionaries are used as ordered sets (keep insertion order, O(1) lookup)
+        # - nodes: key=node, value=None
+        # - links: key=link, value=tuple of indexed (connector, node)
+        self.__nodes = {}
+        self.__links = {}
+
+        # indexes, maintained by addNode()/removeNode()/addLink()/removeLink()
+        # - node id => node
+        # - connector => links (as ordered set)
+        # - node => links (as ordered set)
+        self.__nodesById = {}
+        self.__linksByConnector = {}
+        self.__linksByNode = {}
+
+        # output connectors for which value has been modified but not yet
+        # propagated to linked input connectors (used as an ordered set)
+        self.__dirtyOutputs = {}
+
+        # input connectors modified while outputs are propagated, for which
+        # node has not been notified yet
+        # key=node, value=input connectors (as ordered set)
+        self.__dirtyInputs = {}
+
+        # flag set to True while dirty outputs are propagated
+        self.__inEvaluation = False
+
+        # propagation is deferred to next event loop iteration, allowing to
+        # coalesce all modifications made in between
+        self.__timerEvaluation = QTimer(self)
+        self.__timerEvaluation.setSingleShot(True)
+        self.__timerEvaluation.setInterval(0)
+        self.__timerEvaluation.timeout.connect(self.__evaluate)
+
+        # spatial index for nodes & links, used to find items from a position/area
+        # items for which geometry has been modified are stored in a 'dirty'
+        # ordered set and only re-indexed when a query is made
+        self.__spatialIndex = NodeEditorSpatialIndex()
+        self.__spatialIndexDirty = {}
+
+        # selected nodes & links (as ordered sets), maintained when item
+        # selection state is modified
+        self.__selectedNodes = {}
+        self.__selectedLinks = {}
+        # selected nodes & links on last selection check
+        self.__checkedSelectedNodes = frozenset()
+        self.__checkedSelectedLinks = frozenset()
+        # selection perimeter (SELECTION_NODES, SELECTION_LINKS) modified since
+        # last selection check
+        self.__selectionModified = 0
 
         # current linking item (link currently created/updated)
         self.__linkingItem = None
@@ -267,32 +405,61 @@ class NodeEditorScene(QObject):
         # define option to determinate if node's close button are visible
         self.__optionNodeCloseButtonVisible = False
 
+        # default values changes are forwarded to nodes & links by scene, rather
+        # than having all nodes & links connected to scene signals
+        for signal, method in ((self.defaultNodeTitleColorChanged, NodeEditorNode._defaultSceneNodeTitleColorChanged),
+                               (self.defaultNodeTitleBgColorChanged, NodeEditorNode._defaultSceneNodeTitleBgColorChanged),
+                               (self.defaultNodeTitleSelectedColorChanged, NodeEditorNode._defaultSceneNodeTitleSelectedColorChanged),
+                               (self.defaultNodeTitleSelectedBgColorChanged, NodeEditorNode._defaultSceneNodeTitleSelectedBgColorChanged),
+                               (self.defaultNodeBgColorChanged, NodeEditorNode._defaultSceneNodeBgColorChanged),
+                               (self.defaultNodeSelectedBgColorChanged, NodeEditorNode._defaultSceneNodeSelectedBgColorChanged),
+                               (self.defaultNodeBorderRadiusChanged, NodeEditorNode._defaultSceneNodeBorderRadiusChanged),
+                               (self.defaultNodeBorderSizeChanged, NodeEditorNode._defaultSceneNodeBorderSizeChanged),
+                               (self.defaultNodePaddingChanged, NodeEditorNode._defaultSceneNodePaddingChanged),
+                               (self.defaultConnectorRadiusChanged, NodeEditorNode._defaultSceneConnectorRadiusChanged),
+                               (self.defaultConnectorBorderSizeChanged, NodeEditorNode._defaultSceneConnectorBorderSizeChanged),
+                               (self.defaultConnectorBorderColorChanged, NodeEditorNode._defaultSceneConnectorBorderColorChanged),
+                               (self.defaultConnectorInputColorChanged, NodeEditorNode._defaultSceneConnectorInputColorChanged),
+                               (self.defaultConnectorOutputColorChanged, NodeEditorNode._defaultSceneConnectorOutputColorChanged),
+                               (self.optionNodeCloseButtonVisibilityChanged, NodeEditorNode._optionSceneNodeCloseButtonVisibilityChanged)):
+            signal.connect(functools.partial(self.__forwardToItems, self.__nodes, method))
+
+        for signal, method in ((self.defaultLinkRenderModeChanged, NodeEditorLink._defaultSceneLinkRenderModeChanged),
+                               (self.defaultLinkSizeChanged, NodeEditorLink._defaultSceneLinkSizeChanged),
+                               (self.defaultLinkColorChanged, NodeEditorLink._defaultSceneLinkColorChanged),
+                               (self.defaultLinkSelectedColorChanged, NodeEditorLink._defaultSceneLinkColorSelectedChanged)):
+            signal.connect(functools.partial(self.__forwardToItems, self.__links, method))
+
         # define default scene size to 10000x10000 pixels
         self.setSize(QSize(10000, 10000))
 
+    def __forwardToItems(self, items, method, value):
+        """Call `method` with given `value` for all given `items` (nodes or links in scene)"""
+        for item in list(items):
+            method(item, value)
+
     def __checkSelection(self):
         """Check current selected items"""
-        if self.__inClearMode or self.__inModification is not None:
-            # in mass modification state, do not check
+        if self.__inClearMode or self.__inModification is not None or self.__selectionModified == 0:
+            # in mass modification state, or nothing to check
             return
 
-        hash = hashlib.blake2b(digest_size=32)
-        hash.update("".join([node.id() for node in self.selectedNodes()]).encode())
-        selectedNodes = hash.hexdigest()
+        selectionModified = self.__selectionModified
+        self.__selectionModified = 0
 
-        hash = hashlib.blake2b(digest_size=32)
-        hash.update("".join([link.id() for link in self.selectedLinks()]).encode())
-        selectedLinks = hash.hexdigest()
+        if selectionModified & NodeEditorScene.SELECTION_NODES:
+            selectedNodes = frozenset(self.__selectedNodes)
+            if selectedNodes != self.__checkedSelectedNodes:
+                # selection has changed
+                self.__checkedSelectedNodes = selectedNodes
+                self.nodeSelectionChanged.emit()
 
-        if selectedNodes != self.__selectedNodesHash:
-            # selection has changed
-            self.__selectedNodesHash = selectedNodes
-            self.nodeSelectionChanged.emit()
-
-        if selectedLinks != self.__selectedLinksHash:
-            # selection has changed
-            self.__selectedLinksHash = selectedLinks
-            self.linkSelectionChanged.emit()
+        if selectionModified & NodeEditorScene.SELECTION_LINKS:
+            selectedLinks = frozenset(self.__selectedLinks)
+            if selectedLinks != self.__checkedSelectedLinks:
+                # selection has changed
+                self.__checkedSelectedLinks = selectedLinks
+                self.linkSelectionChanged.emit()
 
     def __copyCutToClipboard(self, cutSelection=False):
         """Copy/Cut current selection to clipboard
@@ -390,6 +557,163 @@ class NodeEditorScene(QObject):
                     link = NodeEditorLink(fromConnector, toConnector)
                     link.deserialize(linkAsDict)
 
+    def __indexLink(self, link):
+        """Add given `link` to connectors/nodes indexes"""
+        indexed = [(link.connectorFrom(), link.connectorFrom().node())]
+        if link.connectorTo() is not None:
+            indexed.append((link.connectorTo(), link.connectorTo().node()))
+
+        for connector, node in indexed:
+            self.__linksByConnector.setdefault(connector, {})[link] = None
+            self.__linksByNode.setdefault(node, {})[link] = None
+
+        self.__links[link] = tuple(indexed)
+
+    def __unindexLink(self, link):
+        """Remove given `link` from connectors/nodes indexes"""
+        for connector, node in self.__links.pop(link):
+            for index, key in ((self.__linksByConnector, connector), (self.__linksByNode, node)):
+                if key in index:
+                    index[key].pop(link, None)
+                    if len(index[key]) == 0:
+                        index.pop(key)
+
+    def __linkingItemConnectedTo(self, item):
+        """Return True if current linking item is temporary connected to given `item` (node or connector)
+
+        Temporary connector of linking item is not indexed, as it changes while mouse is moving over scene
+        """
+        if self.__linkingItem is None or self.__linkingItem not in self.__links:
+            return False
+
+        connector = self.__linkingItem.connectorTo()
+        if connector is None:
+            return False
+        elif isinstance(item, NodeEditorNode):
+            return connector.node() == item
+        return connector == item
+
+    def __downstreamNodes(self, node):
+        """Return list of nodes for which an input is linked to an output of given `node`
+
+        A node is returned as many times there's links to it
+        """
+        returned = []
+        for link in self.__linksByNode.get(node, {}):
+            indexed = self.__links[link]
+            if len(indexed) == 2 and indexed[0][1] == node:
+                returned.append(indexed[1][1])
+        return returned
+
+    def __evaluationOrder(self, nodes):
+        """Return nodes impacted by modification of given `nodes` outputs
+
+        Returned value is a tuple (orderedNodes, cycleNodes):
+        - orderedNodes: impacted nodes, in topological order
+        - cycleNodes: impacted nodes that are part of a cycle, or depend on a cycle
+        """
+        # 1. collect modified nodes and all nodes downstream
+        #    key=node, value=number of links from impacted nodes
+        impacted = {}
+        toProcess = list(nodes)
+        while len(toProcess):
+            node = toProcess.pop()
+            if node not in impacted:
+                impacted[node] = 0
+                toProcess.extend(self.__downstreamNodes(node))
+
+        for node in impacted:
+            for downstreamNode in self.__downstreamNodes(node):
+                impacted[downstreamNode] += 1
+
+        # 2. sort them (Kahn's algorithm)
+        ready = [node for node in impacted if impacted[node] == 0]
+        ordered = []
+        while len(ready):
+            node = ready.pop()
+            ordered.append(node)
+            for downstreamNode in self.__downstreamNodes(node):
+                impacted[downstreamNode] -= 1
+                if impacted[downstreamNode] == 0:
+                    ready.append(downstreamNode)
+
+        # nodes that have never been ready are in a cycle (or after a cycle)
+        return (ordered, [node for node in impacted if impacted[node] > 0])
+
+    def __evaluate(self):
+        """Propagate values of dirty outputs to linked inputs
+
+        Impacted nodes are processed in topological order: when a node is processed,
+        all its upstream nodes have already been processed, so its modified inputs
+        have their final value: node is notified once for all of them, then its
+        modified outputs are propagated to linked inputs
+        """
+        self.__timerEvaluation.stop()
+        if self.__inEvaluation:
+            return
+
+        # ignore outputs from connectors/nodes removed in between
+        self.__dirtyOutputs = {connector: None for connector in self.__dirtyOutputs if connector.node() in self.__nodes}
+        if len(self.__dirtyOutputs) == 0:
+            return
+
+        self.__inEvaluation = True
+        try:
+            ordered, cycle = self.__evaluationOrder({connector.node(): None for connector in self.__dirtyOutputs})
+            if len(cycle):
+                self.evaluationCycleDetected.emit(cycle)
+
+            for node in ordered + cycle:
+                inputs = self.__dirtyInputs.pop(node, None)
+                if inputs and node in self.__nodes:
+                    node._inputsUpdated(list(inputs))
+
+                for connector in node.outputs():
+                    if connector in self.__dirtyOutputs:
+                        self.__dirtyOutputs.pop(connector)
+
+                        for link in list(self.__linksByConnector.get(connector, {})):
+                            indexed = self.__links.get(link, ())
+                            if len(indexed) == 2:
+                                # input value is set, node is notified when processed
+                                indexed[1][0].setValue(connector.value())
+
+            # inputs modified by nodes in a cycle, after node has been processed
+            for node, inputs in list(self.__dirtyInputs.items()):
+                if node in self.__nodes:
+                    node._inputsUpdated(list(inputs))
+
+            # outputs modified again by nodes in a cycle are not propagated, otherwise
+            # evaluation would never end
+            for node in cycle:
+                for connector in node.outputs():
+                    self.__dirtyOutputs.pop(connector, None)
+        finally:
+            self.__dirtyInputs = {}
+            self.__inEvaluation = False
+
+        if len(self.__dirtyOutputs):
+            # some outputs has been modified asynchronously
+            self.__timerEvaluation.start()
+
+    def __updateSpatialIndex(self):
+        """Re-index items for which geometry has been modified since last query"""
+        if self.__linkingItem is not None and self.__linkingItem in self.__links:
+            # linking item follows mouse position
+            self.__spatialIndexDirty[self.__linkingItem] = None
+
+        for item in self.__spatialIndexDirty:
+            grItem = item.graphicItem()
+            if isinstance(item, NodeEditorNode):
+                # take in account connectors, that are outside node bounding rect
+                rect = grItem.mapRectToScene(grItem.boundingRect().united(grItem.childrenBoundingRect()))
+            else:
+                grItem.updatePath()
+                rect = grItem.sceneBoundingRect()
+            self.__spatialIndex.insert(item, rect)
+
+        self.__spatialIndexDirty = {}
+
     def __startModification(self):
         """Start scene modification"""
         self.__inModification = self.__isModified
@@ -431,10 +755,14 @@ class NodeEditorScene(QObject):
         self.__inClearMode = True
 
         while len(self.__links):
-            self.removeLink(self.__links[-1])
+            self.removeLink(next(reversed(self.__links)))
 
         while len(self.__nodes):
-            self.removeNode(self.__nodes[-1])
+            self.removeNode(next(reversed(self.__nodes)))
+
+        self.__dirtyOutputs = {}
+        self.__spatialIndex.clear()
+        self.__spatialIndexDirty = {}
 
         self.__inClearMode = False
         self.__checkSelection()
@@ -442,11 +770,17 @@ class NodeEditorScene(QObject):
     def addNode(self, node):
         """Add node to current scene"""
         if node not in self.__nodes:
-            self.__nodes.append(node)
+            self.__nodes[node] = None
+            self.__nodesById[node.id()] = node
+            self.__spatialIndexDirty[node] = None
             self.__grScene.addItem(node.graphicItem())
-            self.nodeAdded.emit(node)
-            self.__checkSelection()
-            self.setModified()
+            if node.isSelected():
+                self._itemSelectionChanged(node, True)
+            if not self.__inMassModification:
+                # on mass modification, scene state is updated once at the end
+                self.nodeAdded.emit(node)
+                self.__checkSelection()
+                self.setModified()
 
     def removeNode(self, node):
         """Remove node from current scene
@@ -454,30 +788,41 @@ class NodeEditorScene(QObject):
         If node is not found, does nothing
         """
         if self.__inClearMode or node in self.__nodes and node.isRemovable():
-            linksToRemove = []
-            for link in self.__links:
-                if node == link.nodeFrom() or node == link.nodeTo():
-                    linksToRemove.append(link)
-            for link in linksToRemove:
+            for link in list(self.__linksByNode.get(node, {})):
                 self.removeLink(link)
 
             self.__grScene.removeItem(node.graphicItem())
-            self.__nodes.remove(node)
-            self.nodeRemoved.emit(node)
-            self.__checkSelection()
-            self.setModified()
+            self.__nodes.pop(node)
+            if self.__nodesById.get(node.id()) == node:
+                self.__nodesById.pop(node.id())
+            self.__spatialIndex.remove(node)
+            self.__spatialIndexDirty.pop(node, None)
+            self._itemSelectionChanged(node, False)
+            if not self.__inMassModification:
+                # on mass modification, scene state is updated once at the end
+                self.nodeRemoved.emit(node)
+                self.__checkSelection()
+                self.setModified()
 
     def addLink(self, link):
         """Add link to current scene"""
         if isinstance(link, NodeEditorLink) and link not in self.__links:
-            self.__links.append(link)
+            self.__indexLink(link)
+            self.__spatialIndexDirty[link] = None
             self.__grScene.addItem(link.graphicItem())
+            if link.isSelected():
+                self._itemSelectionChanged(link, True)
             if link != self.__linkingItem and not link.connectorTo() is None:
                 link.connectorTo().linkConnectionAdded(link)
                 link.connectorFrom().linkConnectionAdded(link)
-                self.linkAdded.emit(link)
-                self.__checkSelection()
-                self.setModified()
+                # only linked nodes need to be informed
+                for node in {link.nodeFrom(): None, link.nodeTo(): None}:
+                    node._checkAddedLink(link)
+                if not self.__inMassModification:
+                    # on mass modification, scene state is updated once at the end
+                    self.linkAdded.emit(link)
+                    self.__checkSelection()
+                    self.setModified()
 
     def removeLink(self, link):
         """Remove `link` from current scene
@@ -486,14 +831,23 @@ class NodeEditorScene(QObject):
         """
         if isinstance(link, NodeEditorLink) and link in self.__links:
             self.__grScene.removeItem(link.graphicItem())
-            self.__links.remove(link)
+            self.__unindexLink(link)
+            self.__spatialIndex.remove(link)
+            self.__spatialIndexDirty.pop(link, None)
+            self._itemSelectionChanged(link, False)
             if link != self.__linkingItem and not link.connectorTo() is None:
                 # link.setConnectorTo(None)
-                self.__checkSelection()
+                if not self.__inMassModification:
+                    self.__checkSelection()
                 link.connectorTo().linkConnectionRemoved(link)
                 link.connectorFrom().linkConnectionRemoved(link)
-                self.linkRemoved.emit(link)
-                self.setModified()
+                # only linked nodes need to be informed
+                for node in {link.nodeFrom(): None, link.nodeTo(): None}:
+                    node._checkRemovedLink(link)
+                if not self.__inMassModification:
+                    # on mass modification, scene state is updated once at the end
+                    self.linkRemoved.emit(link)
+                    self.setModified()
             # need to force cleanup
             del link
 
@@ -543,18 +897,82 @@ class NodeEditorScene(QObject):
 
     def nodeFromId(self, id):
         """Return node from given Id, return None if no node is found"""
-        for node in self.__nodes:
-            if node.id() == id:
-                return node
-        return None
+        return self.__nodesById.get(id, None)
+
+    def _updateNodeId(self, node, previousId):
+        """Called by `node` when its identifier has been modified, to keep id index up to date"""
+        if node in self.__nodes:
+            if self.__nodesById.get(previousId) == node:
+                self.__nodesById.pop(previousId)
+            self.__nodesById[node.id()] = node
+
+    def _itemGeometryChanged(self, item):
+        """Called when geometry (position, size, path) of given `item` (node or link) has been modified
+
+        For a node, connected links are also considered as modified
+        """
+        if item in self.__nodes:
+            self.__spatialIndexDirty[item] = None
+            for link in self.__linksByNode.get(item, {}):
+                self.__spatialIndexDirty[link] = None
+        elif item in self.__links:
+            self.__spatialIndexDirty[item] = None
+
+    def _itemSelectionChanged(self, item, selected):
+        """Called when selection state of given `item` (node or link) has been modified, to keep selected items up to date
+
+        Items that are not in scene are never considered as selected
+        """
+        if isinstance(item, NodeEditorNode):
+            selectedItems = self.__selectedNodes
+            perimeter = NodeEditorScene.SELECTION_NODES
+            inScene = item in self.__nodes
+        else:
+            selectedItems = self.__selectedLinks
+            perimeter = NodeEditorScene.SELECTION_LINKS
+            inScene = item in self.__links
+
+        if selected and inScene:
+            if item not in selectedItems:
+                selectedItems[item] = None
+                self.__selectionModified |= perimeter
+        elif item in selectedItems:
+            selectedItems.pop(item)
+            self.__selectionModified |= perimeter
+
+    def _outputValueChanged(self, connector):
+        """Called by node when value of output `connector` has been modified
+
+        Propagation to linked inputs is asynchronous: it's scheduled on next
+        event loop iteration (0ms timer)
+        """
+        self.__dirtyOutputs[connector] = None
+        if not self.__inEvaluation:
+            self.__timerEvaluation.start()
+
+    def _inputValueChanged(self, connector):
+        """Called by node when value of input `connector` has been modified
+
+        Return True if input has been modified while outputs are propagated: node
+        will be notified once for all its modified inputs
+        Otherwise return False: node have to process input immediately
+        """
+        if self.__inEvaluation:
+            node = connector.node()
+            if node in self.__dirtyInputs:
+                self.__dirtyInputs[node][connector] = None
+            else:
+                self.__dirtyInputs[node] = {connector: None}
+            return True
+        return False
 
     def nodes(self):
         """Return all nodes"""
-        return self.__nodes
+        return list(self.__nodes)
 
     def selectedNodes(self):
-        """Return all selected nodes"""
-        return [node for node in self.__nodes if node.isSelected()]
+        """Return all selected nodes, in selection order"""
+        return list(self.__selectedNodes)
 
     def selectAll(self, perimeter=None):
         """Select all items in scene
@@ -604,35 +1022,36 @@ class NodeEditorScene(QObject):
         If `item` is a <NodeEditorConnector>, return all links connected to connector
         """
         if item is None:
-            return self.__links
-        elif isinstance(item, NodeEditorNode):
-            returned = []
-            for link in self.__links:
-                if link.connectorFrom().node() == item or link.connectorTo() and link.connectorTo().node() == item:
-                    returned.append(link)
-            return returned
-        elif isinstance(item, NodeEditorConnector):
-            returned = []
-            for link in self.__links:
-                if link.connectorFrom() == item or link.connectorTo() == item:
-                    returned.append(link)
+            return list(self.__links)
+        elif isinstance(item, (NodeEditorNode, NodeEditorConnector)):
+            if isinstance(item, NodeEditorNode):
+                returned = list(self.__linksByNode.get(item, {}))
+            else:
+                returned = list(self.__linksByConnector.get(item, {}))
+
+            if self.__linkingItemConnectedTo(item) and self.__linkingItem not in returned:
+                returned.append(self.__linkingItem)
             return returned
 
     def selectedLinks(self):
-        """Return all selected links"""
-        return [link for link in self.__links if link.isSelected()]
+        """Return all selected links, in selection order"""
+        return list(self.__selectedLinks)
 
     def cursorScenePosition(self):
         """Return current position of mouse on scene"""
         return self.__grScene.cursorScenePosition()
 
     def updateOutputs(self):
-        """Force all outputs to be updated, even if option output event is disabled"""
+        """Force all outputs to be updated, even if option output event is disabled
+
+        All updated outputs are propagated in a single pass
+        """
         eventEnabled = self.__optionOutputEventEnabled
         # temporary enable output event
         self.__optionOutputEventEnabled = True
         for node in self.__nodes:
             node.updateOutputs()
+        self.__evaluate()
         self.__optionOutputEventEnabled = eventEnabled
 
     def cutLine(self):
@@ -642,18 +1061,97 @@ class NodeEditorScene(QObject):
         """
         return self.__cutLine
 
+    def itemsInRect(self, rect, perimeter=None):
+        """Return items for which bounding rect intersects given `rect` (<QRectF>, in scene coordinates)
+
+        If `perimeter` is:
+        - None or NodeEditorScene.SELECTION_ALL: nodes & links are returned
+        - NodeEditorScene.SELECTION_NODES: only nodes are returned
+        - NodeEditorScene.SELECTION_LINKS: only links are returned
+
+        Note: only bounding rect are checked, returned items are candidates for
+              a more accurate test (path, shape, ...)
+        """
+        self.__updateSpatialIndex()
+
+        if perimeter is None or perimeter == NodeEditorScene.SELECTION_ALL:
+            return self.__spatialIndex.query(rect)
+        elif perimeter & NodeEditorScene.SELECTION_NODES:
+            return [item for item in self.__spatialIndex.query(rect) if isinstance(item, NodeEditorNode)]
+        else:
+            return [item for item in self.__spatialIndex.query(rect) if isinstance(item, NodeEditorLink)]
+
+    def connectorAt(self, position):
+        """Return connector at given `position` (<QPointF>, in scene coordinates)
+
+        If there's no connector at position, return None
+        """
+        for node in self.itemsInRect(QRectF(position, position), NodeEditorScene.SELECTION_NODES):
+            for connector in node.connector():
+                grItem = connector.graphicItem()
+                if grItem.contains(grItem.mapFromScene(position)):
+                    return connector
+        return None
+
+    def selectInRect(self, rect, perimeter=None, addToSelection=False, mode=Qt.IntersectsItemShape):
+        """Select items in given `rect` (<QRectF>, in scene coordinates)
+
+        Given `mode` (<Qt.ItemSelectionMode>) define, like QGraphicsScene.setSelectionArea(),
+        if items have to intersect or to be fully contained in `rect`
+
+        If `addToSelection` is False, items outside given `rect` are deselected
+
+        Given `perimeter` define items to select (see itemsInRect())
+        """
+        self.__startModification()
+
+        if mode in (Qt.ContainsItemShape, Qt.IntersectsItemShape):
+            rectPath = QPainterPath()
+            rectPath.addRect(rect)
+
+        selected = {}
+        for item in self.itemsInRect(rect, perimeter):
+            if not item.isSelectable():
+                continue
+
+            grItem = item.graphicItem()
+            if mode == Qt.ContainsItemBoundingRect:
+                isInRect = rect.contains(grItem.sceneBoundingRect())
+            elif mode == Qt.IntersectsItemBoundingRect:
+                isInRect = rect.intersects(grItem.sceneBoundingRect())
+            elif mode == Qt.ContainsItemShape:
+                isInRect = rectPath.contains(grItem.mapToScene(grItem.shape()))
+            else:
+                isInRect = rectPath.intersects(grItem.mapToScene(grItem.shape()))
+
+            if isInRect:
+                selected[item] = None
+                item.setSelected(True)
+
+        if not addToSelection:
+            for item in self.selectedNodes() + self.selectedLinks():
+                if item not in selected:
+                    item.setSelected(False)
+
+        self.__stopModification()
+        self.__checkSelection()
+
     def cutLineDeleteLinks(self):
         """Delete all links which intersect cut line"""
         points = self.__cutLine.points()
+
+        # links to remove (dictionary used as an ordered set)
+        linksToRemove = {}
         for ptNumber in range(len(points)-1):
             path = QPainterPath(points[ptNumber])
             path.lineTo(points[ptNumber+1])
 
-            linksToRemove = []
-            for link in self.__links:
-                if path.intersects(link.graphicItem().path()):
-                    linksToRemove.append(link)
+            # check only links for which bounding rect intersects cut segment
+            for link in self.itemsInRect(path.boundingRect(), NodeEditorScene.SELECTION_LINKS):
+                if link not in linksToRemove and path.intersects(link.graphicItem().path()):
+                    linksToRemove[link] = None
 
+        if len(linksToRemove):
             self.__startModification()
             for link in linksToRemove:
                 self.removeLink(link)
@@ -945,6 +1443,8 @@ class NodeEditorScene(QObject):
         if value in (NodeEditorLink.RENDER_CURVE, NodeEditorLink.RENDER_DIRECT, NodeEditorLink.RENDER_ANGLE) and self.__defaultLinkRender != value:
             self.__defaultLinkRender = value
             self.defaultLinkRenderModeChanged.emit(self.__defaultLinkRender)
+            for link in self.__links:
+                self._itemGeometryChanged(link)
 
     def defaultLinkColor(self):
         """Return default color value for links"""
@@ -1253,157 +1753,198 @@ class NodeEditorScene(QObject):
                             }
                     },
                 'nodes': [node.serialize() for node in self.__nodes],
-                'links': [link.serialize() for link in self.__links if not link.serialize() is None]
+                'links': [linkAsDict for link in self.__links if (linkAsDict := link.serialize()) is not None]
             }
 
     def deserialize(self, jsonAsDict):
-        """Deserialize given dictionnary `jsonAsDict` to a scene"""
+        """Deserialize given dictionnary `jsonAsDict` to a scene
+
+        Deserialization is made as a mass modification: items are added without
+        nodeAdded/linkAdded (and nodeRemoved/linkRemoved for cleared items)
+        signals, selection and modification checks; only sceneLoaded signal is
+        emitted once scene is loaded
+        """
         # deserialize scene data only scene if available
         if isinstance(jsonAsDict, dict) and 'scene' in jsonAsDict:
             self.__startModification()
             self.__inMassModification = True
 
-            # 1. reset current scene content
-            self.clear()
+            try:
+                # 1. reset current scene content
+                self.clear()
 
-            # 2. apply options, if any
-            if 'options' in jsonAsDict['scene'] and isinstance(jsonAsDict['scene']['options'], dict):
-                options = jsonAsDict['scene']['options']
+                # 2. apply options, if any
+                if 'options' in jsonAsDict['scene'] and isinstance(jsonAsDict['scene']['options'], dict):
+                    options = jsonAsDict['scene']['options']
 
-                if 'snapToGrid' in options and isinstance(options['snapToGrid'], bool):
-                    self.__optionSnapToGrid = options['snapToGrid']
+                    if 'snapToGrid' in options and isinstance(options['snapToGrid'], bool):
+                        self.__optionSnapToGrid = options['snapToGrid']
 
-                if 'nodeCloseButtonVisible' in options and isinstance(options['nodeCloseButtonVisible'], bool):
-                    self.__optionNodeCloseButtonVisible = options['nodeCloseButtonVisible']
+                    if 'nodeCloseButtonVisible' in options and isinstance(options['nodeCloseButtonVisible'], bool):
+                        self.__optionNodeCloseButtonVisible = options['nodeCloseButtonVisible']
 
-            # 3. apply styles, if any
-            if 'style' in jsonAsDict['scene'] and isinstance(jsonAsDict['scene']['style'], dict):
-                style = jsonAsDict['scene']['style']
+                # 3. apply styles, if any
+                if 'style' in jsonAsDict['scene'] and isinstance(jsonAsDict['scene']['style'], dict):
+                    style = jsonAsDict['scene']['style']
 
-                if 'defaultNodeColorTitle' in style and isinstance(style['defaultNodeColorTitle'], str):
-                    self.__defaultNodeColorTitle = QColor(style['defaultNodeColorTitle'])
+                    if 'defaultNodeColorTitle' in style and isinstance(style['defaultNodeColorTitle'], str):
+                        self.__defaultNodeColorTitle = QColor(style['defaultNodeColorTitle'])
 
-                if 'defaultNodeColorBgTitle' in style and isinstance(style['defaultNodeColorBgTitle'], str):
-                    self.__defaultNodeColorBgTitle = QColor(style['defaultNodeColorBgTitle'])
+                    if 'defaultNodeColorBgTitle' in style and isinstance(style['defaultNodeColorBgTitle'], str):
+                        self.__defaultNodeColorBgTitle = QColor(style['defaultNodeColorBgTitle'])
 
-                if 'defaultNodeColorSelectedTitle' in style and isinstance(style['defaultNodeColorSelectedTitle'], str):
-                    self.__defaultNodeColorSelectedTitle = QColor(style['defaultNodeColorSelectedTitle'])
+                    if 'defaultNodeColorSelectedTitle' in style and isinstance(style['defaultNodeColorSelectedTitle'], str):
+                        self.__defaultNodeColorSelectedTitle = QColor(style['defaultNodeColorSelectedTitle'])
 
-                if 'defaultNodeColorSelectedBgTitle' in style and isinstance(style['defaultNodeColorSelectedBgTitle'], str):
-                    self.__defaultNodeColorSelectedBgTitle = QColor(style['defaultNodeColorSelectedBgTitle'])
+                    if 'defaultNodeColorSelectedBgTitle' in style and isinstance(style['defaultNodeColorSelectedBgTitle'], str):
+                        self.__defaultNodeColorSelectedBgTitle = QColor(style['defaultNodeColorSelectedBgTitle'])
 
-                if 'defaultNodeColorBgNode' in style and isinstance(style['defaultNodeColorBgNode'], str):
-                    self.__defaultNodeColorBgNode = QColor(style['defaultNodeColorBgNode'])
+                    if 'defaultNodeColorBgNode' in style and isinstance(style['defaultNodeColorBgNode'], str):
+                        self.__defaultNodeColorBgNode = QColor(style['defaultNodeColorBgNode'])
 
-                if 'defaultNodeColorBgNodesSelected' in style and isinstance(style['defaultNodeColorBgNodesSelected'], str):
-                    self.__defaultNodeColorBgNodesSelected = QColor(style['defaultNodeColorBgNodesSelected'])
+                    if 'defaultNodeColorBgNodesSelected' in style and isinstance(style['defaultNodeColorBgNodesSelected'], str):
+                        self.__defaultNodeColorBgNodesSelected = QColor(style['defaultNodeColorBgNodesSelected'])
 
-                if 'defaultNodeBorderRadius' in style and isinstance(style['defaultNodeBorderRadius'], (int, float)):
-                    self.__defaultNodeBorderRadius = max(0, style['defaultNodeBorderRadius'])
+                    if 'defaultNodeBorderRadius' in style and isinstance(style['defaultNodeBorderRadius'], (int, float)):
+                        self.__defaultNodeBorderRadius = max(0, style['defaultNodeBorderRadius'])
 
-                if 'defaultNodeBorderSize' in style and isinstance(style['defaultNodeBorderSize'], (int, float)):
-                    self.__defaultNodeBorderSize = max(0, style['defaultNodeBorderSize'])
+                    if 'defaultNodeBorderSize' in style and isinstance(style['defaultNodeBorderSize'], (int, float)):
+                        self.__defaultNodeBorderSize = max(0, style['defaultNodeBorderSize'])
 
-                if 'defaultNodePadding' in style and isinstance(style['defaultNodePadding'], (int, float)):
-                    self.__defaultNodePadding = max(0, style['defaultNodePadding'])
+                    if 'defaultNodePadding' in style and isinstance(style['defaultNodePadding'], (int, float)):
+                        self.__defaultNodePadding = max(0, style['defaultNodePadding'])
 
-                if 'defaultLinkRender' in style and isinstance(style['defaultLinkRender'], int) and style['defaultLinkRender'] in (NodeEditorLink.RENDER_DIRECT,
-                                                                                                                                   NodeEditorLink.RENDER_CURVE,
-                                                                                                                                   NodeEditorLink.RENDER_ANGLE):
-                    self.__defaultLinkRender = style['defaultLinkRender']
+                    if 'defaultLinkRender' in style and isinstance(style['defaultLinkRender'], int) and style['defaultLinkRender'] in (NodeEditorLink.RENDER_DIRECT,
+                                                                                                                                       NodeEditorLink.RENDER_CURVE,
+                                                                                                                                       NodeEditorLink.RENDER_ANGLE):
+                        self.__defaultLinkRender = style['defaultLinkRender']
 
-                if 'defaultLinkColor' in style and isinstance(style['defaultLinkColor'], str):
-                    self.__defaultLinkColor = QColor(style['defaultLinkColor'])
+                    if 'defaultLinkColor' in style and isinstance(style['defaultLinkColor'], str):
+                        self.__defaultLinkColor = QColor(style['defaultLinkColor'])
 
-                if 'defaultLinkColorSelected' in style and isinstance(style['defaultLinkColorSelected'], str):
-                    self.__defaultLinkColorSelected = QColor(style['defaultLinkColorSelected'])
+                    if 'defaultLinkColorSelected' in style and isinstance(style['defaultLinkColorSelected'], str):
+                        self.__defaultLinkColorSelected = QColor(style['defaultLinkColorSelected'])
 
-                if 'defaultLinkSize' in style and isinstance(style['defaultLinkSize'], (int, float)):
-                    self.__defaultLinkSize = max(0.01, style['defaultLinkSize'])
+                    if 'defaultLinkSize' in style and isinstance(style['defaultLinkSize'], (int, float)):
+                        self.__defaultLinkSize = max(0.01, style['defaultLinkSize'])
 
-                if 'defaultConnectorRadius' in style and isinstance(style['defaultConnectorRadius'], (int, float)):
-                    self.__defaultConnectorRadius = max(1, style['defaultConnectorRadius'])
+                    if 'defaultConnectorRadius' in style and isinstance(style['defaultConnectorRadius'], (int, float)):
+                        self.__defaultConnectorRadius = max(1, style['defaultConnectorRadius'])
 
-                if 'defaultConnectorBorderSize' in style and isinstance(style['defaultConnectorBorderSize'], (int, float)):
-                    self.__defaultConnectorBorderSize = max(0, style['defaultConnectorBorderSize'])
+                    if 'defaultConnectorBorderSize' in style and isinstance(style['defaultConnectorBorderSize'], (int, float)):
+                        self.__defaultConnectorBorderSize = max(0, style['defaultConnectorBorderSize'])
 
-                if 'defaultConnectorBorderColor' in style and isinstance(style['defaultConnectorBorderColor'], str):
-                    self.__defaultConnectorBorderColor = QColor(style['defaultConnectorBorderColor'])
+                    if 'defaultConnectorBorderColor' in style and isinstance(style['defaultConnectorBorderColor'], str):
+                        self.__defaultConnectorBorderColor = QColor(style['defaultConnectorBorderColor'])
 
-                if 'defaultConnectorInputColor' in style and isinstance(style['defaultConnectorInputColor'], str):
-                    self.__defaultConnectorInputColor = QColor(style['defaultConnectorInputColor'])
+                    if 'defaultConnectorInputColor' in style and isinstance(style['defaultConnectorInputColor'], str):
+                        self.__defaultConnectorInputColor = QColor(style['defaultConnectorInputColor'])
 
-                if 'defaultConnectorOutputColor' in style and isinstance(style['defaultConnectorOutputColor'], str):
-                    self.__defaultConnectorOutputColor = QColor(style['defaultConnectorOutputColor'])
+                    if 'defaultConnectorOutputColor' in style and isinstance(style['defaultConnectorOutputColor'], str):
+                        self.__defaultConnectorOutputColor = QColor(style['defaultConnectorOutputColor'])
 
-                if 'defaultCutLineColor' in style and isinstance(style['defaultCutLineColor'], str):
-                    self.setDefaultCutLineColor(QColor(style['defaultCutLineColor']))
+                    if 'defaultCutLineColor' in style and isinstance(style['defaultCutLineColor'], str):
+                        self.setDefaultCutLineColor(QColor(style['defaultCutLineColor']))
 
-                if 'defaultCutLineSize' in style and isinstance(style['defaultCutLineSize'], (int, float)):
-                    self.setDefaultCutLineSize(style['defaultCutLineSize'])
+                    if 'defaultCutLineSize' in style and isinstance(style['defaultCutLineSize'], (int, float)):
+                        self.setDefaultCutLineSize(style['defaultCutLineSize'])
 
-                if 'defaultCutLineStyle' in style and isinstance(style['defaultCutLineStyle'], int) and style['defaultCutLineStyle'] in []:
-                    self.setDefaultCutLineStyle(style['defaultCutLineStyle'])
+                    if 'defaultCutLineStyle' in style and isinstance(style['defaultCutLineStyle'], int) and style['defaultCutLineStyle'] in []:
+                        self.setDefaultCutLineStyle(style['defaultCutLineStyle'])
 
-                if 'gridVisible' in style and isinstance(style['gridVisible'], bool):
-                    self.setGridVisible(style['gridVisible'])
+                    if 'gridVisible' in style and isinstance(style['gridVisible'], bool):
+                        self.setGridVisible(style['gridVisible'])
 
-                gridSizeWidth, gridSizeFrequency = self.gridSize()
-                if 'gridSizeWidth' in style and isinstance(style['gridSizeWidth'], int):
-                    gridSizeWidth = style['gridSizeWidth']
+                    gridSizeWidth, gridSizeFrequency = self.gridSize()
+                    if 'gridSizeWidth' in style and isinstance(style['gridSizeWidth'], int):
+                        gridSizeWidth = style['gridSizeWidth']
 
-                if 'gridSizeFrequency' in style and isinstance(style['gridSizeFrequency'], int):
-                    gridSizeFrequency = style['gridSizeFrequency']
+                    if 'gridSizeFrequency' in style and isinstance(style['gridSizeFrequency'], int):
+                        gridSizeFrequency = style['gridSizeFrequency']
 
-                self.setGridSize(gridSizeWidth, gridSizeFrequency)
+                    self.setGridSize(gridSizeWidth, gridSizeFrequency)
 
-                if 'gridBgColor' in style and isinstance(style['gridBgColor'], str):
-                    self.setGridBgColor(QColor(style['gridBgColor']))
+                    if 'gridBgColor' in style and isinstance(style['gridBgColor'], str):
+                        self.setGridBgColor(QColor(style['gridBgColor']))
 
-                if 'gridFgColor' in style and isinstance(style['gridFgColor'], str):
-                    self.setGridFgColor(QColor(style['gridFgColor']))
+                    if 'gridFgColor' in style and isinstance(style['gridFgColor'], str):
+                        self.setGridFgColor(QColor(style['gridFgColor']))
 
-                if 'gridStyleMain' in style and isinstance(style['gridStyleMain'], str):
-                    self.setGridStyleMain(style['gridStyleMain'])
+                    if 'gridStyleMain' in style and isinstance(style['gridStyleMain'], str):
+                        self.setGridStyleMain(style['gridStyleMain'])
 
-                if 'gridStyleSecondary' in style and isinstance(style['gridStyleSecondary'], str):
-                    self.setGridStyleSecondary(style['gridStyleSecondary'])
+                    if 'gridStyleSecondary' in style and isinstance(style['gridStyleSecondary'], str):
+                        self.setGridStyleSecondary(style['gridStyleSecondary'])
 
-                if 'gridOpacity' in style and isinstance(style['gridOpacity'], (int, float)):
-                    self.setGridOpacity(style['gridOpacity'])
+                    if 'gridOpacity' in style and isinstance(style['gridOpacity'], (int, float)):
+                        self.setGridOpacity(style['gridOpacity'])
 
-            # 4. apply bounds, if any
-            if 'geometry' in jsonAsDict['scene'] and isinstance(jsonAsDict['scene']['geometry'], dict):
-                geometry = jsonAsDict['scene']['geometry']
+                # 4. apply bounds, if any
+                if 'geometry' in jsonAsDict['scene'] and isinstance(jsonAsDict['scene']['geometry'], dict):
+                    geometry = jsonAsDict['scene']['geometry']
 
-                size = self.__size
+                    size = self.__size
 
-                if 'width' in geometry and isinstance(geometry['width'], int):
-                    size.setWidth(geometry['width'])
+                    if 'width' in geometry and isinstance(geometry['width'], int):
+                        size.setWidth(geometry['width'])
 
-                if 'height' in geometry and isinstance(geometry['height'], int):
-                    size.setHeight(geometry['height'])
+                    if 'height' in geometry and isinstance(geometry['height'], int):
+                        size.setHeight(geometry['height'])
 
-                self.setSize(size)
+                    self.setSize(size)
 
-            # 5. import nodes, if any
-            if 'nodes' in jsonAsDict and isinstance(jsonAsDict['nodes'], list):
-                self.__importNodesFromDict(jsonAsDict)
+                # 5. import nodes, if any
+                if 'nodes' in jsonAsDict and isinstance(jsonAsDict['nodes'], list):
+                    self.__importNodesFromDict(jsonAsDict)
 
-            # 6. import links, if any
-            if 'links' in jsonAsDict and isinstance(jsonAsDict['links'], list):
-                self.__importLinksFromDict(jsonAsDict)
+                # 6. import links, if any
+                if 'links' in jsonAsDict and isinstance(jsonAsDict['links'], list):
+                    self.__importLinksFromDict(jsonAsDict)
 
-            # consider after import that scene is not modified
-            self.setModified(False)
-            self.__stopModification()
-            self.__inMassModification = False
+                # consider after import that scene is not modified
+                self.setModified(False)
+            finally:
+                # ensure scene is not left in mass modification state
+                self.__inMassModification = False
+                self.__stopModification()
+
+            # single notification for loaded content
+            self.__checkSelection()
             self.sceneLoaded.emit()
 
     def toJson(self, indent=4, sortKeys=True):
-        """Convert current scene to a json string"""
+        """Convert current scene to a json string
+
+        If `indent` is None, a compact json string is returned
+        """
+        if indent is None:
+            return json.dumps(self.serialize(), separators=(',', ':'), sort_keys=sortKeys, cls=JsonQObjectEncoder)
         return json.dumps(self.serialize(), indent=indent, sort_keys=sortKeys, cls=JsonQObjectEncoder)
 
+    def toBinary(self):
+        """Convert current scene to a compact binary content (bytes)
+
+        Binary content is a compressed compact json string, prefixed by BINARY_HEADER
+
+        Binary format is really smaller than indented json (about 50 times) and
+        slightly faster to decode (decompression is cheaper than parsing indents);
+        but loading time is mostly spent in items creation, whatever the format
+        """
+        return NodeEditorScene.BINARY_HEADER + zlib.compress(self.toJson(None, False).encode())
+
+    def fromBinary(self, binaryData):
+        """Convert provided `binaryData` (bytes, as returned by toBinary()) to scene"""
+        if not isinstance(binaryData, (bytes, bytearray)) or not binaryData.startswith(NodeEditorScene.BINARY_HEADER):
+            return False
+
+        try:
+            jsonAsStr = zlib.decompress(binaryData[len(NodeEditorScene.BINARY_HEADER):]).decode()
+        except Exception as e:
+            Debug.print("Can't decompress binary data: {0}", f"{e}")
+            return False
+
+        return self.fromJson(jsonAsStr)
+
     def fromJson(self, jsonAsStr):
         """Convert provided `dataAsJson` string to scene"""
         try:
@@ -1427,15 +1968,21 @@ class NodeEditorScene(QObject):
 
         return True
 
-    def exportToFile(self, fileName):
+    def exportToFile(self, fileName, binary=False):
         """Export current scene as json file
 
         Given `fileName` define full path/file name on which exported content is saved
+
+        If `binary` is True, scene is exported as a compact binary file (see toBinary())
         """
         returned = NodeEditorScene.EXPORT_OK
         try:
-            with open(fileName, 'w') as fHandle:
-                fHandle.write(self.toJson())
+            if binary:
+                with open(fileName, 'wb') as fHandle:
+                    fHandle.write(self.toBinary())
+            else:
+                with open(fileName, 'w') as fHandle:
+                    fHandle.write(self.toJson())
         except Exception as e:
             returned = NodeEditorScene.EXPORT_CANT_SAVE
 
@@ -1445,6 +1992,7 @@ class NodeEditorScene(QObject):
         """Import scene from a json file
 
         Given `fileName` define full path/file name on which exported content is saved
+        File can be a json file or a binary file (see exportToFile())
 
         Given `fileFormatIdentifier` is a <str> provided to define scene format:
         => If the format identifier in json file doesn't match provided value, import is cancelled
@@ -1453,8 +2001,13 @@ class NodeEditorScene(QObject):
             return NodeEditorScene.IMPORT_FILE_NOT_FOUND
 
         try:
-            with open(fileName, 'r') as fHandle:
-                jsonAsStr = fHandle.read()
+            with open(fileName, 'rb') as fHandle:
+                fileContent = fHandle.read()
+
+            if fileContent.startswith(NodeEditorScene.BINARY_HEADER):
+                jsonAsStr = zlib.decompress(fileContent[len(NodeEditorScene.BINARY_HEADER):]).decode()
+            else:
+                jsonAsStr = fileContent.decode()
         except Exception as e:
             Debug.print("Can't open/read file {0}: {1}", fileName, f"{e}")
             return NodeEditorScene.IMPORT_FILE_CANT_READ
@@ -1517,24 +2070,8 @@ class NodeEditorNode(QObject):
             raise EInvalidType("Given `scene` must be <NodeEditorScene>")
 
         # parent scene
+        # (default values changes are forwarded to node by scene)
         self.__scene = scene
-        self.__scene.defaultNodeTitleColorChanged.connect(self.__defaultSceneNodeTitleColorChanged)
-        self.__scene.defaultNodeTitleBgColorChanged.connect(self.__defaultSceneNodeTitleBgColorChanged)
-        self.__scene.defaultNodeTitleSelectedColorChanged.connect(self.__defaultSceneNodeTitleSelectedColorChanged)
-        self.__scene.defaultNodeTitleSelectedBgColorChanged.connect(self.__defaultSceneNodeTitleSelectedBgColorChanged)
-        self.__scene.defaultNodeBgColorChanged.connect(self.__defaultSceneNodeBgColorChanged)
-        self.__scene.defaultNodeSelectedBgColorChanged.connect(self.__defaultSceneNodeSelectedBgColorChanged)
-        self.__scene.defaultNodeBorderRadiusChanged.connect(self.__defaultSceneNodeBorderRadiusChanged)
-        self.__scene.defaultNodeBorderSizeChanged.connect(self.__defaultSceneNodeBorderSizeChanged)
-        self.__scene.defaultNodePaddingChanged.connect(self.__defaultSceneNodePaddingChanged)
-
-        self.__scene.defaultConnectorRadiusChanged.connect(self.__defaultSceneConnectorRadiusChanged)
-        self.__scene.defaultConnectorBorderSizeChanged.connect(self.__defaultSceneConnectorBorderSizeChanged)
-        self.__scene.defaultConnectorBorderColorChanged.connect(self.__defaultSceneConnectorBorderColorChanged)
-        self.__scene.defaultConnectorInputColorChanged.connect(self.__defaultSceneConnectorInputColorChanged)
-        self.__scene.defaultConnectorOutputColorChanged.connect(self.__defaultSceneConnectorOutputColorChanged)
-        self.__scene.linkAdded.connect(self.__checkAddedLink)
-        self.__scene.linkRemoved.connect(self.__checkRemovedLink)
 
         # node's unique Id
         self.__id = None
@@ -1591,6 +2128,14 @@ class NodeEditorNode(QObject):
         # - key = connector identifier
         # - value = connector
         self.__connectors = {}
+
+        # default connectors values changes are forwarded to connectors by node,
+        # rather than having all connectors connected to node signals
+        self.defaultConnectorRadiusChanged.connect(self.__defaultConnectorRadiusChanged)
+        self.defaultConnectorBorderSizeChanged.connect(self.__defaultConnectorBorderSizeChanged)
+        self.defaultConnectorBorderColorChanged.connect(self.__defaultConnectorBorderColorChanged)
+        self.defaultConnectorInputColorChanged.connect(self.__defaultConnectorInputColorChanged)
+        self.defaultConnectorOutputColorChanged.connect(self.__defaultConnectorOutputColorChanged)
         # list of connectors Id; keep order in which connectors has been added
         self.__connectorsId = []
 
@@ -1640,8 +2185,6 @@ class NodeEditorNode(QObject):
         self.borderRadiusChanged.emit(self.borderRadius())
         self.borderSizeChanged.emit(self.borderSize())
 
-        self.__scene.optionNodeCloseButtonVisibilityChanged.connect(self.__updateCloseButtonVisibility)
-
         #
         if widget is not None:
             self.setWidget(widget)
@@ -1652,8 +2195,8 @@ class NodeEditorNode(QObject):
     def __repr__(self):
         return f"<NodeEditorNode({self.__id}, '{self.__title}')>"
 
-    def __updateCloseButtonVisibility(self, value):
-        """Update close button visibility"""
+    def _optionSceneNodeCloseButtonVisibilityChanged(self, value):
+        """Option from scene has been changed; update close button visibility"""
         self.__grItem.setCloseButtonVisibility(value)
         self.__updateAllConnectorPosition()
 
@@ -1753,81 +2296,111 @@ class NodeEditorNode(QObject):
                                                                      offsetPositionRightTop+offsetPositionRightBottom+maxPositionRightTop+maxPositionRightBottom))
         self.__updateMinSize()
 
-    def __defaultSceneNodeTitleColorChanged(self, value):
+    def _defaultSceneNodeTitleColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__colorTitle is None:
             self.titleColorChanged.emit(value)
 
-    def __defaultSceneNodeTitleBgColorChanged(self, value):
+    def _defaultSceneNodeTitleBgColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__colorBgTitle is None:
             self.titleBgColorChanged.emit(value)
 
-    def __defaultSceneNodeTitleSelectedColorChanged(self, value):
+    def _defaultSceneNodeTitleSelectedColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__colorSelectedTitle is None:
             self.titleSelectedColorChanged.emit(value)
 
-    def __defaultSceneNodeTitleSelectedBgColorChanged(self, value):
+    def _defaultSceneNodeTitleSelectedBgColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__colorSelectedBgTitle is None:
             self.titleSelectedBgColorChanged.emit(value)
 
-    def __defaultSceneNodeBgColorChanged(self, value):
+    def _defaultSceneNodeBgColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__colorBgNode is None:
             self.nodeBgColorChanged.emit(value)
 
-    def __defaultSceneNodeSelectedBgColorChanged(self, value):
+    def _defaultSceneNodeSelectedBgColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__colorBgNodesSelected is None:
             self.nodeSelectedBgColorChanged.emit(value)
 
-    def __defaultSceneNodeBorderRadiusChanged(self, value):
+    def _defaultSceneNodeBorderRadiusChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__borderRadius is None:
             self.borderRadiusChanged.emit(value)
             self.__updateAllConnectorPosition()
 
-    def __defaultSceneNodeBorderSizeChanged(self, value):
+    def _defaultSceneNodeBorderSizeChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__borderSize is None:
             self.borderSizeChanged.emit(value)
 
-    def __defaultSceneNodePaddingChanged(self, value):
+    def _defaultSceneNodePaddingChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__padding is None:
             self.paddingChanged.emit(value)
 
-    def __defaultSceneConnectorRadiusChanged(self, value):
+    def _defaultSceneConnectorRadiusChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__defaultConnectorRadius is None:
             self.defaultConnectorRadiusChanged.emit(value)
             self.__updateAllConnectorPosition()
 
-    def __defaultSceneConnectorBorderSizeChanged(self, value):
+    def _defaultSceneConnectorBorderSizeChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__defaultConnectorBorderSize is None:
             self.defaultConnectorBorderSizeChanged.emit(value)
             self.__updateAllConnectorPosition()
 
-    def __defaultSceneConnectorBorderColorChanged(self, value):
+    def _defaultSceneConnectorBorderColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__defaultConnectorBorderColor is None:
             self.defaultConnectorBorderColorChanged.emit(value)
 
-    def __defaultSceneConnectorInputColorChanged(self, value):
+    def _defaultSceneConnectorInputColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__defaultConnectorInputColor is None:
             self.defaultConnectorInputColorChanged.emit(value)
 
-    def __defaultSceneConnectorOutputColorChanged(self, value):
+    def _defaultSceneConnectorOutputColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__defaultConnectorOutputColor is None:
             self.defaultConnectorOutputColorChanged.emit(value)
 
-    def __checkAddedLink(self, link):
-        """Check if added link is connected to node and emit signal if needed"""
+    def __defaultConnectorRadiusChanged(self, value):
+        """Default value for connectors has been changed; forward to connectors"""
+        for connector in list(self.__connectors.values()):
+            connector._defaultNodeConnectorRadiusChanged(value)
+
+    def __defaultConnectorBorderSizeChanged(self, value):
+        """Default value for connectors has been changed; forward to connectors"""
+        for connector in list(self.__connectors.values()):
+            connector._defaultNodeConnectorBorderSizeChanged(value)
+
+    def __defaultConnectorBorderColorChanged(self, value):
+        """Default value for connectors has been changed; forward to connectors"""
+        for connector in list(self.__connectors.values()):
+            connector._defaultNodeConnectorBorderColorChanged(value)
+
+    def __defaultConnectorInputColorChanged(self, value):
+        """Default value for input connectors has been changed; forward to input connectors"""
+        for connector in list(self.__connectors.values()):
+            if connector.isInput():
+                connector._defaultNodeConnectorInputColorChanged(value)
+
+    def __defaultConnectorOutputColorChanged(self, value):
+        """Default value for output connectors has been changed; forward to output connectors"""
+        for connector in list(self.__connectors.values()):
+            if connector.isOutput():
+                connector._defaultNodeConnectorOutputColorChanged(value)
+
+    def _checkAddedLink(self, link):
+        """Check if added link is connected to node and emit signal if needed
+
+        Called by scene when a link is added
+        """
         if link.connectorFrom().node() == self:
             self.connectorLinked.emit(self, link.connectorFrom())
         elif link.connectorTo().node() == self:
@@ -1836,8 +2409,11 @@ class NodeEditorNode(QObject):
                 link.connectorTo().setValue(link.connectorFrom().value())
             self.connectorLinked.emit(self, link.connectorTo())
 
-    def __checkRemovedLink(self, link):
-        """Check if removed link was connected to node and emit signal if needed"""
+    def _checkRemovedLink(self, link):
+        """Check if removed link was connected to node and emit signal if needed
+
+        Called by scene when a link is removed
+        """
         if link.connectorFrom().node() == self:
             self.connectorUnlinked.emit(self, link.connectorFrom())
         elif link.connectorTo().node() == self:
@@ -1851,13 +2427,12 @@ class NodeEditorNode(QObject):
         if self.__widget is not None:
             if connector.isInput():
                 # print('NodeEditorNode.__connectorValueChanged(input)', connector.id(), connector.value())
-                self.__widget.inputUpdated(connector.id(), connector.value())
-                self.inputValueChanged.emit(connector)
+                if not self.__scene._inputValueChanged(connector):
+                    self._inputsUpdated([connector])
             elif self.__scene.optionOutputEventEnabled():
                 # print('NodeEditorNode.__connectorValueChanged(output)', connector.id(), connector.value())
-                links = self.__scene.links(connector)
-                for link in links:
-                    link.connectorTo().setValue(connector.value())
+                # value is propagated to linked inputs by scene
+                self.__scene._outputValueChanged(connector)
                 self.outputValueChanged.emit(connector)  # node content
 
     def __outputUpdated(self, value):
@@ -1890,8 +2465,10 @@ class NodeEditorNode(QObject):
                 # restore node to initial zIndex
                 self.__grItem.setZValue(NodeEditorScene.NODE_ZINDEX)
             self.__isSelected = bool(value)
+            self.__scene._itemSelectionChanged(self, self.__isSelected)
             self.selectionChanged.emit(self.__isSelected)
         elif change == QGraphicsItem.ItemPositionHasChanged:
+            self.__scene._itemGeometryChanged(self)
             self.positionChanged.emit(value)
             self.__scene.setModified()
 
@@ -1994,6 +2571,16 @@ class NodeEditorNode(QObject):
         if self.__widget:
             self.__widget.updateOutputs(outputs)
 
+    def _inputsUpdated(self, connectors):
+        """Values for given input `connectors` have been modified
+
+        Widget is notified once for all connectors
+        """
+        if self.__widget is not None:
+            self.__widget.inputsUpdated({connector.id(): connector.value() for connector in connectors})
+            for connector in connectors:
+                self.inputValueChanged.emit(connector)
+
     def scene(self):
         """Return scene in which node is defined"""
         return self.__scene
@@ -2039,11 +2626,9 @@ class NodeEditorNode(QObject):
             # add signal connection when connector value is changed
             connector.valueChanged.connect(self.__connectorValueChanged)
 
-            self.defaultConnectorRadiusChanged.emit(self.defaultConnectorRadius())
-            self.defaultConnectorBorderSizeChanged.emit(self.defaultConnectorBorderSize())
-            self.defaultConnectorBorderColorChanged.emit(self.defaultConnectorBorderColor())
-            self.defaultConnectorInputColorChanged.emit(self.defaultConnectorInputColor())
-            self.defaultConnectorOutputColorChanged.emit(self.defaultConnectorOutputColor())
+            # default values are applied to new connector by setNode(), and
+            # are not modified for other connectors: no need to emit default
+            # values signals
 
             # need to recalculate positions
             self.__updateAllConnectorPosition()
@@ -2388,7 +2973,9 @@ class NodeEditorNode(QObject):
             return False
 
         if self.__scene.nodeFromId(id) is None:
+            previousId = self.__id
             self.__id = id
+            self.__scene._updateNodeId(self, previousId)
             return True
         else:
             return False
@@ -2443,7 +3030,9 @@ class NodeEditorNode(QObject):
                 properties = dataAsDict['properties']
 
                 if 'id' in properties and isinstance(properties['id'], str):
+                    previousId = self.__id
                     self.__id = properties['id']
+                    self.__scene._updateNodeId(self, previousId)
 
                 if 'title' in properties and isinstance(properties['title'], str):
                     self.setTitle(properties['title'])
@@ -2740,27 +3329,27 @@ class NodeEditorConnector(QObject):
         elif self.__location == NodeEditorConnector.LOCATION_BOTTOM_RIGHT:
             self.__grItem.setPos(self.__node.graphicItem().size().width() - self.__position, self.__node.graphicItem().size().height())
 
-    def __defaultNodeConnectorRadiusChanged(self, value):
+    def _defaultNodeConnectorRadiusChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__radius is None:
             self.radiusChanged.emit(value)
 
-    def __defaultNodeConnectorBorderSizeChanged(self, value):
+    def _defaultNodeConnectorBorderSizeChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__borderSize is None:
             self.borderSizeChanged.emit(value)
 
-    def __defaultNodeConnectorBorderColorChanged(self, value):
+    def _defaultNodeConnectorBorderColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__borderColor is None:
             self.borderColorChanged.emit(value)
 
-    def __defaultNodeConnectorInputColorChanged(self, value):
+    def _defaultNodeConnectorInputColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__color is None:
             self.colorChanged.emit(value)
 
-    def __defaultNodeConnectorOutputColorChanged(self, value):
+    def _defaultNodeConnectorOutputColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__color is None:
             self.colorChanged.emit(value)
@@ -2800,11 +3389,6 @@ class NodeEditorConnector(QObject):
         """
         if node is None:
             # connector has been removed from node??
-            if self.__node is not None:
-                self.__node.defaultConnectorRadiusChanged.disconnect(self.__defaultNodeConnectorRadiusChanged)
-                self.__node.defaultConnectorBorderSizeChanged.disconnect(self.__defaultNodeConnectorBorderSizeChanged)
-                self.__node.defaultConnectorBorderColorChanged.disconnect(self.__defaultNodeConnectorBorderColorChanged)
-
             self.__node = None
             self.__scene.grScene().removeItem(self.__grItem)
             self.__scene = None
@@ -2814,10 +3398,8 @@ class NodeEditorConnector(QObject):
             raise EInvalidType("Given `node` <NodeEditorNode>")
         elif self.__node is not None:
             raise EInvalidType("Node is is already defined for connector")
+        # default values changes are forwarded to connector by node
         self.__node = node
-        self.__node.defaultConnectorRadiusChanged.connect(self.__defaultNodeConnectorRadiusChanged)
-        self.__node.defaultConnectorBorderSizeChanged.connect(self.__defaultNodeConnectorBorderSizeChanged)
-        self.__node.defaultConnectorBorderColorChanged.connect(self.__defaultNodeConnectorBorderColorChanged)
 
         if self.__id is None:
             # id hasn't been provided
@@ -2827,11 +3409,6 @@ class NodeEditorConnector(QObject):
             else:
                 self.__id = f"cO.{node.connectorIndex():04X}.{self.__location:02X}"
 
-        if self.isInput():
-            self.__node.defaultConnectorInputColorChanged.connect(self.__defaultNodeConnectorInputColorChanged)
-        else:
-            self.__node.defaultConnectorOutputColorChanged.connect(self.__defaultNodeConnectorOutputColorChanged)
-
         self.__grItem.setParentItem(self.__node.graphicItem())
         self.__scene = self.__node.scene()
 
@@ -3150,11 +3727,8 @@ class NodeEditorLink(QObject):
             return
 
         # parent scene
+        # (default values changes are forwarded to link by scene)
         self.__scene = self.__fromConnector.node().scene()
-        self.__scene.defaultLinkRenderModeChanged.connect(self.__defaultSceneLinkRenderModeChanged)
-        self.__scene.defaultLinkSizeChanged.connect(self.__defaultSceneLinkSizeChanged)
-        self.__scene.defaultLinkColorChanged.connect(self.__defaultSceneLinkColorChanged)
-        self.__scene.defaultLinkSelectedColorChanged.connect(self.__defaultSceneLinkColorSelectedChanged)
 
         # QGraphicsItem for link
         self.__grItem = NodeEditorGrLink(self)
@@ -3176,22 +3750,22 @@ class NodeEditorLink(QObject):
             self.setConnectorTo(None)
             del self.__grItem
 
-    def __defaultSceneLinkRenderModeChanged(self, value):
+    def _defaultSceneLinkRenderModeChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__renderMode is None:
             self.renderModeChanged.emit(value)
 
-    def __defaultSceneLinkSizeChanged(self, value):
+    def _defaultSceneLinkSizeChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__size is None:
             self.sizeChanged.emit(value)
 
-    def __defaultSceneLinkColorChanged(self, value):
+    def _defaultSceneLinkColorChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__color is None:
             self.colorChanged.emit(value)
 
-    def __defaultSceneLinkColorSelectedChanged(self, value):
+    def _defaultSceneLinkColorSelectedChanged(self, value):
         """Default value from scene has been changed; check for update"""
         if self.__colorSelected is None:
             self.colorSelectedChanged.emit(value)
@@ -3221,6 +3795,7 @@ class NodeEditorLink(QObject):
                 # restore node to initial zIndex
                 self.__grItem.setZValue(NodeEditorScene.LINK_ZINDEX)
             self.__isSelected = bool(value)
+            self.__scene._itemSelectionChanged(self, self.__isSelected)
             self.selectionChanged.emit(self.__isSelected)
 
     def isValid(self):
@@ -3310,6 +3885,7 @@ class NodeEditorLink(QObject):
 
         if renderMode != self.__renderMode:
             self.__renderMode = renderMode
+            self.__scene._itemGeometryChanged(self)
             self.renderModeChanged.emit(self.renderMode())
 
     def size(self):
@@ -3524,6 +4100,20 @@ class NodeEditorNodeWidget(QWidget):
         """
         pass
 
+    def inputsUpdated(self, inputs):
+        """Input entries have been updated
+
+        Given `inputs` is a dictionary (key=input id, value=input value)
+
+        Automatically called by node when input values have been changed; when
+        outputs are propagated by scene, called once with all modified inputs
+
+        Default implementation calls inputUpdated() for each input; can be
+        overrided to process all inputs at once
+        """
+        for inputId, value in inputs.items():
+            self.inputUpdated(inputId, value)
+
     def updateOutput(self, outputId, value):
         """Update output defined by `outputId` with given `value`"""
         self.outputUpdated.emit({outputId: value})
@@ -3597,7 +4187,9 @@ class NodeEditorGrTitleButton(QGraphicsWidget):
 
         self.__node = node
         self.__size = QSize()
-        self.__icon = buildIcon(name)
+        self.__name = name
+        # icon and rendered pixmaps are shared by all buttons
+        self.__icon = ProceduralCache.get(('nodeTitleButtonIcon', name), lambda: buildIcon(name))
         self.__pixmap = None
         self.__color = self.__node.titleColor()
 
@@ -3629,6 +4221,9 @@ class NodeEditorGrTitleButton(QGraphicsWidget):
 
     def paint(self, painter, option, widget=None):
         """Paint button"""
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < NodeEditorScene.LOD_SIMPLIFIED:
+            return
+
         painter.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform)
         if self.__bgBrush.style() != Qt.NoBrush:
             painter.setBrush(self.__bgBrush)
@@ -3640,7 +4235,11 @@ class NodeEditorGrTitleButton(QGraphicsWidget):
     def updateColor(self, color=None):
         if isinstance(color, QColor):
             self.__color = color
-        self.__pixmap = paintOpaqueAsColor(self.__icon.pixmap(self.__size), self.__color)
+        # icon pixmap is rendered for application device pixel ratio (and cached by QIcon)
+        pixmap = self.__icon.pixmap(self.__size)
+        self.__pixmap = ProceduralCache.get(('nodeTitleButtonPixmap', self.__name, self.__size.width(), self.__size.height(), pixmap.devicePixelRatio(),
+                                             ProceduralCache.colorKey(self.__color)),
+                                            lambda: paintOpaqueAsColor(pixmap, self.__color))
 
     def setSize(self, size):
         """Set size for close button"""
@@ -3664,6 +4263,10 @@ class NodeEditorGrScene(QGraphicsScene):
     __SECONDARY_FACTOR_OPACITY = 0.5    # define opacity of secondary grid relative to main grid
     __FULFILL_FACTOR_OPACITY = 0.75     # define opacity of position fulfill
 
+    __GRID_MIN_SPACING = 4              # minimum space (in pixels) between 2 grid strokes; below, strokes are not drawn
+    __GRID_TILE_MAX_SIZE = 2048         # maximum size (in pixels) for a grid tile
+    __GRID_TILE_CACHE_SIZE = 32         # maximum number of grid tiles kept in cache
+
     def __init__(self, scene, parent=None):
         super(NodeEditorGrScene, self).__init__(parent)
 
@@ -3685,9 +4288,10 @@ class NodeEditorGrScene(QGraphicsScene):
         self.__sceneBounds = None
 
         # internal data for rendering
-        self.__gridStrokesRect = QRect()
-        self.__gridStrokesMain = []
-        self.__gridStrokesSecondary = []
+        # grid tiles brushes cache
+        # - key: tuple (zoom bucket, grid settings)
+        # - value: QBrush
+        self.__gridTiles = {}
         self.__viewZoom = 1.0
 
         self.__mouseScenePos = QPointF(0, 0)
@@ -3701,40 +4305,63 @@ class NodeEditorGrScene(QGraphicsScene):
         """Emit signal for variable name"""
         self.propertyChanged.emit((name, value))
 
-    def __generateGridStrokes(self, rect):
-        """Generate grid strokes (avoid to regenerate them on each update)"""
-        if rect == self.__gridStrokesRect and len(self.__gridStrokesSecondary) > 0 and len(self.__gridStrokesMain) > 0:
-            # viewport is the same, keep current grid definition
-            return
+    def __gridTileBrush(self, zoom):
+        """Return a textured brush to render grid for given `zoom` level
 
-        self.__gridStrokesSecondary = []
-        self.__gridStrokesMain = []
+        The brush texture is a tile (from a main stroke to the next one) aligned
+        on scene origin; tiles are cached according to zoom level & grid settings
 
-        # bounds
-        left = int(math.floor(rect.left()))
-        right = int(math.ceil(rect.right()))
-        top = int(math.floor(rect.top()))
-        bottom = int(math.ceil(rect.bottom()))
+        Return None if grid strokes are too close to be drawn
+        """
+        # zoom is rounded to 5% steps
+        zoomBucket = max(0.01, round(zoom*20)/20)
 
-        firstLeftStroke = left - (left % self.__gridSizeWidth)
-        firstTopStroke = top - (top % self.__gridSizeWidth)
+        # number of secondary strokes between 2 main strokes
+        mainStroke = max(1, self.__gridSizeMain)
+        tileSize = self.__gridSizeWidth * mainStroke
 
-        # frequency of main strokes
-        mainStroke = max(1, self.__gridSizeWidth * self.__gridSizeMain)
+        if tileSize * zoomBucket < NodeEditorGrScene.__GRID_MIN_SPACING:
+            # even main strokes are too close
+            return None
 
-        # generate vertical grid lines
-        for positionX in range(firstLeftStroke, right, self.__gridSizeWidth):
-            if (positionX % mainStroke != 0):
-                self.__gridStrokesSecondary.append(QLine(positionX, top, positionX, bottom))
-            else:
-                self.__gridStrokesMain.append(QLine(positionX, top, positionX, bottom))
+        # at low zoom, draw only main strokes
+        drawSecondary = (mainStroke > 1 and self.__gridSizeWidth * zoomBucket >= NodeEditorGrScene.__GRID_MIN_SPACING)
 
-        # generate horizontal grid lines
-        for positionY in range(firstTopStroke, bottom, self.__gridSizeWidth):
-            if (positionY % mainStroke != 0):
-                self.__gridStrokesSecondary.append(QLine(left, positionY, right, positionY))
-            else:
-                self.__gridStrokesMain.append(QLine(left, positionY, right, positionY))
+        key = (zoomBucket, self.__gridSizeWidth, mainStroke, drawSecondary,
+               self.__gridPenMain.color().rgba(), self.__gridPenMain.style(),
+               self.__gridPenSecondary.color().rgba(), self.__gridPenSecondary.style())
+
+        if key in self.__gridTiles:
+            return self.__gridTiles[key]
+
+        pixelSize = min(NodeEditorGrScene.__GRID_TILE_MAX_SIZE, max(1, round(tileSize * zoomBucket)))
+        scale = pixelSize / tileSize
+
+        pixmap = QPixmap(pixelSize, pixelSize)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        if drawSecondary:
+            painter.setPen(self.__gridPenSecondary)
+            for index in range(1, mainStroke):
+                position = round(index * self.__gridSizeWidth * scale)
+                painter.drawLine(position, 0, position, pixelSize)
+                painter.drawLine(0, position, pixelSize, position)
+
+        painter.setPen(self.__gridPenMain)
+        painter.drawLine(0, 0, 0, pixelSize)
+        painter.drawLine(0, 0, pixelSize, 0)
+        painter.end()
+
+        # brush texture is scaled back to scene units
+        brush = QBrush(pixmap)
+        brush.setTransform(QTransform.fromScale(1/scale, 1/scale))
+
+        if len(self.__gridTiles) >= NodeEditorGrScene.__GRID_TILE_CACHE_SIZE:
+            self.__gridTiles = {}
+        self.__gridTiles[key] = brush
+
+        return brush
 
     def __calculateSceneSize(self):
         """Calculate scene size/rect"""
@@ -3761,20 +4388,13 @@ class NodeEditorGrScene(QGraphicsScene):
         """Draw background grid fro scene..."""
         super(NodeEditorGrScene, self).drawBackground(painter, rect)
 
-        # generate grid lines
-        self.__generateGridStrokes(rect)
-
-        # draw the lines
-        # -> if grid is not visible, there's no strokes generated
-        if self.__gridVisible and len(self.__gridStrokesSecondary) > 0:
-            painter.setPen(self.__gridPenSecondary)
-            painter.drawLines(*self.__gridStrokesSecondary)
-
-        if self.__gridVisible and len(self.__gridStrokesMain) > 0:
-            painter.setPen(self.__gridPenMain)
-            painter.drawLines(*self.__gridStrokesMain)
+        if not self.__gridVisible:
+            return
 
-        self.__gridStrokesRect = rect
+        # grid is rendered from a cached tile, according to current zoom level
+        brush = self.__gridTileBrush(painter.transform().m11())
+        if brush is not None:
+            painter.fillRect(rect, brush)
 
     def mouseMoveEvent(self, event):
         """Mouse move over scene"""
@@ -3788,15 +4408,11 @@ class NodeEditorGrScene(QGraphicsScene):
             # position
             link.graphicItem().update()
 
-            # check if mouse is over an item
-            if isinstance(event.widget(), QGraphicsView):
-                # in this case, event.widget() is the current view then use
-                # current view QTransform value
-                hoverItem = self.itemAt(self.__mouseScenePos, event.widget().transform())
-            else:
-                # in this case, event.widget() is???
-                # use a default QTransform value (I suppose this can't occurs, but...)
-                hoverItem = self.itemAt(self.__mouseScenePos, QTransform())
+            # check if mouse is over a connector
+            # (use scene spatial index rather than checking all graphic items)
+            hoverItem = self.__scene.connectorAt(self.__mouseScenePos)
+            if hoverItem is not None:
+                hoverItem = hoverItem.graphicItem()
 
             # check in scene if mouse is over a connector
             if isinstance(hoverItem, NodeEditorGrConnector):
@@ -3889,7 +4505,19 @@ class NodeEditorGrScene(QGraphicsScene):
     # --------------------------------------------------------------------------
     # setters
     # --------------------------------------------------------------------------
+    def viewZoom(self):
+        """Return current view zoom"""
+        return self.__viewZoom
+
     def setViewZoom(self, value):
+        """Set current view zoom
+
+        Node's widgets are hidden when zoom is below simplified level of detail
+        """
+        widgetVisible = (value >= NodeEditorScene.LOD_SIMPLIFIED)
+        if widgetVisible != (self.__viewZoom >= NodeEditorScene.LOD_SIMPLIFIED):
+            for node in self.__scene.nodes():
+                node.graphicItem().setWidgetVisible(widgetVisible)
         self.__viewZoom = value
 
     def setGridVisible(self, value):
@@ -3904,10 +4532,6 @@ class NodeEditorGrScene(QGraphicsScene):
         Given `main` is an integer that define to draw a main line everything `main` line
         """
         if width != self.__gridSizeWidth or main != self.__gridSizeMain:
-            # force grid to be recalculated
-            self.__gridStrokesRect = QRect()
-            self.__gridStrokesSecondary = []
-            self.__gridStrokesMain = []
             self.__gridSizeWidth = max(2, round(width))
             self.__gridSizeMain = max(0, main)
             self.__propertyChanged('canvas.grid.size.main', self.__gridSizeMain)
@@ -4056,9 +4680,8 @@ class NodeEditorGrNode(QGraphicsItem):
         self.__titleSize = QSize()
 
         # define close button
-        self.__itemTitleCloseButton = NodeEditorGrTitleButton('pktk:close', self.__node, self)
-        self.__itemTitleCloseButton.clicked.connect(self.__remove)
-        self.__itemTitleCloseButton.setVisible(False)
+        # (hidden by default: button is created when displayed for the first time)
+        self.__itemTitleCloseButton = None
         self.__itemTitleCloseButtonVisibility = False
 
         # node's bounding rect is calculated and stored when size/border size is modified
@@ -4083,6 +4706,7 @@ class NodeEditorGrNode(QGraphicsItem):
                 self.__proxyWidget = QGraphicsProxyWidget(self)
                 self.__proxyWidget.setZValue(NodeEditorScene.WIDGET_ZINDEX)
                 self.__proxyWidget.setWidget(widget)
+                self.__proxyWidget.setVisible(self.__node.scene().grScene().viewZoom() >= NodeEditorScene.LOD_SIMPLIFIED)
 
         if self.__proxyWidget is None:
             return
@@ -4107,7 +4731,8 @@ class NodeEditorGrNode(QGraphicsItem):
             self.__titleTextColor = value
             if not self.isSelected():
                 self.__titleColor = self.__titleTextColor
-                self.__itemTitleCloseButton.updateColor(self.__titleColor)
+                if self.__itemTitleCloseButton is not None:
+                    self.__itemTitleCloseButton.updateColor(self.__titleColor)
                 self.update()
 
     def __updateTitleBgColor(self, value):
@@ -4125,7 +4750,8 @@ class NodeEditorGrNode(QGraphicsItem):
             self.__titleTextColorSelected = value
             if self.isSelected():
                 self.__titleColor = self.__titleTextColorSelected
-                self.__itemTitleCloseButton.updateColor(self.__titleColor)
+                if self.__itemTitleCloseButton is not None:
+                    self.__itemTitleCloseButton.updateColor(self.__titleColor)
                 self.update()
 
     def __updateTitleSelectorBgColor(self, value):
@@ -4222,7 +4848,7 @@ class NodeEditorGrNode(QGraphicsItem):
         # calculate title bounds from text + font metrics
         self.__titleTextBounds = self.__titleFontMetrics.boundingRect(QRect(0, 0, 800, 100), 0, self.__titleText)
 
-        if self.__itemTitleCloseButton.isVisible():
+        if self.__itemTitleCloseButton is not None and self.__itemTitleCloseButton.isVisible():
             # button size: width=height=title text height
             buttonSize = self.__titleTextBounds.height()
             self.__itemTitleCloseButton.setSize(QSize(buttonSize, buttonSize))
@@ -4249,13 +4875,14 @@ class NodeEditorGrNode(QGraphicsItem):
         # self.__titleTextBounds.moveTo(padding, padding)
         self.__titleTextBounds.translate(padding, padding)
 
-        if self.__itemTitleCloseButton.isVisible():
+        if self.__itemTitleCloseButton is not None and self.__itemTitleCloseButton.isVisible():
             # if button is visible, position have to be updated, otherwise we don't care
             self.__itemTitleCloseButton.setPos(self.__size.width()-padding-buttonSize, padding)
 
         self.__updateBoundingRect()
         self.__updateWidgetGeometry()
         self.prepareGeometryChange()
+        self.__node.scene()._itemGeometryChanged(self.__node)
 
     def __updateBoundingRect(self):
         """Calculate bounding rect according to connector properties"""
@@ -4270,7 +4897,8 @@ class NodeEditorGrNode(QGraphicsItem):
                 self.__titleColor = self.__titleTextColorSelected
             else:
                 self.__titleColor = self.__titleTextColor
-            self.__itemTitleCloseButton.updateColor(self.__titleColor)
+            if self.__itemTitleCloseButton is not None:
+                self.__itemTitleCloseButton.updateColor(self.__titleColor)
         elif change == QGraphicsItem.ItemPositionChange:
             if self.__node.scene().optionSnapToGrid():
                 # snap to grid, force position to be aligned to grid
@@ -4306,8 +4934,23 @@ class NodeEditorGrNode(QGraphicsItem):
         """Return boundingRect for node"""
         return self.__boundingRect
 
+    def setWidgetVisible(self, value):
+        """Set if node's widget is visible"""
+        if self.__proxyWidget is not None:
+            self.__proxyWidget.setVisible(value)
+
     def paint(self, painter, options, widget=None):
         """Render node"""
+        levelOfDetail = options.levelOfDetailFromTransform(painter.worldTransform())
+
+        if levelOfDetail < NodeEditorScene.LOD_MINIMAL:
+            # too small to be readable, just render a filled rect
+            if self.isSelected():
+                painter.fillRect(QRectF(0, 0, self.__size.width(), self.__size.height()), self.__titleBrushSelected)
+            else:
+                painter.fillRect(QRectF(0, 0, self.__size.width(), self.__size.height()), self.__titleBrush)
+            return
+
         painter.setRenderHints(QPainter.Antialiasing | QPainter.SmoothPixmapTransform | QPainter.TextAntialiasing, True)
 
         # -- calculate paths --
@@ -4352,6 +4995,10 @@ class NodeEditorGrNode(QGraphicsItem):
         painter.setBrush(Qt.NoBrush)
         painter.drawPath(pathWindowBorder)
 
+        if levelOfDetail < NodeEditorScene.LOD_SIMPLIFIED:
+            # title text is not readable
+            return
+
         # -- draw title text --
         painter.setPen(QPen(self.__titleColor))
         painter.setFont(self.__titleFont)
@@ -4365,7 +5012,14 @@ class NodeEditorGrNode(QGraphicsItem):
         if isinstance(value, bool):
             self.__itemTitleCloseButtonVisibility = value
 
-        self.__itemTitleCloseButton.setVisible(self.__itemTitleCloseButtonVisibility and self.__node.isRemovable())
+        visible = self.__itemTitleCloseButtonVisibility and self.__node.isRemovable()
+        if visible and self.__itemTitleCloseButton is None:
+            self.__itemTitleCloseButton = NodeEditorGrTitleButton('pktk:close', self.__node, self)
+            self.__itemTitleCloseButton.clicked.connect(self.__remove)
+            self.__itemTitleCloseButton.updateColor(self.__titleColor)
+
+        if self.__itemTitleCloseButton is not None:
+            self.__itemTitleCloseButton.setVisible(visible)
         self.__updateSize()
 
 
@@ -4494,6 +5148,9 @@ class NodeEditorGrConnector(QGraphicsItem):
 
     def paint(self, painter, options, widget=None):
         """Render connector"""
+        if options.levelOfDetailFromTransform(painter.worldTransform()) < NodeEditorScene.LOD_MINIMAL:
+            return
+
         painter.setRenderHints(QPainter.Antialiasing, True)
         painter.setPen(self.__borderPen)
         painter.setBrush(self.__brush)
@@ -4555,6 +5212,10 @@ class NodeEditorGrLink(QGraphicsPathItem):
         # define if link have a START/END values defined (by default, True)
         self.__isLinked = True
 
+        # from/to points, linked flag and render mode for which current path
+        # has been calculated
+        self.__pathKey = None
+
         # define link border
         self.__borderSize = 2.0
 
@@ -4591,6 +5252,12 @@ class NodeEditorGrLink(QGraphicsPathItem):
             self.__isLinked = True
             toPoint = self.__link.connectorTo().graphicItem().scenePos()
 
+        pathKey = (fromPoint, toPoint, self.__isLinked, self.__link.renderMode())
+        if pathKey == self.__pathKey:
+            # nothing has been modified, current path is still valid
+            return
+        self.__pathKey = pathKey
+
         # initialise path
         pathLink = QPainterPath()
         if self.__link.renderMode() == NodeEditorLink.RENDER_DIRECT or not self.__isLinked:
@@ -4688,6 +5355,11 @@ class NodeEditorGrLink(QGraphicsPathItem):
         self.__borderPen.setColor(QColor(value))
         self.update()
 
+    def updatePath(self):
+        """Force path to be recalculated from current connectors position"""
+        self.__pathKey = None
+        self.__updatePath()
+
     def __colorSelectedUpdated(self, value):
         """Color has been updated for selected link"""
         self.__borderPenSelected.setColor(QColor(value))
@@ -4707,8 +5379,6 @@ class NodeEditorGrLink(QGraphicsPathItem):
 
     def paint(self, painter, options, widget=None):
         """Render link"""
-        painter.setRenderHints(QPainter.Antialiasing, True)
-
         # update path if needed
         self.__updatePath()
 
@@ -4718,6 +5388,18 @@ class NodeEditorGrLink(QGraphicsPathItem):
         else:
             pen = QPen(self.__borderPen)
 
+        if options.levelOfDetailFromTransform(painter.worldTransform()) < NodeEditorScene.LOD_MINIMAL:
+            # too small to see curves/angles, just render a straight line
+            path = self.path()
+            if path.elementCount() > 1:
+                first = path.elementAt(0)
+                last = path.elementAt(path.elementCount()-1)
+                painter.setPen(pen)
+                painter.drawLine(QPointF(first.x, first.y), QPointF(last.x, last.y))
+            return
+
+        painter.setRenderHints(QPainter.Antialiasing, True)
+
         if not self.__isLinked:
             # if not linked, draw a bullet at current 'end' position
             painter.setPen(Qt.NoPen)
@@ -4863,6 +5545,12 @@ class WNodeEditorView(QGraphicsView):
         self.setDragMode(QGraphicsView.NoDrag)
 
         self.__cutLine = scene.cutLine()
+
+        # rubber band selection is managed by view, to use scene spatial index
+        # rather than checking all graphic items
+        self.__rubberBand = QRubberBand(QRubberBand.Rectangle, self.viewport())
+        self.__rubberBandOrigin = None
+
         self.__minimumZoomFactor = 0.01
         self.__maximumZoomFactor = 1.0
         self.__currentZoomFactor = 1.0
@@ -4886,7 +5574,11 @@ class WNodeEditorView(QGraphicsView):
         if event.button() == Qt.LeftButton:
             hoverItem = self.itemAt(event.pos())
             if event.modifiers() & Qt.ShiftModifier == Qt.ShiftModifier:
-                self.setDragMode(QGraphicsView.RubberBandDrag)
+                self.setDragMode(QGraphicsView.NoDrag)
+                if hoverItem is None:
+                    self.__rubberBandOrigin = event.pos()
+                    self.__rubberBand.setGeometry(QRect(self.__rubberBandOrigin, QSize()))
+                    self.__rubberBand.show()
             elif event.modifiers() & Qt.AltModifier == Qt.AltModifier:
                 if self.__scene.optionCutLineActive():
                     self.setCursor(Qt.CrossCursor)
@@ -4915,6 +5607,9 @@ class WNodeEditorView(QGraphicsView):
             self.__cutLine.setVisible(False)
             self.__cutLine.clear()
             self.unsetCursor()
+        elif event.button() == Qt.LeftButton and self.__rubberBandOrigin is not None:
+            self.__rubberBand.hide()
+            self.__rubberBandOrigin = None
 
         super(WNodeEditorView, self).mouseReleaseEvent(event)
 
@@ -4922,6 +5617,12 @@ class WNodeEditorView(QGraphicsView):
         """Mouse is moving..."""
         if event.buttons() & Qt.LeftButton == Qt.LeftButton and self.__cutLine.isVisible():
             self.__cutLine.appendPosition(self.mapToScene(event.pos()))
+        elif event.buttons() & Qt.LeftButton == Qt.LeftButton and self.__rubberBandOrigin is not None:
+            rect = QRect(self.__rubberBandOrigin, event.pos()).normalized()
+            self.__rubberBand.setGeometry(rect)
+            self.__scene.selectInRect(self.mapToScene(rect).boundingRect(),
+                                      addToSelection=(event.modifiers() & Qt.ControlModifier == Qt.ControlModifier),
+                                      mode=self.rubberBandSelectionMode())
 
         super(WNodeEditorView, self).mouseMoveEvent(event)
 
@@ -18,8 +18,13 @@
 #       Widget
 #       An input widget with optinal buttons
 #
+# - SearchFromPlainTextEdit:
+#       Search/replace occurences in a QPlainTextEdit
+#       (search all is executed in a background thread)
+#
 # -----------------------------------------------------------------------------
 
+from bisect import (bisect_left, bisect_right)
 import html
 import re
 
@@ -36,6 +41,8 @@ from ..modules.utils import replaceLineEditClearButton
 from ..modules.imgutils import buildIcon
 from .wseparator import WVLine
 
+from ..pktk import *
+
 
 class SearchOptions:
     REGEX =               0b0000000000000001
@@ -499,17 +506,185 @@ class WSearchInput(QWidget):
         return self.__leReplace
 
 
-class SearchFromPlainTextEdit:
-    """Provide high level method to search ocurences in a QPlainTextEdit"""
+class SearchFromPlainTextEditPattern(object):
+    """Search rules used by SearchFromPlainTextEdit
+
+    Occurences are searched line by line (block by block) like
+    QTextDocument.find() does: an occurence can't be found across lines.
+    Background index and searchNext() use the same rules
+
+    Like QTextDocument.find(), a QRegularExpression is used: regular
+    expressions syntax (PCRE) is the same than before background search, and
+    positions are UTF-16 based like QTextDocument positions
+
+    Not aimed to be instancied directly, just use SearchFromPlainTextEdit
+    """
+
+    def __init__(self, text, options):
+        self.__wholeWords = (options & SearchOptions.WHOLEWORD == SearchOptions.WHOLEWORD)
+
+        if options & SearchOptions.REGEX != SearchOptions.REGEX:
+            text = QRegularExpression.escape(text)
+
+        if options & SearchOptions.CASESENSITIVE == SearchOptions.CASESENSITIVE:
+            patternOptions = QRegularExpression.NoPatternOption
+        else:
+            patternOptions = QRegularExpression.CaseInsensitiveOption
+
+        self.__pattern = QRegularExpression(text, patternOptions)
+        if not self.__pattern.isValid():
+            self.__pattern = None
+
+    def isValid(self):
+        """Return True if pattern is a valid regular expression"""
+        return self.__pattern is not None
+
+    def occurences(self, line):
+        """Return occurences found in given `line`, as a list of tuple(start, end)
+
+        Positions are relative to line start, as QTextDocument positions
+        (UTF-16 based: characters outside BMP count for 2 positions)
+        """
+        if self.__pattern is None:
+            return []
+
+        # like QTextDocument.find()
+        line = line.replace('\u00a0', ' ')
+        length = SearchFromPlainTextEditPattern.utf16Length(line)
+
+        if length != len(line):
+            # UTF-16 positions of characters outside BMP
+            astralPositions = [match.start() + index for index, match in enumerate(re.finditer('[\U00010000-\U0010FFFF]', line))]
+        else:
+            astralPositions = []
+
+        def character(position):
+            # return character at given UTF-16 position
+            return line[position - bisect_left(astralPositions, position)]
+
+        def nextPosition(position):
+            # return UTF-16 position of character after the one at given position
+            if len(astralPositions) > 0 and ord(character(position)) > 0xFFFF:
+                return position + 2
+            return position + 1
+
+        returned = []
+        position = 0
+        while position <= length:
+            match = self.__pattern.match(line, position)
+            if not match.hasMatch():
+                break
+
+            start = match.capturedStart()
+            end = match.capturedEnd()
+            if start == end:
+                # ignore empty match
+                if start >= length:
+                    break
+                position = nextPosition(start)
+                continue
+
+            if self.__wholeWords and ((start > 0 and character(start - 1).isalnum()) or (end < length and character(end).isalnum())):
+                # like QTextDocument.FindWholeWords: not a whole word if preceded
+                # or followed by a letter or a number
+                position = nextPosition(start)
+                continue
+
+            returned.append((start, end))
+            position = end
+
+        return returned
+
+    @staticmethod
+    def utf16Length(line):
+        """Return length of `line` in QTextDocument positions"""
+        return len(line.encode('utf-16-le')) >> 1
+
+
+class SearchFromPlainTextEditWorkerSignals(QObject):
+    processed = Signal(int, list)       # search id, list of tuple(start, end)
+    finished = Signal(int, int)         # search id, number of occurences found
+
+
+class SearchFromPlainTextEditWorker(QRunnable):
+    """Search all occurences of a pattern in a text, in a background thread
+
+    Not aimed to be instancied directly, just use SearchFromPlainTextEdit
+    """
+    CHUNK_SIZE = 2500
+
+    def __init__(self, search, searchId, text, pattern, maxOccurences):
+        super(SearchFromPlainTextEditWorker, self).__init__()
+        self.__search = search
+        self.__searchId = searchId
+        self.__text = text
+        self.__pattern = pattern
+        self.__maxOccurences = maxOccurences
+        self.signals = SearchFromPlainTextEditWorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        """Search occurences, line by line
+
+        Found occurences are returned by chunks, as position in document
+        """
+        found = []
+        nbFound = 0
+        position = 0
+        for lineNumber, line in enumerate(self.__text.split('\n')):
+            for start, end in self.__pattern.occurences(line):
+                found.append((position + start, position + end))
+                nbFound += 1
+
+                if nbFound >= self.__maxOccurences:
+                    break
+
+            if nbFound >= self.__maxOccurences:
+                break
+
+            if len(found) >= SearchFromPlainTextEditWorker.CHUNK_SIZE:
+                if self.__search.isCancelled(self.__searchId):
+                    return
+                self.signals.processed.emit(self.__searchId, found)
+                found = []
+            elif lineNumber % 10000 == 0 and self.__search.isCancelled(self.__searchId):
+                return
+
+            # +1 for block separator
+            position += SearchFromPlainTextEditPattern.utf16Length(line) + 1
+
+        if self.__search.isCancelled(self.__searchId):
+            return
+
+        if len(found) > 0:
+            self.signals.processed.emit(self.__searchId, found)
+        self.signals.finished.emit(self.__searchId, nbFound)
+
+
+class SearchFromPlainTextEdit(QObject):
+    """Provide high level method to search ocurences in a QPlainTextEdit
+
+    Search all occurences is made in a background thread and builds a sorted
+    index of occurences positions; highlighting is only applied to occurences
+    near visible area
+    When document is modified, only modified blocks are searched again
+    """
+    searchAllProgress = Signal(int)     # number of occurences found so far
+    searchAllFinished = Signal(int)     # search all has been finished (or index updated); number of occurences found
 
     COLOR_SEARCH_ALL = 0
     COLOR_SEARCH_CURRENT_BG = 'highlightSearchCurrent.bg'
     COLOR_SEARCH_CURRENT_FG = 'highlightSearchCurrent.fg'
 
+    # maximum number of occurences stored in index
+    MAX_OCCURENCES = 250000
+
     def __init__(self, plainTextEdit):
         if not isinstance(plainTextEdit, QPlainTextEdit):
             raise EInvalidType("Given `plainTextEdit` must be a <QPlainTextEdit>")
 
+        super(SearchFromPlainTextEdit, self).__init__(plainTextEdit)
+
         self.__plainTextEdit = plainTextEdit
 
         # search results
@@ -517,12 +692,36 @@ class SearchFromPlainTextEdit:
         self.__extraSelectionsFoundCurrent = None
         self.__lastFound = None
 
+        # search all index
+        # - search id, incremented on each search (allows to cancel running search)
+        # - search key (text, options) and pattern for which index has been built
+        # - start/end positions of occurences (sorted)
+        # - index is complete or not
+        # - document modifications made while index is built, merged as a
+        #   tuple(start, previous end, new end)
+        # - range (start, end) of document for which extra selections have been built
+        self.__searchId = 0
+        self.__searchKey = None
+        self.__searchPattern = None
+        self.__searchHighlight = False
+        self.__indexStarts = []
+        self.__indexEnds = []
+        self.__indexComplete = False
+        self.__pendingChange = None
+        self.__materializedRange = None
+
+        self.__threadPool = QThreadPool()
+        self.__threadPool.setMaxThreadCount(1)
+
         self.__searchColors = {
                 SearchFromPlainTextEdit.COLOR_SEARCH_ALL:           QColor("#77ffc706"),
                 SearchFromPlainTextEdit.COLOR_SEARCH_CURRENT_BG:    QColor("#9900b86f"),
                 SearchFromPlainTextEdit.COLOR_SEARCH_CURRENT_FG:    QColor("#ffff00")
             }
 
+        self.__plainTextEdit.document().contentsChange.connect(self.__documentModified)
+        self.__plainTextEdit.verticalScrollBar().valueChanged.connect(self.__updateVisibleSelections)
+
     def __highlightedSelections(self):
         """Build extra selection for highlighting"""
         foundCurrentAdded = False
@@ -542,6 +741,219 @@ class SearchFromPlainTextEdit:
 
         return returned
 
+    def __searchKeyFor(self, text, options):
+        """Return key identifying search made with given `text` and `options`"""
+        return (text, options & (SearchOptions.REGEX | SearchOptions.CASESENSITIVE | SearchOptions.WHOLEWORD))
+
+    def __documentModified(self, position, charsRemoved, charsAdded):
+        """Document content has been modified: update index for modified blocks"""
+        if self.__searchKey is None or not self.__searchPattern.isValid():
+            return
+
+        if self.__indexComplete:
+            self.__updateIndex(position, charsRemoved, charsAdded)
+        elif self.__pendingChange is None:
+            # index is currently built from a previous content of document;
+            # keep modified range, index will be updated once built
+            self.__pendingChange = (position, position + charsRemoved, position + charsAdded)
+        else:
+            # merge with previous modifications
+            start, previousEnd, newEnd = self.__pendingChange
+            end = max(newEnd, position + charsRemoved)
+            self.__pendingChange = (min(start, position), end - (newEnd - previousEnd), end + charsAdded - charsRemoved)
+
+    def __updateIndex(self, position, charsRemoved, charsAdded):
+        """Update index for a modified range of document
+
+        Only blocks impacted by modification are searched again; occurences
+        after them are moved
+        """
+        document = self.__plainTextEdit.document()
+
+        firstBlock = document.findBlock(position)
+        if not firstBlock.isValid():
+            firstBlock = document.lastBlock()
+        lastBlock = document.findBlock(position + charsAdded)
+        if not lastBlock.isValid():
+            lastBlock = document.lastBlock()
+
+        rangeStart = firstBlock.position()
+        rangeEnd = lastBlock.position() + lastBlock.length()
+        delta = charsAdded - charsRemoved
+
+        # occurences in range (before modification) are replaced
+        fromIndex = bisect_left(self.__indexStarts, rangeStart)
+        toIndex = bisect_left(self.__indexStarts, rangeEnd - delta)
+
+        starts = []
+        ends = []
+        block = firstBlock
+        while block.isValid():
+            blockPosition = block.position()
+            for start, end in self.__searchPattern.occurences(block.text()):
+                starts.append(blockPosition + start)
+                ends.append(blockPosition + end)
+
+            if block == lastBlock:
+                break
+            block = block.next()
+
+        if delta == 0:
+            starts += self.__indexStarts[toIndex:]
+            ends += self.__indexEnds[toIndex:]
+        else:
+            starts += [start + delta for start in self.__indexStarts[toIndex:]]
+            ends += [end + delta for end in self.__indexEnds[toIndex:]]
+
+        self.__indexStarts[fromIndex:] = starts
+        self.__indexEnds[fromIndex:] = ends
+
+        self.__updateVisibleSelections(True)
+        self.searchAllFinished.emit(len(self.__indexStarts))
+
+    def __workerProcessed(self, searchId, found):
+        """Worker has found occurences"""
+        if searchId != self.__searchId:
+            return
+
+        for start, end in found:
+            self.__indexStarts.append(start)
+            self.__indexEnds.append(end)
+
+        self.searchAllProgress.emit(len(self.__indexStarts))
+
+        if self.__pendingChange is None and self.__searchHighlight and (self.__materializedRange is None or found[0][0] <= self.__materializedRange[1]):
+            # new occurences might be in visible area
+            self.__updateVisibleSelections(True)
+
+    def __workerFinished(self, searchId, nbFound):
+        """Worker has finished"""
+        if searchId != self.__searchId:
+            return
+        self.__indexComplete = True
+
+        if self.__pendingChange is not None:
+            # document has been modified while index was built
+            start, previousEnd, newEnd = self.__pendingChange
+            self.__pendingChange = None
+            self.__updateIndex(start, previousEnd - start, newEnd - start)
+        else:
+            self.searchAllFinished.emit(nbFound)
+
+    def __visibleRange(self):
+        """Return range of document positions (start, end) around visible area"""
+        viewportRect = self.__plainTextEdit.viewport().rect()
+        start = self.__plainTextEdit.cursorForPosition(viewportRect.topLeft()).position()
+        end = self.__plainTextEdit.cursorForPosition(viewportRect.bottomRight()).position()
+        return (start, end)
+
+    def __updateVisibleSelections(self, force=False):
+        """Build extra selections for occurences near visible area"""
+        if not self.__searchHighlight:
+            return
+
+        start, end = self.__visibleRange()
+
+        if not force and self.__materializedRange is not None and start >= self.__materializedRange[0] and end <= self.__materializedRange[1]:
+            # already built
+            return
+
+        # build selection for a page before and a page after visible area
+        margin = max(end - start, 1000)
+        self.__materializedRange = (max(0, start - margin), end + margin)
+
+        document = self.__plainTextEdit.document()
+        brush = QBrush(self.__searchColors[SearchFromPlainTextEdit.COLOR_SEARCH_ALL])
+        self.__extraSelectionsFoundAll = []
+        for index in range(bisect_left(self.__indexEnds, self.__materializedRange[0]), bisect_right(self.__indexStarts, self.__materializedRange[1])):
+            cursor = QTextCursor(document)
+            cursor.setPosition(self.__indexStarts[index], QTextCursor.MoveAnchor)
+            cursor.setPosition(self.__indexEnds[index], QTextCursor.KeepAnchor)
+
+            extraSelection = QTextEdit.ExtraSelection()
+            extraSelection.cursor = cursor
+            extraSelection.format.setBackground(brush)
+            self.__extraSelectionsFoundAll.append(extraSelection)
+
+        self.__plainTextEdit.setExtraSelections(self.__highlightedSelections())
+
+    def __searchNextFromIndex(self, position, backward):
+        """Search next occurence from index
+
+        Return a QTextCursor, None if nothing is found or False if index can't be used
+        """
+        nbOccurences = len(self.__indexStarts)
+        if not self.__indexComplete or nbOccurences >= SearchFromPlainTextEdit.MAX_OCCURENCES:
+            # index is not built, or has been capped: can't be used
+            return False
+        elif nbOccurences == 0:
+            return None
+
+        if backward:
+            index = bisect_left(self.__indexStarts, position) - 1
+        else:
+            index = bisect_left(self.__indexStarts, position)
+
+        document = self.__plainTextEdit.document()
+        for loop in range(nbOccurences):
+            index %= nbOccurences
+            if document.findBlock(self.__indexStarts[index]).isVisible():
+                cursor = QTextCursor(document)
+                cursor.setPosition(self.__indexStarts[index], QTextCursor.MoveAnchor)
+                cursor.setPosition(self.__indexEnds[index], QTextCursor.KeepAnchor)
+                return cursor
+
+            if backward:
+                index -= 1
+            else:
+                index += 1
+
+        return None
+
+    def __searchNextFromDocument(self, pattern, position, backward):
+        """Search next occurence from document, block by block
+
+        Use the same rules than index (used when index can't be used)
+        Return a QTextCursor or None if nothing is found
+        """
+        document = self.__plainTextEdit.document()
+
+        block = document.findBlock(position)
+        if not block.isValid():
+            block = document.lastBlock()
+
+        # all blocks are checked, looping at end/start of document; first block
+        # is checked twice: first for occurences after/before position, then
+        # for all occurences
+        for loop in range(document.blockCount() + 1):
+            if block.isVisible():
+                blockPosition = block.position()
+                occurences = pattern.occurences(block.text())
+                if backward:
+                    occurences.reverse()
+
+                for start, end in occurences:
+                    if loop > 0 or (backward and blockPosition + start < position) or (not backward and blockPosition + start >= position):
+                        cursor = QTextCursor(document)
+                        cursor.setPosition(blockPosition + start, QTextCursor.MoveAnchor)
+                        cursor.setPosition(blockPosition + end, QTextCursor.KeepAnchor)
+                        return cursor
+
+            if backward:
+                block = block.previous()
+                if not block.isValid():
+                    block = document.lastBlock()
+            else:
+                block = block.next()
+                if not block.isValid():
+                    block = document.firstBlock()
+
+        return None
+
+    def isCancelled(self, searchId):
+        """Return True if search all for given `searchId` is not needed anymore"""
+        return (searchId != self.__searchId)
+
     def clearCurrent(self):
         """Clear current found selection"""
         if self.__extraSelectionsFoundCurrent:
@@ -564,42 +976,56 @@ class SearchFromPlainTextEdit:
             WHOLEWORD =       search for while words only
             CASESENSITIVE =   search with case sensitive
 
-        Return list of cursors
-        """
-        extraSelectionsFoundAll = []
+        Search is made line by line in a background thread:
+        - signal searchAllProgress() is emitted each time occurences are found
+        - signal searchAllFinished() is emitted when search is finished
+        (at most, MAX_OCCURENCES occurences are indexed)
+        Then index is updated when document is modified
 
-        if (text is None or text == '') and options & SearchOptions.HIGHLIGHT == SearchOptions.HIGHLIGHT:
-            # clear current selections
-            self.__extraSelectionsFoundAll = []
-            self.__plainTextEdit.setExtraSelections(self.__highlightedSelections())
-            return self.__extraSelectionsFoundAll
+        Only occurences near visible area are highlighted
 
-        findFlags = 0
-        if options & SearchOptions.WHOLEWORD == SearchOptions.WHOLEWORD:
-            findFlags |= QTextDocument.FindWholeWords
-        if options & SearchOptions.CASESENSITIVE == SearchOptions.CASESENSITIVE:
-            findFlags |= QTextDocument.FindCaseSensitively
-        if options & SearchOptions.REGEX == SearchOptions.REGEX:
-            text = QRegularExpression(text)
+        Return nothing: occurences are available from searchAllOccurences()
+        once searchAllFinished() is emitted
+        """
+        # cancel current search
+        self.__searchId += 1
+        self.__indexStarts = []
+        self.__indexEnds = []
+        self.__indexComplete = False
+        self.__pendingChange = None
+        self.__materializedRange = None
+        self.__extraSelectionsFoundAll = []
 
-        cursor = self.__plainTextEdit.document().find(text, 0, QTextDocument.FindFlags(findFlags))
-        while cursor.position() > 0:
-            extraSelection = QTextEdit.ExtraSelection()
+        if text is None or text == '':
+            self.__searchKey = None
+            self.__searchPattern = None
+            self.__searchHighlight = False
 
-            extraSelection.cursor = cursor
-            extraSelection.format.setBackground(QBrush(self.__searchColors[SearchFromPlainTextEdit.COLOR_SEARCH_ALL]))
+            if options & SearchOptions.HIGHLIGHT == SearchOptions.HIGHLIGHT:
+                # clear current selections
+                self.__plainTextEdit.setExtraSelections(self.__highlightedSelections())
+            return
 
-            extraSelectionsFoundAll.append(extraSelection)
-            cursor = self.__plainTextEdit.document().find(text, cursor, QTextDocument.FindFlags(findFlags))
+        self.__searchKey = self.__searchKeyFor(text, options)
+        self.__searchPattern = SearchFromPlainTextEditPattern(text, options)
+        self.__searchHighlight = (options & SearchOptions.HIGHLIGHT == SearchOptions.HIGHLIGHT)
+        self.__plainTextEdit.setExtraSelections(self.__highlightedSelections())
 
-        if options & SearchOptions.HIGHLIGHT == SearchOptions.HIGHLIGHT:
-            self.__extraSelectionsFoundAll = extraSelectionsFoundAll
-        else:
-            self.__extraSelectionsFoundAll = []
+        if not self.__searchPattern.isValid():
+            # invalid regular expression
+            self.__indexComplete = True
+            self.searchAllFinished.emit(0)
+            return
 
-        self.__plainTextEdit.setExtraSelections(self.__highlightedSelections())
+        worker = SearchFromPlainTextEditWorker(self, self.__searchId, self.__plainTextEdit.toPlainText(), self.__searchPattern, SearchFromPlainTextEdit.MAX_OCCURENCES)
+        worker.signals.processed.connect(self.__workerProcessed)
+        worker.signals.finished.connect(self.__workerFinished)
+        worker.setAutoDelete(True)
+        self.__threadPool.start(worker)
 
-        return extraSelectionsFoundAll
+    def searchAllOccurences(self):
+        """Return list of occurences found by last search all, as a list of tuple(start, end) positions"""
+        return list(zip(self.__indexStarts, self.__indexEnds))
 
     def searchNext(self, text, options=0, fromCursor=None):
         """Search for next occurence of `text`
@@ -621,48 +1047,33 @@ class SearchFromPlainTextEdit:
             self.__plainTextEdit.setExtraSelections(self.__highlightedSelections())
             return self.__extraSelectionsFoundCurrent
 
-        findFlags = 0
-        if options & SearchOptions.WHOLEWORD == SearchOptions.WHOLEWORD:
-            findFlags |= QTextDocument.FindWholeWords
-        if options & SearchOptions.CASESENSITIVE == SearchOptions.CASESENSITIVE:
-            findFlags |= QTextDocument.FindCaseSensitively
-        if options & SearchOptions.BACKWARD == SearchOptions.BACKWARD:
-            findFlags |= QTextDocument.FindBackward
-
-        if options & SearchOptions.REGEX == SearchOptions.REGEX:
-            text = QRegularExpression(text)
+        backward = (options & SearchOptions.BACKWARD == SearchOptions.BACKWARD)
 
         if not isinstance(fromCursor, (int, QTextCursor)):
             if self.__extraSelectionsFoundCurrent is None:
-                cursor = self.__plainTextEdit.textCursor().position()
+                fromCursor = self.__plainTextEdit.textCursor().position()
             else:
-                cursor = self.__extraSelectionsFoundCurrent.cursor
-        else:
-            cursor = fromCursor
-
-        found = self.__plainTextEdit.document().find(text, cursor, QTextDocument.FindFlags(findFlags))
-        loopNumber = 0
-        while loopNumber <= 1:
-            # check found occurence
-            if found is None or found.position() == -1:
-                loopNumber += 1
-
-                # nothing found: may be we need to loop
-                if options & SearchOptions.BACKWARD == SearchOptions.BACKWARD:
-                    cursor = self.__plainTextEdit.document().characterCount()
-                else:
-                    cursor = 0
+                fromCursor = self.__extraSelectionsFoundCurrent.cursor
 
-                found = self.__plainTextEdit.document().find(text, cursor, QTextDocument.FindFlags(findFlags))
+        if isinstance(fromCursor, QTextCursor):
+            # like QTextDocument.find(), start after/before selection
+            if backward:
+                position = fromCursor.selectionStart()
+            else:
+                position = fromCursor.selectionEnd()
+        else:
+            position = fromCursor
 
-                if found is not None and found.position() == -1:
-                    found = None
+        if self.__searchKey == self.__searchKeyFor(text, options):
+            found = self.__searchNextFromIndex(position, backward)
+            pattern = self.__searchPattern
+        else:
+            found = False
+            pattern = SearchFromPlainTextEditPattern(text, options)
 
-            if found and not found.block().isVisible():
-                # something found, but not visible
-                found = self.__plainTextEdit.document().find(text, found, QTextDocument.FindFlags(findFlags))
-            elif found:
-                break
+        if found is False:
+            # index can't be used, search from document with same rules
+            found = self.__searchNextFromDocument(pattern, position, backward)
 
         if options & SearchOptions.HIGHLIGHT == SearchOptions.HIGHLIGHT and found is not None:
             self.__extraSelectionsFoundCurrent = QTextEdit.ExtraSelection()